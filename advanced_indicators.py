@@ -5,8 +5,9 @@ Comprehensive collection of professional trading indicators
 
 import numpy as np
 import pandas as pd
-import talib
-from typing import Dict, List, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from indicator_backend import get_indicator_backend
 
 class AdvancedTechnicalIndicators:
     """
@@ -14,10 +15,15 @@ class AdvancedTechnicalIndicators:
     """
     
     @staticmethod
-    def calculate_all_indicators(data: pd.DataFrame) -> pd.DataFrame:
+    def calculate_all_indicators(data: pd.DataFrame, backend: Optional[str] = None) -> pd.DataFrame:
         """
         Calculate comprehensive set of technical indicators
+        
+        Args:
+            data: OHLCV data
+            backend: Indicator backend ('auto', 'talib' or 'numba'), see indicator_backend
         """
+        lib = get_indicator_backend(backend)
         df = data.copy()
         high = df['High'].values
         low = df['Low'].values
@@ -29,30 +35,30 @@ class AdvancedTechnicalIndicators:
         
         # Moving Averages (Multiple timeframes)
         for period in [5, 10, 20, 50, 100, 200]:
-            df[f'SMA_{period}'] = talib.SMA(close, timeperiod=period)
-            df[f'EMA_{period}'] = talib.EMA(close, timeperiod=period)
+            df[f'SMA_{period}'] = lib.SMA(close, timeperiod=period)
+            df[f'EMA_{period}'] = lib.EMA(close, timeperiod=period)
         
         # MACD with multiple settings
-        macd, macd_signal, macd_hist = talib.MACD(close, fastperiod=12, slowperiod=26, signalperiod=9)
+        macd, macd_signal, macd_hist = lib.MACD(close, fastperiod=12, slowperiod=26, signalperiod=9)
         df['MACD'] = macd
         df['MACD_Signal'] = macd_signal
         df['MACD_Histogram'] = macd_hist
         
         # Additional MACD timeframes
-        macd_fast, macd_signal_fast, macd_hist_fast = talib.MACD(close, fastperiod=5, slowperiod=13, signalperiod=5)
+        macd_fast, macd_signal_fast, macd_hist_fast = lib.MACD(close, fastperiod=5, slowperiod=13, signalperiod=5)
         df['MACD_Fast'] = macd_fast
         df['MACD_Signal_Fast'] = macd_signal_fast
         
         # Directional Movement Index (ADX)
-        df['ADX'] = talib.ADX(high, low, close, timeperiod=14)
-        df['DI_Plus'] = talib.PLUS_DI(high, low, close, timeperiod=14)
-        df['DI_Minus'] = talib.MINUS_DI(high, low, close, timeperiod=14)
+        df['ADX'] = lib.ADX(high, low, close, timeperiod=14)
+        df['DI_Plus'] = lib.PLUS_DI(high, low, close, timeperiod=14)
+        df['DI_Minus'] = lib.MINUS_DI(high, low, close, timeperiod=14)
         
         # Parabolic SAR
-        df['PSAR'] = talib.SAR(high, low, acceleration=0.02, maximum=0.2)
+        df['PSAR'] = lib.SAR(high, low, acceleration=0.02, maximum=0.2)
         
         # Aroon Oscillator
-        aroon_down, aroon_up = talib.AROON(high, low, timeperiod=14)
+        aroon_down, aroon_up = lib.AROON(high, low, timeperiod=14)
         df['Aroon_Up'] = aroon_up
         df['Aroon_Down'] = aroon_down
         df['Aroon_Oscillator'] = aroon_up - aroon_down
@@ -61,36 +67,36 @@ class AdvancedTechnicalIndicators:
         
         # RSI with multiple timeframes
         for period in [9, 14, 21, 30]:
-            df[f'RSI_{period}'] = talib.RSI(close, timeperiod=period)
+            df[f'RSI_{period}'] = lib.RSI(close, timeperiod=period)
         
         # Stochastic Oscillator
-        slowk, slowd = talib.STOCH(high, low, close, fastk_period=14, slowk_period=3, slowd_period=3)
+        slowk, slowd = lib.STOCH(high, low, close, fastk_period=14, slowk_period=3, slowd_period=3)
         df['Stoch_K'] = slowk
         df['Stoch_D'] = slowd
         
         # Fast Stochastic
-        fastk, fastd = talib.STOCHF(high, low, close, fastk_period=5, fastd_period=3)
+        fastk, fastd = lib.STOCHF(high, low, close, fastk_period=5, fastd_period=3)
         df['Fast_Stoch_K'] = fastk
         df['Fast_Stoch_D'] = fastd
         
         # Williams %R
-        df['Williams_R'] = talib.WILLR(high, low, close, timeperiod=14)
+        df['Williams_R'] = lib.WILLR(high, low, close, timeperiod=14)
         
         # Rate of Change
         for period in [10, 20, 30]:
-            df[f'ROC_{period}'] = talib.ROC(close, timeperiod=period)
+            df[f'ROC_{period}'] = lib.ROC(close, timeperiod=period)
         
         # Commodity Channel Index
-        df['CCI'] = talib.CCI(high, low, close, timeperiod=14)
-        df['CCI_20'] = talib.CCI(high, low, close, timeperiod=20)
+        df['CCI'] = lib.CCI(high, low, close, timeperiod=14)
+        df['CCI_20'] = lib.CCI(high, low, close, timeperiod=20)
         
         # Momentum
-        df['MOM'] = talib.MOM(close, timeperiod=10)
+        df['MOM'] = lib.MOM(close, timeperiod=10)
         
         # === VOLATILITY INDICATORS ===
         
         # Bollinger Bands
-        bb_upper, bb_middle, bb_lower = talib.BBANDS(close, timeperiod=20, nbdevup=2, nbdevdn=2)
+        bb_upper, bb_middle, bb_lower = lib.BBANDS(close, timeperiod=20, nbdevup=2, nbdevdn=2)
         df['BB_Upper'] = bb_upper
         df['BB_Middle'] = bb_middle
         df['BB_Lower'] = bb_lower
@@ -98,34 +104,34 @@ class AdvancedTechnicalIndicators:
         df['BB_Position'] = (close - bb_lower) / (bb_upper - bb_lower)
         
         # Bollinger Bands with different settings
-        bb_upper_10, bb_middle_10, bb_lower_10 = talib.BBANDS(close, timeperiod=10, nbdevup=2, nbdevdn=2)
+        bb_upper_10, bb_middle_10, bb_lower_10 = lib.BBANDS(close, timeperiod=10, nbdevup=2, nbdevdn=2)
         df['BB_Width_10'] = (bb_upper_10 - bb_lower_10) / bb_middle_10
         
         # Average True Range
-        df['ATR'] = talib.ATR(high, low, close, timeperiod=14)
+        df['ATR'] = lib.ATR(high, low, close, timeperiod=14)
         df['ATR_Ratio'] = df['ATR'] / close
         
         # True Range
-        df['TRANGE'] = talib.TRANGE(high, low, close)
+        df['TRANGE'] = lib.TRANGE(high, low, close)
         
         # === VOLUME INDICATORS ===
         
         # On-Balance Volume
-        df['OBV'] = talib.OBV(close, volume)
+        df['OBV'] = lib.OBV(close, volume)
         
         # Volume moving averages
-        df['Volume_SMA_20'] = talib.SMA(volume, timeperiod=20)
-        df['Volume_SMA_50'] = talib.SMA(volume, timeperiod=50)
+        df['Volume_SMA_20'] = lib.SMA(volume, timeperiod=20)
+        df['Volume_SMA_50'] = lib.SMA(volume, timeperiod=50)
         df['Volume_Ratio'] = volume / df['Volume_SMA_20']
         
         # Money Flow Index
-        df['MFI'] = talib.MFI(high, low, close, volume, timeperiod=14)
+        df['MFI'] = lib.MFI(high, low, close, volume, timeperiod=14)
         
         # Accumulation/Distribution Line
-        df['AD'] = talib.AD(high, low, close, volume)
+        df['AD'] = lib.AD(high, low, close, volume)
         
         # Chaikin A/D Oscillator
-        df['ADOSC'] = talib.ADOSC(high, low, close, volume, fastperiod=3, slowperiod=10)
+        df['ADOSC'] = lib.ADOSC(high, low, close, volume, fastperiod=3, slowperiod=10)
         
         # === PRICE ACTION INDICATORS ===
         
@@ -138,7 +144,7 @@ class AdvancedTechnicalIndicators:
         # Volatility measures
         df['Price_Volatility_10'] = df['Price_Change'].rolling(10).std()
         df['Price_Volatility_20'] = df['Price_Change'].rolling(20).std()
-        df['Volume_Volatility'] = (volume / np.roll(volume, 1) - 1).rolling(20).std()
+        df['Volume_Volatility'] = pd.Series(volume / np.roll(volume, 1) - 1, index=df.index).rolling(20).std()
         
         # === ICHIMOKU CLOUD ===
         
@@ -147,7 +153,7 @@ class AdvancedTechnicalIndicators:
         df['Kijun'] = (df['High'].rolling(26).max() + df['Low'].rolling(26).min()) / 2
         df['Senkou_A'] = ((df['Tenkan'] + df['Kijun']) / 2).shift(26)
         df['Senkou_B'] = ((df['High'].rolling(52).max() + df['Low'].rolling(52).min()) / 2).shift(26)
-        df['Chikou'] = close.shift(-26)
+        df['Chikou'] = df['Close'].shift(-26)
         
         # === FIBONACCI AND SUPPORT/RESISTANCE ===
         
@@ -176,20 +182,20 @@ class AdvancedTechnicalIndicators:
         # === ADVANCED OSCILLATORS ===
         
         # Ultimate Oscillator
-        df['ULTOSC'] = talib.ULTOSC(high, low, close, timeperiod1=7, timeperiod2=14, timeperiod3=28)
+        df['ULTOSC'] = lib.ULTOSC(high, low, close, timeperiod1=7, timeperiod2=14, timeperiod3=28)
         
         # Balance of Power
-        df['BOP'] = talib.BOP(open_price, high, low, close)
+        df['BOP'] = lib.BOP(open_price, high, low, close)
         
         # === PATTERN RECOGNITION ===
         
         # Candlestick patterns (key ones)
-        df['Doji'] = talib.CDLDOJI(open_price, high, low, close)
-        df['Hammer'] = talib.CDLHAMMER(open_price, high, low, close)
-        df['Shooting_Star'] = talib.CDLSHOOTINGSTAR(open_price, high, low, close)
-        df['Engulfing_Bullish'] = talib.CDLENGULFING(open_price, high, low, close)
-        df['Morning_Star'] = talib.CDLMORNINGSTAR(open_price, high, low, close)
-        df['Evening_Star'] = talib.CDLEVENINGSTAR(open_price, high, low, close)
+        df['Doji'] = lib.CDLDOJI(open_price, high, low, close)
+        df['Hammer'] = lib.CDLHAMMER(open_price, high, low, close)
+        df['Shooting_Star'] = lib.CDLSHOOTINGSTAR(open_price, high, low, close)
+        df['Engulfing_Bullish'] = lib.CDLENGULFING(open_price, high, low, close)
+        df['Morning_Star'] = lib.CDLMORNINGSTAR(open_price, high, low, close)
+        df['Evening_Star'] = lib.CDLEVENINGSTAR(open_price, high, low, close)
         
         # === CUSTOM COMPOSITE INDICATORS ===
         
@@ -322,10 +328,65 @@ class AdvancedTechnicalIndicators:
         }
     
     @staticmethod
-    def calculate_market_regime(df: pd.DataFrame) -> pd.DataFrame:
+    def signal_confluence_series(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """
+        get_signal_confluence scores for every row of df at once
+        
+        Returns:
+            Arrays of bullish_score, bearish_score, bullish_ratio, bearish_ratio and confluence_strength
+        """
+        def column(name, default):
+            if name not in df.columns:
+                return np.full(len(df), default, dtype=np.float64)
+            return df[name].to_numpy(dtype=np.float64, na_value=np.nan)
+        
+        rsi = column('RSI_14', 50)
+        macd = column('MACD', 0)
+        macd_signal = column('MACD_Signal', 0)
+        macd_hist = column('MACD_Histogram', 0)
+        bb_position = column('BB_Position', 0.5)
+        trend_alignment = column('Trend_Alignment', 0.5)
+        
+        with np.errstate(invalid='ignore'):
+            bullish = (
+                np.select([rsi < 30, rsi > 70, rsi < 40], [2, 0, 1], 0)
+                + np.where((macd > macd_signal) & (macd_hist > 0), 2, 0)
+                + np.where(bb_position < 0.1, 2, 0)
+                + np.where(trend_alignment > 0.8, 1, 0)
+            )
+            bearish = (
+                np.select([rsi < 30, rsi > 70, rsi < 40, rsi > 60], [0, 2, 0, 1], 0)
+                + np.where((macd < macd_signal) & (macd_hist < 0), 2, 0)
+                + np.where(bb_position > 0.9, 2, 0)
+                + np.where(trend_alignment < 0.2, 1, 0)
+            )
+        
+        total = bullish + bearish
+        safe_total = np.where(total > 0, total, 1)
+        bullish_ratio = np.where(total > 0, bullish / safe_total, 0.0)
+        bearish_ratio = np.where(total > 0, bearish / safe_total, 0.0)
+        
+        return {
+            'bullish_score': bullish,
+            'bearish_score': bearish,
+            'bullish_ratio': bullish_ratio,
+            'bearish_ratio': bearish_ratio,
+            'confluence_strength': np.maximum(bullish_ratio, bearish_ratio)
+        }
+    
+    @staticmethod
+    def calculate_market_regime(df: pd.DataFrame, volatile_threshold: Optional[float] = None) -> pd.DataFrame:
         """
         Identify market regime (trending, ranging, volatile)
+
+        Args:
+            df: Frame with indicators
+            volatile_threshold: ATR_Ratio above which the market counts as volatile;
+                defaults to the 80th percentile of df['ATR_Ratio']
         """
+        if volatile_threshold is None:
+            volatile_threshold = df['ATR_Ratio'].quantile(0.8)
+
         # ADX for trend strength
         adx = df['ADX'].rolling(10).mean()
         
@@ -348,7 +409,7 @@ class AdvancedTechnicalIndicators:
             
             if current_adx > 25 and current_eff > 0.3:
                 regime.append('TRENDING')
-            elif current_vol > df['ATR_Ratio'].quantile(0.8):
+            elif current_vol > volatile_threshold:
                 regime.append('VOLATILE')
             else:
                 regime.append('RANGING')
@@ -384,6 +445,26 @@ class AdvancedTechnicalIndicators:
         
         return df
     
+    @staticmethod
+    def compact_frame(df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Shrink a processed frame: float32 indicators, int8 flags and candlestick
+        patterns, categorical regimes. Prices, volume and returns keep float64.
+        """
+        dtypes = {}
+        for column in df.columns:
+            values = df[column]
+            if column in REGIME_CATEGORIES:
+                dtypes[column] = pd.CategoricalDtype(REGIME_CATEGORIES[column])
+            elif column in FULL_PRECISION_COLUMNS:
+                continue
+            elif column in FLAG_COLUMNS or column in PATTERN_COLUMNS:
+                dtypes[column] = np.float32 if values.isna().any() else np.int8
+            elif pd.api.types.is_float_dtype(values) or pd.api.types.is_integer_dtype(values):
+                dtypes[column] = np.float32
+        
+        return df.astype(dtypes)
+    
     @staticmethod
     def calculate_risk_metrics(df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -405,6 +486,275 @@ class AdvancedTechnicalIndicators:
         
         return df
 
+# Numeric codes for the Volatility_Regime labels in array outputs
+VOLATILITY_REGIME_CODES = {'LOW': 0, 'NORMAL': 1, 'HIGH': 2}
+
+# Column groups for the compact frame representation
+FULL_PRECISION_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume', 'Future_Return']
+FLAG_COLUMNS = ['Higher_High', 'Lower_Low', 'Higher_Low', 'Lower_High', 'Target', 'Binary_Target']
+PATTERN_COLUMNS = ['Doji', 'Hammer', 'Shooting_Star', 'Engulfing_Bullish', 'Morning_Star', 'Evening_Star']
+REGIME_CATEGORIES = {
+    'Volatility_Regime': list(VOLATILITY_REGIME_CODES.keys()),
+    'Market_Regime': ['UNKNOWN', 'TRENDING', 'RANGING', 'VOLATILE']
+}
+
+OHLCV_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+class BatchTechnicalIndicators:
+    """
+    Array-first indicator computation for many symbols at once.
+    Works on a stacked (symbols x time x OHLCV) block and produces the same
+    columns as AdvancedTechnicalIndicators.calculate_all_indicators.
+    """
+    
+    @staticmethod
+    def stack_ohlcv(frames: Dict[str, pd.DataFrame]) -> Tuple[np.ndarray, pd.DatetimeIndex, List[str]]:
+        """
+        Align per-symbol OHLCV frames on their common timestamps and stack them
+        
+        Returns:
+            (ohlcv block of shape (symbols, time, 5), shared index, symbol order)
+        """
+        symbols = list(frames.keys())
+        index = frames[symbols[0]].index
+        for symbol in symbols[1:]:
+            index = index.intersection(frames[symbol].index)
+        
+        ohlcv = np.stack([
+            frames[symbol].loc[index, OHLCV_COLUMNS].to_numpy(dtype=np.float64)
+            for symbol in symbols
+        ])
+        
+        return ohlcv, index, symbols
+    
+    @staticmethod
+    def _backend_indicators(lib, ohlcv: np.ndarray) -> Dict[str, np.ndarray]:
+        """Run the per-series backend functions for one symbol's (time x 5) block"""
+        open_price, high, low, close, volume = (np.ascontiguousarray(ohlcv[:, i]) for i in range(5))
+        out = {}
+        
+        for period in [5, 10, 20, 50, 100, 200]:
+            out[f'SMA_{period}'] = lib.SMA(close, timeperiod=period)
+            out[f'EMA_{period}'] = lib.EMA(close, timeperiod=period)
+        
+        out['MACD'], out['MACD_Signal'], out['MACD_Histogram'] = lib.MACD(
+            close, fastperiod=12, slowperiod=26, signalperiod=9)
+        out['MACD_Fast'], out['MACD_Signal_Fast'], _ = lib.MACD(
+            close, fastperiod=5, slowperiod=13, signalperiod=5)
+        
+        out['ADX'] = lib.ADX(high, low, close, timeperiod=14)
+        out['DI_Plus'] = lib.PLUS_DI(high, low, close, timeperiod=14)
+        out['DI_Minus'] = lib.MINUS_DI(high, low, close, timeperiod=14)
+        out['PSAR'] = lib.SAR(high, low, acceleration=0.02, maximum=0.2)
+        out['Aroon_Down'], out['Aroon_Up'] = lib.AROON(high, low, timeperiod=14)
+        
+        for period in [9, 14, 21, 30]:
+            out[f'RSI_{period}'] = lib.RSI(close, timeperiod=period)
+        out['Stoch_K'], out['Stoch_D'] = lib.STOCH(
+            high, low, close, fastk_period=14, slowk_period=3, slowd_period=3)
+        out['Fast_Stoch_K'], out['Fast_Stoch_D'] = lib.STOCHF(
+            high, low, close, fastk_period=5, fastd_period=3)
+        out['Williams_R'] = lib.WILLR(high, low, close, timeperiod=14)
+        for period in [10, 20, 30]:
+            out[f'ROC_{period}'] = lib.ROC(close, timeperiod=period)
+        out['CCI'] = lib.CCI(high, low, close, timeperiod=14)
+        out['CCI_20'] = lib.CCI(high, low, close, timeperiod=20)
+        out['MOM'] = lib.MOM(close, timeperiod=10)
+        
+        out['BB_Upper'], out['BB_Middle'], out['BB_Lower'] = lib.BBANDS(
+            close, timeperiod=20, nbdevup=2, nbdevdn=2)
+        out['BB_Upper_10'], out['BB_Middle_10'], out['BB_Lower_10'] = lib.BBANDS(
+            close, timeperiod=10, nbdevup=2, nbdevdn=2)
+        out['ATR'] = lib.ATR(high, low, close, timeperiod=14)
+        out['TRANGE'] = lib.TRANGE(high, low, close)
+        
+        out['OBV'] = lib.OBV(close, volume)
+        out['Volume_SMA_20'] = lib.SMA(volume, timeperiod=20)
+        out['Volume_SMA_50'] = lib.SMA(volume, timeperiod=50)
+        out['MFI'] = lib.MFI(high, low, close, volume, timeperiod=14)
+        out['AD'] = lib.AD(high, low, close, volume)
+        out['ADOSC'] = lib.ADOSC(high, low, close, volume, fastperiod=3, slowperiod=10)
+        
+        out['ULTOSC'] = lib.ULTOSC(high, low, close, timeperiod1=7, timeperiod2=14, timeperiod3=28)
+        out['BOP'] = lib.BOP(open_price, high, low, close)
+        
+        out['Doji'] = lib.CDLDOJI(open_price, high, low, close)
+        out['Hammer'] = lib.CDLHAMMER(open_price, high, low, close)
+        out['Shooting_Star'] = lib.CDLSHOOTINGSTAR(open_price, high, low, close)
+        out['Engulfing_Bullish'] = lib.CDLENGULFING(open_price, high, low, close)
+        out['Morning_Star'] = lib.CDLMORNINGSTAR(open_price, high, low, close)
+        out['Evening_Star'] = lib.CDLEVENINGSTAR(open_price, high, low, close)
+        
+        return out
+    
+    @staticmethod
+    def _rolling(values: np.ndarray, window: int, method: str, *args) -> np.ndarray:
+        """Rolling statistic along the time axis of a (symbols x time) array"""
+        rolled = pd.DataFrame(values.T).rolling(window)
+        return getattr(rolled, method)(*args).to_numpy().T
+    
+    @staticmethod
+    def _shift(values: np.ndarray, periods: int) -> np.ndarray:
+        """Shift a (symbols x time) array along time, filling with NaN like Series.shift"""
+        shifted = np.full(values.shape, np.nan)
+        if periods > 0:
+            shifted[:, periods:] = values[:, :-periods]
+        elif periods < 0:
+            shifted[:, :periods] = values[:, -periods:]
+        else:
+            shifted[:] = values
+        return shifted
+    
+    @staticmethod
+    def calculate_all_indicators(
+        ohlcv: np.ndarray,
+        backend: Optional[str] = None,
+        max_workers: Optional[int] = None
+    ) -> Tuple[np.ndarray, List[str]]:
+        """
+        Calculate every indicator for all symbols of a stacked OHLCV block
+        
+        Args:
+            ohlcv: Array of shape (symbols, time, 5) with Open, High, Low, Close, Volume
+            backend: Indicator backend ('auto', 'talib' or 'numba'), see indicator_backend
+            max_workers: Threads for the per-symbol backend calls (TA-Lib and the
+                         Numba kernels release the GIL); None or 1 runs serially
+            
+        Returns:
+            (float32 tensor of shape (symbols, time, columns), column names)
+        """
+        lib = get_indicator_backend(backend)
+        ohlcv = np.asarray(ohlcv, dtype=np.float64)
+        
+        if max_workers and max_workers > 1 and len(ohlcv) > 1:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                per_symbol = list(executor.map(
+                    lambda block: BatchTechnicalIndicators._backend_indicators(lib, block), ohlcv))
+        else:
+            per_symbol = [BatchTechnicalIndicators._backend_indicators(lib, block) for block in ohlcv]
+        
+        ind = {name: np.stack([result[name] for result in per_symbol]).astype(np.float64)
+               for name in per_symbol[0]}
+        
+        rolling = BatchTechnicalIndicators._rolling
+        shift = BatchTechnicalIndicators._shift
+        open_price, high, low, close, volume = (ohlcv[:, :, i] for i in range(5))
+        cols = {'Open': open_price, 'High': high, 'Low': low, 'Close': close, 'Volume': volume}
+        
+        # === TREND INDICATORS ===
+        for period in [5, 10, 20, 50, 100, 200]:
+            cols[f'SMA_{period}'] = ind[f'SMA_{period}']
+            cols[f'EMA_{period}'] = ind[f'EMA_{period}']
+        for name in ['MACD', 'MACD_Signal', 'MACD_Histogram', 'MACD_Fast', 'MACD_Signal_Fast',
+                     'ADX', 'DI_Plus', 'DI_Minus', 'PSAR', 'Aroon_Up', 'Aroon_Down']:
+            cols[name] = ind[name]
+        cols['Aroon_Oscillator'] = ind['Aroon_Up'] - ind['Aroon_Down']
+        
+        # === MOMENTUM INDICATORS ===
+        for period in [9, 14, 21, 30]:
+            cols[f'RSI_{period}'] = ind[f'RSI_{period}']
+        for name in ['Stoch_K', 'Stoch_D', 'Fast_Stoch_K', 'Fast_Stoch_D', 'Williams_R']:
+            cols[name] = ind[name]
+        for period in [10, 20, 30]:
+            cols[f'ROC_{period}'] = ind[f'ROC_{period}']
+        for name in ['CCI', 'CCI_20', 'MOM']:
+            cols[name] = ind[name]
+        
+        # === VOLATILITY INDICATORS ===
+        for name in ['BB_Upper', 'BB_Middle', 'BB_Lower']:
+            cols[name] = ind[name]
+        cols['BB_Width'] = (ind['BB_Upper'] - ind['BB_Lower']) / ind['BB_Middle']
+        cols['BB_Position'] = (close - ind['BB_Lower']) / (ind['BB_Upper'] - ind['BB_Lower'])
+        cols['BB_Width_10'] = (ind['BB_Upper_10'] - ind['BB_Lower_10']) / ind['BB_Middle_10']
+        cols['ATR'] = ind['ATR']
+        cols['ATR_Ratio'] = ind['ATR'] / close
+        cols['TRANGE'] = ind['TRANGE']
+        
+        # === VOLUME INDICATORS ===
+        cols['OBV'] = ind['OBV']
+        cols['Volume_SMA_20'] = ind['Volume_SMA_20']
+        cols['Volume_SMA_50'] = ind['Volume_SMA_50']
+        cols['Volume_Ratio'] = volume / ind['Volume_SMA_20']
+        for name in ['MFI', 'AD', 'ADOSC']:
+            cols[name] = ind[name]
+        
+        # === PRICE ACTION INDICATORS ===
+        cols['Price_Change'] = close / np.roll(close, 1, axis=1) - 1
+        cols['High_Low_Ratio'] = high / low
+        cols['Close_Open_Ratio'] = close / open_price
+        cols['Body_Size'] = abs(close - open_price) / open_price
+        cols['Price_Volatility_10'] = rolling(cols['Price_Change'], 10, 'std')
+        cols['Price_Volatility_20'] = rolling(cols['Price_Change'], 20, 'std')
+        cols['Volume_Volatility'] = rolling(volume / np.roll(volume, 1, axis=1) - 1, 20, 'std')
+        
+        # === ICHIMOKU CLOUD ===
+        cols['Tenkan'] = (rolling(high, 9, 'max') + rolling(low, 9, 'min')) / 2
+        cols['Kijun'] = (rolling(high, 26, 'max') + rolling(low, 26, 'min')) / 2
+        cols['Senkou_A'] = shift((cols['Tenkan'] + cols['Kijun']) / 2, 26)
+        cols['Senkou_B'] = shift((rolling(high, 52, 'max') + rolling(low, 52, 'min')) / 2, 26)
+        cols['Chikou'] = shift(close, -26)
+        
+        # === FIBONACCI AND SUPPORT/RESISTANCE ===
+        cols['Resistance_20'] = rolling(high, 20, 'max')
+        cols['Support_20'] = rolling(low, 20, 'min')
+        cols['Resistance_50'] = rolling(high, 50, 'max')
+        cols['Support_50'] = rolling(low, 50, 'min')
+        cols['Distance_to_Resistance'] = (cols['Resistance_20'] - close) / close
+        cols['Distance_to_Support'] = (close - cols['Support_20']) / close
+        
+        # === MARKET STRUCTURE ===
+        # Comparisons against the NaN-shifted first bar are False, as in pandas
+        cols['Higher_High'] = (high > shift(high, 1)).astype(np.float64)
+        cols['Lower_Low'] = (low < shift(low, 1)).astype(np.float64)
+        cols['Higher_Low'] = (low > shift(low, 1)).astype(np.float64)
+        cols['Lower_High'] = (high < shift(high, 1)).astype(np.float64)
+        cols['Uptrend_Strength'] = rolling(cols['Higher_High'], 10, 'sum')
+        cols['Downtrend_Strength'] = rolling(cols['Lower_Low'], 10, 'sum')
+        
+        # === ADVANCED OSCILLATORS ===
+        cols['ULTOSC'] = ind['ULTOSC']
+        cols['BOP'] = ind['BOP']
+        
+        # === PATTERN RECOGNITION ===
+        for name in ['Doji', 'Hammer', 'Shooting_Star', 'Engulfing_Bullish', 'Morning_Star', 'Evening_Star']:
+            cols[name] = ind[name]
+        
+        # === CUSTOM COMPOSITE INDICATORS ===
+        cols['Trend_Alignment'] = (
+            (close > cols['SMA_20']).astype(np.float64) +
+            (cols['SMA_20'] > cols['SMA_50']).astype(np.float64) +
+            (cols['SMA_50'] > cols['SMA_200']).astype(np.float64)
+        ) / 3
+        cols['Momentum_Composite'] = (
+            ((cols['RSI_14'] - 50) / 50) +
+            (cols['Stoch_K'] - 50) / 50 +
+            (cols['Williams_R'] + 50) / 50
+        ) / 3
+        cols['Volume_Strength'] = (
+            (cols['Volume_Ratio'] > 1.5).astype(np.float64) +
+            (cols['OBV'] > shift(cols['OBV'], 1)).astype(np.float64) +
+            (cols['MFI'] > 50).astype(np.float64)
+        ) / 3
+        
+        # Volatility regime as numeric codes (see VOLATILITY_REGIME_CODES)
+        atr_ratio = cols['ATR_Ratio']
+        cols['Volatility_Regime'] = np.where(
+            atr_ratio > rolling(atr_ratio, 50, 'quantile', 0.8),
+            VOLATILITY_REGIME_CODES['HIGH'],
+            np.where(
+                atr_ratio < rolling(atr_ratio, 50, 'quantile', 0.2),
+                VOLATILITY_REGIME_CODES['LOW'],
+                VOLATILITY_REGIME_CODES['NORMAL']
+            )
+        ).astype(np.float64)
+        
+        columns = list(cols.keys())
+        tensor = np.empty((ohlcv.shape[0], ohlcv.shape[1], len(columns)), dtype=np.float32)
+        for i, name in enumerate(columns):
+            tensor[:, :, i] = cols[name]
+        
+        return tensor, columns
+
 class ConfidenceScoring:
     """
     Advanced confidence scoring system for trading signals
@@ -496,6 +846,170 @@ class ConfidenceScoring:
         
         # All conditions met
         return True, "All conditions met for high-confidence trade"
+    
+    @staticmethod
+    def comprehensive_confidence_series(
+        predictions: np.ndarray,
+        confluence_strength: np.ndarray,
+        market_regime: np.ndarray,
+        volume_confirmation: np.ndarray,
+        volatility_level: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        calculate_comprehensive_confidence for whole series
+        
+        Args:
+            predictions: Model outputs
+            confluence_strength: signal_confluence_series()['confluence_strength']
+            market_regime: Market_Regime labels
+            volume_confirmation: Boolean volume confirmation per bar
+            volatility_level: Volatility_Regime labels
+        
+        Returns:
+            (confidence, factor bitmask) arrays; see CONFIDENCE_FACTOR_BITS
+        """
+        predictions = np.asarray(predictions, dtype=np.float64)
+        confluence_strength = np.asarray(confluence_strength, dtype=np.float64)
+        regime = np.asarray(market_regime, dtype=object)
+        volatility = np.asarray(volatility_level, dtype=object)
+        volume = np.asarray(volume_confirmation, dtype=bool)
+        
+        conditions = {
+            'strong_confluence': confluence_strength > 0.7,
+            'moderate_confluence': ~(confluence_strength > 0.7) & (confluence_strength > 0.5),
+            'trending_regime': regime == 'TRENDING',
+            'ranging_regime': regime == 'RANGING',
+            'volatile_regime': regime == 'VOLATILE',
+            'volume_confirmation': volume,
+            'low_volatility': volatility == 'LOW',
+            'high_volatility': volatility == 'HIGH'
+        }
+        
+        score = np.abs(predictions - 0.5) * 2  # Base model confidence
+        factors = np.zeros(len(predictions), dtype=np.uint16)
+        for name, mask in conditions.items():
+            score = score + np.where(mask, CONFIDENCE_FACTOR_ADJUSTMENTS[name], 0.0)
+            factors |= np.where(mask, CONFIDENCE_FACTOR_BITS[name], 0).astype(np.uint16)
+        
+        # Cap confidence at 95%
+        return np.minimum(score, 0.95), factors
+    
+    @staticmethod
+    def should_trade_series(
+        confidence: np.ndarray,
+        confluence_strength: np.ndarray,
+        market_regime: np.ndarray,
+        volume_confirmation: np.ndarray,
+        risk_parameters: Dict
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        should_trade for whole series
+        
+        Returns:
+            (trade permission mask, reason code per bar); codes index TRADE_BLOCK_REASONS
+            and give the first failed check, as the scalar version does
+        """
+        min_confidence = risk_parameters.get('min_confidence', 0.8)
+        min_confluence = risk_parameters.get('min_confluence', 0.6)
+        
+        reasons = np.select(
+            [
+                np.asarray(confidence, dtype=np.float64) < min_confidence,
+                np.asarray(confluence_strength, dtype=np.float64) < min_confluence,
+                np.asarray(market_regime, dtype=object) == 'VOLATILE',
+                ~np.asarray(volume_confirmation, dtype=bool)
+            ],
+            [1, 2, 3, 4],
+            0
+        ).astype(np.int8)
+        
+        return reasons == 0, reasons
+    
+    @staticmethod
+    def score_frame(df: pd.DataFrame, predictions: np.ndarray, risk_parameters: Dict) -> Dict[str, np.ndarray]:
+        """
+        Confluence, confidence and trade permission for predictions aligned with df's rows
+        
+        Returns:
+            Arrays: confluence_strength, confidence, factors, should_trade, trade_reason
+        """
+        confluence = AdvancedTechnicalIndicators.signal_confluence_series(df)
+        market_regime = df['Market_Regime'].to_numpy(dtype=object) if 'Market_Regime' in df.columns \
+            else np.full(len(df), 'UNKNOWN', dtype=object)
+        volatility_level = df['Volatility_Regime'].to_numpy(dtype=object) if 'Volatility_Regime' in df.columns \
+            else np.full(len(df), 'NORMAL', dtype=object)
+        volume_confirmation = df['Volume_Ratio'].to_numpy(dtype=np.float64) > 1.5 if 'Volume_Ratio' in df.columns \
+            else np.zeros(len(df), dtype=bool)
+        
+        confidence, factors = ConfidenceScoring.comprehensive_confidence_series(
+            predictions, confluence['confluence_strength'], market_regime, volume_confirmation, volatility_level
+        )
+        should_trade, trade_reason = ConfidenceScoring.should_trade_series(
+            confidence, confluence['confluence_strength'], market_regime, volume_confirmation, risk_parameters
+        )
+        
+        return {
+            'confluence_strength': confluence['confluence_strength'],
+            'confidence': confidence,
+            'factors': factors,
+            'should_trade': should_trade,
+            'trade_reason': trade_reason
+        }
+    
+    @staticmethod
+    def pre_model_gates(df: pd.DataFrame, risk_parameters: Dict) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        The should_trade checks that hold regardless of the model output
+        
+        Each row is scored with a fully confident prediction (the highest
+        confidence any output can reach), so a row failing here cannot trade
+        whatever the model predicts and its inference can be skipped.
+        
+        Returns:
+            (mask of rows that may still trade, reason code per row as in should_trade_series)
+        """
+        scores = ConfidenceScoring.score_frame(df, np.ones(len(df)), risk_parameters)
+        return scores['should_trade'], scores['trade_reason']
+    
+    @staticmethod
+    def describe_factors(mask: int) -> List[str]:
+        """Factor names set in a bitmask from comprehensive_confidence_series"""
+        return [name for name, bit in CONFIDENCE_FACTOR_BITS.items() if int(mask) & bit]
+
+# Bits of the factor masks returned by ConfidenceScoring.comprehensive_confidence_series
+CONFIDENCE_FACTOR_BITS = {
+    'strong_confluence': 1 << 0,
+    'moderate_confluence': 1 << 1,
+    'trending_regime': 1 << 2,
+    'ranging_regime': 1 << 3,
+    'volatile_regime': 1 << 4,
+    'volume_confirmation': 1 << 5,
+    'low_volatility': 1 << 6,
+    'high_volatility': 1 << 7
+}
+
+# Confidence added by each factor (as in calculate_comprehensive_confidence)
+CONFIDENCE_FACTOR_ADJUSTMENTS = {
+    'strong_confluence': 0.2,
+    'moderate_confluence': 0.1,
+    'trending_regime': 0.1,
+    'ranging_regime': -0.1,
+    'volatile_regime': -0.15,
+    'volume_confirmation': 0.1,
+    'low_volatility': 0.05,
+    'high_volatility': -0.1
+}
+
+# Reason codes returned by ConfidenceScoring.should_trade_series
+TRADE_BLOCK_REASONS = {
+    0: "All conditions met for high-confidence trade",
+    1: "Confidence below threshold",
+    2: "Technical confluence below threshold",
+    3: "Market too volatile for high-confidence trading",
+    4: "Insufficient volume confirmation"
+}
 
 # Export functions for easy import
-__all__ = ['AdvancedTechnicalIndicators', 'ConfidenceScoring']
\ No newline at end of file
+__all__ = ['AdvancedTechnicalIndicators', 'BatchTechnicalIndicators', 'ConfidenceScoring',
+           'VOLATILITY_REGIME_CODES', 'REGIME_CATEGORIES', 'CONFIDENCE_FACTOR_BITS',
+           'CONFIDENCE_FACTOR_ADJUSTMENTS', 'TRADE_BLOCK_REASONS']
\ No newline at end of file
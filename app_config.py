@@ -0,0 +1,46 @@
+"""
+Application Configuration
+Loads the shared config.json used by the predictors, UI and tooling
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, Optional
+
+# Environment override for the configuration file location
+CONFIG_ENV_VAR = 'CRYPTO_CONFIG'
+DEFAULT_CONFIG_PATH = Path(__file__).resolve().parent / 'config.json'
+
+_config_cache = {}
+
+
+def load_config(path: Optional[str] = None) -> Dict:
+    """
+    Load config.json (cached per path)
+
+    Args:
+        path: Config file; defaults to $CRYPTO_CONFIG, then config.json next to this module
+
+    Returns:
+        Parsed configuration, or an empty dict when the file does not exist
+    """
+    path = Path(path or os.environ.get(CONFIG_ENV_VAR) or DEFAULT_CONFIG_PATH)
+    key = str(path.resolve())
+
+    if key not in _config_cache:
+        if path.exists():
+            with open(path, 'r') as f:
+                _config_cache[key] = json.load(f)
+        else:
+            _config_cache[key] = {}
+
+    return _config_cache[key]
+
+
+def get_section(name: str, path: Optional[str] = None) -> Dict:
+    """Return one top-level section of the configuration (empty dict if missing)"""
+    return load_config(path).get(name, {})
+
+
+__all__ = ['load_config', 'get_section', 'DEFAULT_CONFIG_PATH']
@@ -0,0 +1,189 @@
+"""
+Async Market Data Fetcher
+Concurrent multi-symbol, multi-timeframe downloads over a pooled HTTP session
+"""
+
+import asyncio
+import random
+import time
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Tuple
+
+import aiohttp
+import pandas as pd
+
+from app_config import get_section
+from data_providers import DataProvider, get_data_provider
+
+try:
+    import ccxt
+    # NetworkError covers RateLimitExceeded, RequestTimeout, DDoSProtection and ExchangeNotAvailable
+    CCXT_RETRYABLE = (ccxt.NetworkError,)
+except ImportError:
+    CCXT_RETRYABLE = ()
+
+# HTTP statuses worth retrying (rate limited or transient server errors)
+RETRY_STATUSES = {408, 425, 429, 500, 502, 503, 504}
+
+
+class RateLimiter:
+    """
+    Spaces request starts so a provider sees at most `rate` requests per second
+    """
+
+    def __init__(self, rate: Optional[float]):
+        self.interval = 1.0 / rate if rate else 0.0
+        self._next_slot = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        if not self.interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            wait = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self.interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+def _is_retryable(error: Exception) -> bool:
+    if isinstance(error, aiohttp.ClientResponseError):
+        return error.status in RETRY_STATUSES
+    return isinstance(error, (aiohttp.ClientError, asyncio.TimeoutError, ConnectionError) + CCXT_RETRYABLE)
+
+
+class AsyncDataFetcher:
+    """
+    Fetches many (symbol, timeframe) series concurrently
+
+    One aiohttp session (with a bounded connection pool) is shared by every
+    request; a semaphore bounds concurrency, a per-provider RateLimiter spaces
+    requests, and transient failures are retried with exponential backoff.
+
+    Usage:
+        async with AsyncDataFetcher('yfinance') as fetcher:
+            async for symbol, timeframe, data in fetcher.iter_fetch(requests):
+                ...
+    """
+
+    def __init__(self, provider=None, max_concurrency: int = 8, max_retries: int = 3,
+                 backoff: float = 0.5, timeout: float = 30.0, rate_limit: Optional[float] = None):
+        """
+        Args:
+            provider: DataProvider instance or name (defaults like get_data_provider)
+            max_concurrency: Requests in flight at once
+            max_retries: Retries per request after the first attempt
+            backoff: Base delay in seconds, doubled on each retry (with jitter)
+            timeout: Total timeout per HTTP request in seconds
+            rate_limit: Requests per second; defaults to the provider's rate_limit
+        """
+        self.provider: DataProvider = get_data_provider(provider)
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.rate_limiter = RateLimiter(rate_limit if rate_limit is not None else self.provider.rate_limit)
+        self.errors: Dict[Tuple[str, str], str] = {}
+        self.session: Optional[aiohttp.ClientSession] = None
+        self._semaphore = None
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def open(self):
+        if self.session is None:
+            connector = aiohttp.TCPConnector(limit=self.max_concurrency, ttl_dns_cache=300)
+            self.session = aiohttp.ClientSession(
+                connector=connector, timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    async def close(self):
+        await self.provider.close_async()
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def fetch(self, symbol: str, timeframe: str, period: str) -> pd.DataFrame:
+        """Fetch one series, retrying transient errors"""
+        await self.open()
+
+        attempt = 0
+        while True:
+            async with self._semaphore:
+                await self.rate_limiter.acquire()
+                try:
+                    return await self.provider.fetch_async(symbol, timeframe, period, session=self.session)
+                except Exception as e:
+                    if attempt >= self.max_retries or not _is_retryable(e):
+                        raise
+            attempt += 1
+            # Back off outside the semaphore so other requests keep flowing
+            await asyncio.sleep(self.backoff * 2 ** (attempt - 1) * (1 + random.random() * 0.25))
+
+    async def _fetch_labeled(self, symbol, timeframe, period):
+        try:
+            data = await self.fetch(symbol, timeframe, period)
+            self.errors.pop((symbol, timeframe), None)
+        except Exception as e:
+            self.errors[(symbol, timeframe)] = str(e)
+            print(f"❌ Error fetching {symbol} {timeframe}: {e}")
+            data = None
+        return symbol, timeframe, data
+
+    async def iter_fetch(self, requests: Iterable[Tuple[str, str]],
+                         period: str = '1mo') -> AsyncIterator[Tuple[str, str, Optional[pd.DataFrame]]]:
+        """
+        Yield (symbol, timeframe, data) as each download completes
+
+        Failed downloads yield data=None; the error is kept in self.errors.
+        """
+        await self.open()
+        tasks = [asyncio.create_task(self._fetch_labeled(symbol, timeframe, period))
+                 for symbol, timeframe in requests]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def fetch_all(self, requests: Iterable[Tuple[str, str]],
+                        period: str = '1mo') -> Dict[Tuple[str, str], pd.DataFrame]:
+        """Fetch everything and return {(symbol, timeframe): data} for the successful downloads"""
+        results = {}
+        async for symbol, timeframe, data in self.iter_fetch(requests, period):
+            if data is not None:
+                results[(symbol, timeframe)] = data
+        return results
+
+
+def universe_requests(symbols: Optional[List[str]] = None,
+                      timeframes: Optional[List[str]] = None) -> List[Tuple[str, str]]:
+    """(symbol, timeframe) pairs, defaulting to data_sources in config.json"""
+    settings = get_section('data_sources')
+    symbols = symbols or settings.get('crypto_symbols', ['BTC-USD'])
+    timeframes = timeframes or settings.get('timeframes', ['1h'])
+    return [(symbol, timeframe) for symbol in symbols for timeframe in timeframes]
+
+
+def fetch_universe(symbols: Optional[List[str]] = None, timeframes: Optional[List[str]] = None,
+                   period: str = '1mo', provider=None, **fetcher_options) -> Dict[Tuple[str, str], pd.DataFrame]:
+    """
+    Blocking helper: refresh a whole symbol x timeframe universe concurrently
+
+    Returns:
+        {(symbol, timeframe): OHLCV DataFrame}
+    """
+    async def run():
+        async with AsyncDataFetcher(provider, **fetcher_options) as fetcher:
+            return await fetcher.fetch_all(universe_requests(symbols, timeframes), period)
+
+    return asyncio.run(run())
+
+
+__all__ = ['AsyncDataFetcher', 'RateLimiter', 'fetch_universe', 'universe_requests']
@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Benchmark Suite for Crypto Trading AI Predictor
+Offline, reproducible timings of the pipeline hot paths on synthetic data
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from synthetic_data import generate_universe
+
+BENCHMARK_STAGES = [
+    'calculate_all_indicators',
+    'batch_indicators',
+    'calculate_market_regime',
+    'prepare_features',
+    'prepare_features_tail',
+    'create_lstm_sequences',
+    'predict_single',
+    'predict_batched',
+    'predict_streaming_step',
+    'comprehensive_backtest'
+]
+
+# Relative slowdown reported as a regression by compare_results
+DEFAULT_REGRESSION_THRESHOLD = 0.15
+
+
+def time_call(func: Callable, repeat: int = 3, warmup: int = 1) -> Dict:
+    """
+    Time a zero-argument callable
+
+    Returns:
+        {'min_seconds', 'median_seconds', 'mean_seconds', 'runs'}
+    """
+    for _ in range(warmup):
+        func()
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    return {
+        'min_seconds': min(timings),
+        'median_seconds': float(np.median(timings)),
+        'mean_seconds': float(np.mean(timings)),
+        'runs': repeat
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                text=True, cwd=Path(__file__).resolve().parent, timeout=10)
+        return result.stdout.strip() or None
+    except Exception:
+        return None
+
+
+def run_benchmarks(length: int = 2000, timeframe: str = '1h', num_symbols: int = 4,
+                   repeat: int = 3, stages: Optional[List[str]] = None,
+                   backend: Optional[str] = None, seed: int = 7, verbose: bool = False) -> Dict:
+    """
+    Run the benchmark suite
+
+    Args:
+        length: Bars per symbol
+        timeframe: Synthetic bar size
+        num_symbols: Symbols in the synthetic universe (used by batch_indicators)
+        repeat: Timed runs per stage (after one warm-up run)
+        stages: Subset of BENCHMARK_STAGES to run (default: all)
+        backend: Indicator backend ('talib', 'numba', ...; default: auto)
+        seed: Synthetic data seed
+        verbose: Show the pipeline's own progress output
+
+    Returns:
+        JSON-serialisable dict with run metadata and per-stage timings
+    """
+    from advanced_indicators import AdvancedTechnicalIndicators, BatchTechnicalIndicators
+    from enhanced_predictor import EnhancedCryptoPredictorLSTM
+    from indicator_backend import get_indicator_backend, get_backend_name
+
+    stages = stages or BENCHMARK_STAGES
+    unknown = [stage for stage in stages if stage not in BENCHMARK_STAGES]
+    if unknown:
+        raise ValueError(f"Unknown benchmark stages: {unknown}")
+
+    universe = generate_universe(num_symbols, length, timeframe, seed)
+    symbol = next(iter(universe))
+    data = universe[symbol]
+
+    predictor = EnhancedCryptoPredictorLSTM(symbol, timeframe)
+    predictor.indicator_backend = backend
+    quiet = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+
+    results = {}
+    with quiet:
+        # Shared inputs, built once outside the timed sections
+        indicators = AdvancedTechnicalIndicators.calculate_all_indicators(data, backend=backend)
+        df = predictor.prepare_features(data)
+        X, y, returns, indices = predictor.create_lstm_sequences(df)
+
+        needs_model = {'predict_single', 'predict_batched', 'predict_streaming_step',
+                       'comprehensive_backtest'} & set(stages)
+        if needs_model:
+            predictor.model = predictor.build_advanced_lstm_model((X.shape[1], X.shape[2]))
+            streaming = predictor.enable_streaming_inference(resync_every=len(X))
+            # Each call feeds the next bar, so after the warm-up prime every run is one step
+            bars = iter(range(len(X)))
+
+            def stream_next_bar():
+                i = next(bars)
+                return streaming.predict(symbol, X[i], df.index[i:i + predictor.lookback_window])
+
+        ohlcv, _, _ = BatchTechnicalIndicators.stack_ohlcv(universe)
+        latest = X[-1:]
+
+        benchmarks = {
+            'calculate_all_indicators': (
+                lambda: AdvancedTechnicalIndicators.calculate_all_indicators(data, backend=backend), length),
+            'batch_indicators': (
+                lambda: BatchTechnicalIndicators.calculate_all_indicators(ohlcv, backend=backend),
+                length * len(universe)),
+            'calculate_market_regime': (
+                lambda: AdvancedTechnicalIndicators.calculate_market_regime(indicators.copy()), length),
+            'prepare_features': (lambda: predictor.prepare_features(data), length),
+            # The warm-up call seeds the recursive indicator state; timed calls reuse it
+            'prepare_features_tail': (lambda: predictor.prepare_features_tail(data), 1),
+            'create_lstm_sequences': (lambda: predictor.create_lstm_sequences(df), len(df)),
+            'predict_single': (lambda: predictor.model.predict(latest, verbose=0), 1),
+            'predict_batched': (lambda: predictor.model.predict(X, verbose=0), len(X)),
+            'predict_streaming_step': (lambda: stream_next_bar(), 1),
+            'comprehensive_backtest': (lambda: predictor.comprehensive_backtest(data), len(X) - int(len(X) * 0.7))
+        }
+
+        for stage in stages:
+            func, rows = benchmarks[stage]
+            timing = time_call(func, repeat=repeat)
+            timing['rows'] = int(rows)
+            timing['rows_per_second'] = rows / timing['median_seconds'] if timing['median_seconds'] > 0 else 0.0
+            results[stage] = timing
+
+    import tensorflow as tf
+
+    return {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'commit': _git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'tensorflow': tf.__version__,
+            'indicator_backend': get_backend_name(get_indicator_backend(backend)),
+            'params': {
+                'length': length, 'timeframe': timeframe, 'num_symbols': num_symbols,
+                'repeat': repeat, 'seed': seed
+            }
+        },
+        'results': results
+    }
+
+
+def run_profile_benchmarks(profiles: Optional[List[str]] = None, samples: int = 2048,
+                           epochs: int = 2, batch_size: int = 64, lookback: int = 60,
+                           architecture: Optional[Dict] = None) -> Dict:
+    """
+    LSTM training/inference samples per second under each performance profile
+
+    Every profile runs in its own spawned process, because TensorFlow thread
+    pools and oneDNN cannot be reconfigured once initialised.
+
+    Args:
+        profiles: Profile names (default: all in performance_profile / config.json)
+        samples: Synthetic training windows
+        epochs: Timed training epochs
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    from multiprocessing import get_context
+    from performance_profile import DEFAULT_PROFILES, profile_throughput
+    from app_config import get_section
+
+    if profiles is None:
+        profiles = list(dict(DEFAULT_PROFILES, **get_section('performance').get('profiles', {})))
+
+    results = {}
+    for name in profiles:
+        with ProcessPoolExecutor(1, mp_context=get_context('spawn')) as executor:
+            results[name] = executor.submit(
+                profile_throughput, name, samples, lookback, 67, batch_size, epochs, architecture
+            ).result()
+
+    return {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'commit': _git_commit(),
+            'platform': platform.platform(),
+            'params': {'samples': samples, 'epochs': epochs, 'batch_size': batch_size, 'lookback': lookback}
+        },
+        'profiles': results
+    }
+
+
+def print_profile_results(report: Dict):
+    """Print samples/sec per performance profile"""
+    params = report['meta']['params']
+    print(f"🏁 Performance profiles @ {report['meta']['commit'] or 'unknown commit'} "
+          f"({params['samples']} windows x {params['lookback']} bars, batch {params['batch_size']})")
+    for name, stats in report['profiles'].items():
+        print(f"  {name:<16} train {stats['train_samples_per_second']:>10,.0f} samples/s"
+              f"  predict {stats['predict_samples_per_second']:>10,.0f} samples/s  ({stats['compute_dtype']})")
+        for warning in stats['warnings']:
+            print(f"    ⚠️ {warning}")
+
+
+def compare_results(baseline: Dict, current: Dict,
+                    threshold: float = DEFAULT_REGRESSION_THRESHOLD) -> Dict:
+    """
+    Compare two benchmark runs stage by stage on median time
+
+    Returns:
+        {stage: {'baseline_seconds', 'current_seconds', 'change', 'regression'}}
+        where change is the relative difference (+0.2 = 20% slower)
+    """
+    comparison = {}
+    for stage, stats in current['results'].items():
+        if stage not in baseline.get('results', {}):
+            continue
+        before = baseline['results'][stage]['median_seconds']
+        after = stats['median_seconds']
+        change = (after - before) / before if before > 0 else 0.0
+        comparison[stage] = {
+            'baseline_seconds': before,
+            'current_seconds': after,
+            'change': change,
+            'regression': change > threshold
+        }
+
+    return comparison
+
+
+def print_results(report: Dict, comparison: Optional[Dict] = None):
+    """Print a human-readable summary"""
+    meta = report['meta']
+    params = meta['params']
+    print(f"🏁 Benchmark @ {meta['commit'] or 'unknown commit'} "
+          f"({params['length']} x {params['timeframe']} bars, {params['num_symbols']} symbols, "
+          f"backend={meta['indicator_backend']})")
+
+    for stage, stats in report['results'].items():
+        line = (f"  {stage:<26} {stats['median_seconds'] * 1000:>10.1f} ms"
+                f"  {stats['rows_per_second']:>12,.0f} rows/s")
+        if comparison and stage in comparison:
+            change = comparison[stage]
+            marker = '❌' if change['regression'] else '✅'
+            line += f"  {marker} {change['change']:+.1%}"
+        print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline benchmark suite on synthetic OHLCV data")
+    parser.add_argument('--length', type=int, default=2000, help="Bars per symbol")
+    parser.add_argument('--timeframe', default='1h', help="Synthetic bar size")
+    parser.add_argument('--symbols', type=int, default=4, help="Number of synthetic symbols")
+    parser.add_argument('--repeat', type=int, default=3, help="Timed runs per stage")
+    parser.add_argument('--stages', nargs='+', choices=BENCHMARK_STAGES, help="Stages to run")
+    parser.add_argument('--backend', default=None, help="Indicator backend (talib, numba)")
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--output', help="Write the JSON report to this file")
+    parser.add_argument('--compare', help="Baseline JSON report to compare against")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_REGRESSION_THRESHOLD,
+                        help="Relative slowdown treated as a regression")
+    parser.add_argument('--verbose', action='store_true', help="Show pipeline output")
+    parser.add_argument('--profiles', nargs='*',
+                        help="Benchmark LSTM samples/sec per performance profile instead (all if no names)")
+    args = parser.parse_args(argv)
+
+    if args.profiles is not None:
+        report = run_profile_benchmarks(args.profiles or None)
+        print_profile_results(report)
+        if args.output:
+            with open(args.output, 'w') as f:
+                json.dump(report, f, indent=2)
+            print(f"💾 Saved report to {args.output}")
+        return 0
+
+    report = run_benchmarks(args.length, args.timeframe, args.symbols, args.repeat,
+                            args.stages, args.backend, args.seed, args.verbose)
+
+    comparison = None
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            comparison = compare_results(json.load(f), report, args.threshold)
+        report['comparison'] = comparison
+
+    print_results(report, comparison)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 Saved report to {args.output}")
+
+    if comparison and any(stage['regression'] for stage in comparison.values()):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,276 @@
+"""
+Candle Store with Local Resampling
+Keeps one 1m base series per symbol and derives every higher timeframe from it
+"""
+
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from data_providers import (
+    DataProvider, OHLCV_COLUMNS, covering_period, get_data_provider, normalize_ohlcv, period_to_timedelta
+)
+from synthetic_data import timeframe_to_minutes
+
+BASE_TIMEFRAME = '1m'
+
+OHLCV_AGGREGATION = {'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last', 'Volume': 'sum'}
+
+
+def bucket_starts(index: pd.DatetimeIndex, timeframe: str) -> pd.DatetimeIndex:
+    """
+    Start of the bucket each timestamp falls into
+
+    Buckets are aligned to the epoch (so 4h bars start at 00:00, 04:00, ...),
+    daily bars to midnight and weekly bars to Monday midnight.
+    """
+    minutes = timeframe_to_minutes(timeframe)
+    if timeframe == '1w':
+        days = index.floor('1D')
+        return days - pd.to_timedelta(days.dayofweek, unit='D')
+    return index.floor(f"{minutes}min")
+
+
+def resample_ohlcv(data: pd.DataFrame, timeframe: str) -> pd.DataFrame:
+    """Aggregate OHLCV candles into `timeframe` buckets"""
+    if data.empty:
+        return pd.DataFrame(columns=OHLCV_COLUMNS)
+    return data[OHLCV_COLUMNS].groupby(bucket_starts(data.index, timeframe)).agg(OHLCV_AGGREGATION)
+
+
+class ResampledSeries:
+    """
+    Higher-timeframe view of a base series, maintained incrementally
+
+    update() only recomputes buckets from the first changed base bar
+    onwards, which for streaming 1m data is just the last open bucket.
+    """
+
+    def __init__(self, timeframe: str):
+        self.timeframe = timeframe
+        self.data = pd.DataFrame(columns=OHLCV_COLUMNS)
+
+    def rebuild(self, base: pd.DataFrame):
+        self.data = resample_ohlcv(base, self.timeframe)
+
+    def update(self, base: pd.DataFrame, first_changed: pd.Timestamp):
+        """
+        Refresh the buckets affected by base bars at or after `first_changed`
+
+        Args:
+            base: Complete base series (already containing the new bars)
+            first_changed: Timestamp of the earliest new or modified base bar
+        """
+        if self.data.empty:
+            self.rebuild(base)
+            return
+
+        bucket = bucket_starts(pd.DatetimeIndex([first_changed]), self.timeframe)[0]
+        tail = resample_ohlcv(base[base.index >= bucket], self.timeframe)
+        self.data = pd.concat([self.data[self.data.index < bucket], tail])
+
+    def is_last_closed(self, base_end: pd.Timestamp) -> bool:
+        """Whether the newest bucket is complete, given the end time of the last base bar"""
+        if self.data.empty:
+            return False
+        next_bucket = self.data.index[-1] + pd.Timedelta(minutes=timeframe_to_minutes(self.timeframe))
+        return base_end >= next_bucket
+
+
+class CandleStore:
+    """
+    In-memory 1m candles per symbol with lazily built, incrementally
+    updated higher timeframes. save()/load() use '<symbol>_1m.csv' files,
+    the same layout the replay provider reads.
+    """
+
+    def __init__(self, root: Optional[str] = None, base_timeframe: str = BASE_TIMEFRAME):
+        self.root = Path(root) if root else None
+        self.base_timeframe = base_timeframe
+        self.base_minutes = timeframe_to_minutes(base_timeframe)
+        self._base: Dict[str, pd.DataFrame] = {}
+        self._views: Dict[str, Dict[str, ResampledSeries]] = {}
+        self.updated_at: Dict[str, float] = {}
+
+    def symbols(self) -> List[str]:
+        return sorted(self._base)
+
+    def has(self, symbol: str) -> bool:
+        return symbol in self._base and not self._base[symbol].empty
+
+    def append(self, symbol: str, candles: pd.DataFrame):
+        """
+        Merge base-timeframe candles (new bars, or revisions of the open bar)
+
+        Registered higher-timeframe views are updated incrementally.
+        """
+        candles = normalize_ohlcv(candles)
+        if candles.empty:
+            return
+
+        base = self._base.get(symbol)
+        if base is None or base.empty:
+            merged = candles[~candles.index.duplicated(keep='last')]
+        elif candles.index[0] > base.index[-1]:
+            merged = pd.concat([base, candles])
+        else:
+            merged = pd.concat([base[base.index < candles.index[0]], candles,
+                                base[base.index > candles.index[-1]]])
+            merged = merged[~merged.index.duplicated(keep='last')].sort_index()
+
+        self._base[symbol] = merged
+        self.updated_at[symbol] = time.time()
+
+        for view in self._views.get(symbol, {}).values():
+            view.update(merged, candles.index[0])
+
+    def get(self, symbol: str, timeframe: Optional[str] = None, closed_only: bool = False) -> pd.DataFrame:
+        """
+        Candles for a symbol at any timeframe at or above the base timeframe
+
+        Args:
+            closed_only: Drop the newest bucket while it is still forming
+        """
+        base = self._base.get(symbol, pd.DataFrame(columns=OHLCV_COLUMNS))
+        timeframe = timeframe or self.base_timeframe
+        if timeframe == self.base_timeframe:
+            return base
+
+        if timeframe_to_minutes(timeframe) < self.base_minutes:
+            raise ValueError(f"Cannot build {timeframe} candles from {self.base_timeframe} data")
+
+        views = self._views.setdefault(symbol, {})
+        if timeframe not in views:
+            views[timeframe] = ResampledSeries(timeframe)
+            views[timeframe].rebuild(base)
+
+        view = views[timeframe]
+        if closed_only and not base.empty:
+            base_end = base.index[-1] + pd.Timedelta(minutes=self.base_minutes)
+            if not view.is_last_closed(base_end):
+                return view.data.iloc[:-1]
+        return view.data
+
+    def _file(self, symbol):
+        if self.root is None:
+            raise ValueError("CandleStore has no root directory")
+        return self.root / f"{symbol}_{self.base_timeframe}.csv"
+
+    def save(self, symbol: Optional[str] = None):
+        """Write base candles to disk (all symbols by default)"""
+        self.root.mkdir(parents=True, exist_ok=True)
+        for name in [symbol] if symbol else self.symbols():
+            path = self._file(name)
+            tmp_path = path.with_suffix('.csv.tmp')
+            self._base[name].to_csv(tmp_path)
+            tmp_path.replace(path)
+
+    def load(self, symbol: str) -> bool:
+        """Load a symbol's base candles from disk; returns False when no file exists"""
+        path = self._file(symbol)
+        if not path.exists():
+            return False
+        self._base.pop(symbol, None)
+        self._views.pop(symbol, None)
+        self.append(symbol, pd.read_csv(path, index_col=0, parse_dates=True))
+        return True
+
+
+class ResamplingProvider(DataProvider):
+    """
+    Data provider that downloads only the base timeframe per symbol and
+    serves every higher timeframe from a CandleStore
+
+    Requests return exactly the requested period, as the upstream provider
+    would. The base series is sized to the longest period requested so far
+    plus `warmup_bars`, so the bars ahead of a period are already stored when
+    a predictor asks for more history; spans beyond `max_base_period` (the 1m
+    history the upstream can serve) go straight to the upstream provider.
+    """
+
+    name = 'resample'
+
+    def __init__(self, upstream=None, store: Optional[CandleStore] = None, max_base_period: str = '7d',
+                 refresh_period: str = '1d', max_age_seconds: float = 60.0, warmup_bars: Optional[int] = None):
+        """
+        Args:
+            upstream: Provider the base candles come from (defaults to yfinance)
+            max_base_period: Longest base-timeframe history to download
+            refresh_period: History re-fetched to pick up new bars once the series is loaded
+            max_age_seconds: Seconds before a symbol's base series is refreshed
+            warmup_bars: Bars kept in the base series before the requested period (defaults
+                to the prediction-time indicator warm-up plus the default lookback window)
+        """
+        self.upstream = get_data_provider(upstream if upstream not in (None, self.name) else 'yfinance')
+        super().__init__(self.upstream.rate_limit)
+        self.store = store or CandleStore()
+        self.max_base_period = max_base_period
+        self.refresh_period = refresh_period
+        self.max_age_seconds = max_age_seconds
+        if warmup_bars is None:
+            from tail_features import tail_length
+            warmup_bars = tail_length(60)
+        self.warmup_bars = warmup_bars
+        self.coverage: Dict[str, pd.Timedelta] = {}
+        self._lock = threading.Lock()
+
+    def history_span(self, timeframe: str, period: str) -> Optional[pd.Timedelta]:
+        """Requested period plus the warm-up bars; None for 'max'"""
+        delta = period_to_timedelta(period)
+        if delta is None:
+            return None
+        return delta + pd.Timedelta(minutes=timeframe_to_minutes(timeframe) * self.warmup_bars)
+
+    def refresh(self, symbol: str, span: Optional[pd.Timedelta] = None):
+        """
+        Pull base candles: enough for `span` when the stored series is shorter,
+        otherwise only the recent tail
+        """
+        covered = self.coverage.get(symbol)
+        if covered is None or (span is not None and span > covered):
+            period = covering_period(span or period_to_timedelta(self.refresh_period))
+            self.coverage[symbol] = period_to_timedelta(period)
+        else:
+            period = self.refresh_period
+        self.store.append(symbol, self.upstream.fetch(symbol, self.store.base_timeframe, period))
+
+    def fetch(self, symbol, timeframe, period):
+        span = self.history_span(timeframe, period)
+        if (span is None or span > period_to_timedelta(self.max_base_period)
+                or timeframe_to_minutes(timeframe) < self.store.base_minutes):
+            return self.upstream.fetch(symbol, timeframe, period)
+
+        with self._lock:
+            stale = time.time() - self.store.updated_at.get(symbol, 0) > self.max_age_seconds
+            if stale or self.coverage.get(symbol, pd.Timedelta(0)) < span:
+                self.refresh(symbol, span)
+            data = self.store.get(symbol, timeframe)
+        if data.empty:
+            return data.copy()
+        return data[data.index > data.index[-1] - period_to_timedelta(period)].copy()
+
+
+_shared_providers: Dict[tuple, ResamplingProvider] = {}
+_shared_lock = threading.Lock()
+
+
+def shared_resampling_provider(upstream=None, **options) -> ResamplingProvider:
+    """
+    Process-wide ResamplingProvider per upstream and options
+
+    get_data_provider('resample') goes through here, so every predictor and
+    timeframe in a process shares one base series per symbol.
+    """
+    upstream_key = id(upstream) if isinstance(upstream, DataProvider) else upstream
+    key = (upstream_key, tuple(sorted((name, repr(value)) for name, value in options.items())))
+    with _shared_lock:
+        if key not in _shared_providers:
+            _shared_providers[key] = ResamplingProvider(upstream, **options)
+        return _shared_providers[key]
+
+
+__all__ = ['CandleStore', 'ResampledSeries', 'ResamplingProvider', 'shared_resampling_provider',
+           'resample_ohlcv', 'bucket_starts']
@@ -5,15 +5,21 @@ High-confidence trading signals with detailed explanations
 
 import numpy as np
 import pandas as pd
+from performance_profile import apply_performance_profile, configure_environment
+configure_environment(strict=False)  # oneDNN options are read when TensorFlow is imported
 import tensorflow as tf
 from tensorflow.keras.models import Sequential
 from tensorflow.keras.layers import LSTM, Dense, Dropout, Attention, Input
 from tensorflow.keras.optimizers import Adam
 from sklearn.preprocessing import MinMaxScaler
 from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
-import yfinance as yf
 import ccxt
-import talib
+from indicator_backend import get_indicator_backend
+from instrumentation import get_profiler
+from data_providers import get_data_provider
+from model_builder import build_lstm_model, get_architecture
+from streaming_inference import StreamingLSTM
+from app_config import get_section
 import ta
 import pandas_ta as pta
 from datetime import datetime, timedelta
@@ -21,21 +27,29 @@ import warnings
 warnings.filterwarnings('ignore')
 
 class CryptoPredictorLSTM:
-    def __init__(self, symbol='BTC-USD', timeframe='1h'):
+    def __init__(self, symbol='BTC-USD', timeframe='1h', data_provider=None):
         """
         Initialize the crypto predictor with LSTM and comprehensive technical analysis
         
         Args:
             symbol: Trading symbol (e.g., 'BTC-USD', 'ETH-USD')
             timeframe: Data timeframe ('1m', '5m', '15m', '1h', '4h', '1d')
+            data_provider: DataProvider instance or name ('yfinance', 'ccxt', 'replay');
+                           defaults to data_sources.primary in config.json
         """
         self.symbol = symbol
         self.timeframe = timeframe
+        self.data_provider = get_data_provider(data_provider)
         self.model = None
         self.scaler = MinMaxScaler()
         self.feature_scalers = {}
         self.lookback_window = 60  # Number of time periods to look back
         self.confidence_threshold = 0.8  # High confidence threshold
+        self.model_architecture = get_architecture()
+        self.streaming_inference = get_section('performance').get('streaming_inference', {}).get('enabled', False)
+        self.streaming = None  # StreamingLSTM carrying recurrent state between live bars
+        self.profiler = get_profiler()
+        self.performance_profile = apply_performance_profile(strict=False)
         
         # Technical indicators configuration
         self.indicators_config = {
@@ -52,8 +66,9 @@ class CryptoPredictorLSTM:
         """
         try:
             # Using yfinance for reliable data
-            ticker = yf.Ticker(self.symbol)
-            data = ticker.history(period=period, interval=self.timeframe)
+            with self.profiler.span('fetch_data') as span:
+                data = self.data_provider.fetch(self.symbol, self.timeframe, period)
+                span.rows = len(data)
             
             if data.empty:
                 raise ValueError(f"No data found for symbol {self.symbol}")
@@ -73,6 +88,7 @@ class CryptoPredictorLSTM:
         """
         Calculate comprehensive technical analysis indicators
         """
+        lib = get_indicator_backend()
         df = data.copy()
         
         # Price data
@@ -83,48 +99,48 @@ class CryptoPredictorLSTM:
         open_price = df['Open'].values
         
         # Trend Indicators
-        df['SMA_20'] = talib.SMA(close, timeperiod=20)
-        df['SMA_50'] = talib.SMA(close, timeperiod=50)
-        df['SMA_200'] = talib.SMA(close, timeperiod=200)
-        df['EMA_12'] = talib.EMA(close, timeperiod=12)
-        df['EMA_26'] = talib.EMA(close, timeperiod=26)
-        df['EMA_50'] = talib.EMA(close, timeperiod=50)
+        df['SMA_20'] = lib.SMA(close, timeperiod=20)
+        df['SMA_50'] = lib.SMA(close, timeperiod=50)
+        df['SMA_200'] = lib.SMA(close, timeperiod=200)
+        df['EMA_12'] = lib.EMA(close, timeperiod=12)
+        df['EMA_26'] = lib.EMA(close, timeperiod=26)
+        df['EMA_50'] = lib.EMA(close, timeperiod=50)
         
         # MACD
-        macd, macd_signal, macd_hist = talib.MACD(close)
+        macd, macd_signal, macd_hist = lib.MACD(close)
         df['MACD'] = macd
         df['MACD_Signal'] = macd_signal
         df['MACD_Histogram'] = macd_hist
         
         # ADX (Average Directional Index)
-        df['ADX'] = talib.ADX(high, low, close, timeperiod=14)
-        df['DI_Plus'] = talib.PLUS_DI(high, low, close, timeperiod=14)
-        df['DI_Minus'] = talib.MINUS_DI(high, low, close, timeperiod=14)
+        df['ADX'] = lib.ADX(high, low, close, timeperiod=14)
+        df['DI_Plus'] = lib.PLUS_DI(high, low, close, timeperiod=14)
+        df['DI_Minus'] = lib.MINUS_DI(high, low, close, timeperiod=14)
         
         # Parabolic SAR
-        df['PSAR'] = talib.SAR(high, low, acceleration=0.02, maximum=0.2)
+        df['PSAR'] = lib.SAR(high, low, acceleration=0.02, maximum=0.2)
         
         # Momentum Indicators
-        df['RSI'] = talib.RSI(close, timeperiod=14)
-        df['RSI_30'] = talib.RSI(close, timeperiod=30)
+        df['RSI'] = lib.RSI(close, timeperiod=14)
+        df['RSI_30'] = lib.RSI(close, timeperiod=30)
         
         # Stochastic Oscillator
-        slowk, slowd = talib.STOCH(high, low, close)
+        slowk, slowd = lib.STOCH(high, low, close)
         df['Stoch_K'] = slowk
         df['Stoch_D'] = slowd
         
         # Williams %R
-        df['Williams_R'] = talib.WILLR(high, low, close, timeperiod=14)
+        df['Williams_R'] = lib.WILLR(high, low, close, timeperiod=14)
         
         # Rate of Change
-        df['ROC'] = talib.ROC(close, timeperiod=10)
+        df['ROC'] = lib.ROC(close, timeperiod=10)
         
         # Commodity Channel Index
-        df['CCI'] = talib.CCI(high, low, close, timeperiod=14)
+        df['CCI'] = lib.CCI(high, low, close, timeperiod=14)
         
         # Volatility Indicators
         # Bollinger Bands
-        bb_upper, bb_middle, bb_lower = talib.BBANDS(close, timeperiod=20)
+        bb_upper, bb_middle, bb_lower = lib.BBANDS(close, timeperiod=20)
         df['BB_Upper'] = bb_upper
         df['BB_Middle'] = bb_middle
         df['BB_Lower'] = bb_lower
@@ -132,18 +148,18 @@ class CryptoPredictorLSTM:
         df['BB_Position'] = (close - bb_lower) / (bb_upper - bb_lower)
         
         # Average True Range
-        df['ATR'] = talib.ATR(high, low, close, timeperiod=14)
+        df['ATR'] = lib.ATR(high, low, close, timeperiod=14)
         
         # Volume Indicators
-        df['OBV'] = talib.OBV(close, volume)
-        df['Volume_SMA'] = talib.SMA(volume, timeperiod=20)
+        df['OBV'] = lib.OBV(close, volume)
+        df['Volume_SMA'] = lib.SMA(volume, timeperiod=20)
         df['Volume_Ratio'] = volume / df['Volume_SMA']
         
         # Money Flow Index
-        df['MFI'] = talib.MFI(high, low, close, volume, timeperiod=14)
+        df['MFI'] = lib.MFI(high, low, close, volume, timeperiod=14)
         
         # Accumulation/Distribution Line
-        df['AD'] = talib.AD(high, low, close, volume)
+        df['AD'] = lib.AD(high, low, close, volume)
         
         # Additional Advanced Indicators
         # Ichimoku Cloud components
@@ -181,7 +197,8 @@ class CryptoPredictorLSTM:
         Create feature matrix for LSTM model
         """
         # Calculate all technical indicators
-        df = self.calculate_technical_indicators(data)
+        with self.profiler.span('calculate_technical_indicators', rows=len(data)):
+            df = self.calculate_technical_indicators(data)
         
         # Select features for the model
         feature_columns = [
@@ -228,29 +245,18 @@ class CryptoPredictorLSTM:
         
         return np.array(X), np.array(y), np.array(returns)
     
-    def build_lstm_model(self, input_shape):
+    def build_lstm_model(self, input_shape, architecture=None):
         """
         Build advanced LSTM model with attention mechanism
+        
+        Layer sizes, dropout and optimizer come from config.json model_architecture
+        unless an architecture is given.
         """
-        model = Sequential([
-            Input(shape=input_shape),
-            LSTM(128, return_sequences=True, dropout=0.2, recurrent_dropout=0.2),
-            LSTM(64, return_sequences=True, dropout=0.2, recurrent_dropout=0.2),
-            LSTM(32, return_sequences=False, dropout=0.2, recurrent_dropout=0.2),
-            Dense(50, activation='relu'),
-            Dropout(0.3),
-            Dense(25, activation='relu'),
-            Dropout(0.2),
-            Dense(1, activation='sigmoid')  # Binary classification (buy/sell)
-        ])
-        
-        model.compile(
-            optimizer=Adam(learning_rate=0.001),
-            loss='binary_crossentropy',
+        return build_lstm_model(
+            input_shape,
+            architecture or self.model_architecture,
             metrics=['accuracy', 'precision', 'recall']
         )
-        
-        return model
     
     def calculate_confidence_score(self, prediction, technical_signals):
         """
@@ -300,6 +306,48 @@ class CryptoPredictorLSTM:
         
         return min(final_confidence, 1.0)
     
+    def calculate_confidence_scores(self, predictions, frame):
+        """
+        calculate_confidence_score for a series of predictions aligned with frame's rows
+        """
+        predictions = np.asarray(predictions, dtype=np.float64)
+        bullish = predictions > 0.5
+        bearish = predictions < 0.5
+        base_confidence = np.abs(predictions - 0.5) * 2
+        
+        def column(name):
+            return frame[name].to_numpy(dtype=np.float64)
+        
+        technical_score = np.zeros(len(predictions))
+        total_signals = 0
+        
+        with np.errstate(invalid='ignore'):
+            if 'RSI' in frame.columns:
+                rsi = column('RSI')
+                technical_score += ((rsi < 30) & bullish) | ((rsi > 70) & bearish)
+                total_signals += 1
+            
+            if 'MACD_Signal' in frame.columns:
+                macd_bullish = column('MACD') > column('MACD_Signal')
+                technical_score += (macd_bullish & bullish) | (~macd_bullish & bearish)
+                total_signals += 1
+            
+            if 'BB_Position' in frame.columns:
+                bb_pos = column('BB_Position')
+                technical_score += ((bb_pos < 0.2) & bullish) | ((bb_pos > 0.8) & bearish)
+                total_signals += 1
+            
+            if 'Volume_Ratio' in frame.columns:
+                technical_score += np.where(column('Volume_Ratio') > 1.5, 0.5, 0.0)
+                total_signals += 0.5
+        
+        if total_signals > 0:
+            final_confidence = (base_confidence + technical_score / total_signals) / 2
+        else:
+            final_confidence = base_confidence
+        
+        return np.minimum(final_confidence, 1.0)
+    
     def generate_trading_signal(self, data_row, prediction, confidence):
         """
         Generate trading signal with detailed explanation
@@ -392,17 +440,18 @@ class CryptoPredictorLSTM:
         self.model = self.build_lstm_model((X.shape[1], X.shape[2]))
         
         print("Training LSTM model...")
-        history = self.model.fit(
-            X_train, y_train,
-            validation_data=(X_val, y_val),
-            epochs=epochs,
-            batch_size=32,
-            verbose=1,
-            callbacks=[
-                tf.keras.callbacks.EarlyStopping(patience=10, restore_best_weights=True),
-                tf.keras.callbacks.ReduceLROnPlateau(patience=5, factor=0.5)
-            ]
-        )
+        with self.profiler.span('model.fit', rows=len(X_train)):
+            history = self.model.fit(
+                X_train, y_train,
+                validation_data=(X_val, y_val),
+                epochs=epochs,
+                batch_size=32,
+                verbose=1,
+                callbacks=[
+                    tf.keras.callbacks.EarlyStopping(patience=10, restore_best_weights=True),
+                    tf.keras.callbacks.ReduceLROnPlateau(patience=5, factor=0.5)
+                ]
+            )
         
         # Evaluate model
         val_predictions = self.model.predict(X_val)
@@ -438,8 +487,16 @@ class CryptoPredictorLSTM:
         # Reshape for LSTM
         X = latest_features_scaled.reshape(1, self.lookback_window, -1)
         
-        # Make prediction
-        prediction = self.model.predict(X, verbose=0)[0][0]
+        # Make prediction (one recurrent step per new bar in streaming mode)
+        with self.profiler.span('model.predict', rows=1):
+            if self.streaming_inference and (self.streaming is None or self.streaming.model is not self.model):
+                self.streaming = StreamingLSTM(self.model) if StreamingLSTM.supports(self.model) else None
+            if self.streaming_inference and self.streaming is not None:
+                prediction = self.streaming.predict(
+                    (self.symbol, self.timeframe), X[0], features.index[-self.lookback_window:]
+                )
+            else:
+                prediction = self.model.predict(X, verbose=0)[0][0]
         
         # Get technical signals from latest data
         latest_row = processed_data.iloc[-1]
@@ -468,40 +525,47 @@ class CryptoPredictorLSTM:
         y_test = y[test_start:]
         returns_test = returns[test_start:]
         
-        predictions = self.model.predict(X_test, verbose=0).flatten()
+        with self.profiler.span('model.predict', rows=len(X_test)):
+            predictions = self.model.predict(X_test, verbose=0).flatten()
         
         # Simulate trading
         capital = initial_capital
         position = 0  # 0: no position, 1: long position
         trades = []
         
-        for i, (pred, actual_return) in enumerate(zip(predictions, returns_test)):
-            current_row = processed_data.iloc[test_start + i]
-            confidence = self.calculate_confidence_score(pred, current_row.to_dict())
+        test_rows = processed_data.iloc[test_start:test_start + len(predictions)]
+        with self.profiler.span('calculate_confidence_scores', rows=len(predictions)):
+            confidences = self.calculate_confidence_scores(predictions, test_rows)
+        closes = test_rows['Close'].to_numpy()
+        timestamps = test_rows.index
+        
+        with self.profiler.span('backtest_loop', rows=len(predictions)):
+            for i, (pred, actual_return) in enumerate(zip(predictions, returns_test)):
+                confidence = confidences[i]
             
-            if confidence >= self.confidence_threshold:
-                if pred > 0.5 and position == 0:  # Buy signal
-                    position = 1
-                    entry_price = current_row['Close']
-                    trades.append({
-                        'type': 'BUY',
-                        'price': entry_price,
-                        'confidence': confidence,
-                        'timestamp': current_row.name
-                    })
-                elif pred < 0.5 and position == 1:  # Sell signal
-                    position = 0
-                    exit_price = current_row['Close']
-                    if trades and trades[-1]['type'] == 'BUY':
-                        trade_return = (exit_price - trades[-1]['price']) / trades[-1]['price']
-                        capital *= (1 + trade_return)
+                if confidence >= self.confidence_threshold:
+                    if pred > 0.5 and position == 0:  # Buy signal
+                        position = 1
+                        entry_price = closes[i]
                         trades.append({
-                            'type': 'SELL',
-                            'price': exit_price,
+                            'type': 'BUY',
+                            'price': entry_price,
                             'confidence': confidence,
-                            'return': trade_return,
-                            'timestamp': current_row.name
+                            'timestamp': timestamps[i]
                         })
+                    elif pred < 0.5 and position == 1:  # Sell signal
+                        position = 0
+                        exit_price = closes[i]
+                        if trades and trades[-1]['type'] == 'BUY':
+                            trade_return = (exit_price - trades[-1]['price']) / trades[-1]['price']
+                            capital *= (1 + trade_return)
+                            trades.append({
+                                'type': 'SELL',
+                                'price': exit_price,
+                                'confidence': confidence,
+                                'return': trade_return,
+                                'timestamp': timestamps[i]
+                            })
         
         total_return = (capital - initial_capital) / initial_capital
         num_trades = len([t for t in trades if t['type'] == 'SELL'])
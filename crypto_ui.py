@@ -10,7 +10,8 @@ import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import plotly.express as px
 from crypto_predictor import CryptoPredictorLSTM
-import yfinance as yf
+from data_providers import get_data_provider
+from prediction_memo import get_prediction_memo, memo_key
 from datetime import datetime, timedelta
 import json
 
@@ -227,11 +228,13 @@ class CryptoTradingUI:
         if st.button("🔄 Get Latest Signal", use_container_width=True):
             with st.spinner("Analyzing current market conditions..."):
                 try:
-                    # Fetch latest data
-                    data = self.predictor.fetch_data('3mo')  # Get recent data for prediction
+                    # Shared across sessions: the same model and closed bar is only predicted once
+                    result = get_prediction_memo().get_or_compute(
+                        memo_key(self.predictor), self.predict_latest_signal
+                    )
                     
-                    if data is not None:
-                        signal, current_data = self.predictor.predict_with_confidence(data)
+                    if result is not None:
+                        signal, current_data = result
                         st.session_state.current_signal = signal
                         
                         # Display signal
@@ -248,6 +251,13 @@ class CryptoTradingUI:
             st.subheader("📊 Latest Signal")
             self.display_trading_signal(signal, None)
     
+    def predict_latest_signal(self):
+        """Fetch recent data and predict the latest bar; None when no data is available"""
+        data = self.predictor.fetch_data('3mo')  # Get recent data for prediction
+        if data is None:
+            return None
+        return self.predictor.predict_with_confidence(data)
+    
     def display_trading_signal(self, signal, current_data):
         """Display trading signal with styling"""
         action = signal['action']
@@ -316,7 +326,7 @@ class CryptoTradingUI:
         
         try:
             # Fetch data for charts
-            data = yf.Ticker(config['symbol']).history(period='3mo', interval=config['timeframe'])
+            data = get_data_provider().fetch(config['symbol'], config['timeframe'], '3mo')
             
             if data.empty:
                 st.error("No data available for charts")
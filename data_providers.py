@@ -0,0 +1,384 @@
+"""
+Market Data Providers
+Pluggable OHLCV sources: yfinance, ccxt exchanges and an offline replay provider
+"""
+
+import asyncio
+import os
+import time
+import zlib
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+import pandas as pd
+
+from app_config import get_section
+from synthetic_data import generate_ohlcv, timeframe_to_minutes
+
+PROVIDER_ENV_VAR = 'DATA_PROVIDER'
+
+OHLCV_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+# yfinance-style period strings used across the app
+PERIOD_DELTAS = {
+    '1d': pd.Timedelta(days=1), '5d': pd.Timedelta(days=5),
+    '7d': pd.Timedelta(days=7), '1mo': pd.Timedelta(days=30),
+    '3mo': pd.Timedelta(days=91), '6mo': pd.Timedelta(days=182),
+    '1y': pd.Timedelta(days=365), '2y': pd.Timedelta(days=730),
+    '5y': pd.Timedelta(days=1826)
+}
+
+
+def period_to_timedelta(period: str) -> Optional[pd.Timedelta]:
+    """Length of a period string such as '3mo'; None for 'max'"""
+    if period == 'max':
+        return None
+    if period not in PERIOD_DELTAS:
+        raise ValueError(f"Unsupported period '{period}'. Choose from {list(PERIOD_DELTAS) + ['max']}")
+    return PERIOD_DELTAS[period]
+
+
+def covering_period(delta: pd.Timedelta) -> str:
+    """Shortest period string spanning at least `delta` ('max' beyond the longest)"""
+    for period, length in PERIOD_DELTAS.items():
+        if length >= delta:
+            return period
+    return 'max'
+
+
+def market_symbol(symbol: str, quote_currency: Optional[str] = 'USDT') -> str:
+    """Convert an app symbol like 'BTC-USD' to an exchange market like 'BTC/USDT'"""
+    if '/' in symbol:
+        return symbol
+    base, _, quote = symbol.partition('-')
+    if quote in ('', 'USD') and quote_currency:
+        quote = quote_currency
+    return f"{base}/{quote}"
+
+
+def normalize_ohlcv(data: pd.DataFrame) -> pd.DataFrame:
+    """Keep the OHLCV columns, drop incomplete rows and ensure a sorted DatetimeIndex"""
+    data = data[OHLCV_COLUMNS].dropna()
+    data.index = pd.to_datetime(data.index)
+    return data.sort_index()
+
+
+class DataProvider:
+    """
+    Interface for OHLCV sources
+
+    Subclasses implement fetch(); stream() is optional. fetch_async() runs
+    fetch() in a worker thread unless a provider has a native async path.
+    """
+
+    name = 'base'
+
+    def __init__(self, rate_limit: Optional[float] = None):
+        # Requests per second honoured by the async fetcher (None = unlimited)
+        self.rate_limit = rate_limit
+
+    def fetch(self, symbol: str, timeframe: str, period: str) -> pd.DataFrame:
+        """
+        Historical candles
+
+        Args:
+            symbol: App symbol (e.g. 'BTC-USD')
+            timeframe: Bar size ('1m' ... '1d')
+            period: History length ('1d' ... '5y', 'max')
+
+        Returns:
+            DataFrame with Open, High, Low, Close, Volume (empty when nothing is available)
+        """
+        raise NotImplementedError
+
+    def stream(self, symbol: str, timeframe: str, **kwargs) -> Iterator[pd.Series]:
+        """Yield closed bars one at a time"""
+        raise NotImplementedError(f"{self.name} provider does not support streaming")
+
+    async def fetch_async(self, symbol: str, timeframe: str, period: str, session=None) -> pd.DataFrame:
+        """
+        Asynchronous fetch()
+
+        Args:
+            session: Shared aiohttp.ClientSession, used by providers that speak HTTP directly
+        """
+        return await asyncio.to_thread(self.fetch, symbol, timeframe, period)
+
+    async def close_async(self):
+        """Release resources opened by fetch_async()"""
+
+
+class YFinanceProvider(DataProvider):
+    """
+    Yahoo Finance history via yfinance
+
+    The async path calls the Yahoo chart API directly over the shared session.
+    """
+
+    name = 'yfinance'
+
+    def __init__(self, rate_limit: Optional[float] = 5.0,
+                 base_url: str = 'https://query2.finance.yahoo.com'):
+        super().__init__(rate_limit)
+        self.base_url = base_url.rstrip('/')
+
+    def fetch(self, symbol, timeframe, period):
+        import yfinance as yf
+
+        data = yf.Ticker(symbol).history(period=period, interval=timeframe)
+        if data.empty:
+            return data
+        return normalize_ohlcv(data)
+
+    async def fetch_async(self, symbol, timeframe, period, session=None):
+        if session is None:
+            return await super().fetch_async(symbol, timeframe, period)
+
+        url = f"{self.base_url}/v8/finance/chart/{symbol}"
+        params = {'range': period, 'interval': timeframe, 'includePrePost': 'false'}
+        async with session.get(url, params=params, headers={'User-Agent': 'Mozilla/5.0'}) as response:
+            response.raise_for_status()
+            payload = await response.json()
+
+        return self.parse_chart(payload)
+
+    @staticmethod
+    def parse_chart(payload: Dict) -> pd.DataFrame:
+        """Convert a Yahoo chart API response into an OHLCV frame"""
+        chart = payload.get('chart', {})
+        if chart.get('error'):
+            raise ValueError(chart['error'].get('description', chart['error']))
+
+        result = (chart.get('result') or [{}])[0]
+        timestamps = result.get('timestamp')
+        if not timestamps:
+            return pd.DataFrame(columns=OHLCV_COLUMNS)
+
+        quote = result['indicators']['quote'][0]
+        data = pd.DataFrame(
+            {column: quote.get(column.lower()) for column in OHLCV_COLUMNS},
+            index=pd.to_datetime(timestamps, unit='s', utc=True)
+        )
+        return normalize_ohlcv(data)
+
+
+class CCXTProvider(DataProvider):
+    """
+    Exchange candles through ccxt's unified fetch_ohlcv
+
+    App symbols like 'BTC-USD' are mapped to exchange markets like 'BTC/USDT'.
+    """
+
+    name = 'ccxt'
+
+    def __init__(self, exchange: str = 'binance', quote_currency: str = 'USDT',
+                 page_limit: int = 1000, exchange_options: Optional[Dict] = None,
+                 rate_limit: Optional[float] = None):
+        super().__init__(rate_limit)
+        self.exchange_id = exchange
+        self.quote_currency = quote_currency
+        self.page_limit = page_limit
+        self.exchange_options = exchange_options or {}
+        self._exchange = None
+        self._async_exchange = None
+
+    @property
+    def exchange(self):
+        if self._exchange is None:
+            import ccxt
+
+            options = {'enableRateLimit': True}
+            options.update(self.exchange_options)
+            self._exchange = getattr(ccxt, self.exchange_id)(options)
+        return self._exchange
+
+    def market_symbol(self, symbol: str) -> str:
+        """Convert 'BTC-USD' to 'BTC/<quote_currency>'; exchange symbols pass through"""
+        return market_symbol(symbol, self.quote_currency)
+
+    def _start(self, exchange, period):
+        delta = period_to_timedelta(period)
+        now_ms = exchange.milliseconds()
+        since = now_ms - int(delta.total_seconds() * 1000) if delta is not None else None
+        return since, now_ms
+
+    def _next_since(self, batch, since, now_ms, timeframe):
+        """Start of the next page, or None when the history is complete"""
+        bar_ms = timeframe_to_minutes(timeframe) * 60_000
+        if not batch or since is None or len(batch) < self.page_limit or batch[-1][0] + bar_ms >= now_ms:
+            return None
+        return batch[-1][0] + bar_ms
+
+    @staticmethod
+    def _to_frame(rows):
+        if not rows:
+            return pd.DataFrame(columns=OHLCV_COLUMNS)
+
+        data = pd.DataFrame(rows, columns=['Timestamp'] + OHLCV_COLUMNS)
+        data = data.drop_duplicates('Timestamp').set_index('Timestamp')
+        data.index = pd.to_datetime(data.index, unit='ms', utc=True)
+        return normalize_ohlcv(data)
+
+    def fetch(self, symbol, timeframe, period):
+        market = self.market_symbol(symbol)
+        since, now_ms = self._start(self.exchange, period)
+
+        rows = []
+        while True:
+            batch = self.exchange.fetch_ohlcv(market, timeframe, since=since, limit=self.page_limit)
+            rows.extend(batch or [])
+            since = self._next_since(batch, since, now_ms, timeframe)
+            if since is None:
+                break
+
+        return self._to_frame(rows)
+
+    async def fetch_async(self, symbol, timeframe, period, session=None):
+        if self._async_exchange is None:
+            import ccxt.async_support as ccxt_async
+
+            options = {'enableRateLimit': True}
+            options.update(self.exchange_options)
+            if session is not None:
+                options['session'] = session
+            self._async_exchange = getattr(ccxt_async, self.exchange_id)(options)
+
+        exchange = self._async_exchange
+        market = self.market_symbol(symbol)
+        since, now_ms = self._start(exchange, period)
+
+        rows = []
+        while True:
+            batch = await exchange.fetch_ohlcv(market, timeframe, since=since, limit=self.page_limit)
+            rows.extend(batch or [])
+            since = self._next_since(batch, since, now_ms, timeframe)
+            if since is None:
+                break
+
+        return self._to_frame(rows)
+
+    async def close_async(self):
+        if self._async_exchange is not None:
+            await self._async_exchange.close()
+            self._async_exchange = None
+
+
+class ReplayProvider(DataProvider):
+    """
+    Offline provider that serves stored or synthetic candles
+
+    Candles come from, in order: frames passed in `frames`, CSV files named
+    '<symbol>_<timeframe>.csv' in `data_dir`, then a deterministic synthetic
+    series. stream() replays them at `speed` times market speed.
+    """
+
+    name = 'replay'
+
+    def __init__(self, frames: Optional[Dict] = None, data_dir: Optional[str] = None,
+                 speed: Optional[float] = None, synthetic: bool = True,
+                 max_synthetic_bars: int = 50000, seed: int = 7, rate_limit: Optional[float] = None):
+        super().__init__(rate_limit)
+        self.frames = dict(frames or {})
+        self.data_dir = Path(data_dir) if data_dir else None
+        self.speed = speed
+        self.synthetic = synthetic
+        self.max_synthetic_bars = max_synthetic_bars
+        self.seed = seed
+
+    def add_frame(self, symbol: str, timeframe: str, data: pd.DataFrame):
+        """Register candles to replay for a symbol/timeframe"""
+        self.frames[(symbol, timeframe)] = normalize_ohlcv(data)
+
+    def _load(self, symbol, timeframe, period):
+        if (symbol, timeframe) in self.frames:
+            return self.frames[(symbol, timeframe)]
+
+        if self.data_dir is not None:
+            path = self.data_dir / f"{symbol}_{timeframe}.csv"
+            if path.exists():
+                data = normalize_ohlcv(pd.read_csv(path, index_col=0, parse_dates=True))
+                self.frames[(symbol, timeframe)] = data
+                return data
+
+        if not self.synthetic:
+            return pd.DataFrame(columns=OHLCV_COLUMNS)
+
+        delta = period_to_timedelta(period)
+        minutes = timeframe_to_minutes(timeframe)
+        bars = self.max_synthetic_bars if delta is None else int(delta.total_seconds() // 60 // minutes)
+        seed = self.seed + zlib.crc32(symbol.encode('utf-8'))
+        return generate_ohlcv(min(bars, self.max_synthetic_bars), timeframe, seed)
+
+    def fetch(self, symbol, timeframe, period):
+        data = self._load(symbol, timeframe, period)
+        delta = period_to_timedelta(period)
+        if delta is None or data.empty:
+            return data.copy()
+        return data[data.index > data.index[-1] - delta].copy()
+
+    def stream(self, symbol: str, timeframe: str, period: str = 'max',
+               speed: Optional[float] = None, start: int = 0) -> Iterator[pd.Series]:
+        """
+        Replay candles one closed bar at a time
+
+        Args:
+            period: How much history to replay
+            speed: Multiple of market speed (1 = real time, 1000 = a 1h bar every 3.6s);
+                   None or 0 replays as fast as possible. Defaults to the provider speed.
+            start: Index of the first bar to emit
+        """
+        data = self.fetch(symbol, timeframe, period)
+        speed = self.speed if speed is None else speed
+        interval = timeframe_to_minutes(timeframe) * 60 / speed if speed else 0.0
+
+        began = time.monotonic()
+        for i, (timestamp, bar) in enumerate(data.iloc[start:].iterrows()):
+            if interval:
+                # Schedule against the start time so sleep jitter does not accumulate
+                delay = began + (i + 1) * interval - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+            yield bar
+
+
+def _resampling_provider(**options) -> DataProvider:
+    # candle_store builds on this module, so it is imported on first use
+    from candle_store import shared_resampling_provider
+    return shared_resampling_provider(**options)
+
+
+DATA_PROVIDERS = {
+    'yfinance': YFinanceProvider,
+    'ccxt': CCXTProvider,
+    'replay': ReplayProvider,
+    'resample': _resampling_provider
+}
+
+
+def get_data_provider(name=None, **kwargs) -> DataProvider:
+    """
+    Build a data provider
+
+    Args:
+        name: 'yfinance', 'ccxt', 'replay' or 'resample' (a DataProvider instance is returned as is).
+              Defaults to the DATA_PROVIDER environment variable, then
+              data_sources.primary in config.json, then 'yfinance'.
+        kwargs: Provider options; missing ones come from data_sources.<name> in config.json
+    """
+    if isinstance(name, DataProvider):
+        return name
+
+    settings = get_section('data_sources')
+    name = (name or os.environ.get(PROVIDER_ENV_VAR) or settings.get('primary') or 'yfinance').lower()
+
+    if name not in DATA_PROVIDERS:
+        raise ValueError(f"Unknown data provider: {name}. Choose from {list(DATA_PROVIDERS)}")
+
+    options = dict(settings.get(name, {}))
+    options.update(kwargs)
+    return DATA_PROVIDERS[name](**options)
+
+
+__all__ = ['DataProvider', 'YFinanceProvider', 'CCXTProvider', 'ReplayProvider',
+           'get_data_provider', 'market_symbol', 'normalize_ohlcv', 'period_to_timedelta', 'covering_period',
+           'DATA_PROVIDERS']
@@ -0,0 +1,90 @@
+"""
+Feature Drift Monitor
+Reference feature distributions saved at fit time and population stability of recent windows against them
+"""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from app_config import get_section
+
+# Price levels, moving averages, bands and cumulative volume trend by construction,
+# and price-denominated spreads (ATR, MACD, momentum) scale with the level: any
+# window after a move looks shifted, so they are left out of the drift score
+LEVEL_FEATURES = {
+    'Close', 'High', 'Low', 'Open',
+    'SMA_5', 'SMA_10', 'SMA_20', 'SMA_50', 'SMA_100', 'SMA_200',
+    'EMA_5', 'EMA_10', 'EMA_12', 'EMA_20', 'EMA_26', 'EMA_50', 'EMA_100', 'EMA_200',
+    'PSAR', 'BB_Upper', 'BB_Middle', 'BB_Lower',
+    'Tenkan', 'Kijun', 'Senkou_A', 'Senkou_B', 'Chikou',
+    'Support_20', 'Resistance_20', 'Support_50', 'Resistance_50',
+    'OBV', 'AD',
+    'ATR', 'TRANGE', 'MOM', 'MACD', 'MACD_Signal', 'MACD_Histogram', 'MACD_Fast', 'MACD_Signal_Fast'
+}
+
+DEFAULT_BINS = 10
+
+# Floor for empty bins, so the log ratio stays finite
+_MIN_PROPORTION = 1e-4
+
+
+def reference_rows() -> int:
+    """Rows in a drift reference (retrain_scheduler.drift_window, so windows compare like for like)"""
+    return int(get_section('retrain_scheduler').get('drift_window', 500))
+
+
+def _bin_proportions(values: np.ndarray, edges: List[float]) -> np.ndarray:
+    counts = np.bincount(np.searchsorted(edges, values, side='right'), minlength=len(edges) + 1)
+    return np.maximum(counts / max(len(values), 1), _MIN_PROPORTION)
+
+
+def build_drift_reference(features: List[str], scaled: np.ndarray, rows: Optional[int] = None,
+                          bins: int = DEFAULT_BINS) -> Dict:
+    """
+    Quantile bins of the last `rows` rows of a scaled training matrix
+
+    Args:
+        features: Column names of `scaled`
+        scaled: Scaled (time x features) matrix the model was fitted on
+        rows: Reference window (defaults to reference_rows())
+
+    Returns:
+        JSON-serialisable {'rows', 'features': {name: {'edges', 'proportions'}}},
+        stored with the model config
+    """
+    rows = rows or reference_rows()
+    window = np.asarray(scaled[-rows:], dtype=np.float64)
+    reference = {}
+    for i, name in enumerate(features):
+        if name in LEVEL_FEATURES:
+            continue
+        values = window[:, i][np.isfinite(window[:, i])]
+        if len(values) == 0:
+            continue
+        # Interior quantiles; repeated ones collapse, so discrete features get one bin per value
+        edges = np.unique(np.quantile(values, np.linspace(0, 1, bins + 1)[1:-1])).tolist()
+        reference[name] = {'edges': edges, 'proportions': _bin_proportions(values, edges).tolist()}
+    return {'rows': int(len(window)), 'features': reference}
+
+
+def population_stability(reference: Dict, features: List[str], scaled: np.ndarray) -> Dict[str, float]:
+    """
+    Population stability index of each referenced feature over a scaled window
+
+    PSI = sum((current - reference) * ln(current / reference)) over the
+    reference bins; below 0.1 is stable, above 0.25 a significant shift.
+    """
+    scores = {}
+    for i, name in enumerate(features):
+        bins = reference['features'].get(name)
+        if bins is None:
+            continue
+        values = scaled[:, i][np.isfinite(scaled[:, i])]
+        expected = np.asarray(bins['proportions'])
+        actual = _bin_proportions(values, bins['edges'])
+        scores[name] = float(np.sum((actual - expected) * np.log(actual / expected)))
+    return scores
+
+
+__all__ = ['build_drift_reference', 'population_stability', 'reference_rows', 'LEVEL_FEATURES', 'DEFAULT_BINS']
@@ -5,15 +5,26 @@ High-precision trading system with comprehensive indicator analysis
 
 import numpy as np
 import pandas as pd
+from performance_profile import apply_performance_profile, configure_environment
+configure_environment(strict=False)  # oneDNN options are read when TensorFlow is imported
 import tensorflow as tf
 from tensorflow.keras.models import Sequential
 from tensorflow.keras.layers import LSTM, Dense, Dropout, BatchNormalization, Attention
 from tensorflow.keras.optimizers import Adam
-from tensorflow.keras.callbacks import EarlyStopping, ReduceLROnPlateau, ModelCheckpoint
+from tensorflow.keras.callbacks import EarlyStopping, ReduceLROnPlateau
 from sklearn.preprocessing import MinMaxScaler, RobustScaler
 from sklearn.model_selection import TimeSeriesSplit
-import yfinance as yf
-from advanced_indicators import AdvancedTechnicalIndicators, ConfidenceScoring
+from advanced_indicators import AdvancedTechnicalIndicators, ConfidenceScoring, TRADE_BLOCK_REASONS
+from feature_store import FeatureMatrix, sequence_windows, feature_set_hash
+from instrumentation import get_profiler
+from data_providers import get_data_provider
+from model_builder import apply_search_params, build_lstm_model, get_architecture, get_training_settings
+from model_registry import LazyModel
+from streaming_inference import StreamingLSTM
+from tail_features import TailFeatureState, compute_tail_features, tail_length, warmup_bars
+from training_checkpoint import EpochCheckpoint, TrainingRun, history_from_logs
+from app_config import get_section
+from drift_monitor import build_drift_reference
 import joblib
 import json
 from datetime import datetime, timedelta
@@ -25,15 +36,32 @@ class EnhancedCryptoPredictorLSTM:
     Enhanced crypto predictor with advanced technical analysis and confidence scoring
     """
     
-    def __init__(self, symbol='BTC-USD', timeframe='1h'):
+    def __init__(self, symbol='BTC-USD', timeframe='1h', data_provider=None):
         self.symbol = symbol
         self.timeframe = timeframe
+        self.data_provider = get_data_provider(data_provider)
         self.model = None
+        self.model_version = None  # Set when loaded from a ModelRegistry
         self.feature_scaler = RobustScaler()  # More robust to outliers
         self.target_scaler = MinMaxScaler()
         self.lookback_window = 60
         self.confidence_threshold = 0.8
         self.min_confluence_score = 0.6
+        self.compact_features = False  # float32/int8/categorical processed frames
+        self.indicator_backend = None  # 'talib'/'numba'; None follows INDICATOR_BACKEND, then 'auto'
+        self.model_architecture = get_architecture()
+        self.training_settings = get_training_settings()
+        self.cv_results = None  # Per-fold metrics of the last train_with_cross_validation
+        self.trained_through = None  # Index of the last bar the model was trained on (str)
+        self.drift_reference = None  # Feature bins of the latest rows the scaler was fitted on
+        self.streaming_inference = get_section('performance').get('streaming_inference', {}).get('enabled', False)
+        self.streaming = None  # StreamingLSTM carrying recurrent state between live bars
+        self.tail_features = get_section('performance').get('tail_features', True)
+        self.tail_state = None  # TailFeatureState seeding recursive indicators between prediction calls
+        self.cascade_inference = get_section('performance').get('cascade_inference', False)
+        self.cascade_stats = {'predicted': 0, 'skipped': 0}
+        self.profiler = get_profiler()
+        self.performance_profile = apply_performance_profile(strict=False)
         
         # Feature selection for LSTM
         self.selected_features = [
@@ -94,8 +122,9 @@ class EnhancedCryptoPredictorLSTM:
         """
         try:
             print(f"Fetching {period} of data for {self.symbol}...")
-            ticker = yf.Ticker(self.symbol)
-            data = ticker.history(period=period, interval=self.timeframe)
+            with self.profiler.span('fetch_comprehensive_data') as span:
+                data = self.data_provider.fetch(self.symbol, self.timeframe, period)
+                span.rows = len(data)
             
             if data.empty:
                 raise ValueError(f"No data found for {self.symbol}")
@@ -111,24 +140,44 @@ class EnhancedCryptoPredictorLSTM:
             print(f"❌ Error fetching data: {e}")
             return None
     
-    def prepare_features(self, data):
+    def prepare_features(self, data, compact=None):
         """
         Prepare comprehensive feature set with all indicators
+        
+        Args:
+            data: OHLCV data
+            compact: Store the frame with compact dtypes (defaults to self.compact_features)
         """
         print("🔧 Calculating technical indicators...")
         
+        rows = len(data)
+        
         # Calculate all advanced indicators
-        df = AdvancedTechnicalIndicators.calculate_all_indicators(data)
+        with self.profiler.span('calculate_all_indicators', rows=rows):
+            df = AdvancedTechnicalIndicators.calculate_all_indicators(data, backend=self.indicator_backend)
         
         # Add market regime analysis
-        df = AdvancedTechnicalIndicators.calculate_market_regime(df)
+        with self.profiler.span('calculate_market_regime', rows=rows):
+            df = AdvancedTechnicalIndicators.calculate_market_regime(df)
         
         # Add support/resistance levels
-        df = AdvancedTechnicalIndicators.calculate_support_resistance_levels(df)
+        with self.profiler.span('calculate_support_resistance_levels', rows=rows):
+            df = AdvancedTechnicalIndicators.calculate_support_resistance_levels(df)
         
         # Add risk metrics
-        df = AdvancedTechnicalIndicators.calculate_risk_metrics(df)
+        with self.profiler.span('calculate_risk_metrics', rows=rows):
+            df = AdvancedTechnicalIndicators.calculate_risk_metrics(df)
+        
+        df = self.add_targets(df, compact)
         
+        print(f"✅ Prepared {len(df)} samples with {len(self.selected_features)} features")
+        
+        return df
+    
+    def add_targets(self, df, compact=None):
+        """
+        Add target variables, drop incomplete rows and optionally compact the frame
+        """
         # Create target variables
         # Multi-class target: 0=sell, 1=hold, 2=buy
         future_returns = (df['Close'].shift(-1) - df['Close']) / df['Close']
@@ -153,13 +202,41 @@ class EnhancedCryptoPredictorLSTM:
         # Remove rows with NaN values
         df = df.dropna()
         
-        print(f"✅ Prepared {len(df)} samples with {len(self.selected_features)} features")
+        if self.compact_features if compact is None else compact:
+            df = AdvancedTechnicalIndicators.compact_frame(df)
+        
+        return df
+    
+    def prepare_features_tail(self, data, compact=None):
+        """
+        Prediction-time prepare_features: the same last rows, computed over the minimum tail
+        
+        Only the last tail_features.tail_length(lookback_window) bars are run through
+        the indicators; EMA/MACD/RSI/ATR/ADX/SAR/OBV/AD state is carried in
+        self.tail_state, so repeated calls only process the newly appended bars.
+        Falls back to prepare_features when the history is no longer than the tail.
+        """
+        rows = tail_length(self.lookback_window)
+        if len(data) <= rows:
+            return self.prepare_features(data, compact)
+        
+        if self.tail_state is None or self.tail_state.rows != rows:
+            self.tail_state = TailFeatureState(rows)
+        
+        with self.profiler.span('prepare_features_tail', rows=rows):
+            df = compute_tail_features(data, self.tail_state, backend=self.indicator_backend)
+            df = self.add_targets(df, compact)
         
         return df
     
-    def create_lstm_sequences(self, df):
+    def create_lstm_sequences(self, df, fit_scaler=True):
         """
         Create sequences for LSTM training with proper feature selection
+        
+        Args:
+            df: Frame from prepare_features
+            fit_scaler: Refit the feature scaler on df; False scales with the
+                fitted one, as the model being fine-tuned was trained with it
         """
         # Select and validate features
         available_features = [f for f in self.selected_features if f in df.columns]
@@ -170,75 +247,123 @@ class EnhancedCryptoPredictorLSTM:
         
         print(f"📊 Using {len(available_features)} features for training")
         
-        # Prepare feature matrix
-        feature_data = df[available_features].values
+        # Prepare feature matrix (float32 end to end in compact mode)
+        feature_data = df[available_features].to_numpy(
+            dtype=np.float32 if self.compact_features else np.float64
+        )
         targets = df['Binary_Target'].values
         future_returns = df['Future_Return'].values
         
-        # Scale features
-        scaled_features = self.feature_scaler.fit_transform(feature_data)
+        with self.profiler.span('create_lstm_sequences', rows=len(feature_data)):
+            # Scale features
+            if fit_scaler:
+                scaled_features = self.feature_scaler.fit_transform(feature_data)
+                self.drift_reference = build_drift_reference(available_features, scaled_features)
+            else:
+                scaled_features = self.feature_scaler.transform(feature_data)
+            
+            # Create sequences as strided windows over the scaled matrix
+            X = sequence_windows(scaled_features, self.lookback_window)[:-1]
+        y = targets[self.lookback_window:]
+        returns = future_returns[self.lookback_window:]
+        indices = list(df.index[self.lookback_window:])
         
-        # Create sequences
-        X, y, returns, indices = [], [], [], []
+        return X, y, returns, indices
+    
+    def export_feature_matrix(self, df, store, key=None):
+        """
+        Fit the feature scaler and write the scaled matrix to a FeatureMatrixStore
+        so other processes can attach to it instead of rebuilding features
         
-        for i in range(self.lookback_window, len(scaled_features)):
-            X.append(scaled_features[i-self.lookback_window:i])
-            y.append(targets[i])
-            returns.append(future_returns[i])
-            indices.append(df.index[i])
+        Returns:
+            Store key of the written entry
+        """
+        available_features = [f for f in self.selected_features if f in df.columns]
+        feature_data = df[available_features].to_numpy(
+            dtype=np.float32 if self.compact_features else np.float64
+        )
+        scaled_features = self.feature_scaler.fit_transform(feature_data)
+        self.drift_reference = build_drift_reference(available_features, scaled_features)
+        
+        if key is None:
+            key = f"{self.symbol}_{self.timeframe}_{feature_set_hash(available_features, self.lookback_window)}"
+        
+        scaler = self.feature_scaler
+        store.write(
+            key,
+            scaled_features,
+            df['Binary_Target'].values,
+            df['Future_Return'].values,
+            index=df.index.values,
+            metadata={
+                'symbol': self.symbol,
+                'timeframe': self.timeframe,
+                'lookback_window': self.lookback_window,
+                'features': available_features
+            },
+            # Written before meta.json, so a complete entry always has its scaler
+            artifacts={'feature_scaler.pkl': lambda path: joblib.dump(scaler, path)}
+        )
         
-        return np.array(X), np.array(y), np.array(returns), indices
+        print(f"💾 Stored {scaled_features.shape} feature matrix as {key}")
+        return key
     
-    def build_advanced_lstm_model(self, input_shape):
+    def load_feature_matrix(self, store, key):
         """
-        Build advanced LSTM architecture with attention and regularization
+        Attach to a stored feature matrix (memory-mapped) and restore its scaler
+        
+        Returns:
+            FeatureMatrix whose windows() give the LSTM inputs without copying
         """
-        model = Sequential([
-            # Input layer
-            tf.keras.layers.Input(shape=input_shape),
-            
-            # First LSTM layer with return sequences
-            LSTM(128, return_sequences=True, dropout=0.2, recurrent_dropout=0.2),
-            BatchNormalization(),
-            
-            # Second LSTM layer
-            LSTM(64, return_sequences=True, dropout=0.2, recurrent_dropout=0.2),
-            BatchNormalization(),
-            
-            # Third LSTM layer
-            LSTM(32, return_sequences=False, dropout=0.2, recurrent_dropout=0.2),
-            BatchNormalization(),
-            
-            # Dense layers with regularization
-            Dense(50, activation='relu'),
-            Dropout(0.3),
-            BatchNormalization(),
-            
-            Dense(25, activation='relu'),
-            Dropout(0.2),
-            
-            # Output layer
-            Dense(1, activation='sigmoid')
-        ])
+        matrix = store.attach(key)
+        self.feature_scaler = joblib.load(matrix.path / 'feature_scaler.pkl')
+        self.lookback_window = matrix.lookback_window
+        self.drift_reference = build_drift_reference(matrix.metadata['features'], matrix.features)
+        return matrix
+    
+    def build_advanced_lstm_model(self, input_shape, architecture=None):
+        """
+        Build advanced LSTM architecture with attention and regularization
         
-        # Compile with advanced optimizer
-        model.compile(
-            optimizer=Adam(learning_rate=0.001, beta_1=0.9, beta_2=0.999),
-            loss='binary_crossentropy',
+        Layer sizes, dropout and optimizer come from self.model_architecture
+        (config.json model_architecture) unless an architecture is given.
+        """
+        return build_lstm_model(
+            input_shape,
+            architecture or self.model_architecture,
+            batch_norm=True,
             metrics=['accuracy', 'precision', 'recall', 'f1_score']
         )
-        
-        return model
     
-    def train_with_cross_validation(self, data, n_splits=5, epochs=100):
+    def train_with_cross_validation(self, data, n_splits=5, epochs=100, warm_start=None, run_dir=None):
         """
         Train model with time series cross-validation
+        
+        Args:
+            data: OHLCV data, or a FeatureMatrix from load_feature_matrix to train
+                on its shared windows without rebuilding features
+            n_splits: Number of TimeSeriesSplit folds
+            epochs: Maximum epochs per fold (for the first fold when warm starting)
+            warm_start: Start each fold from the previous fold's weights and train
+                only on the bars the fold adds plus a replay sample of earlier
+                bars; defaults to training_settings.warm_start_cv
+            run_dir: Checkpoint model, optimizer and fold state here after every
+                epoch; an interrupted run in this directory is continued from
+                its last finished epoch (see resume_training)
         """
         print("🚀 Starting enhanced training with cross-validation...")
+        settings = self.training_settings
+        if warm_start is None:
+            warm_start = settings.get('warm_start_cv', False)
         
         # Prepare comprehensive features
-        df = self.prepare_features(data)
-        X, y, returns, indices = self.create_lstm_sequences(df)
+        if isinstance(data, FeatureMatrix):
+            df = None
+            X, y, returns = data.windows(self.lookback_window)
+            indices = list(pd.DatetimeIndex(data.index[self.lookback_window:]))
+        else:
+            df = self.prepare_features(data)
+            X, y, returns, indices = self.create_lstm_sequences(df)
         
         print(f"📈 Training data shape: {X.shape}")
         print(f"🎯 Target distribution: {np.bincount(y)}")
@@ -246,76 +371,400 @@ class EnhancedCryptoPredictorLSTM:
         # Time series cross-validation
         tscv = TimeSeriesSplit(n_splits=n_splits)
         cv_scores = []
+        fold_epochs = []
         
         best_score = 0
         best_model = None
+        best_fold = None
+        previous_model = None
+        previous_end = 0
+        rng = np.random.default_rng(42)
+        
+        run = TrainingRun(run_dir) if run_dir else None
+        state = self._training_run_state(run, X, indices, n_splits, epochs, warm_start) if run else None
+        resumed_from = None
+        if state is not None:
+            if state['rng_state']:
+                rng.bit_generator.state = state['rng_state']
+            if state['status'] == 'complete':
+                print(f"♻️ Run already complete, restoring its {len(state['folds'])} folds")
+            elif state['folds'] or state['current']:
+                current = state['current'] or {'fold': len(state['folds']), 'epoch': 0}
+                resumed_from = {'fold': current['fold'], 'epoch': current['epoch']}
+                print(f"♻️ Resuming run from fold {current['fold'] + 1}, epoch {current['epoch']}")
         
         for fold, (train_idx, val_idx) in enumerate(tscv.split(X)):
+            if state is not None and fold < len(state['folds']):
+                # Finished before the run was interrupted
+                finished = state['folds'][fold]
+                cv_scores.append(finished['val_accuracy'])
+                fold_epochs.append(finished['epochs'])
+                previous_model = None
+                previous_end = train_idx[-1] + 1
+                if finished['val_accuracy'] > best_score:
+                    best_score = finished['val_accuracy']
+                    best_model, best_fold = None, fold
+                    best_history = history_from_logs(finished['history'])
+                continue
+            
             print(f"\n📊 Training fold {fold + 1}/{n_splits}")
             
-            X_train, X_val = X[train_idx], X[val_idx]
-            y_train, y_val = y[train_idx], y[val_idx]
+            # An interrupted fold continues from its own checkpoint instead of a new model
+            resuming = (state is not None and state['current'] is not None
+                        and state['current']['fold'] == fold and run.current_model_path().exists())
             
-            # Build model for this fold
-            model = self.build_advanced_lstm_model((X.shape[1], X.shape[2]))
+            fold_max_epochs = epochs
+            if warm_start and fold > 0:
+                # Folds are nested: train on the new bars plus a replay sample of the
+                # earlier ones so the warm-started weights do not forget them
+                new_idx = train_idx[previous_end:]
+                replay_size = min(int(len(new_idx) * settings.get('replay_fraction', 0.5)), previous_end)
+                replay_idx = np.sort(rng.choice(train_idx[:previous_end], replay_size, replace=False))
+                train_idx = np.concatenate([replay_idx, new_idx])
+                fold_max_epochs = min(epochs, settings.get('warm_start_epochs', 25))
+                
+                if not resuming:
+                    if previous_model is None:
+                        previous_model = run.load_model(run.fold_model_path(fold - 1))
+                    model = self.build_advanced_lstm_model((X.shape[1], X.shape[2]))
+                    model.set_weights(previous_model.get_weights())
+                print(f"🔁 Warm start: {len(new_idx)} new + {replay_size} replayed samples")
+            elif not resuming:
+                # Build model for this fold
+                model = self.build_advanced_lstm_model((X.shape[1], X.shape[2]))
+            previous_end = train_idx[-1] + 1
             
-            # Callbacks
-            callbacks = [
-                EarlyStopping(
-                    monitor='val_accuracy',
-                    patience=15,
-                    restore_best_weights=True,
-                    verbose=0
-                ),
-                ReduceLROnPlateau(
-                    monitor='val_loss',
-                    patience=8,
-                    factor=0.5,
-                    min_lr=1e-6,
-                    verbose=0
-                )
-            ]
+            X_train, X_val = X[train_idx], X[val_idx]
+            # 2D targets: the f1_score metric rejects (batch,) labels
+            y_train, y_val = y[train_idx].reshape(-1, 1), y[val_idx].reshape(-1, 1)
             
-            # Train model
-            history = model.fit(
-                X_train, y_train,
-                validation_data=(X_val, y_val),
-                epochs=epochs,
-                batch_size=32,
-                callbacks=callbacks,
+            # Callbacks
+            early_stopping = EarlyStopping(
+                monitor='val_accuracy',
+                patience=settings['early_stopping_patience'],
+                restore_best_weights=True,
+                verbose=0
+            )
+            reduce_lr = ReduceLROnPlateau(
+                monitor='val_loss',
+                patience=settings['reduce_lr_patience'],
+                factor=settings['reduce_lr_factor'],
+                min_lr=settings['min_learning_rate'],
                 verbose=0
             )
+            callbacks = [early_stopping, reduce_lr]
+            
+            initial_epoch = 0
+            if resuming:
+                # Continue the interrupted fold with its weights and optimizer state
+                model = run.load_model(run.current_model_path())
+                initial_epoch = state['current']['epoch']
+            elif state is not None:
+                state['current'] = {'fold': fold, 'epoch': 0, 'history': {}, 'callbacks': None, 'stopped': False}
+            if state is not None:
+                callbacks.append(EpochCheckpoint(run, state, early_stopping, reduce_lr))
+            
+            # Train model
+            if state is not None and (state['current']['stopped'] or initial_epoch >= fold_max_epochs):
+                # Interrupted between the last epoch and the end of fit
+                best_weights = run.load_best_weights()
+                if best_weights is not None:
+                    model.set_weights(best_weights)
+            else:
+                with self.profiler.span('model.fit', rows=len(X_train)):
+                    history = model.fit(
+                        X_train, y_train,
+                        validation_data=(X_val, y_val),
+                        epochs=fold_max_epochs,
+                        initial_epoch=initial_epoch,
+                        batch_size=settings['batch_size'],
+                        callbacks=callbacks,
+                        verbose=0
+                    )
+            if state is not None:
+                # Includes the epochs from before an interruption
+                history = history_from_logs(state['current']['history'])
             
             # Evaluate
             val_accuracy = max(history.history['val_accuracy'])
             cv_scores.append(val_accuracy)
+            fold_epochs.append(len(history.epoch))
+            previous_model = model
+            
+            if state is not None:
+                run.save_model(model, run.fold_model_path(fold))
+                state['folds'].append({
+                    'fold': fold,
+                    'val_accuracy': float(val_accuracy),
+                    'epochs': len(history.epoch),
+                    'history': history.history
+                })
+                state['current'] = None
+                state['rng_state'] = rng.bit_generator.state
+                run.save_state(state)
+                run.clear_current()
             
-            print(f"✅ Fold {fold + 1} validation accuracy: {val_accuracy:.3f}")
+            print(f"✅ Fold {fold + 1} validation accuracy: {val_accuracy:.3f} ({fold_epochs[-1]} epochs)")
             
             # Keep best model
             if val_accuracy > best_score:
                 best_score = val_accuracy
-                best_model = model
+                best_model, best_fold = model, fold
                 best_history = history
         
         # Use best model
+        if best_model is None and best_fold is not None:
+            best_model = run.load_model(run.fold_model_path(best_fold))
         self.model = best_model
+        self.trained_through = str(indices[-1])
+        self.cv_results = {
+            'warm_start': bool(warm_start),
+            'fold_scores': cv_scores,
+            'fold_epochs': fold_epochs,
+            'total_epochs': int(sum(fold_epochs)),
+            'mean_accuracy': float(np.mean(cv_scores)),
+            'best_accuracy': float(best_score)
+        }
+        if state is not None:
+            state['status'] = 'complete'
+            run.save_state(state)
+            self.cv_results.update({'run_dir': str(run.run_dir), 'resumed_from': resumed_from})
         
         print(f"\n🏆 Cross-validation results:")
         print(f"📊 Mean accuracy: {np.mean(cv_scores):.3f} ± {np.std(cv_scores):.3f}")
         print(f"🎯 Best accuracy: {best_score:.3f}")
+        print(f"⏱️ Total epochs: {sum(fold_epochs)}")
         
         return best_history, df
     
-    def predict_with_advanced_confidence(self, current_data):
+    def _training_run_state(self, run, X, indices, n_splits, epochs, warm_start):
+        """
+        State of the checkpointed run in run.run_dir, started fresh if there is none
+        
+        Raises:
+            ValueError: The directory holds a run with other parameters or data
+        """
+        params = {
+            'n_splits': n_splits,
+            'epochs': epochs,
+            'warm_start': bool(warm_start),
+            'model_architecture': self.model_architecture,
+            'training_settings': self.training_settings,
+            'samples': int(len(X)),
+            'num_features': int(X.shape[2]),
+            'first_bar': str(indices[0]),
+            'last_bar': str(indices[-1])
+        }
+        if run.exists:
+            state = run.load_state()
+            # Round-trip through JSON so tuples/ints compare like the stored values
+            if state['params'] != json.loads(json.dumps(params, default=float)):
+                raise ValueError(f"Training run in {run.run_dir} was started with other parameters or data")
+            return state
+        
+        state = {'params': params, 'folds': [], 'current': None, 'rng_state': None, 'status': 'running'}
+        run.save_state(state)
+        return state
+    
+    def resume_training(self, data, run_dir):
+        """
+        Continue an interrupted train_with_cross_validation run
+        
+        Folds finished before the interruption are not retrained; the fold in
+        progress continues from its last saved epoch with its optimizer state.
+        
+        Args:
+            data: The OHLCV data the run was started with
+            run_dir: Run directory passed to train_with_cross_validation
+        """
+        params = TrainingRun(run_dir).load_state()['params']
+        self.model_architecture = params['model_architecture']
+        self.training_settings = params['training_settings']
+        return self.train_with_cross_validation(
+            data, params['n_splits'], params['epochs'], params['warm_start'], run_dir=run_dir
+        )
+
+    def fine_tune(self, data, epochs=None, replay_fraction=None, since=None):
+        """
+        Update a trained model with the bars added since it was trained
+
+        Trains a copy of the model for a few epochs on the samples whose bar
+        is later than trained_through, plus a replay sample drawn from the
+        most recent earlier samples so the update does not forget them. The
+        newest training_settings.fine_tune_holdout_fraction of the new samples
+        is held out: accuracy before and after is measured on it only, and
+        trained_through stops short of it so the next update trains on it.
+        The feature scaler is kept as fitted, so the inputs stay on the scale
+        the model learned.
+
+        Args:
+            data: OHLCV data covering the new bars and enough history before
+                them for the indicators and the lookback window
+            epochs: Defaults to training_settings.fine_tune_epochs
+            replay_fraction: Replayed samples per new sample; defaults to
+                training_settings.replay_fraction
+            since: Bars after this index count as new; defaults to trained_through
+
+        Returns:
+            Summary dict, or None when data has no bars after since (or too
+            few to split off the holdout)
+
+        Raises:
+            ValueError: No trained model, no bar to count new samples from, or
+                data not reaching far enough back before it for the indicator
+                warm-up and the lookback window
+        """
+        if self.model is None:
+            raise ValueError("No model to fine-tune")
+        since = since if since is not None else self.trained_through
+        if since is None:
+            raise ValueError("Model has no trained_through bar; pass since")
+
+        settings = self.training_settings
+        epochs = epochs or settings.get('fine_tune_epochs', 5)
+        if replay_fraction is None:
+            replay_fraction = settings.get('replay_fraction', 0.5)
+
+        # Otherwise the first new samples get indicators and windows cut short by the data start
+        history_bars = int(data.index.searchsorted(pd.Timestamp(since), side='right'))
+        required_bars = warmup_bars() + self.lookback_window
+        if history_bars < required_bars:
+            raise ValueError(
+                f"Data has {history_bars} bars up to {since}; fine-tuning needs {required_bars} "
+                f"(indicator warm-up + lookback window). Fetch a longer period."
+            )
+
+        df = self.prepare_features(data)
+        X, y, returns, indices = self.create_lstm_sequences(df, fit_scaler=False)
+
+        new_mask = pd.Index(indices) > pd.Timestamp(since)
+        new_idx = np.flatnonzero(new_mask)
+        if len(new_idx) == 0:
+            print(f"✅ {self.symbol} {self.timeframe} has no new bars since {since}")
+            return None
+
+        # The newest samples are never trained on, so the reported gain is out of sample
+        holdout_size = int(len(new_idx) * settings.get('fine_tune_holdout_fraction', 0.2))
+        if holdout_size == 0 or holdout_size == len(new_idx):
+            print(f"⏳ {self.symbol} {self.timeframe}: {len(new_idx)} new samples are too few to hold some out yet")
+            return None
+        new_idx, holdout_idx = new_idx[:-holdout_size], new_idx[-holdout_size:]
+
+        # Replay from the most recent earlier samples, the regime the model last saw
+        earlier_idx = np.flatnonzero(~new_mask)[-settings.get('fine_tune_replay_window', 2000):]
+        replay_size = min(int(len(new_idx) * replay_fraction), len(earlier_idx))
+        rng = np.random.default_rng(42)
+        replay_idx = np.sort(rng.choice(earlier_idx, replay_size, replace=False))
+        train_idx = np.concatenate([replay_idx, new_idx])
+        print(f"🔁 Fine-tuning on {len(new_idx)} new + {replay_size} replayed samples for {epochs} epochs "
+              f"({holdout_size} newest held out)")
+
+        # Train a copy: a registry model may be shared with other predictors through the cache
+        base = self.model.resolve() if isinstance(self.model, LazyModel) else self.model
+        architecture = apply_search_params(self.model_architecture, {
+            'learning_rate': self.model_architecture['optimizer']['learning_rate']
+            * settings.get('fine_tune_learning_rate_factor', 0.1)
+        })
+        model = self.build_advanced_lstm_model((X.shape[1], X.shape[2]), architecture)
+        model.set_weights(base.get_weights())
+
+        X_holdout, y_holdout = X[holdout_idx], y[holdout_idx].reshape(-1, 1)
+        accuracy_before = float(model.evaluate(X_holdout, y_holdout, verbose=0, return_dict=True)['accuracy'])
+        with self.profiler.span('model.fit', rows=len(train_idx)):
+            history = model.fit(
+                X[train_idx], y[train_idx].reshape(-1, 1),
+                epochs=epochs,
+                batch_size=settings['batch_size'],
+                verbose=0
+            )
+        accuracy_after = float(model.evaluate(X_holdout, y_holdout, verbose=0, return_dict=True)['accuracy'])
+
+        self.model = model
+        self.model_version = None  # No longer the registered weights
+        self.trained_through = str(indices[new_idx[-1]])
+
+        print(f"✅ Fine-tuned through {self.trained_through}: "
+              f"held-out new-bar accuracy {accuracy_before:.3f} → {accuracy_after:.3f}")
+        return {
+            'fine_tuned_since': str(since),
+            'trained_through': self.trained_through,
+            'new_samples': int(len(new_idx)),
+            'replay_samples': int(replay_size),
+            'holdout_samples': int(holdout_size),
+            'epochs': int(epochs),
+            'loss': float(history.history['loss'][-1]),
+            'new_bar_accuracy_before': accuracy_before,
+            'new_bar_accuracy_after': accuracy_after
+        }
+
+    def predict_with_advanced_confidence(self, current_data, cascade=None):
         """
         Make prediction with advanced confidence analysis
+        
+        Args:
+            current_data: OHLCV data
+            cascade: Check the trade gates that do not depend on the model first and
+                skip inference when they already veto the latest bar (defaults to
+                self.cascade_inference); the signal is then a HOLD with no prediction
         """
         if self.model is None:
             raise ValueError("Model not trained. Call train_with_cross_validation() first.")
         
-        # Prepare features
-        df = self.prepare_features(current_data)
+        df, X = self.prepare_prediction_input(current_data)
+        
+        if self.cascade_inference if cascade is None else cascade:
+            veto = self.pre_model_veto(df)
+            if veto is not None:
+                self.cascade_stats['skipped'] += 1
+                return self.signal_from_prediction(df, None, veto)
+        
+        # Model prediction
+        with self.profiler.span('model.predict', rows=1):
+            prediction = self.predict_latest(df, X)
+        self.cascade_stats['predicted'] += 1
+        
+        return self.signal_from_prediction(df, prediction)
+    
+    def pre_model_veto(self, df):
+        """
+        Reason the latest bar cannot trade whatever the model predicts, or None
+        """
+        allowed, reasons = ConfidenceScoring.pre_model_gates(df.iloc[-1:], self.risk_params)
+        if allowed[0]:
+            return None
+        return TRADE_BLOCK_REASONS[int(reasons[0])]
+    
+    def enable_streaming_inference(self, enabled=True, resync_every=None):
+        """
+        Predict live bars with one recurrent step each instead of re-running the
+        whole lookback window (see StreamingLSTM)
+        """
+        self.streaming_inference = enabled
+        self.streaming = StreamingLSTM(self.model, resync_every) if enabled and self.model is not None else None
+        return self.streaming
+    
+    def predict_latest(self, df, X):
+        """
+        Model output for the latest bar of a prepare_prediction_input result
+        """
+        if self.streaming_inference and (self.streaming is None or self.streaming.model is not self.model):
+            self.streaming = StreamingLSTM(self.model) if StreamingLSTM.supports(self.model) else None
+        if not self.streaming_inference or self.streaming is None:
+            return self.model.predict(X, verbose=0)[0][0]
+        
+        return self.streaming.predict(
+            (self.symbol, self.timeframe), X[0], df.index[-self.lookback_window:]
+        )
+    
+    def prepare_prediction_input(self, current_data):
+        """
+        Feature frame and the scaled (1, lookback, features) model input for the latest bar
+        """
+        # Prepare features (only the warm-up tail when enabled)
+        if self.tail_features:
+            df = self.prepare_features_tail(current_data)
+        else:
+            df = self.prepare_features(current_data)
         
         # Get latest sequence
         available_features = [f for f in self.selected_features if f in df.columns]
@@ -325,14 +774,20 @@ class EnhancedCryptoPredictorLSTM:
         # Reshape for LSTM
         X = latest_features_scaled.reshape(1, self.lookback_window, -1)
         
-        # Model prediction
-        prediction = self.model.predict(X, verbose=0)[0][0]
+        return df, X
+    
+    def signal_from_prediction(self, df, prediction, veto=None):
+        """
+        Confluence, confidence and the trading signal for a model output on the latest bar
         
+        prediction is None when the model was skipped because of a pre-model veto.
+        """
         # Get latest market data
         latest_row = df.iloc[-1]
         
         # Technical confluence analysis
-        confluence = AdvancedTechnicalIndicators.get_signal_confluence(df, -1)
+        with self.profiler.span('get_signal_confluence', rows=1):
+            confluence = AdvancedTechnicalIndicators.get_signal_confluence(df, -1)
         
         # Market regime
         market_regime = latest_row.get('Market_Regime', 'UNKNOWN')
@@ -343,21 +798,26 @@ class EnhancedCryptoPredictorLSTM:
         # Volatility level
         volatility_level = latest_row.get('Volatility_Regime', 'NORMAL')
         
-        # Calculate comprehensive confidence
-        confidence, confidence_factors = ConfidenceScoring.calculate_comprehensive_confidence(
-            prediction, confluence, market_regime, volume_confirmation, volatility_level
-        )
-        
-        # Determine if should trade
-        market_conditions = {
-            'regime': market_regime,
-            'volume_confirmation': volume_confirmation,
-            'volatility': volatility_level
-        }
-        
-        should_trade, trade_reason = ConfidenceScoring.should_trade(
-            confidence, confluence, market_conditions, self.risk_params
-        )
+        if prediction is None:
+            # Vetoed before inference: nothing to be confident about
+            confidence, confidence_factors = 0.0, []
+            should_trade, trade_reason = False, f"{veto} (model skipped)"
+        else:
+            # Calculate comprehensive confidence
+            confidence, confidence_factors = ConfidenceScoring.calculate_comprehensive_confidence(
+                prediction, confluence, market_regime, volume_confirmation, volatility_level
+            )
+            
+            # Determine if should trade
+            market_conditions = {
+                'regime': market_regime,
+                'volume_confirmation': volume_confirmation,
+                'volatility': volatility_level
+            }
+            
+            should_trade, trade_reason = ConfidenceScoring.should_trade(
+                confidence, confluence, market_conditions, self.risk_params
+            )
         
         # Generate enhanced signal
         signal = self.generate_enhanced_signal(
@@ -373,7 +833,9 @@ class EnhancedCryptoPredictorLSTM:
         Generate comprehensive trading signal with detailed analysis
         """
         # Determine base action
-        if prediction > 0.6:
+        if prediction is None:
+            base_action = 'HOLD'
+        elif prediction > 0.6:
             base_action = 'STRONG_BUY'
         elif prediction > 0.5:
             base_action = 'BUY'
@@ -411,7 +873,8 @@ class EnhancedCryptoPredictorLSTM:
         
         # Compile detailed explanation
         explanation_parts = [
-            f"Model prediction: {prediction:.1%} ({'bullish' if prediction > 0.5 else 'bearish'})",
+            f"Model prediction: {prediction:.1%} ({'bullish' if prediction > 0.5 else 'bearish'})"
+            if prediction is not None else "Model prediction: skipped",
             f"Overall confidence: {confidence:.1%}",
             f"Technical confluence: {confluence['confluence_strength']:.1%}",
             action_reason
@@ -445,9 +908,16 @@ class EnhancedCryptoPredictorLSTM:
             }
         }
     
-    def comprehensive_backtest(self, data, initial_capital=10000):
+    def comprehensive_backtest(self, data, initial_capital=10000, cascade=None):
         """
         Comprehensive backtesting with advanced metrics
+        
+        Args:
+            data: OHLCV data
+            initial_capital: Starting capital
+            cascade: Only run the model on bars that pass the pre-model trade gates
+                (defaults to self.cascade_inference); vetoed bars never trade, so
+                the results are the same
         """
         print("🧪 Running comprehensive backtest...")
         
@@ -459,8 +929,19 @@ class EnhancedCryptoPredictorLSTM:
         X_test = X[test_start:]
         test_indices = indices[test_start:]
         
+        test_rows = df.iloc[df.index.get_indexer(test_indices)]
+        
+        # Rule vetoes first, so the model only sees bars that can still trade
+        if self.cascade_inference if cascade is None else cascade:
+            candidates, _ = ConfidenceScoring.pre_model_gates(test_rows, self.risk_params)
+        else:
+            candidates = np.ones(len(X_test), dtype=bool)
+        
         # Get predictions
-        predictions = self.model.predict(X_test, verbose=0).flatten()
+        predictions = np.full(len(X_test), np.nan)
+        with self.profiler.span('model.predict', rows=int(candidates.sum())):
+            if candidates.any():
+                predictions[candidates] = self.model.predict(X_test[candidates], verbose=0).flatten()
         
         # Simulate trading with advanced logic
         portfolio = {
@@ -476,90 +957,74 @@ class EnhancedCryptoPredictorLSTM:
         max_drawdown = 0
         peak_capital = initial_capital
         
-        for i, (pred, timestamp) in enumerate(zip(predictions, test_indices)):
-            current_row = df.loc[timestamp]
-            current_price = current_row['Close']
-            
-            # Get confluence analysis
-            confluence = AdvancedTechnicalIndicators.get_signal_confluence(
-                df.loc[:timestamp], -1
-            )
-            
-            # Calculate confidence
-            market_regime = current_row.get('Market_Regime', 'UNKNOWN')
-            volume_confirmation = current_row.get('Volume_Ratio', 1) > 1.5
-            volatility_level = current_row.get('Volatility_Regime', 'NORMAL')
-            
-            confidence, _ = ConfidenceScoring.calculate_comprehensive_confidence(
-                pred, confluence, market_regime, volume_confirmation, volatility_level
-            )
-            
-            # Check if should trade
-            market_conditions = {
-                'regime': market_regime,
-                'volume_confirmation': volume_confirmation,
-                'volatility': volatility_level
-            }
-            
-            should_trade, _ = ConfidenceScoring.should_trade(
-                confidence, confluence, market_conditions, self.risk_params
-            )
+        # Confluence, confidence and trade permission for every test bar at once
+        with self.profiler.span('score_frame', rows=len(predictions)):
+            scores = ConfidenceScoring.score_frame(test_rows, predictions, self.risk_params)
+        tradeable = scores['should_trade'] & candidates
+        closes = test_rows['Close'].to_numpy(dtype=np.float64)
+        atrs = test_rows['ATR'].to_numpy(dtype=np.float64) if 'ATR' in test_rows.columns else np.zeros(len(test_rows))
+        
+        with self.profiler.span('backtest_loop', rows=len(predictions)):
+            for i, (pred, timestamp) in enumerate(zip(predictions, test_indices)):
+                current_price = closes[i]
+                confidence = scores['confidence'][i]
+                should_trade = tradeable[i]
             
-            # Trading logic
-            if should_trade and confidence >= self.confidence_threshold:
-                atr = current_row.get('ATR', 0)
+                # Trading logic
+                if should_trade and confidence >= self.confidence_threshold:
+                    atr = atrs[i]
                 
-                # Entry signals
-                if pred > 0.6 and portfolio['position'] == 0:  # Strong buy signal
-                    portfolio['position'] = 1
-                    portfolio['entry_price'] = current_price
-                    portfolio['stop_loss'] = current_price - (2 * atr)
-                    portfolio['take_profit'] = current_price + (3 * atr)
+                    # Entry signals
+                    if pred > 0.6 and portfolio['position'] == 0:  # Strong buy signal
+                        portfolio['position'] = 1
+                        portfolio['entry_price'] = current_price
+                        portfolio['stop_loss'] = current_price - (2 * atr)
+                        portfolio['take_profit'] = current_price + (3 * atr)
                     
-                    trades.append({
-                        'type': 'BUY',
-                        'timestamp': timestamp,
-                        'price': current_price,
-                        'confidence': confidence,
-                        'confluence': confluence['confluence_strength'],
-                        'atr': atr
-                    })
+                        trades.append({
+                            'type': 'BUY',
+                            'timestamp': timestamp,
+                            'price': current_price,
+                            'confidence': confidence,
+                            'confluence': scores['confluence_strength'][i],
+                            'atr': atr
+                        })
                 
-                # Exit signals
-                elif (pred < 0.4 or 
-                      current_price <= portfolio['stop_loss'] or 
-                      current_price >= portfolio['take_profit']) and portfolio['position'] == 1:
+                    # Exit signals
+                    elif (pred < 0.4 or 
+                          current_price <= portfolio['stop_loss'] or 
+                          current_price >= portfolio['take_profit']) and portfolio['position'] == 1:
                     
-                    exit_reason = 'SIGNAL' if pred < 0.4 else ('STOP_LOSS' if current_price <= portfolio['stop_loss'] else 'TAKE_PROFIT')
+                        exit_reason = 'SIGNAL' if pred < 0.4 else ('STOP_LOSS' if current_price <= portfolio['stop_loss'] else 'TAKE_PROFIT')
                     
-                    trade_return = (current_price - portfolio['entry_price']) / portfolio['entry_price']
-                    portfolio['capital'] *= (1 + trade_return)
-                    portfolio['position'] = 0
+                        trade_return = (current_price - portfolio['entry_price']) / portfolio['entry_price']
+                        portfolio['capital'] *= (1 + trade_return)
+                        portfolio['position'] = 0
                     
-                    trades.append({
-                        'type': 'SELL',
-                        'timestamp': timestamp,
-                        'price': current_price,
-                        'confidence': confidence,
-                        'return': trade_return,
-                        'exit_reason': exit_reason
-                    })
-            
-            # Track portfolio performance
-            if portfolio['position'] == 1:
-                unrealized_return = (current_price - portfolio['entry_price']) / portfolio['entry_price']
-                current_portfolio_value = portfolio['capital'] * (1 + unrealized_return)
-            else:
-                current_portfolio_value = portfolio['capital']
+                        trades.append({
+                            'type': 'SELL',
+                            'timestamp': timestamp,
+                            'price': current_price,
+                            'confidence': confidence,
+                            'return': trade_return,
+                            'exit_reason': exit_reason
+                        })
             
-            daily_returns.append(current_portfolio_value / initial_capital - 1)
+                # Track portfolio performance
+                if portfolio['position'] == 1:
+                    unrealized_return = (current_price - portfolio['entry_price']) / portfolio['entry_price']
+                    current_portfolio_value = portfolio['capital'] * (1 + unrealized_return)
+                else:
+                    current_portfolio_value = portfolio['capital']
             
-            # Track drawdown
-            if current_portfolio_value > peak_capital:
-                peak_capital = current_portfolio_value
-            else:
-                drawdown = (peak_capital - current_portfolio_value) / peak_capital
-                max_drawdown = max(max_drawdown, drawdown)
+                daily_returns.append(current_portfolio_value / initial_capital - 1)
+            
+                # Track drawdown
+                if current_portfolio_value > peak_capital:
+                    peak_capital = current_portfolio_value
+                else:
+                    drawdown = (peak_capital - current_portfolio_value) / peak_capital
+                    max_drawdown = max(max_drawdown, drawdown)
         
         # Calculate comprehensive metrics
         total_return = (portfolio['capital'] - initial_capital) / initial_capital
@@ -596,7 +1061,8 @@ class EnhancedCryptoPredictorLSTM:
             'avg_win': avg_win,
             'avg_loss': avg_loss,
             'trades': trades,
-            'daily_returns': daily_returns
+            'daily_returns': daily_returns,
+            'model_evaluations': int(candidates.sum())
         }
         
         print(f"\n🏆 Backtest Results:")
@@ -609,6 +1075,40 @@ class EnhancedCryptoPredictorLSTM:
         
         return results
     
+    def get_model_config(self):
+        """
+        Settings that must travel with a trained model
+        """
+        return {
+            'symbol': self.symbol,
+            'timeframe': self.timeframe,
+            'lookback_window': self.lookback_window,
+            'confidence_threshold': self.confidence_threshold,
+            'selected_features': self.selected_features,
+            'risk_params': self.risk_params,
+            'compact_features': self.compact_features,
+            'model_architecture': self.model_architecture,
+            'training_settings': self.training_settings,
+            'trained_through': self.trained_through,
+            'drift_reference': self.drift_reference
+        }
+    
+    def apply_model_config(self, config):
+        """
+        Restore settings saved by get_model_config
+        """
+        self.symbol = config['symbol']
+        self.timeframe = config['timeframe']
+        self.lookback_window = config['lookback_window']
+        self.confidence_threshold = config['confidence_threshold']
+        self.selected_features = config['selected_features']
+        self.risk_params = config['risk_params']
+        self.compact_features = config.get('compact_features', False)
+        self.model_architecture = config.get('model_architecture', self.model_architecture)
+        self.training_settings = config.get('training_settings', self.training_settings)
+        self.trained_through = config.get('trained_through')
+        self.drift_reference = config.get('drift_reference')
+    
     def save_model(self, filepath='crypto_model'):
         """
         Save trained model and scalers
@@ -623,17 +1123,8 @@ class EnhancedCryptoPredictorLSTM:
         joblib.dump(self.feature_scaler, f"{filepath}_feature_scaler.pkl")
         
         # Save configuration
-        config = {
-            'symbol': self.symbol,
-            'timeframe': self.timeframe,
-            'lookback_window': self.lookback_window,
-            'confidence_threshold': self.confidence_threshold,
-            'selected_features': self.selected_features,
-            'risk_params': self.risk_params
-        }
-        
         with open(f"{filepath}_config.json", 'w') as f:
-            json.dump(config, f, indent=2)
+            json.dump(self.get_model_config(), f, indent=2)
         
         print(f"✅ Model saved to {filepath}")
     
@@ -650,14 +1141,7 @@ class EnhancedCryptoPredictorLSTM:
             
             # Load configuration
             with open(f"{filepath}_config.json", 'r') as f:
-                config = json.load(f)
-            
-            self.symbol = config['symbol']
-            self.timeframe = config['timeframe']
-            self.lookback_window = config['lookback_window']
-            self.confidence_threshold = config['confidence_threshold']
-            self.selected_features = config['selected_features']
-            self.risk_params = config['risk_params']
+                self.apply_model_config(json.load(f))
             
             print(f"✅ Model loaded from {filepath}")
             return True
@@ -0,0 +1,161 @@
+"""
+Fake Exchange for Stream Testing
+Local websocket server replaying candles as kline and trade streams, plus a ccxt.pro-style client
+"""
+
+import asyncio
+import json
+from typing import Dict, List, Optional
+
+import aiohttp
+import pandas as pd
+from aiohttp import web
+
+
+def candles_to_trades(candles: pd.DataFrame, trades_per_bar: int = 4) -> List[Dict]:
+    """
+    Trades whose aggregation reproduces each candle exactly
+
+    Each bar becomes open -> high -> low -> close trades (padded with close
+    trades), spread inside the bar with the volume split evenly.
+    """
+    bar_ms = int((candles.index[1] - candles.index[0]).total_seconds() * 1000) if len(candles) > 1 else 60_000
+    trades_per_bar = max(trades_per_bar, 4)
+    trades = []
+
+    for timestamp, bar in candles.iterrows():
+        start = int(pd.Timestamp(timestamp).timestamp() * 1000)
+        prices = [bar['Open'], bar['High'], bar['Low']] + [bar['Close']] * (trades_per_bar - 3)
+        amount = bar['Volume'] / trades_per_bar
+        for i, price in enumerate(prices):
+            trades.append({
+                'timestamp': start + i * bar_ms // trades_per_bar,
+                'price': float(price),
+                'amount': float(amount)
+            })
+
+    return trades
+
+
+class FakeExchangeServer:
+    """
+    Websocket server streaming candles as an exchange would
+
+    Clients send {"channel": "ohlcv"|"trades", "symbol": ...}. The ohlcv
+    channel sends a partial then a final snapshot of every bar; the trades
+    channel sends batches of trades. {"event": "end"} marks the end of data.
+    """
+
+    def __init__(self, candles: pd.DataFrame, speed: Optional[float] = None,
+                 trades_per_bar: int = 4, host: str = '127.0.0.1', port: int = 0):
+        """
+        Args:
+            candles: OHLCV frame to replay
+            speed: Multiple of market speed; None streams as fast as possible
+        """
+        self.candles = candles
+        self.speed = speed
+        self.trades_per_bar = trades_per_bar
+        self.host = host
+        self.port = port
+        self.bar_seconds = (candles.index[1] - candles.index[0]).total_seconds() if len(candles) > 1 else 60.0
+        self._runner = None
+
+    @property
+    def url(self) -> str:
+        return f"ws://{self.host}:{self.port}/ws"
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get('/ws', self._handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc_info):
+        await self.stop()
+
+    async def _pause(self, bars: float = 1.0):
+        await asyncio.sleep(self.bar_seconds * bars / self.speed if self.speed else 0)
+
+    async def _handle(self, request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+
+        subscription = await ws.receive_json()
+        if subscription.get('channel') == 'trades':
+            trades = candles_to_trades(self.candles, self.trades_per_bar)
+            batch = max(self.trades_per_bar // 2, 1)
+            for start in range(0, len(trades), batch):
+                await ws.send_json({'data': trades[start:start + batch]})
+                await self._pause(batch / self.trades_per_bar)
+        else:
+            for timestamp, bar in self.candles.iterrows():
+                start = int(pd.Timestamp(timestamp).timestamp() * 1000)
+                final = [start] + [float(bar[column]) for column in ['Open', 'High', 'Low', 'Close', 'Volume']]
+                partial = [start, final[1], final[1], final[1], final[1], 0.0]
+                await ws.send_json({'data': [partial]})
+                await ws.send_json({'data': [final]})
+                await self._pause()
+
+        await ws.send_json({'event': 'end'})
+        await ws.close()
+        return ws
+
+
+class FakeExchangeClient:
+    """
+    Minimal ccxt.pro-style client for FakeExchangeServer
+
+    watch_ohlcv()/watch_trades() return the next update and raise EOFError
+    once the server signals the end of its data.
+    """
+
+    def __init__(self, url: str):
+        self.url = url
+        self._session = None
+        self._sockets: Dict[str, aiohttp.ClientWebSocketResponse] = {}
+
+    async def _next(self, channel: str, symbol: str):
+        if channel not in self._sockets:
+            if self._session is None:
+                self._session = aiohttp.ClientSession()
+            ws = await self._session.ws_connect(self.url)
+            await ws.send_json({'channel': channel, 'symbol': symbol})
+            self._sockets[channel] = ws
+
+        message = await self._sockets[channel].receive()
+        if message.type != aiohttp.WSMsgType.TEXT:
+            raise EOFError("Fake exchange stream closed")
+        payload = json.loads(message.data)
+        if payload.get('event') == 'end':
+            raise EOFError("Fake exchange stream ended")
+        return payload['data']
+
+    async def watch_ohlcv(self, symbol, timeframe='1m', since=None, limit=None, params=None):
+        return await self._next('ohlcv', symbol)
+
+    async def watch_trades(self, symbol, since=None, limit=None, params=None):
+        return [dict(trade, symbol=symbol) for trade in await self._next('trades', symbol)]
+
+    async def close(self):
+        for ws in self._sockets.values():
+            await ws.close()
+        self._sockets = {}
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
+__all__ = ['FakeExchangeServer', 'FakeExchangeClient', 'candles_to_trades']
@@ -0,0 +1,174 @@
+"""
+Feature Matrix Store
+Memory-mapped storage of scaled feature matrices shared across training processes
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+MATRIX_FILES = ['features', 'targets', 'returns', 'index']
+
+
+def sequence_windows(matrix: np.ndarray, lookback: int) -> np.ndarray:
+    """
+    Strided view of every lookback window of a (time x features) matrix
+
+    Returns an array of shape (time - lookback + 1, lookback, features) that
+    shares memory with `matrix`, so no window data is copied; empty when
+    `matrix` has fewer than `lookback` rows.
+    """
+    if len(matrix) < lookback:
+        return np.empty((0, lookback) + matrix.shape[1:], dtype=matrix.dtype)
+    return np.lib.stride_tricks.sliding_window_view(matrix, lookback, axis=0).transpose(0, 2, 1)
+
+
+def feature_set_hash(features: List[str], lookback_window: int) -> str:
+    """Short stable hash identifying a feature selection and window length"""
+    payload = json.dumps({'features': list(features), 'lookback_window': lookback_window})
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:12]
+
+
+class FeatureMatrix:
+    """
+    Read-only, memory-mapped feature matrix with its targets and returns
+    """
+
+    def __init__(self, path: Path, features: np.ndarray, targets: np.ndarray,
+                 returns: np.ndarray, index: np.ndarray, metadata: Dict):
+        self.path = path
+        self.features = features
+        self.targets = targets
+        self.returns = returns
+        self.index = index
+        self.metadata = metadata
+
+    def __len__(self):
+        return len(self.features)
+
+    @property
+    def lookback_window(self) -> int:
+        return self.metadata.get('lookback_window', 60)
+
+    def windows(self, lookback: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        LSTM inputs as views over the mapping, aligned like create_lstm_sequences
+
+        Returns:
+            (X of shape (samples, lookback, features), targets, future returns)
+        """
+        lookback = lookback or self.lookback_window
+        X = sequence_windows(self.features, lookback)[:-1]
+        return X, self.targets[lookback:], self.returns[lookback:]
+
+    def batches(self, sample_indices: np.ndarray, batch_size: int = 32,
+                lookback: Optional[int] = None) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Yield contiguous (X, y) batches for the given sample positions
+
+        Only one batch is materialized at a time, so workers can stream
+        training data from the shared mapping without copying all windows.
+        """
+        X, y, _ = self.windows(lookback)
+        for start in range(0, len(sample_indices), batch_size):
+            batch = sample_indices[start:start + batch_size]
+            yield np.ascontiguousarray(X[batch]), np.asarray(y[batch])
+
+
+class FeatureMatrixStore:
+    """
+    Writes scaled feature matrices once as .npy files and lets any number of
+    processes attach to them zero-copy through memory mapping
+    """
+
+    def __init__(self, root: str = 'data/feature_store'):
+        self.root = Path(root)
+
+    def path(self, key: str) -> Path:
+        return self.root / key
+
+    def exists(self, key: str) -> bool:
+        # The metadata file is written last, so its presence marks a complete entry
+        return (self.path(key) / 'meta.json').exists()
+
+    def keys(self) -> List[str]:
+        if not self.root.exists():
+            return []
+        return sorted(p.name for p in self.root.iterdir() if (p / 'meta.json').exists())
+
+    def write(self, key: str, features: np.ndarray, targets: np.ndarray, returns: np.ndarray,
+              index: Optional[np.ndarray] = None, metadata: Optional[Dict] = None,
+              artifacts: Optional[Dict[str, Callable[[Path], None]]] = None) -> Path:
+        """
+        Persist a feature matrix and its aligned targets/returns
+
+        Args:
+            key: Entry name (e.g. '<symbol>_<timeframe>_<feature hash>')
+            features: Scaled (time x features) matrix
+            targets: Target per row
+            returns: Future return per row
+            index: Row timestamps (stored as int64 nanoseconds)
+            metadata: Extra JSON-serialisable information (features, lookback_window, ...)
+            artifacts: File name -> writer(path) for companion files (e.g. the fitted scaler);
+                they are in place before the entry is marked complete
+        """
+        path = self.path(key)
+        path.mkdir(parents=True, exist_ok=True)
+        meta_file = path / 'meta.json'
+        if meta_file.exists():
+            meta_file.unlink()
+
+        if index is None:
+            index = np.arange(len(features), dtype=np.int64)
+        else:
+            index = np.asarray(index).astype('datetime64[ns]').astype(np.int64)
+
+        arrays = {
+            'features': np.ascontiguousarray(features),
+            'targets': np.ascontiguousarray(targets),
+            'returns': np.ascontiguousarray(returns),
+            'index': index
+        }
+        for name, values in arrays.items():
+            tmp_file = path / f".{name}.{os.getpid()}.npy"
+            np.save(tmp_file, values)
+            os.replace(tmp_file, path / f"{name}.npy")
+
+        for name, writer in (artifacts or {}).items():
+            tmp_file = path / f".{name}.{os.getpid()}"
+            writer(tmp_file)
+            os.replace(tmp_file, path / name)
+
+        meta = dict(metadata or {})
+        meta.update({
+            'rows': int(len(features)),
+            'num_features': int(features.shape[1]),
+            'dtype': str(arrays['features'].dtype)
+        })
+        tmp_meta = path / f".meta.{os.getpid()}.json"
+        with open(tmp_meta, 'w') as f:
+            json.dump(meta, f, indent=2)
+        os.replace(tmp_meta, meta_file)
+
+        return path
+
+    def attach(self, key: str) -> FeatureMatrix:
+        """Memory-map a stored entry read-only"""
+        if not self.exists(key):
+            raise FileNotFoundError(f"No feature matrix stored under '{key}' in {self.root}")
+
+        path = self.path(key)
+        with open(path / 'meta.json', 'r') as f:
+            metadata = json.load(f)
+
+        arrays = {name: np.load(path / f"{name}.npy", mmap_mode='r') for name in MATRIX_FILES}
+
+        return FeatureMatrix(path, arrays['features'], arrays['targets'], arrays['returns'],
+                             arrays['index'], metadata)
+
+
+__all__ = ['FeatureMatrix', 'FeatureMatrixStore', 'sequence_windows', 'feature_set_hash']
@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+Hyperparameter Search
+Successive-halving search over model_architecture/training_settings on one shared feature matrix
+"""
+
+import argparse
+import json
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from app_config import get_section
+from feature_store import FeatureMatrixStore
+from model_builder import apply_search_params, get_architecture, get_training_settings
+from performance_profile import set_thread_budget
+
+DEFAULT_SEARCH_SPACE = {
+    'lstm_units': [32, 64, 128],
+    'dense_units': [25, 50, 100],
+    'dropout': [0.1, 0.2, 0.3],
+    'learning_rate': {'low': 1e-4, 'high': 3e-3, 'log': True},
+    'batch_size': [32, 64, 128],
+    'lookback_window': [30, 60, 90]
+}
+
+# Per-process state of search workers
+_worker_matrices = {}
+
+
+def sample_params(search_space: Dict, rng: np.random.Generator) -> Dict:
+    """
+    Draw one configuration
+
+    Lists are sampled uniformly; {'low', 'high', 'log'} dicts are continuous ranges.
+    """
+    params = {}
+    for name, space in search_space.items():
+        if isinstance(space, dict):
+            low, high = space['low'], space['high']
+            if space.get('log'):
+                params[name] = float(math.exp(rng.uniform(math.log(low), math.log(high))))
+            else:
+                params[name] = float(rng.uniform(low, high))
+        else:
+            value = space[rng.integers(len(space))]
+            params[name] = value.item() if isinstance(value, np.generic) else value
+    return params
+
+
+def rung_budgets(min_epochs: int, max_epochs: int, reduction_factor: int) -> List[int]:
+    """Cumulative epochs trained by survivors at each successive-halving rung"""
+    budgets = []
+    epochs = min_epochs
+    while epochs < max_epochs:
+        budgets.append(epochs)
+        epochs *= reduction_factor
+    budgets.append(max_epochs)
+    return budgets
+
+
+def _attach_matrix(store_root: str, key: str):
+    if (store_root, key) not in _worker_matrices:
+        _worker_matrices[(store_root, key)] = FeatureMatrixStore(store_root).attach(key)
+    return _worker_matrices[(store_root, key)]
+
+
+def train_trial(task: Dict) -> Dict:
+    """
+    Train one trial up to task['end_epoch'], resuming from its checkpoint
+
+    Runs in a worker process. The training windows are views over the shared
+    memory-mapped feature matrix, sliced at the same validation boundary for
+    every lookback so trials are scored on the same bars.
+    """
+    set_thread_budget(task.get('threads'))
+
+    import tensorflow as tf
+    from model_builder import build_lstm_model
+
+    params = task['params']
+    matrix = _attach_matrix(task['store_root'], task['key'])
+    lookback = int(params.get('lookback_window', matrix.lookback_window))
+    X, y, _ = matrix.windows(lookback)
+
+    # Sample i predicts row i + lookback; validation covers rows from validation_row on
+    cut = max(task['validation_row'] - lookback, 1)
+    X_train, y_train = np.asarray(X[:cut], dtype=np.float32), np.asarray(y[:cut])
+    X_val, y_val = np.asarray(X[cut:], dtype=np.float32), np.asarray(y[cut:])
+
+    checkpoint = Path(task['checkpoint'])
+    tf.keras.utils.set_random_seed(task['seed'])
+    if task['start_epoch'] > 0 and checkpoint.exists():
+        model = tf.keras.models.load_model(checkpoint)
+    else:
+        model = build_lstm_model((lookback, X.shape[2]), task['architecture'], batch_norm=True)
+
+    history = model.fit(
+        X_train, y_train,
+        validation_data=(X_val, y_val),
+        initial_epoch=task['start_epoch'],
+        epochs=task['end_epoch'],
+        batch_size=int(params.get('batch_size', 32)),
+        verbose=0
+    )
+    model.save(checkpoint)
+
+    return {
+        'trial': task['trial'],
+        'epochs': task['end_epoch'],
+        'history': {name: [float(value) for value in values] for name, values in history.history.items()}
+    }
+
+
+class HyperparameterSearch:
+    """
+    Successive-halving search over the LSTM architecture and training settings
+
+    All trials start with a short budget; after each rung only the best
+    1/reduction_factor continue (from their checkpoints) with reduction_factor
+    times more epochs. Trials train in parallel worker processes that attach
+    to one memory-mapped FeatureMatrix, so features are built exactly once.
+    """
+
+    def __init__(self, store: FeatureMatrixStore, key: str, search_space: Optional[Dict] = None,
+                 n_trials: Optional[int] = None, max_epochs: Optional[int] = None,
+                 min_epochs: Optional[int] = None, reduction_factor: Optional[int] = None,
+                 max_workers: Optional[int] = None, metric: Optional[str] = None,
+                 output_dir: Optional[str] = None, seed: int = 42,
+                 base_architecture: Optional[Dict] = None, validation_split: Optional[float] = None):
+        """
+        Args:
+            store: FeatureMatrixStore holding the feature matrix
+            key: Entry written by EnhancedCryptoPredictorLSTM.export_feature_matrix
+            search_space: Parameter -> list of choices or {'low', 'high', 'log'} range
+            n_trials: Configurations sampled for the first rung
+            max_epochs: Epochs for trials that survive every rung
+            min_epochs: Epochs before the first pruning decision
+            reduction_factor: Keep 1/reduction_factor of the trials at each rung
+            max_workers: Worker processes (1 trains in this process)
+            metric: Validation metric to rank trials ('val_loss' is minimised, others maximised)
+        """
+        settings = get_section('hyperparameter_search')
+        training = get_training_settings()
+
+        self.store = store
+        self.key = key
+        self.search_space = search_space or settings.get('search_space', DEFAULT_SEARCH_SPACE)
+        self.n_trials = n_trials or settings.get('n_trials', 27)
+        self.max_epochs = max_epochs or settings.get('max_epochs', training['epochs'])
+        self.min_epochs = min_epochs or settings.get('min_epochs', 3)
+        self.reduction_factor = reduction_factor or settings.get('reduction_factor', 3)
+        self.max_workers = max_workers or settings.get('max_workers', min(os.cpu_count() or 1, 4))
+        self.metric = metric or settings.get('metric', 'val_loss')
+        self.output_dir = Path(output_dir or settings.get('output_dir', 'models/hpo')) / key
+        self.seed = seed
+        self.base_architecture = base_architecture or get_architecture()
+        self.validation_split = validation_split or training['validation_split']
+
+        if self.reduction_factor < 2:
+            raise ValueError("reduction_factor must be at least 2")
+
+    @classmethod
+    def from_predictor(cls, predictor, data, store: FeatureMatrixStore, **kwargs):
+        """
+        Search on a predictor's features, exporting the feature matrix unless
+        one built from the same features and data is already in the store
+        """
+        from feature_store import feature_set_hash
+        from training_farm import data_fingerprint
+
+        df = predictor.prepare_features(data)
+        available_features = [f for f in predictor.selected_features if f in df.columns]
+        key = (f"{predictor.symbol}_{predictor.timeframe}_"
+               f"{feature_set_hash(available_features, predictor.lookback_window)}_{data_fingerprint(data)}")
+        if not store.exists(key):
+            predictor.export_feature_matrix(df, store, key)
+        return cls(store, key, **kwargs)
+
+    def _better(self, a: float, b: float) -> bool:
+        return a < b if 'loss' in self.metric else a > b
+
+    def _score(self, history: Dict) -> float:
+        values = history.get(self.metric, [])
+        if not values:
+            return math.inf if 'loss' in self.metric else -math.inf
+        values = [v if math.isfinite(v) else (math.inf if 'loss' in self.metric else -math.inf) for v in values]
+        return min(values) if 'loss' in self.metric else max(values)
+
+    def run(self) -> Dict:
+        """
+        Run the search
+
+        Returns:
+            Summary with the best trial, every trial's rung scores and the cost
+            relative to training every sampled configuration for max_epochs
+        """
+        matrix = self.store.attach(self.key)
+        validation_row = int(len(matrix) * (1 - self.validation_split))
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+
+        rng = np.random.default_rng(self.seed)
+        trials = []
+        for trial_id in range(self.n_trials):
+            params = sample_params(self.search_space, rng)
+            trials.append({
+                'trial': trial_id,
+                'params': params,
+                'architecture': apply_search_params(self.base_architecture, params),
+                'epochs': 0,
+                'history': {},
+                'rung_scores': [],
+                'pruned_at': None
+            })
+
+        budgets = rung_budgets(self.min_epochs, self.max_epochs, self.reduction_factor)
+        threads = max((os.cpu_count() or 1) // self.max_workers, 1)
+        print(f"🔎 Searching {self.n_trials} configurations over rungs {budgets} "
+              f"with {self.max_workers} worker(s)")
+
+        started = time.perf_counter()
+        executor = None
+        if self.max_workers > 1:
+            # spawn: forked TensorFlow runtimes are not safe to reuse
+            executor = ProcessPoolExecutor(self.max_workers, mp_context=get_context('spawn'))
+
+        try:
+            alive = list(trials)
+            for rung, budget in enumerate(budgets):
+                tasks = [{
+                    'trial': trial['trial'],
+                    'params': trial['params'],
+                    'architecture': trial['architecture'],
+                    'store_root': str(self.store.root),
+                    'key': self.key,
+                    'validation_row': validation_row,
+                    'checkpoint': str(self.output_dir / f"trial_{trial['trial']}.keras"),
+                    'start_epoch': trial['epochs'],
+                    'end_epoch': budget,
+                    'seed': self.seed + trial['trial'],
+                    'threads': threads if executor is not None else None
+                } for trial in alive]
+
+                results = executor.map(train_trial, tasks) if executor is not None else map(train_trial, tasks)
+                for result in results:
+                    trial = trials[result['trial']]
+                    trial['epochs'] = result['epochs']
+                    for name, values in result['history'].items():
+                        trial['history'].setdefault(name, []).extend(values)
+                    trial['score'] = self._score(trial['history'])
+                    trial['rung_scores'].append(trial['score'])
+
+                ranked = sorted(alive, key=lambda t: t['score'], reverse='loss' not in self.metric)
+                best = ranked[0]
+                print(f"📊 Rung {rung + 1}/{len(budgets)} ({budget} epochs): {len(alive)} trial(s), "
+                      f"best {self.metric} {best['score']:.4f} (trial {best['trial']})")
+
+                if rung < len(budgets) - 1:
+                    keep = max(math.ceil(len(alive) / self.reduction_factor), 1)
+                    for trial in ranked[keep:]:
+                        trial['pruned_at'] = budget
+                        Path(self.output_dir / f"trial_{trial['trial']}.keras").unlink(missing_ok=True)
+                    alive = ranked[:keep]
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        best = min(trials, key=lambda t: t['score']) if 'loss' in self.metric else max(trials, key=lambda t: t['score'])
+        epochs_trained = sum(trial['epochs'] for trial in trials)
+        full_budget = self.n_trials * self.max_epochs
+
+        summary = {
+            'key': self.key,
+            'metric': self.metric,
+            'rungs': budgets,
+            'best': {
+                'trial': best['trial'],
+                'params': best['params'],
+                'score': best['score'],
+                'epochs': best['epochs'],
+                'architecture': best['architecture'],
+                'checkpoint': str(self.output_dir / f"trial_{best['trial']}.keras")
+            },
+            'trials': [{key: trial[key] for key in ('trial', 'params', 'epochs', 'score', 'rung_scores', 'pruned_at')}
+                       for trial in trials],
+            'epochs_trained': epochs_trained,
+            'full_budget_epochs': full_budget,
+            'cost_fraction': epochs_trained / full_budget,
+            'elapsed_seconds': time.perf_counter() - started
+        }
+
+        with open(self.output_dir / 'results.json', 'w') as f:
+            json.dump(summary, f, indent=2)
+
+        print(f"🏆 Best trial {best['trial']}: {self.metric} {best['score']:.4f} with {best['params']}")
+        print(f"⚡ Trained {epochs_trained} epochs ({summary['cost_fraction']:.0%} of {full_budget} for a full search)")
+        return summary
+
+
+def apply_best_params(predictor, summary: Dict):
+    """Configure a predictor with the best trial's architecture, lookback and batch size"""
+    params = summary['best']['params']
+    predictor.model_architecture = summary['best']['architecture']
+    if 'lookback_window' in params:
+        predictor.lookback_window = int(params['lookback_window'])
+    if 'batch_size' in params:
+        predictor.training_settings = dict(predictor.training_settings, batch_size=int(params['batch_size']))
+    return predictor
+
+
+__all__ = ['HyperparameterSearch', 'apply_best_params', 'sample_params', 'rung_budgets',
+           'train_trial', 'DEFAULT_SEARCH_SPACE']
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Hyperparameter search for the LSTM predictor")
+    parser.add_argument('--symbol', default='BTC-USD')
+    parser.add_argument('--timeframe', default='1h')
+    parser.add_argument('--period', default='2y')
+    parser.add_argument('--provider', help="Data provider name (defaults to config.json)")
+    parser.add_argument('--store', default='data/feature_store')
+    parser.add_argument('--trials', type=int)
+    parser.add_argument('--max-epochs', type=int)
+    parser.add_argument('--min-epochs', type=int)
+    parser.add_argument('--workers', type=int)
+    args = parser.parse_args(argv)
+
+    from enhanced_predictor import EnhancedCryptoPredictorLSTM
+
+    predictor = EnhancedCryptoPredictorLSTM(args.symbol, args.timeframe, data_provider=args.provider)
+    data = predictor.fetch_comprehensive_data(args.period)
+    if data is None or data.empty:
+        print(f"❌ No data for {args.symbol}")
+        return 1
+
+    search = HyperparameterSearch.from_predictor(
+        predictor, data, FeatureMatrixStore(args.store),
+        n_trials=args.trials, max_epochs=args.max_epochs,
+        min_epochs=args.min_epochs, max_workers=args.workers
+    )
+    search.run()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,1004 @@
+"""
+Indicator Backends for Technical Analysis
+Pluggable TA-Lib / JIT-compiled NumPy implementations of the indicators used by the predictors
+"""
+
+import os
+import numpy as np
+
+try:
+    import talib
+    TALIB_AVAILABLE = True
+except ImportError:
+    talib = None
+    TALIB_AVAILABLE = False
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Fallback decorator: run the kernels as plain Python when Numba is missing"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+# Environment override for backend selection ('auto', 'talib' or 'numba')
+BACKEND_ENV_VAR = 'INDICATOR_BACKEND'
+
+# Same tolerances TA-Lib uses for its zero checks
+_EPSILON = 0.00000001
+
+# TA-Lib candle settings: (range type, average period, factor)
+# Range types: 0 = real body, 1 = high-low, 2 = shadows
+_BODY_LONG = (0, 10, 1.0)
+_BODY_SHORT = (0, 10, 1.0)
+_BODY_DOJI = (1, 10, 0.1)
+_SHADOW_LONG = (0, 0, 1.0)
+_SHADOW_VERY_SHORT = (1, 10, 0.1)
+_NEAR = (1, 5, 0.2)
+
+
+# === KERNELS ===
+# Every kernel works on float64 arrays without leading NaNs and returns an
+# output of the same length with the TA-Lib lookback region left as NaN.
+
+@njit(cache=True, nogil=True)
+def _sma_kernel(x, period):
+    n = len(x)
+    out = np.full(n, np.nan)
+    if n < period:
+        return out
+    total = 0.0
+    for i in range(period - 1):
+        total += x[i]
+    for i in range(period - 1, n):
+        total += x[i]
+        out[i] = total / period
+        total -= x[i - period + 1]
+    return out
+
+
+@njit(cache=True, nogil=True)
+def _ema_seeded(x, period, k, start):
+    # EMA seeded with the simple average of the `period` values ending at `start`
+    n = len(x)
+    out = np.full(n, np.nan)
+    if start >= n or start < period - 1:
+        return out
+    total = 0.0
+    for i in range(start - period + 1, start + 1):
+        total += x[i]
+    prev = total / period
+    out[start] = prev
+    for i in range(start + 1, n):
+        prev = (x[i] - prev) * k + prev
+        out[i] = prev
+    return out
+
+
+@njit(cache=True, nogil=True)
+def _ema_kernel(x, period):
+    return _ema_seeded(x, period, 2.0 / (period + 1), period - 1)
+
+
+@njit(cache=True, nogil=True)
+def _macd_kernel(x, fast, slow, signal):
+    if slow < fast:
+        fast, slow = slow, fast
+    n = len(x)
+    macd = np.full(n, np.nan)
+    macd_signal = np.full(n, np.nan)
+    macd_hist = np.full(n, np.nan)
+    lookback = (slow - 1) + (signal - 1)
+    if n <= lookback:
+        return macd, macd_signal, macd_hist
+
+    # Both averages start at the slow lookback, as in TA-Lib
+    fast_ema = _ema_seeded(x, fast, 2.0 / (fast + 1), slow - 1)
+    slow_ema = _ema_seeded(x, slow, 2.0 / (slow + 1), slow - 1)
+    line = fast_ema - slow_ema
+    sig = _ema_seeded(line, signal, 2.0 / (signal + 1), lookback)
+
+    for i in range(lookback, n):
+        macd[i] = line[i]
+        macd_signal[i] = sig[i]
+        macd_hist[i] = line[i] - sig[i]
+    return macd, macd_signal, macd_hist
+
+
+@njit(cache=True, nogil=True)
+def _rsi_kernel(x, period):
+    n = len(x)
+    out = np.full(n, np.nan)
+    if n <= period:
+        return out
+    gain = 0.0
+    loss = 0.0
+    for i in range(1, period + 1):
+        diff = x[i] - x[i - 1]
+        if diff < 0:
+            loss -= diff
+        else:
+            gain += diff
+    loss /= period
+    gain /= period
+    total = gain + loss
+    out[period] = 100.0 * (gain / total) if not (-_EPSILON < total < _EPSILON) else 0.0
+    for i in range(period + 1, n):
+        diff = x[i] - x[i - 1]
+        loss *= (period - 1)
+        gain *= (period - 1)
+        if diff < 0:
+            loss -= diff
+        else:
+            gain += diff
+        loss /= period
+        gain /= period
+        total = gain + loss
+        out[i] = 100.0 * (gain / total) if not (-_EPSILON < total < _EPSILON) else 0.0
+    return out
+
+
+@njit(cache=True, nogil=True)
+def _rolling_max(x, period):
+    n = len(x)
+    out = np.full(n, np.nan)
+    for i in range(period - 1, n):
+        value = x[i - period + 1]
+        for j in range(i - period + 2, i + 1):
+            if x[j] > value:
+                value = x[j]
+        out[i] = value
+    return out
+
+
+@njit(cache=True, nogil=True)
+def _rolling_min(x, period):
+    n = len(x)
+    out = np.full(n, np.nan)
+    for i in range(period - 1, n):
+        value = x[i - period + 1]
+        for j in range(i - period + 2, i + 1):
+            if x[j] < value:
+                value = x[j]
+        out[i] = value
+    return out
+
+
+@njit(cache=True, nogil=True)
+def _fast_k(high, low, close, period):
+    n = len(close)
+    out = np.full(n, np.nan)
+    highest = _rolling_max(high, period)
+    lowest = _rolling_min(low, period)
+    for i in range(period - 1, n):
+        diff = (highest[i] - lowest[i]) / 100.0
+        out[i] = (close[i] - lowest[i]) / diff if diff != 0.0 else 0.0
+    return out
+
+
+@njit(cache=True, nogil=True)
+def _sma_from(x, period, start):
+    # SMA over a series whose first valid value is at `start`
+    n = len(x)
+    out = np.full(n, np.nan)
+    if n - start >= period:
+        out[start:] = _sma_kernel(x[start:], period)
+    return out
+
+
+@njit(cache=True, nogil=True)
+def _stoch_kernel(high, low, close, fastk_period, slowk_period, slowd_period):
+    fastk = _fast_k(high, low, close, fastk_period)
+    slowk = _sma_from(fastk, slowk_period, fastk_period - 1)
+    start_d = fastk_period - 1 + slowk_period - 1
+    slowd = _sma_from(slowk, slowd_period, start_d)
+    lookback = start_d + slowd_period - 1
+    slowk[:min(lookback, len(close))] = np.nan
+    return slowk, slowd
+
+
+@njit(cache=True, nogil=True)
+def _stochf_kernel(high, low, close, fastk_period, fastd_period):
+    fastk = _fast_k(high, low, close, fastk_period)
+    fastd = _sma_from(fastk, fastd_period, fastk_period - 1)
+    lookback = fastk_period - 1 + fastd_period - 1
+    fastk[:min(lookback, len(close))] = np.nan
+    return fastk, fastd
+
+
+@njit(cache=True, nogil=True)
+def _willr_kernel(high, low, close, period):
+    n = len(close)
+    out = np.full(n, np.nan)
+    highest = _rolling_max(high, period)
+    lowest = _rolling_min(low, period)
+    for i in range(period - 1, n):
+        diff = (highest[i] - lowest[i]) * -0.01
+        out[i] = (highest[i] - close[i]) / diff if diff != 0.0 else 0.0
+    return out
+
+
+@njit(cache=True, nogil=True)
+def _roc_kernel(x, period):
+    n = len(x)
+    out = np.full(n, np.nan)
+    for i in range(period, n):
+        prev = x[i - period]
+        out[i] = ((x[i] / prev) - 1.0) * 100.0 if prev != 0.0 else 0.0
+    return out
+
+
+@njit(cache=True, nogil=True)
+def _mom_kernel(x, period):
+    n = len(x)
+    out = np.full(n, np.nan)
+    for i in range(period, n):
+        out[i] = x[i] - x[i - period]
+    return out
+
+
+@njit(cache=True, nogil=True)
+def _cci_kernel(high, low, close, period):
+    n = len(close)
+    out = np.full(n, np.nan)
+    typical = (high + low + close) / 3.0
+    for i in range(period - 1, n):
+        average = 0.0
+        for j in range(i - period + 1, i + 1):
+            average += typical[j]
+        average /= period
+        deviation = 0.0
+        for j in range(i - period + 1, i + 1):
+            deviation += abs(typical[j] - average)
+        distance = typical[i] - average
+        # TA-Lib's zero tolerance: summation noise on a flat window is not a deviation
+        if abs(distance) >= _EPSILON and abs(deviation) >= _EPSILON:
+            out[i] = distance / (0.015 * (deviation / period))
+        else:
+            out[i] = 0.0
+    return out
+
+
+@njit(cache=True, nogil=True)
+def _trange_kernel(high, low, close):
+    n = len(close)
+    out = np.full(n, np.nan)
+    for i in range(1, n):
+        greatest = high[i] - low[i]
+        value = abs(close[i - 1] - high[i])
+        if value > greatest:
+            greatest = value
+        value = abs(close[i - 1] - low[i])
+        if value > greatest:
+            greatest = value
+        out[i] = greatest
+    return out
+
+
+@njit(cache=True, nogil=True)
+def _atr_kernel(high, low, close, period):
+    n = len(close)
+    out = np.full(n, np.nan)
+    if n <= period:
+        return out
+    tr = _trange_kernel(high, low, close)
+    prev = 0.0
+    for i in range(1, period + 1):
+        prev += tr[i]
+    prev /= period
+    out[period] = prev
+    for i in range(period + 1, n):
+        prev *= period - 1
+        prev += tr[i]
+        prev /= period
+        out[i] = prev
+    return out
+
+
+@njit(cache=True, nogil=True)
+def _directional_kernel(high, low, close, period):
+    # Wilder-smoothed +DI / -DI / ADX following TA-Lib's accumulation order
+    n = len(close)
+    plus_di = np.full(n, np.nan)
+    minus_di = np.full(n, np.nan)
+    adx = np.full(n, np.nan)
+
+    # +DI and -DI
+    if n > period:
+        plus_dm = 0.0
+        minus_dm = 0.0
+        tr_total = 0.0
+        for i in range(1, period):
+            diff_p = high[i] - high[i - 1]
+            diff_m = low[i - 1] - low[i]
+            if diff_p > 0 and diff_p > diff_m:
+                plus_dm += diff_p
+            if diff_m > 0 and diff_p < diff_m:
+                minus_dm += diff_m
+            tr_total += max(high[i] - low[i], abs(high[i] - close[i - 1]), abs(low[i] - close[i - 1]))
+        for i in range(period, n):
+            diff_p = high[i] - high[i - 1]
+            diff_m = low[i - 1] - low[i]
+            if diff_p > 0 and diff_p > diff_m:
+                plus_dm = plus_dm - (plus_dm / period) + diff_p
+            else:
+                plus_dm = plus_dm - (plus_dm / period)
+            if diff_m > 0 and diff_p < diff_m:
+                minus_dm = minus_dm - (minus_dm / period) + diff_m
+            else:
+                minus_dm = minus_dm - (minus_dm / period)
+            tr = max(high[i] - low[i], abs(high[i] - close[i - 1]), abs(low[i] - close[i - 1]))
+            tr_total = tr_total - (tr_total / period) + tr
+            if not (-_EPSILON < tr_total < _EPSILON):
+                plus_di[i] = 100.0 * (plus_dm / tr_total)
+                minus_di[i] = 100.0 * (minus_dm / tr_total)
+            else:
+                plus_di[i] = 0.0
+                minus_di[i] = 0.0
+
+    # ADX
+    lookback = 2 * period - 1
+    if n > lookback:
+        plus_dm = 0.0
+        minus_dm = 0.0
+        tr_total = 0.0
+        for i in range(1, period):
+            diff_p = high[i] - high[i - 1]
+            diff_m = low[i - 1] - low[i]
+            if diff_m > 0 and diff_p < diff_m:
+                minus_dm += diff_m
+            elif diff_p > 0 and diff_p > diff_m:
+                plus_dm += diff_p
+            tr_total += max(high[i] - low[i], abs(high[i] - close[i - 1]), abs(low[i] - close[i - 1]))
+        dx_total = 0.0
+        prev_adx = 0.0
+        for i in range(period, n):
+            diff_p = high[i] - high[i - 1]
+            diff_m = low[i - 1] - low[i]
+            minus_dm -= minus_dm / period
+            plus_dm -= plus_dm / period
+            if diff_m > 0 and diff_p < diff_m:
+                minus_dm += diff_m
+            elif diff_p > 0 and diff_p > diff_m:
+                plus_dm += diff_p
+            tr = max(high[i] - low[i], abs(high[i] - close[i - 1]), abs(low[i] - close[i - 1]))
+            tr_total = tr_total - (tr_total / period) + tr
+            dx = -1.0
+            if not (-_EPSILON < tr_total < _EPSILON):
+                m_di = 100.0 * (minus_dm / tr_total)
+                p_di = 100.0 * (plus_dm / tr_total)
+                di_total = m_di + p_di
+                if not (-_EPSILON < di_total < _EPSILON):
+                    dx = 100.0 * (abs(m_di - p_di) / di_total)
+            if i < lookback:
+                if dx >= 0.0:
+                    dx_total += dx
+            elif i == lookback:
+                if dx >= 0.0:
+                    dx_total += dx
+                prev_adx = dx_total / period
+                adx[i] = prev_adx
+            else:
+                if dx >= 0.0:
+                    prev_adx = ((prev_adx * (period - 1)) + dx) / period
+                adx[i] = prev_adx
+
+    return adx, plus_di, minus_di
+
+
+@njit(cache=True, nogil=True)
+def _sar_kernel(high, low, acceleration, maximum):
+    n = len(high)
+    out = np.full(n, np.nan)
+    if n < 2:
+        return out
+    af = acceleration
+    if af > maximum:
+        af = maximum
+
+    # Initial direction from the first bar's -DM
+    diff_p = high[1] - high[0]
+    diff_m = low[0] - low[1]
+    is_long = not (diff_m > 0 and diff_p < diff_m)
+
+    if is_long:
+        ep = high[1]
+        sar = low[0]
+    else:
+        ep = low[1]
+        sar = high[0]
+
+    new_low = low[1]
+    new_high = high[1]
+    for i in range(1, n):
+        prev_low = new_low
+        prev_high = new_high
+        new_low = low[i]
+        new_high = high[i]
+
+        if is_long:
+            if new_low <= sar:
+                is_long = False
+                sar = ep
+                if sar < prev_high:
+                    sar = prev_high
+                if sar < new_high:
+                    sar = new_high
+                out[i] = sar
+                af = acceleration
+                ep = new_low
+                sar = sar + af * (ep - sar)
+                if sar < prev_high:
+                    sar = prev_high
+                if sar < new_high:
+                    sar = new_high
+            else:
+                out[i] = sar
+                if new_high > ep:
+                    ep = new_high
+                    af += acceleration
+                    if af > maximum:
+                        af = maximum
+                sar = sar + af * (ep - sar)
+                if sar > prev_low:
+                    sar = prev_low
+                if sar > new_low:
+                    sar = new_low
+        else:
+            if new_high >= sar:
+                is_long = True
+                sar = ep
+                if sar > prev_low:
+                    sar = prev_low
+                if sar > new_low:
+                    sar = new_low
+                out[i] = sar
+                af = acceleration
+                ep = new_high
+                sar = sar + af * (ep - sar)
+                if sar > prev_low:
+                    sar = prev_low
+                if sar > new_low:
+                    sar = new_low
+            else:
+                out[i] = sar
+                if new_low < ep:
+                    ep = new_low
+                    af += acceleration
+                    if af > maximum:
+                        af = maximum
+                sar = sar + af * (ep - sar)
+                if sar < prev_high:
+                    sar = prev_high
+                if sar < new_high:
+                    sar = new_high
+    return out
+
+
+@njit(cache=True, nogil=True)
+def _aroon_kernel(high, low, period):
+    n = len(high)
+    aroon_down = np.full(n, np.nan)
+    aroon_up = np.full(n, np.nan)
+    factor = 100.0 / period
+    for i in range(period, n):
+        highest_idx = i - period
+        lowest_idx = i - period
+        # Ties resolve to the most recent bar
+        for j in range(i - period + 1, i + 1):
+            if high[j] >= high[highest_idx]:
+                highest_idx = j
+            if low[j] <= low[lowest_idx]:
+                lowest_idx = j
+        aroon_up[i] = factor * (period - (i - highest_idx))
+        aroon_down[i] = factor * (period - (i - lowest_idx))
+    return aroon_down, aroon_up
+
+
+@njit(cache=True, nogil=True)
+def _bbands_kernel(x, period, nbdevup, nbdevdn):
+    n = len(x)
+    upper = np.full(n, np.nan)
+    lower = np.full(n, np.nan)
+    middle = _sma_kernel(x, period)
+    if n < period:
+        return upper, middle, lower
+    total = 0.0
+    total_sq = 0.0
+    for i in range(period - 1):
+        total += x[i]
+        total_sq += x[i] * x[i]
+    for i in range(period - 1, n):
+        total += x[i]
+        total_sq += x[i] * x[i]
+        mean = total / period
+        variance = total_sq / period - mean * mean
+        std = np.sqrt(variance) if variance >= _EPSILON else 0.0
+        upper[i] = middle[i] + std * nbdevup
+        lower[i] = middle[i] - std * nbdevdn
+        trailing = x[i - period + 1]
+        total -= trailing
+        total_sq -= trailing * trailing
+    return upper, middle, lower
+
+
+@njit(cache=True, nogil=True)
+def _obv_kernel(close, volume):
+    n = len(close)
+    out = np.full(n, np.nan)
+    if n == 0:
+        return out
+    obv = volume[0]
+    out[0] = obv
+    for i in range(1, n):
+        if close[i] > close[i - 1]:
+            obv += volume[i]
+        elif close[i] < close[i - 1]:
+            obv -= volume[i]
+        out[i] = obv
+    return out
+
+
+@njit(cache=True, nogil=True)
+def _mfi_kernel(high, low, close, volume, period):
+    n = len(close)
+    out = np.full(n, np.nan)
+    if n <= period:
+        return out
+    positive = np.zeros(n)
+    negative = np.zeros(n)
+    previous = (high[0] + low[0] + close[0]) / 3.0
+    for i in range(1, n):
+        typical = (high[i] + low[i] + close[i]) / 3.0
+        diff = typical - previous
+        previous = typical
+        # Rounding noise between equal typical prices is no money flow (TA-Lib zero tolerance)
+        if diff <= -_EPSILON:
+            negative[i] = typical * volume[i]
+        elif diff >= _EPSILON:
+            positive[i] = typical * volume[i]
+    pos_total = 0.0
+    neg_total = 0.0
+    for i in range(1, period + 1):
+        pos_total += positive[i]
+        neg_total += negative[i]
+    for i in range(period, n):
+        if i > period:
+            pos_total += positive[i] - positive[i - period]
+            neg_total += negative[i] - negative[i - period]
+        total = pos_total + neg_total
+        out[i] = 100.0 * (pos_total / total) if total >= 1.0 else 0.0
+    return out
+
+
+@njit(cache=True, nogil=True)
+def _ad_kernel(high, low, close, volume):
+    n = len(close)
+    out = np.full(n, np.nan)
+    ad = 0.0
+    for i in range(n):
+        span = high[i] - low[i]
+        if span > 0.0:
+            ad += (((close[i] - low[i]) - (high[i] - close[i])) / span) * volume[i]
+        out[i] = ad
+    return out
+
+
+@njit(cache=True, nogil=True)
+def _adosc_kernel(high, low, close, volume, fastperiod, slowperiod):
+    n = len(close)
+    out = np.full(n, np.nan)
+    lookback = max(fastperiod, slowperiod) - 1
+    if n <= lookback:
+        return out
+    fast_k = 2.0 / (fastperiod + 1)
+    slow_k = 2.0 / (slowperiod + 1)
+    ad = _ad_kernel(high, low, close, volume)
+    fast_ema = ad[0]
+    slow_ema = ad[0]
+    for i in range(1, n):
+        fast_ema = (fast_k * ad[i]) + ((1.0 - fast_k) * fast_ema)
+        slow_ema = (slow_k * ad[i]) + ((1.0 - slow_k) * slow_ema)
+        if i >= lookback:
+            out[i] = fast_ema - slow_ema
+    return out
+
+
+@njit(cache=True, nogil=True)
+def _ultosc_kernel(high, low, close, period1, period2, period3):
+    n = len(close)
+    out = np.full(n, np.nan)
+    lookback = max(period1, max(period2, period3))
+    if n <= lookback:
+        return out
+    buying = np.zeros(n)
+    ranges = np.zeros(n)
+    for i in range(1, n):
+        true_low = min(low[i], close[i - 1])
+        true_high = max(high[i], close[i - 1])
+        buying[i] = close[i] - true_low
+        ranges[i] = true_high - true_low
+    for i in range(lookback, n):
+        value = 0.0
+        weights = (4.0, 2.0, 1.0)
+        periods = (period1, period2, period3)
+        for k in range(3):
+            bp_total = 0.0
+            tr_total = 0.0
+            for j in range(i - periods[k] + 1, i + 1):
+                bp_total += buying[j]
+                tr_total += ranges[j]
+            if not (-_EPSILON < tr_total < _EPSILON):
+                value += weights[k] * (bp_total / tr_total)
+        out[i] = 100.0 * (value / 7.0)
+    return out
+
+
+@njit(cache=True, nogil=True)
+def _bop_kernel(open_price, high, low, close):
+    n = len(close)
+    out = np.full(n, np.nan)
+    for i in range(n):
+        span = high[i] - low[i]
+        out[i] = (close[i] - open_price[i]) / span if span >= _EPSILON else 0.0
+    return out
+
+
+# === CANDLESTICK HELPERS ===
+
+@njit(cache=True, nogil=True)
+def _candle_range(open_price, high, low, close, range_type):
+    if range_type == 0:
+        return np.abs(close - open_price)
+    if range_type == 1:
+        return high - low
+    return (high - np.maximum(open_price, close)) + (np.minimum(open_price, close) - low)
+
+
+@njit(cache=True, nogil=True)
+def _candle_average(open_price, high, low, close, setting):
+    # Average of the setting's range over the `period` candles before each bar
+    range_type, period, factor = setting
+    values = _candle_range(open_price, high, low, close, range_type)
+    n = len(close)
+    out = np.full(n, np.nan)
+    divisor = 2.0 if range_type == 2 else 1.0
+    if period == 0:
+        return factor * values / divisor
+    total = 0.0
+    for i in range(n):
+        if i >= period:
+            out[i] = factor * (total / period) / divisor
+            total -= values[i - period]
+        total += values[i]
+    return out
+
+
+@njit(cache=True, nogil=True)
+def _cdl_doji_kernel(open_price, high, low, close):
+    n = len(close)
+    out = np.zeros(n, dtype=np.int32)
+    body = np.abs(close - open_price)
+    doji = _candle_average(open_price, high, low, close, _BODY_DOJI)
+    for i in range(_BODY_DOJI[1], n):
+        if body[i] <= doji[i]:
+            out[i] = 100
+    return out
+
+
+@njit(cache=True, nogil=True)
+def _cdl_hammer_kernel(open_price, high, low, close):
+    n = len(close)
+    out = np.zeros(n, dtype=np.int32)
+    body = np.abs(close - open_price)
+    upper_shadow = high - np.maximum(open_price, close)
+    lower_shadow = np.minimum(open_price, close) - low
+    body_short = _candle_average(open_price, high, low, close, _BODY_SHORT)
+    shadow_long = _candle_average(open_price, high, low, close, _SHADOW_LONG)
+    shadow_very_short = _candle_average(open_price, high, low, close, _SHADOW_VERY_SHORT)
+    near = _candle_average(open_price, high, low, close, _NEAR)
+    lookback = max(max(_BODY_SHORT[1], _SHADOW_LONG[1]), max(_SHADOW_VERY_SHORT[1], _NEAR[1])) + 1
+    for i in range(lookback, n):
+        if (body[i] < body_short[i] and
+                lower_shadow[i] > shadow_long[i] and
+                upper_shadow[i] < shadow_very_short[i] and
+                min(close[i], open_price[i]) <= low[i - 1] + near[i - 1]):
+            out[i] = 100
+    return out
+
+
+@njit(cache=True, nogil=True)
+def _cdl_shooting_star_kernel(open_price, high, low, close):
+    n = len(close)
+    out = np.zeros(n, dtype=np.int32)
+    body = np.abs(close - open_price)
+    upper_shadow = high - np.maximum(open_price, close)
+    lower_shadow = np.minimum(open_price, close) - low
+    body_short = _candle_average(open_price, high, low, close, _BODY_SHORT)
+    shadow_long = _candle_average(open_price, high, low, close, _SHADOW_LONG)
+    shadow_very_short = _candle_average(open_price, high, low, close, _SHADOW_VERY_SHORT)
+    lookback = max(max(_BODY_SHORT[1], _SHADOW_LONG[1]), _SHADOW_VERY_SHORT[1]) + 1
+    for i in range(lookback, n):
+        if (body[i] < body_short[i] and
+                upper_shadow[i] > shadow_long[i] and
+                lower_shadow[i] < shadow_very_short[i] and
+                min(open_price[i], close[i]) > max(open_price[i - 1], close[i - 1])):
+            out[i] = -100
+    return out
+
+
+@njit(cache=True, nogil=True)
+def _cdl_engulfing_kernel(open_price, high, low, close):
+    n = len(close)
+    out = np.zeros(n, dtype=np.int32)
+    for i in range(2, n):
+        color = 1 if close[i] >= open_price[i] else -1
+        prev_color = 1 if close[i - 1] >= open_price[i - 1] else -1
+        white_engulfs = (color == 1 and prev_color == -1 and
+                         ((close[i] >= open_price[i - 1] and open_price[i] < close[i - 1]) or
+                          (close[i] > open_price[i - 1] and open_price[i] <= close[i - 1])))
+        black_engulfs = (color == -1 and prev_color == 1 and
+                         ((open_price[i] >= close[i - 1] and close[i] < open_price[i - 1]) or
+                          (open_price[i] > close[i - 1] and close[i] <= open_price[i - 1])))
+        if white_engulfs or black_engulfs:
+            if open_price[i] != close[i - 1] and close[i] != open_price[i - 1]:
+                out[i] = color * 100
+            else:
+                out[i] = color * 80
+    return out
+
+
+@njit(cache=True, nogil=True)
+def _cdl_star_kernel(open_price, high, low, close, penetration, bullish):
+    # Morning star when `bullish`, evening star otherwise
+    n = len(close)
+    out = np.zeros(n, dtype=np.int32)
+    body = np.abs(close - open_price)
+    body_long = _candle_average(open_price, high, low, close, _BODY_LONG)
+    body_short = _candle_average(open_price, high, low, close, _BODY_SHORT)
+    lookback = max(_BODY_SHORT[1], _BODY_LONG[1]) + 2
+    for i in range(lookback, n):
+        first_color = 1 if close[i - 2] >= open_price[i - 2] else -1
+        third_color = 1 if close[i] >= open_price[i] else -1
+        if not (body[i - 2] > body_long[i - 2] and
+                body[i - 1] <= body_short[i - 1] and
+                body[i] > body_short[i]):
+            continue
+        if bullish:
+            if (first_color == -1 and third_color == 1 and
+                    max(open_price[i - 1], close[i - 1]) < min(open_price[i - 2], close[i - 2]) and
+                    close[i] > close[i - 2] + body[i - 2] * penetration):
+                out[i] = 100
+        else:
+            if (first_color == 1 and third_color == -1 and
+                    min(open_price[i - 1], close[i - 1]) > max(open_price[i - 2], close[i - 2]) and
+                    close[i] < close[i - 2] - body[i - 2] * penetration):
+                out[i] = -100
+    return out
+
+
+# === INPUT HANDLING ===
+
+def _as_float_arrays(*arrays):
+    """Convert inputs to contiguous float64 arrays and find the first fully valid bar"""
+    converted = [np.ascontiguousarray(np.asarray(a, dtype=np.float64)) for a in arrays]
+    valid = np.ones(len(converted[0]), dtype=bool)
+    for a in converted:
+        valid &= ~np.isnan(a)
+    begin = int(np.argmax(valid)) if valid.any() else len(valid)
+    return converted, begin
+
+
+def _run(kernel, arrays, *params, integer=False):
+    """Run a kernel past any leading NaNs, like the TA-Lib wrapper does"""
+    converted, begin = _as_float_arrays(*arrays)
+    n = len(converted[0])
+    result = kernel(*[a[begin:] for a in converted], *params)
+    outputs = result if isinstance(result, tuple) else (result,)
+    padded = []
+    for values in outputs:
+        if integer:
+            full = np.zeros(n, dtype=np.int32)
+        else:
+            full = np.full(n, np.nan)
+        full[begin:] = values
+        padded.append(full)
+    return tuple(padded) if isinstance(result, tuple) else padded[0]
+
+
+def _check_matype(*matypes):
+    if any(matype != 0 for matype in matypes):
+        raise ValueError("Numba indicator backend only supports matype=0 (SMA)")
+
+
+class NumbaIndicatorBackend:
+    """
+    JIT-compiled NumPy implementation of the TA-Lib functions used by the predictors.
+    Signatures, defaults and lookback periods mirror TA-Lib so either can be used interchangeably.
+    """
+
+    name = 'numba'
+
+    # === OVERLAP STUDIES ===
+
+    @staticmethod
+    def SMA(real, timeperiod=30):
+        return _run(_sma_kernel, (real,), timeperiod)
+
+    @staticmethod
+    def EMA(real, timeperiod=30):
+        return _run(_ema_kernel, (real,), timeperiod)
+
+    @staticmethod
+    def BBANDS(real, timeperiod=5, nbdevup=2.0, nbdevdn=2.0, matype=0):
+        _check_matype(matype)
+        return _run(_bbands_kernel, (real,), timeperiod, float(nbdevup), float(nbdevdn))
+
+    @staticmethod
+    def SAR(high, low, acceleration=0.02, maximum=0.2):
+        return _run(_sar_kernel, (high, low), float(acceleration), float(maximum))
+
+    # === MOMENTUM ===
+
+    @staticmethod
+    def MACD(real, fastperiod=12, slowperiod=26, signalperiod=9):
+        return _run(_macd_kernel, (real,), fastperiod, slowperiod, signalperiod)
+
+    @staticmethod
+    def RSI(real, timeperiod=14):
+        return _run(_rsi_kernel, (real,), timeperiod)
+
+    @staticmethod
+    def STOCH(high, low, close, fastk_period=5, slowk_period=3, slowk_matype=0,
+              slowd_period=3, slowd_matype=0):
+        _check_matype(slowk_matype, slowd_matype)
+        return _run(_stoch_kernel, (high, low, close), fastk_period, slowk_period, slowd_period)
+
+    @staticmethod
+    def STOCHF(high, low, close, fastk_period=5, fastd_period=3, fastd_matype=0):
+        _check_matype(fastd_matype)
+        return _run(_stochf_kernel, (high, low, close), fastk_period, fastd_period)
+
+    @staticmethod
+    def WILLR(high, low, close, timeperiod=14):
+        return _run(_willr_kernel, (high, low, close), timeperiod)
+
+    @staticmethod
+    def ROC(real, timeperiod=10):
+        return _run(_roc_kernel, (real,), timeperiod)
+
+    @staticmethod
+    def MOM(real, timeperiod=10):
+        return _run(_mom_kernel, (real,), timeperiod)
+
+    @staticmethod
+    def CCI(high, low, close, timeperiod=14):
+        return _run(_cci_kernel, (high, low, close), timeperiod)
+
+    @staticmethod
+    def ADX(high, low, close, timeperiod=14):
+        return _run(_directional_kernel, (high, low, close), timeperiod)[0]
+
+    @staticmethod
+    def PLUS_DI(high, low, close, timeperiod=14):
+        return _run(_directional_kernel, (high, low, close), timeperiod)[1]
+
+    @staticmethod
+    def MINUS_DI(high, low, close, timeperiod=14):
+        return _run(_directional_kernel, (high, low, close), timeperiod)[2]
+
+    @staticmethod
+    def AROON(high, low, timeperiod=14):
+        return _run(_aroon_kernel, (high, low), timeperiod)
+
+    @staticmethod
+    def ULTOSC(high, low, close, timeperiod1=7, timeperiod2=14, timeperiod3=28):
+        periods = sorted([timeperiod1, timeperiod2, timeperiod3])
+        return _run(_ultosc_kernel, (high, low, close), *periods)
+
+    @staticmethod
+    def BOP(open, high, low, close):
+        return _run(_bop_kernel, (open, high, low, close))
+
+    # === VOLATILITY ===
+
+    @staticmethod
+    def ATR(high, low, close, timeperiod=14):
+        return _run(_atr_kernel, (high, low, close), timeperiod)
+
+    @staticmethod
+    def TRANGE(high, low, close):
+        return _run(_trange_kernel, (high, low, close))
+
+    # === VOLUME ===
+
+    @staticmethod
+    def OBV(real, volume):
+        return _run(_obv_kernel, (real, volume))
+
+    @staticmethod
+    def MFI(high, low, close, volume, timeperiod=14):
+        return _run(_mfi_kernel, (high, low, close, volume), timeperiod)
+
+    @staticmethod
+    def AD(high, low, close, volume):
+        return _run(_ad_kernel, (high, low, close, volume))
+
+    @staticmethod
+    def ADOSC(high, low, close, volume, fastperiod=3, slowperiod=10):
+        return _run(_adosc_kernel, (high, low, close, volume), fastperiod, slowperiod)
+
+    # === PATTERN RECOGNITION ===
+
+    @staticmethod
+    def CDLDOJI(open, high, low, close):
+        return _run(_cdl_doji_kernel, (open, high, low, close), integer=True)
+
+    @staticmethod
+    def CDLHAMMER(open, high, low, close):
+        return _run(_cdl_hammer_kernel, (open, high, low, close), integer=True)
+
+    @staticmethod
+    def CDLSHOOTINGSTAR(open, high, low, close):
+        return _run(_cdl_shooting_star_kernel, (open, high, low, close), integer=True)
+
+    @staticmethod
+    def CDLENGULFING(open, high, low, close):
+        return _run(_cdl_engulfing_kernel, (open, high, low, close), integer=True)
+
+    @staticmethod
+    def CDLMORNINGSTAR(open, high, low, close, penetration=0.3):
+        return _run(_cdl_star_kernel, (open, high, low, close), float(penetration), True, integer=True)
+
+    @staticmethod
+    def CDLEVENINGSTAR(open, high, low, close, penetration=0.3):
+        return _run(_cdl_star_kernel, (open, high, low, close), float(penetration), False, integer=True)
+
+
+# Functions every backend must provide (checked by the parity tests)
+INDICATOR_FUNCTIONS = [
+    'SMA', 'EMA', 'BBANDS', 'SAR', 'MACD', 'RSI', 'STOCH', 'STOCHF', 'WILLR',
+    'ROC', 'MOM', 'CCI', 'ADX', 'PLUS_DI', 'MINUS_DI', 'AROON', 'ULTOSC', 'BOP',
+    'ATR', 'TRANGE', 'OBV', 'MFI', 'AD', 'ADOSC',
+    'CDLDOJI', 'CDLHAMMER', 'CDLSHOOTINGSTAR', 'CDLENGULFING',
+    'CDLMORNINGSTAR', 'CDLEVENINGSTAR'
+]
+
+
+def get_indicator_backend(name=None):
+    """
+    Resolve the indicator backend to use
+
+    Args:
+        name: 'auto' (TA-Lib when installed, otherwise Numba), 'talib' or 'numba'.
+              Defaults to the INDICATOR_BACKEND environment variable, then 'auto'.
+              A backend object (e.g. tail_features.SeededIndicatorBackend) is returned as is.
+    """
+    if name is not None and not isinstance(name, str):
+        return name
+
+    name = (name or os.environ.get(BACKEND_ENV_VAR) or 'auto').lower()
+
+    if name == 'auto':
+        return talib if TALIB_AVAILABLE else NumbaIndicatorBackend
+    if name == 'talib':
+        if not TALIB_AVAILABLE:
+            raise ImportError("TA-Lib backend requested but talib is not installed")
+        return talib
+    if name in ('numba', 'numpy'):
+        return NumbaIndicatorBackend
+
+    raise ValueError(f"Unknown indicator backend: {name}")
+
+
+def get_backend_name(backend):
+    """Human-readable name of a backend returned by get_indicator_backend()"""
+    return getattr(backend, 'name', None) or getattr(backend, '__name__', 'unknown')
+
+
+__all__ = ['NumbaIndicatorBackend', 'get_indicator_backend', 'get_backend_name',
+           'INDICATOR_FUNCTIONS', 'TALIB_AVAILABLE', 'NUMBA_AVAILABLE']
@@ -0,0 +1,235 @@
+"""
+Pipeline Instrumentation
+Lightweight timing, row-count and peak-memory spans for the predictor hot paths
+"""
+
+import logging
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+from typing import Dict, Optional
+
+from app_config import get_section
+
+LOGGER_NAME = 'crypto_predictor'
+
+# Environment override to switch profiling on without editing config.json
+PROFILE_ENV_VAR = 'CRYPTO_PROFILE'
+
+_logging_configured = False
+_profiler = None
+
+
+def configure_logging(settings: Optional[Dict] = None) -> logging.Logger:
+    """
+    Configure the shared logger from the `logging` section of config.json
+
+    Honours level, log_to_file, log_file, max_log_size_mb and backup_count.
+    """
+    global _logging_configured
+    logger = logging.getLogger(LOGGER_NAME)
+    if _logging_configured:
+        return logger
+
+    settings = get_section('logging') if settings is None else settings
+    logger.setLevel(getattr(logging, str(settings.get('level', 'INFO')).upper(), logging.INFO))
+
+    if settings.get('log_to_file', False) and settings.get('log_file'):
+        log_file = Path(settings['log_file'])
+        log_file.parent.mkdir(parents=True, exist_ok=True)
+        handler = RotatingFileHandler(
+            log_file,
+            maxBytes=int(settings.get('max_log_size_mb', 10) * 1024 * 1024),
+            backupCount=settings.get('backup_count', 5),
+            delay=True
+        )
+        handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(name)s: %(message)s'))
+        logger.addHandler(handler)
+
+    _logging_configured = True
+    return logger
+
+
+class _Span:
+    """Handle yielded by PipelineProfiler.span; set `rows` when the count is only known later"""
+
+    __slots__ = ('stage', 'rows', 'child_peak')
+
+    def __init__(self, stage, rows):
+        self.stage = stage
+        self.rows = rows
+        self.child_peak = 0
+
+
+class PipelineProfiler:
+    """
+    Collects per-stage timings, row counts and peak traced memory
+
+    When disabled, span() hands back a shared no-op context so the
+    instrumented code pays only a function call per stage.
+    """
+
+    def __init__(self, enabled: bool = False, track_memory: bool = False,
+                 logger: Optional[logging.Logger] = None):
+        self.enabled = enabled
+        self.track_memory = track_memory
+        self.logger = logger or logging.getLogger(LOGGER_NAME)
+        self._stats = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._started = time.perf_counter()
+        self._null_span = _Span(None, None)
+
+    def _stack(self):
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+        return self._local.stack
+
+    @contextmanager
+    def span(self, stage: str, rows: Optional[int] = None):
+        """
+        Time a pipeline stage
+
+        Args:
+            stage: Stage name (e.g. 'calculate_all_indicators')
+            rows: Number of rows processed, if known up front
+        """
+        if not self.enabled:
+            yield self._null_span
+            return
+
+        record = _Span(stage, rows)
+        stack = self._stack()
+        tracking = self.track_memory and tracemalloc.is_tracing()
+        if tracking:
+            tracemalloc.reset_peak()
+
+        stack.append(record)
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            elapsed = time.perf_counter() - start
+            stack.pop()
+
+            peak = 0
+            if tracking:
+                peak = max(tracemalloc.get_traced_memory()[1], record.child_peak)
+                if stack:
+                    # Nested spans reset the peak, so hand ours up to the parent
+                    stack[-1].child_peak = max(stack[-1].child_peak, peak)
+                tracemalloc.reset_peak()
+
+            self._record(stage, elapsed, record.rows, peak)
+
+    def _record(self, stage, elapsed, rows, peak):
+        with self._lock:
+            stats = self._stats.setdefault(stage, {
+                'calls': 0, 'total_seconds': 0.0, 'max_seconds': 0.0, 'rows': 0, 'peak_memory_bytes': 0
+            })
+            stats['calls'] += 1
+            stats['total_seconds'] += elapsed
+            stats['max_seconds'] = max(stats['max_seconds'], elapsed)
+            stats['rows'] += rows or 0
+            stats['peak_memory_bytes'] = max(stats['peak_memory_bytes'], peak)
+
+        self.logger.debug(f"{stage}: {elapsed * 1000:.1f} ms, rows={rows}, peak={peak / 1e6:.1f} MB")
+
+    def reset(self):
+        """Drop all collected statistics"""
+        with self._lock:
+            self._stats = {}
+            self._started = time.perf_counter()
+
+    def report(self) -> Dict:
+        """
+        Structured summary of all stages
+
+        Returns:
+            {'enabled', 'wall_seconds', 'stages': {stage: {calls, total_seconds,
+             mean_seconds, max_seconds, rows, rows_per_second, peak_memory_mb}}}
+        """
+        with self._lock:
+            stages = {}
+            for stage, stats in self._stats.items():
+                total = stats['total_seconds']
+                stages[stage] = {
+                    'calls': stats['calls'],
+                    'total_seconds': total,
+                    'mean_seconds': total / stats['calls'],
+                    'max_seconds': stats['max_seconds'],
+                    'rows': stats['rows'],
+                    'rows_per_second': stats['rows'] / total if total > 0 else 0.0,
+                    'peak_memory_mb': stats['peak_memory_bytes'] / 1e6
+                }
+
+        return {
+            'enabled': self.enabled,
+            'wall_seconds': time.perf_counter() - self._started,
+            'stages': stages
+        }
+
+    def log_report(self):
+        """Write the stage summary to the configured logger"""
+        for stage, stats in sorted(self.report()['stages'].items(), key=lambda item: -item[1]['total_seconds']):
+            self.logger.info(
+                f"{stage}: {stats['calls']} calls, {stats['total_seconds']:.3f}s total, "
+                f"{stats['rows']} rows, peak {stats['peak_memory_mb']:.1f} MB"
+            )
+
+    def to_prometheus(self, prefix: str = LOGGER_NAME) -> str:
+        """Render the statistics in the Prometheus text exposition format"""
+        report = self.report()['stages']
+        metrics = [
+            ('stage_seconds_total', 'counter', 'Time spent per pipeline stage', 'total_seconds'),
+            ('stage_calls_total', 'counter', 'Executions per pipeline stage', 'calls'),
+            ('stage_rows_total', 'counter', 'Rows processed per pipeline stage', 'rows'),
+            ('stage_max_seconds', 'gauge', 'Slowest single execution per stage', 'max_seconds'),
+            ('stage_peak_memory_bytes', 'gauge', 'Peak traced memory per stage', 'peak_memory_mb')
+        ]
+
+        lines = []
+        for name, kind, help_text, field in metrics:
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            for stage, stats in sorted(report.items()):
+                value = stats[field] * 1e6 if field == 'peak_memory_mb' else stats[field]
+                lines.append(f'{prefix}_{name}{{stage="{stage}"}} {value}')
+
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str, prefix: str = LOGGER_NAME):
+        """Atomically write the metrics file (for a node_exporter textfile collector)"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(path.suffix + '.tmp')
+        with open(tmp_path, 'w') as f:
+            f.write(self.to_prometheus(prefix))
+        os.replace(tmp_path, path)
+
+
+def get_profiler() -> PipelineProfiler:
+    """
+    Process-wide profiler configured from the `logging` section of config.json
+
+    `profile_pipeline` enables the spans (or set CRYPTO_PROFILE=1) and
+    `profile_memory` additionally tracks peak memory with tracemalloc.
+    """
+    global _profiler
+    if _profiler is None:
+        settings = get_section('logging')
+        logger = configure_logging(settings)
+        enabled = bool(settings.get('profile_pipeline', False)) or os.environ.get(PROFILE_ENV_VAR) == '1'
+        track_memory = enabled and bool(settings.get('profile_memory', False))
+        if track_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        _profiler = PipelineProfiler(enabled=enabled, track_memory=track_memory, logger=logger)
+
+    return _profiler
+
+
+__all__ = ['PipelineProfiler', 'get_profiler', 'configure_logging']
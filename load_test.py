@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Load Test for the Signal Service
+Fires concurrent /predict requests and reports throughput and tail latency
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import sys
+import time
+from typing import Dict, List, Optional
+
+import aiohttp
+import numpy as np
+
+
+def summarize(latencies: List[float], errors: int, elapsed: float) -> Dict:
+    """Throughput and latency percentiles (milliseconds) for a finished run"""
+    completed = len(latencies)
+    latencies_ms = np.asarray(latencies) * 1000 if latencies else np.zeros(1)
+    return {
+        'requests': completed + errors,
+        'completed': completed,
+        'errors': errors,
+        'elapsed_seconds': elapsed,
+        'throughput_rps': completed / elapsed if elapsed > 0 else 0.0,
+        'latency_ms': {
+            'mean': float(latencies_ms.mean()),
+            'p50': float(np.percentile(latencies_ms, 50)),
+            'p95': float(np.percentile(latencies_ms, 95)),
+            'p99': float(np.percentile(latencies_ms, 99)),
+            'max': float(latencies_ms.max())
+        }
+    }
+
+
+async def run_load_test(url: str, symbols: List[str], timeframe: str = '1h',
+                        concurrency: int = 32, total_requests: int = 1000,
+                        timeout: float = 30.0) -> Dict:
+    """
+    Run a closed-loop load test: `concurrency` clients issuing requests back to back
+
+    Args:
+        url: Service base URL (e.g. http://127.0.0.1:8000)
+        symbols: Symbols to cycle through
+        total_requests: Requests to send in total
+    """
+    endpoint = url.rstrip('/') + '/predict'
+    payloads = itertools.cycle([{'symbol': symbol, 'timeframe': timeframe} for symbol in symbols])
+    remaining = itertools.count()
+    latencies = []
+    errors = 0
+
+    async def client(session):
+        nonlocal errors
+        while next(remaining) < total_requests:
+            start = time.perf_counter()
+            try:
+                async with session.post(endpoint, json=next(payloads)) as response:
+                    await response.read()
+                    if response.status != 200:
+                        errors += 1
+                        continue
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - start)
+
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=timeout)) as session:
+        started = time.perf_counter()
+        await asyncio.gather(*(client(session) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return summarize(latencies, errors, elapsed)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the signal service")
+    parser.add_argument('--url', default='http://127.0.0.1:8000')
+    parser.add_argument('--symbols', nargs='+', default=['BTC-USD'])
+    parser.add_argument('--timeframe', default='1h')
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--output', help="Write the JSON summary to this file")
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run_load_test(args.url, args.symbols, args.timeframe,
+                                       args.concurrency, args.requests))
+    latency = report['latency_ms']
+
+    print(f"🚀 {report['completed']}/{report['requests']} requests in {report['elapsed_seconds']:.2f}s "
+          f"({report['throughput_rps']:.1f} req/s, {report['errors']} errors)")
+    print(f"⏱️ Latency ms: p50 {latency['p50']:.1f}  p95 {latency['p95']:.1f}  "
+          f"p99 {latency['p99']:.1f}  max {latency['max']:.1f}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    return 0 if report['errors'] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
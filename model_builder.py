@@ -0,0 +1,154 @@
+"""
+LSTM Model Builder
+Builds the predictors' LSTM networks from the model_architecture section of config.json
+"""
+
+import copy
+from typing import Dict, List, Optional, Sequence
+
+from app_config import get_section
+
+# Matches the layer sizes the predictors used before the architecture was configurable
+DEFAULT_ARCHITECTURE = {
+    'lstm_layers': [
+        {'units': 128, 'return_sequences': True, 'dropout': 0.2},
+        {'units': 64, 'return_sequences': True, 'dropout': 0.2},
+        {'units': 32, 'return_sequences': False, 'dropout': 0.2}
+    ],
+    'dense_layers': [
+        {'units': 50, 'activation': 'relu', 'dropout': 0.3},
+        {'units': 25, 'activation': 'relu', 'dropout': 0.2}
+    ],
+    'output_activation': 'sigmoid',
+    'optimizer': {'type': 'Adam', 'learning_rate': 0.001, 'beta_1': 0.9, 'beta_2': 0.999}
+}
+
+DEFAULT_TRAINING_SETTINGS = {
+    'epochs': 100,
+    'batch_size': 32,
+    'validation_split': 0.2,
+    'cross_validation_folds': 5,
+    'early_stopping_patience': 15,
+    'reduce_lr_patience': 8,
+    'reduce_lr_factor': 0.5,
+    'min_learning_rate': 1e-6,
+    'warm_start_cv': False,
+    'warm_start_epochs': 25,
+    'replay_fraction': 0.5,
+    'fine_tune_epochs': 5,
+    'fine_tune_learning_rate_factor': 0.1,
+    'fine_tune_replay_window': 2000,
+    'fine_tune_holdout_fraction': 0.2
+}
+
+
+def get_architecture() -> Dict:
+    """model_architecture from config.json, with defaults for missing keys"""
+    architecture = copy.deepcopy(DEFAULT_ARCHITECTURE)
+    architecture.update(copy.deepcopy(get_section('model_architecture')))
+    return architecture
+
+
+def get_training_settings() -> Dict:
+    """training_settings from config.json, with defaults for missing keys"""
+    settings = dict(DEFAULT_TRAINING_SETTINGS)
+    settings.update(get_section('training_settings'))
+    return settings
+
+
+def apply_search_params(architecture: Dict, params: Dict) -> Dict:
+    """
+    Architecture with hyperparameters from a search trial applied
+
+    Args:
+        architecture: Base model_architecture
+        params: Any of lstm_units / dense_units (first layer; later layers
+            halve it, as in the default stack), dropout, learning_rate
+
+    Returns:
+        New architecture dict (the base is not modified)
+    """
+    architecture = copy.deepcopy(architecture)
+
+    if 'lstm_units' in params:
+        for i, layer in enumerate(architecture['lstm_layers']):
+            layer['units'] = max(int(params['lstm_units']) >> i, 4)
+    if 'dense_units' in params:
+        for i, layer in enumerate(architecture['dense_layers']):
+            layer['units'] = max(int(params['dense_units']) >> i, 4)
+    if 'dropout' in params:
+        for layer in architecture['lstm_layers'] + architecture['dense_layers']:
+            layer['dropout'] = float(params['dropout'])
+    if 'learning_rate' in params:
+        architecture['optimizer']['learning_rate'] = float(params['learning_rate'])
+
+    return architecture
+
+
+def build_optimizer(settings: Dict):
+    """Keras optimizer from an architecture's optimizer section"""
+    import tensorflow as tf
+
+    settings = dict(settings)
+    optimizer_type = settings.pop('type', 'Adam')
+    return getattr(tf.keras.optimizers, optimizer_type)(**settings)
+
+
+def build_lstm_model(input_shape: Sequence[int], architecture: Optional[Dict] = None,
+                     batch_norm: bool = False, metrics: Optional[List] = None,
+                     input_layers: Optional[List] = None):
+    """
+    Compiled LSTM classifier described by an architecture dict
+
+    Args:
+        input_shape: (lookback_window, num_features)
+        architecture: model_architecture layout; defaults to config.json
+        batch_norm: Add BatchNormalization after each LSTM and each hidden
+            dense block except the last (the enhanced predictor's layout)
+        metrics: Metrics to compile with
+        input_layers: Layers applied to the input before the LSTM stack
+            (e.g. the pooled model's symbol embedding)
+    """
+    import tensorflow as tf
+    from tensorflow.keras.layers import LSTM, BatchNormalization, Dense, Dropout
+
+    from performance_profile import jit_compile_setting
+
+    architecture = architecture or get_architecture()
+    layers = [tf.keras.layers.Input(shape=tuple(input_shape))] + list(input_layers or [])
+
+    lstm_layers = architecture['lstm_layers']
+    for i, layer in enumerate(lstm_layers):
+        dropout = layer.get('dropout', 0.0)
+        layers.append(LSTM(
+            layer['units'],
+            return_sequences=layer.get('return_sequences', i < len(lstm_layers) - 1),
+            dropout=dropout,
+            recurrent_dropout=layer.get('recurrent_dropout', dropout)
+        ))
+        if batch_norm:
+            layers.append(BatchNormalization())
+
+    dense_layers = architecture['dense_layers']
+    for i, layer in enumerate(dense_layers):
+        layers.append(Dense(layer['units'], activation=layer.get('activation', 'relu')))
+        if layer.get('dropout'):
+            layers.append(Dropout(layer['dropout']))
+        if batch_norm and i < len(dense_layers) - 1:
+            layers.append(BatchNormalization())
+
+    # Kept in float32 under a mixed-precision policy so probabilities stay well-behaved
+    layers.append(Dense(1, activation=architecture.get('output_activation', 'sigmoid'), dtype='float32'))
+
+    model = tf.keras.models.Sequential(layers)
+    model.compile(
+        optimizer=build_optimizer(architecture.get('optimizer', {})),
+        loss='binary_crossentropy',
+        metrics=metrics or ['accuracy'],
+        jit_compile=jit_compile_setting()
+    )
+    return model
+
+
+__all__ = ['build_lstm_model', 'build_optimizer', 'apply_search_params', 'get_architecture',
+           'get_training_settings', 'DEFAULT_ARCHITECTURE', 'DEFAULT_TRAINING_SETTINGS']
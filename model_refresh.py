@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Model Refresh
+Fine-tunes or retrains registered models on recent data and registers the new versions
+"""
+
+import argparse
+from typing import Dict, List, Optional
+
+from app_config import get_section
+from model_registry import ModelRegistry
+
+
+def refresh_model(registry: ModelRegistry, symbol: str, timeframe: str, data=None,
+                  period: str = '3mo', data_provider=None, epochs: Optional[int] = None,
+                  replay_fraction: Optional[float] = None) -> Optional[Dict]:
+    """
+    Fine-tune the latest registered model for a symbol/timeframe
+
+    Args:
+        registry: Registry holding the model; the update is registered there
+        symbol, timeframe: Model to refresh
+        data: OHLCV data; fetched for period when not given
+        period: History to fetch; must reach back past the model's
+            trained_through bar by the indicator warm-up and lookback window
+        data_provider: Provider used to fetch data
+        epochs, replay_fraction: Passed to fine_tune
+
+    Returns:
+        Manifest entry of the new version, or None when there was nothing new
+
+    Raises:
+        KeyError: No model is registered for symbol/timeframe
+    """
+    predictor = registry.get_predictor(symbol, timeframe)
+    base_version = predictor.model_version
+    if data_provider is not None:
+        from data_providers import get_data_provider
+        predictor.data_provider = get_data_provider(data_provider)
+    if data is None:
+        data = predictor.fetch_comprehensive_data(period)
+        if data is None or data.empty:
+            print(f"❌ No data for {symbol} {timeframe}")
+            return None
+
+    summary = predictor.fine_tune(data, epochs=epochs, replay_fraction=replay_fraction)
+    if summary is None:
+        return None
+    return registry.register(predictor, metrics=dict(summary, fine_tuned_from=base_version))
+
+
+def retrain_model(registry: ModelRegistry, symbol: str, timeframe: str, data=None,
+                  period: str = '2y', data_provider=None) -> Optional[Dict]:
+    """
+    Retrain the latest registered model from scratch and register the result
+
+    Keeps the registered architecture, lookback window and training settings,
+    but refits the feature scaler, so it also covers a shift in the feature
+    distribution that fine-tuning would not.
+
+    Returns:
+        Manifest entry of the new version, or None without data
+
+    Raises:
+        KeyError: No model is registered for symbol/timeframe
+    """
+    predictor = registry.get_predictor(symbol, timeframe)
+    base_version = predictor.model_version
+    if data_provider is not None:
+        from data_providers import get_data_provider
+        predictor.data_provider = get_data_provider(data_provider)
+    if data is None:
+        data = predictor.fetch_comprehensive_data(period)
+        if data is None or data.empty:
+            print(f"❌ No data for {symbol} {timeframe}")
+            return None
+
+    settings = predictor.training_settings
+    predictor.train_with_cross_validation(data, settings['cross_validation_folds'], settings['epochs'])
+    return registry.register(predictor, metrics=dict(predictor.cv_results, retrained_from=base_version))
+
+
+def refresh_all(registry: ModelRegistry, symbols: Optional[List[str]] = None,
+                timeframe: Optional[str] = None, **kwargs) -> Dict[str, Optional[Dict]]:
+    """
+    Refresh every registered symbol/timeframe (or the given subset)
+
+    A failure is reported and skipped so one bad symbol does not stop the run.
+    Pooled cross-asset models are skipped; they are retrained with
+    PooledCryptoPredictor.train on all member symbols.
+
+    Returns:
+        "<symbol> <timeframe>" -> new manifest entry, or None if not refreshed
+    """
+    from pooled_model import POOLED_SYMBOL
+    pairs = sorted({(entry['symbol'], entry['timeframe']) for entry in registry.list(timeframe=timeframe)
+                    if entry['symbol'] != POOLED_SYMBOL and (symbols is None or entry['symbol'] in symbols)})
+    results = {}
+    for symbol, timeframe in pairs:
+        try:
+            results[f"{symbol} {timeframe}"] = refresh_model(registry, symbol, timeframe, **kwargs)
+        except Exception as e:
+            print(f"❌ Refresh failed for {symbol} {timeframe}: {e}")
+            results[f"{symbol} {timeframe}"] = None
+    return results
+
+
+__all__ = ['refresh_model', 'retrain_model', 'refresh_all']
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fine-tune registered models on their newest bars")
+    parser.add_argument('--symbols', nargs='+', help="Defaults to every registered symbol")
+    parser.add_argument('--timeframe', help="Defaults to every registered timeframe")
+    parser.add_argument('--period', default='3mo')
+    parser.add_argument('--provider', help="Data provider name (defaults to config.json)")
+    parser.add_argument('--registry', default=get_section('signal_service').get('registry_root', 'models/registry'))
+    parser.add_argument('--epochs', type=int)
+    args = parser.parse_args(argv)
+
+    results = refresh_all(ModelRegistry(args.registry), args.symbols, args.timeframe,
+                          period=args.period, data_provider=args.provider, epochs=args.epochs)
+    refreshed = sum(entry is not None for entry in results.values())
+    print(f"🏁 Refreshed {refreshed}/{len(results)} models")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
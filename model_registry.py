@@ -0,0 +1,312 @@
+"""
+Model Registry
+Versioned model storage with an atomic manifest and a shared, memory-bounded model cache
+"""
+
+import json
+import os
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import joblib
+
+from app_config import get_section
+from feature_store import feature_set_hash
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:  # Windows: manifest updates are only serialised within the process
+    FCNTL_AVAILABLE = False
+
+MANIFEST_FILE = 'manifest.json'
+MODEL_FILE = 'model.keras'
+SCALER_FILE = 'feature_scaler.pkl'
+CONFIG_FILE = 'config.json'
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def model_nbytes(model) -> int:
+    """Approximate resident size of a Keras model (its weights)"""
+    try:
+        return int(sum(weight.nbytes for weight in model.get_weights()))
+    except Exception:
+        return int(model.count_params() * 4)
+
+
+class ModelCache:
+    """
+    Thread-safe LRU of loaded models bounded by total weight size
+
+    The least recently used models are evicted once the budget is exceeded;
+    the model just loaded is always kept, even if it alone exceeds the budget.
+    """
+
+    def __init__(self, max_bytes: int = 1024 * 1024 * 1024, sizeof: Callable = model_nbytes):
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self._entries = OrderedDict()  # key -> (model, nbytes)
+        self._lock = threading.Lock()
+        self._loading = {}  # key -> lock, so concurrent misses load once
+        self.total_bytes = 0
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def get(self, key, loader: Callable):
+        """Return the cached model for key, calling loader() on a miss"""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.stats['hits'] += 1
+                return self._entries[key][0]
+            key_lock = self._loading.setdefault(key, threading.Lock())
+
+        with key_lock:
+            with self._lock:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    self.stats['hits'] += 1
+                    return self._entries[key][0]
+
+            model = loader()
+            nbytes = self.sizeof(model)
+
+            with self._lock:
+                self.stats['misses'] += 1
+                self._entries[key] = (model, nbytes)
+                self.total_bytes += nbytes
+                self._evict()
+                self._loading.pop(key, None)
+
+        return model
+
+    def _evict(self):
+        while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+            _, (_, nbytes) = self._entries.popitem(last=False)
+            self.total_bytes -= nbytes
+            self.stats['evictions'] += 1
+
+    def discard(self, key):
+        with self._lock:
+            if key in self._entries:
+                self.total_bytes -= self._entries.pop(key)[1]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+
+def get_model_cache() -> ModelCache:
+    """Process-wide model cache sized by performance.model_cache_mb in config.json"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            max_mb = get_section('performance').get('model_cache_mb', 1024)
+            _cache = ModelCache(int(max_mb * 1024 * 1024))
+    return _cache
+
+
+class LazyModel:
+    """
+    Stand-in for a Keras model that loads it through the shared cache on use
+
+    Predictors hold this instead of the model itself, so an evicted model is
+    really freed and is reloaded transparently on the next predict().
+    """
+
+    def __init__(self, registry, entry: Dict):
+        self._registry = registry
+        self.entry = entry
+
+    @property
+    def key(self):
+        return self._registry.cache_key(self.entry)
+
+    def resolve(self):
+        return self._registry.load_model(self.entry)
+
+    def predict(self, *args, **kwargs):
+        return self.resolve().predict(*args, **kwargs)
+
+    def __call__(self, *args, **kwargs):
+        return self.resolve()(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.resolve(), name)
+
+
+class ModelRegistry:
+    """
+    Models stored as <root>/<symbol>/<timeframe>/v<version>-<feature hash>/
+    and indexed by an atomically replaced manifest.json
+    """
+
+    def __init__(self, root: str = 'models/registry', cache: Optional[ModelCache] = None):
+        self.root = Path(root)
+        self.cache = cache if cache is not None else get_model_cache()
+        self._lock = threading.Lock()
+
+    def cache_key(self, entry: Dict):
+        return (str(self.root.resolve()), entry['symbol'], entry['timeframe'], entry['version'], entry['feature_hash'])
+
+    @contextmanager
+    def _manifest_lock(self):
+        """Serialise manifest read-modify-write across threads and processes"""
+        self.root.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            if not FCNTL_AVAILABLE:
+                yield
+                return
+            with open(self.root / '.manifest.lock', 'w') as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _read_manifest(self) -> Dict:
+        path = self.root / MANIFEST_FILE
+        if not path.exists():
+            return {'models': []}
+        with open(path, 'r') as f:
+            return json.load(f)
+
+    def _write_manifest(self, manifest: Dict):
+        tmp_path = self.root / f".{MANIFEST_FILE}.{os.getpid()}.{threading.get_ident()}"
+        with open(tmp_path, 'w') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, self.root / MANIFEST_FILE)
+
+    def list(self, symbol: Optional[str] = None, timeframe: Optional[str] = None) -> List[Dict]:
+        """Registered models, oldest version first"""
+        entries = [
+            entry for entry in self._read_manifest()['models']
+            if (symbol is None or entry['symbol'] == symbol)
+            and (timeframe is None or entry['timeframe'] == timeframe)
+        ]
+        return sorted(entries, key=lambda entry: (entry['symbol'], entry['timeframe'], entry['version']))
+
+    def resolve(self, symbol: str, timeframe: str, version: Optional[int] = None,
+                feature_hash: Optional[str] = None) -> Dict:
+        """
+        Find a manifest entry (latest version unless one is given)
+
+        Raises:
+            KeyError: No matching model is registered
+        """
+        candidates = [
+            entry for entry in self.list(symbol, timeframe)
+            if (version is None or entry['version'] == version)
+            and (feature_hash is None or entry['feature_hash'] == feature_hash)
+        ]
+        if not candidates:
+            raise KeyError(f"No registered model for {symbol} {timeframe} "
+                           f"(version={version}, feature_hash={feature_hash})")
+        return candidates[-1]
+
+    def register(self, predictor, metrics: Optional[Dict] = None) -> Dict:
+        """
+        Store a trained predictor as the next version for its symbol/timeframe
+
+        Returns:
+            The new manifest entry
+        """
+        if predictor.model is None:
+            raise ValueError("No model to register")
+
+        config = predictor.get_model_config()
+        fhash = feature_set_hash(config['selected_features'], config['lookback_window'])
+        model_dir = self.root / predictor.symbol / predictor.timeframe
+        model_dir.mkdir(parents=True, exist_ok=True)
+
+        # Write artifacts to a private directory first; it is renamed into place under the lock
+        staging = model_dir / f".staging-{os.getpid()}-{threading.get_ident()}-{time.time_ns()}"
+        staging.mkdir()
+        try:
+            model = predictor.model.resolve() if isinstance(predictor.model, LazyModel) else predictor.model
+            model.save(staging / MODEL_FILE)
+            joblib.dump(predictor.feature_scaler, staging / SCALER_FILE)
+            with open(staging / CONFIG_FILE, 'w') as f:
+                json.dump(config, f, indent=2)
+
+            with self._manifest_lock():
+                manifest = self._read_manifest()
+                versions = [entry['version'] for entry in manifest['models']
+                            if entry['symbol'] == predictor.symbol and entry['timeframe'] == predictor.timeframe]
+                version = max(versions, default=0) + 1
+
+                final_dir = model_dir / f"v{version}-{fhash}"
+                os.replace(staging, final_dir)
+
+                entry = {
+                    'symbol': predictor.symbol,
+                    'timeframe': predictor.timeframe,
+                    'version': version,
+                    'feature_hash': fhash,
+                    'path': str(final_dir.relative_to(self.root)),
+                    'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                    'size_bytes': model_nbytes(model),
+                    'metrics': metrics or {}
+                }
+                manifest['models'].append(entry)
+                self._write_manifest(manifest)
+        finally:
+            if staging.exists():
+                shutil.rmtree(staging, ignore_errors=True)
+
+        print(f"✅ Registered {entry['symbol']} {entry['timeframe']} v{version} ({fhash})")
+        return entry
+
+    def load_model(self, entry: Dict):
+        """Keras model for a manifest entry, loaded through the shared cache"""
+        import tensorflow as tf
+
+        path = self.root / entry['path'] / MODEL_FILE
+        return self.cache.get(self.cache_key(entry), lambda: tf.keras.models.load_model(path))
+
+    def load_into(self, predictor, symbol: Optional[str] = None, timeframe: Optional[str] = None,
+                  version: Optional[int] = None, feature_hash: Optional[str] = None) -> Dict:
+        """
+        Point a predictor at a registered model
+
+        The configuration and scaler are restored immediately; the Keras model
+        itself is attached as a LazyModel and loaded on first use.
+        """
+        entry = self.resolve(symbol or predictor.symbol, timeframe or predictor.timeframe, version, feature_hash)
+        path = self.root / entry['path']
+
+        with open(path / CONFIG_FILE, 'r') as f:
+            predictor.apply_model_config(json.load(f))
+        predictor.feature_scaler = joblib.load(path / SCALER_FILE)
+        predictor.model = LazyModel(self, entry)
+        predictor.model_version = entry['version']
+        return entry
+
+    def get_predictor(self, symbol: str, timeframe: str, version: Optional[int] = None,
+                      feature_hash: Optional[str] = None, predictor_cls=None):
+        """New predictor backed by a registered model"""
+        if predictor_cls is None:
+            from enhanced_predictor import EnhancedCryptoPredictorLSTM
+            predictor_cls = EnhancedCryptoPredictorLSTM
+
+        predictor = predictor_cls(symbol, timeframe)
+        self.load_into(predictor, symbol, timeframe, version, feature_hash)
+        return predictor
+
+
+__all__ = ['ModelRegistry', 'ModelCache', 'LazyModel', 'get_model_cache', 'model_nbytes']
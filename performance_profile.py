@@ -0,0 +1,232 @@
+"""
+TensorFlow Performance Profiles
+Thread pools, oneDNN, XLA JIT and mixed precision configured from config.json
+"""
+
+import os
+import sys
+import threading
+import time
+from typing import Dict, Optional
+
+from app_config import get_section
+
+# Environment override for the active profile
+PROFILE_ENV_VAR = 'CRYPTO_PERF_PROFILE'
+
+DEFAULT_PROFILES = {
+    # TensorFlow's own defaults
+    'default': {},
+    # One intra-op thread per core, few concurrent ops, oneDNN kernels
+    'cpu_throughput': {
+        'intra_op_threads': 0,
+        'inter_op_threads': 2,
+        'onednn': True
+    },
+    # As cpu_throughput, with bfloat16 compute (float32 weights) for AVX512-BF16/AMX CPUs
+    'cpu_bf16': {
+        'intra_op_threads': 0,
+        'inter_op_threads': 2,
+        'onednn': True,
+        'mixed_precision': 'mixed_bfloat16'
+    },
+    # XLA-compiled train/predict steps
+    'cpu_xla': {
+        'intra_op_threads': 0,
+        'inter_op_threads': 2,
+        'onednn': True,
+        'xla_jit': True
+    }
+}
+
+_applied = None
+_lock = threading.Lock()
+_thread_budget = None  # CPU threads this process may use (a worker's share of the machine)
+
+
+def get_profile_name(name: Optional[str] = None) -> str:
+    """Active profile name: argument, then $CRYPTO_PERF_PROFILE, then performance.profile"""
+    return name or os.environ.get(PROFILE_ENV_VAR) or get_section('performance').get('profile', 'default')
+
+
+def get_profile(name: Optional[str] = None, strict: bool = True) -> Dict:
+    """
+    Settings of a performance profile (config.json performance.profiles, then built-ins)
+
+    Args:
+        strict: Raise on an unknown profile; otherwise warn and use 'default'
+            (for implicit setup, e.g. at import, where a typo in
+            $CRYPTO_PERF_PROFILE should not take the importer down)
+
+    Raises:
+        ValueError: Unknown profile (strict only)
+    """
+    name = get_profile_name(name)
+    profiles = dict(DEFAULT_PROFILES)
+    profiles.update(get_section('performance').get('profiles', {}))
+    if name not in profiles:
+        message = f"Unknown performance profile: {name} (available: {', '.join(sorted(profiles))})"
+        if strict:
+            raise ValueError(message)
+        print(f"⚠️ {message}; using 'default'")
+        name = 'default'
+    return dict(profiles[name], name=name)
+
+
+def configure_environment(name: Optional[str] = None, strict: bool = True):
+    """
+    Set the environment variables TensorFlow only reads at import time
+
+    Explicitly set variables are left alone. Has no effect once TensorFlow is imported.
+    """
+    profile = get_profile(name, strict)
+    if 'onednn' in profile:
+        os.environ.setdefault('TF_ENABLE_ONEDNN_OPTS', '1' if profile['onednn'] else '0')
+
+
+def _available_cores() -> int:
+    # Logical CPUs (os.cpu_count), capped at this process's thread budget
+    cores = os.cpu_count() or 1
+    return min(cores, _thread_budget) if _thread_budget else cores
+
+
+def set_thread_budget(threads: Optional[int]):
+    """
+    Limit this process to a number of CPU threads, e.g. one worker's share
+    when several train side by side
+
+    Sizes TensorFlow's thread pools and the OpenMP/BLAS pools now; profiles
+    applied afterwards stay within the budget. Must run before TensorFlow's
+    first op (pool sizes are ignored after that).
+    """
+    global _thread_budget
+    if not threads:
+        return
+    _thread_budget = int(threads)
+    for variable in ('OMP_NUM_THREADS', 'MKL_NUM_THREADS', 'OPENBLAS_NUM_THREADS'):
+        os.environ[variable] = str(_thread_budget)
+
+    import tensorflow as tf
+    try:
+        tf.config.threading.set_intra_op_parallelism_threads(_thread_budget)
+        tf.config.threading.set_inter_op_parallelism_threads(max(_thread_budget // 2, 1))
+    except RuntimeError:
+        pass  # Runtime already initialised (in-process use)
+
+
+def apply_performance_profile(name: Optional[str] = None, force: bool = False, strict: bool = True) -> Dict:
+    """
+    Configure TensorFlow for a profile (once per process)
+
+    Thread pools can only be sized before TensorFlow runs its first op; when
+    that has already happened the setting is skipped with a warning. GPU
+    visibility and memory growth follow performance.enable_gpu/memory_growth.
+
+    Args:
+        strict: Raise on an unknown profile instead of falling back to 'default'
+
+    Returns:
+        The applied profile, with 'warnings' listing settings that could not be applied
+    """
+    global _applied
+    with _lock:
+        if _applied is not None and not force:
+            return _applied
+
+        profile = get_profile(name, strict)
+        settings = get_section('performance')
+        warnings = []
+
+        if 'onednn' in profile and 'tensorflow' in sys.modules:
+            expected = '1' if profile['onednn'] else '0'
+            if os.environ.get('TF_ENABLE_ONEDNN_OPTS', expected) != expected:
+                warnings.append("oneDNN setting ignored: TF_ENABLE_ONEDNN_OPTS is set differently")
+        configure_environment(profile['name'])
+
+        import tensorflow as tf
+
+        try:
+            gpus = tf.config.list_physical_devices('GPU')
+            if gpus and not settings.get('enable_gpu', True):
+                tf.config.set_visible_devices([], 'GPU')
+            elif gpus and settings.get('memory_growth', True):
+                for gpu in gpus:
+                    tf.config.experimental.set_memory_growth(gpu, True)
+        except RuntimeError as e:
+            warnings.append(f"GPU settings ignored: {e}")
+
+        try:
+            if 'intra_op_threads' in profile:
+                tf.config.threading.set_intra_op_parallelism_threads(
+                    profile['intra_op_threads'] or _available_cores()
+                )
+            if 'inter_op_threads' in profile:
+                tf.config.threading.set_inter_op_parallelism_threads(
+                    min(profile['inter_op_threads'], _available_cores())
+                )
+        except RuntimeError:
+            warnings.append("Thread pool sizes ignored: TensorFlow was already initialised")
+
+        tf.config.optimizer.set_jit(bool(profile.get('xla_jit', False)))
+        tf.keras.mixed_precision.set_global_policy(profile.get('mixed_precision') or 'float32')
+
+        for warning in warnings:
+            print(f"⚠️ {warning}")
+
+        _applied = dict(profile, warnings=warnings)
+        return _applied
+
+
+def jit_compile_setting():
+    """Value for Model.compile(jit_compile=...) under the applied profile"""
+    if _applied is not None and _applied.get('xla_jit'):
+        return True
+    return 'auto'
+
+
+def profile_throughput(name: str, samples: int = 2048, lookback: int = 60, num_features: int = 67,
+                       batch_size: int = 64, epochs: int = 2, architecture: Optional[Dict] = None) -> Dict:
+    """
+    Training and inference samples/sec of the LSTM under one profile
+
+    Meant to run in a fresh process (see benchmark.run_profile_benchmarks),
+    since thread pools cannot be resized once TensorFlow has started.
+    """
+    configure_environment(name)
+    profile = apply_performance_profile(name, force=True)
+
+    import numpy as np
+    import tensorflow as tf
+    from model_builder import build_lstm_model
+
+    rng = np.random.default_rng(0)
+    X = rng.standard_normal((samples, lookback, num_features)).astype(np.float32)
+    y = (rng.random((samples, 1)) > 0.5).astype(np.float32)
+
+    tf.keras.utils.set_random_seed(0)
+    model = build_lstm_model((lookback, num_features), architecture, batch_norm=True)
+
+    # The first epoch and predict include tracing/compilation and are not timed
+    model.fit(X[:batch_size], y[:batch_size], batch_size=batch_size, epochs=1, verbose=0)
+    model.predict(X[:batch_size], batch_size=batch_size, verbose=0)
+
+    start = time.perf_counter()
+    model.fit(X, y, batch_size=batch_size, epochs=epochs, verbose=0)
+    train_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    model.predict(X, batch_size=batch_size * 4, verbose=0)
+    predict_seconds = time.perf_counter() - start
+
+    return {
+        'profile': name,
+        'settings': {key: value for key, value in profile.items() if key not in ('name', 'warnings')},
+        'warnings': profile['warnings'],
+        'train_samples_per_second': samples * epochs / train_seconds,
+        'predict_samples_per_second': samples / predict_seconds,
+        'compute_dtype': tf.keras.mixed_precision.global_policy().compute_dtype
+    }
+
+
+__all__ = ['apply_performance_profile', 'configure_environment', 'get_profile', 'get_profile_name',
+           'jit_compile_setting', 'set_thread_budget', 'profile_throughput', 'DEFAULT_PROFILES']
@@ -0,0 +1,346 @@
+"""
+Pooled Cross-Asset Model
+One LSTM trained on every symbol's windows, with a learned symbol embedding and per-symbol feature scalers
+"""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import tensorflow as tf
+from tensorflow.keras.callbacks import EarlyStopping, ReduceLROnPlateau
+
+from app_config import get_section
+from data_providers import get_data_provider
+from enhanced_predictor import EnhancedCryptoPredictorLSTM
+from model_builder import build_lstm_model
+
+POOLED_SYMBOL = 'POOLED'  # Registry symbol of pooled models
+
+
+@tf.keras.utils.register_keras_serializable(package='crypto_predictor')
+class SymbolEmbedding(tf.keras.layers.Layer):
+    """
+    Replaces the symbol-id channel (the last feature of every window) with a
+    learned embedding of that symbol, repeated over the timesteps
+
+    Keeping the id inside the window makes the pooled model a single-input
+    model, so windows of different symbols stack into one batch.
+    """
+
+    def __init__(self, n_symbols: int, embedding_dim: int = 8, **kwargs):
+        super().__init__(**kwargs)
+        self.n_symbols = n_symbols
+        self.embedding_dim = embedding_dim
+
+    def build(self, input_shape):
+        self.embeddings = self.add_weight(
+            name='embeddings', shape=(self.n_symbols, self.embedding_dim), initializer='uniform'
+        )
+
+    def call(self, inputs):
+        features = inputs[..., :-1]
+        ids = tf.cast(inputs[:, 0, -1], tf.int32)
+        vectors = tf.cast(tf.gather(self.embeddings, ids), features.dtype)
+        tiled = tf.repeat(vectors[:, None, :], tf.shape(inputs)[1], axis=1)
+        return tf.concat([features, tiled], axis=-1)
+
+    def compute_output_shape(self, input_shape):
+        return tuple(input_shape[:-1]) + (input_shape[-1] - 1 + self.embedding_dim,)
+
+    def get_config(self):
+        return dict(super().get_config(), n_symbols=self.n_symbols, embedding_dim=self.embedding_dim)
+
+
+def with_symbol_channel(X: np.ndarray, symbol_id: int) -> np.ndarray:
+    """Append the constant symbol-id channel SymbolEmbedding reads to (samples, lookback, features) windows"""
+    ids = np.full(X.shape[:2] + (1,), symbol_id, dtype=X.dtype)
+    return np.concatenate([X, ids], axis=2)
+
+
+def build_pooled_lstm_model(input_shape, n_symbols: int, embedding_dim: int = 8, architecture: Optional[Dict] = None):
+    """
+    The enhanced predictor's LSTM with a symbol embedding in front
+
+    Args:
+        input_shape: (lookback_window, num_features + 1); the last channel is the symbol id
+    """
+    return build_lstm_model(
+        input_shape,
+        architecture,
+        batch_norm=True,
+        metrics=['accuracy', 'precision', 'recall', 'f1_score'],
+        input_layers=[SymbolEmbedding(n_symbols, embedding_dim)]
+    )
+
+
+class PooledWindows(tf.keras.utils.PyDataset):
+    """
+    Batches of (symbol, position) samples gathered from per-symbol window views
+
+    Only one batch of windows is materialised at a time, so pooling many
+    symbols does not copy every symbol's windows into one array.
+    """
+
+    def __init__(self, windows: List[np.ndarray], targets: List[np.ndarray], symbol_ids: np.ndarray,
+                 positions: np.ndarray, batch_size: int = 32, shuffle: bool = False, seed: int = 42, **kwargs):
+        super().__init__(**kwargs)
+        self.windows = windows
+        self.targets = targets
+        self.symbol_ids = symbol_ids
+        self.positions = positions
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.rng = np.random.default_rng(seed)
+        self.order = self.rng.permutation(len(positions)) if shuffle else np.arange(len(positions))
+
+    def __len__(self):
+        return int(np.ceil(len(self.positions) / self.batch_size))
+
+    def __getitem__(self, index):
+        batch = self.order[index * self.batch_size:(index + 1) * self.batch_size]
+        ids, positions = self.symbol_ids[batch], self.positions[batch]
+        lookback, num_features = self.windows[0].shape[1:]
+
+        X = np.empty((len(batch), lookback, num_features + 1), dtype=np.float32)
+        y = np.empty((len(batch), 1), dtype=np.float32)
+        for symbol_id in np.unique(ids):
+            mask = ids == symbol_id
+            X[mask, :, :-1] = self.windows[symbol_id][positions[mask]]
+            y[mask, 0] = self.targets[symbol_id][positions[mask]]
+        X[:, :, -1] = ids[:, None]
+        return X, y
+
+    def on_epoch_end(self):
+        if self.shuffle:
+            self.order = self.rng.permutation(len(self.positions))
+
+
+class PooledMemberPredictor(EnhancedCryptoPredictorLSTM):
+    """
+    One symbol of a pooled model: its own features, scaler and signals, the shared model
+
+    Members serve predictions (also through SignalService, where members of one
+    pooled model batch into a single forward pass); training goes through
+    PooledCryptoPredictor.train.
+    """
+
+    def __init__(self, symbol='BTC-USD', timeframe='1h', data_provider=None,
+                 symbol_id: int = 0, n_symbols: int = 1, embedding_dim: int = 8):
+        super().__init__(symbol, timeframe, data_provider)
+        self.symbol_id = symbol_id
+        self.n_symbols = n_symbols
+        self.embedding_dim = embedding_dim
+        self.streaming_inference = False  # StreamingLSTM does not model the embedding
+
+    def build_advanced_lstm_model(self, input_shape, architecture=None):
+        return build_pooled_lstm_model(input_shape, self.n_symbols, self.embedding_dim,
+                                       architecture or self.model_architecture)
+
+    def prepare_prediction_input(self, current_data):
+        df, X = super().prepare_prediction_input(current_data)
+        return df, with_symbol_channel(X, self.symbol_id)
+
+    def train_with_cross_validation(self, *args, **kwargs):
+        raise TypeError(f"{self.symbol} is a pooled model member; train pooled models with PooledCryptoPredictor.train")
+
+    def fine_tune(self, *args, **kwargs):
+        raise TypeError(f"{self.symbol} is a pooled model member; train pooled models with PooledCryptoPredictor.train")
+
+
+class PooledCryptoPredictor:
+    """
+    Cross-asset predictor: one network over all symbols' windows
+
+    Each symbol keeps its own RobustScaler (prices and volumes differ by
+    orders of magnitude), and the network learns a symbol embedding so it
+    can still tell symbols apart. Registers in a ModelRegistry like a
+    per-symbol predictor, under symbol POOLED_SYMBOL, with the scalers
+    stored together as a {symbol: scaler} dict.
+    """
+
+    def __init__(self, symbol: str = POOLED_SYMBOL, timeframe: str = '1h', data_provider=None,
+                 symbols: Optional[List[str]] = None, embedding_dim: Optional[int] = None):
+        """
+        Args:
+            symbol: Registry symbol (kept for ModelRegistry.get_predictor)
+            symbols: Universe; defaults to data_sources.crypto_symbols
+            embedding_dim: Defaults to pooled_model.embedding_dim
+        """
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.data_provider = get_data_provider(data_provider)
+        self.embedding_dim = embedding_dim or get_section('pooled_model').get('embedding_dim', 8)
+        self._model = None
+        self._model_version = None
+        self.results = None  # Validation metrics of the last train()
+        self.members: Dict[str, PooledMemberPredictor] = {}
+        self.set_symbols(symbols or get_section('data_sources').get('crypto_symbols', ['BTC-USD']))
+
+    @property
+    def symbols(self) -> List[str]:
+        return list(self.members)
+
+    def set_symbols(self, symbols: List[str]):
+        """Rebuild the members for a universe (symbol ids follow the list order)"""
+        self.members = {
+            symbol: PooledMemberPredictor(symbol, self.timeframe, self.data_provider,
+                                          symbol_id, len(symbols), self.embedding_dim)
+            for symbol_id, symbol in enumerate(symbols)
+        }
+        for member in self.members.values():
+            member.model, member.model_version = self._model, self._model_version
+
+    @property
+    def template(self) -> PooledMemberPredictor:
+        """First member; lookback window, architecture and training settings are shared"""
+        return next(iter(self.members.values()))
+
+    @property
+    def model(self):
+        return self._model
+
+    @model.setter
+    def model(self, model):
+        self._model = model
+        for member in self.members.values():
+            member.model = model
+
+    @property
+    def model_version(self):
+        return self._model_version
+
+    @model_version.setter
+    def model_version(self, version):
+        self._model_version = version
+        for member in self.members.values():
+            member.model_version = version
+
+    @property
+    def feature_scaler(self) -> Dict:
+        return {symbol: member.feature_scaler for symbol, member in self.members.items()}
+
+    @feature_scaler.setter
+    def feature_scaler(self, scalers: Dict):
+        for symbol, member in self.members.items():
+            member.feature_scaler = scalers[symbol]
+
+    def get_model_config(self):
+        """Member settings plus the universe; the registry hashes its features and lookback"""
+        return dict(
+            self.template.get_model_config(),
+            symbol=self.symbol,
+            pooled=True,
+            symbols=self.symbols,
+            embedding_dim=self.embedding_dim
+        )
+
+    def apply_model_config(self, config):
+        self.symbol = config['symbol']
+        self.timeframe = config['timeframe']
+        self.embedding_dim = config['embedding_dim']
+        self.set_symbols(config['symbols'])
+        for symbol, member in self.members.items():
+            member.apply_model_config(dict(config, symbol=symbol))
+
+    def fetch_universe(self, period: str = '2y') -> Dict[str, pd.DataFrame]:
+        """OHLCV data per symbol (symbols without data are left out)"""
+        data = {symbol: member.fetch_comprehensive_data(period) for symbol, member in self.members.items()}
+        return {symbol: frame for symbol, frame in data.items() if frame is not None and not frame.empty}
+
+    def train(self, data_by_symbol: Dict[str, pd.DataFrame], epochs: Optional[int] = None):
+        """
+        Train the pooled network on every symbol's windows
+
+        Each symbol's scaler is fitted on its own features. Samples of all
+        symbols are ordered by bar time and the latest validation_split of
+        them is held out, so validation bars come after every training bar.
+
+        Args:
+            data_by_symbol: OHLCV data per member symbol
+            epochs: Defaults to training_settings.epochs
+
+        Returns:
+            Keras History
+        """
+        settings = self.template.training_settings
+        epochs = epochs or settings['epochs']
+        missing = [symbol for symbol in self.members if symbol not in data_by_symbol]
+        if missing:
+            raise ValueError(f"No data for pooled symbols: {missing}")
+
+        print(f"🌐 Preparing pooled training data for {len(self.members)} symbols...")
+        windows, targets, ids, positions, times = [], [], [], [], []
+        for symbol, member in self.members.items():
+            df = member.prepare_features(data_by_symbol[symbol])
+            X, y, _, indices = member.create_lstm_sequences(df)
+            member.trained_through = str(indices[-1])
+            windows.append(X)
+            targets.append(y)
+            ids.append(np.full(len(X), member.symbol_id))
+            positions.append(np.arange(len(X)))
+            times.append(pd.DatetimeIndex(indices).asi8)
+
+        order = np.argsort(np.concatenate(times), kind='stable')
+        ids, positions = np.concatenate(ids)[order], np.concatenate(positions)[order]
+        cut = int(len(order) * (1 - settings['validation_split']))
+        batch_size = settings['batch_size']
+        train = PooledWindows(windows, targets, ids[:cut], positions[:cut], batch_size, shuffle=True)
+        validation = PooledWindows(windows, targets, ids[cut:], positions[cut:], batch_size)
+        print(f"📈 Pooled samples: {cut} train, {len(order) - cut} validation")
+
+        model = self.template.build_advanced_lstm_model((windows[0].shape[1], windows[0].shape[2] + 1))
+        callbacks = [
+            EarlyStopping(monitor='val_accuracy', patience=settings['early_stopping_patience'],
+                          restore_best_weights=True, verbose=0),
+            ReduceLROnPlateau(monitor='val_loss', patience=settings['reduce_lr_patience'],
+                              factor=settings['reduce_lr_factor'], min_lr=settings['min_learning_rate'], verbose=0)
+        ]
+        with self.template.profiler.span('model.fit', rows=cut):
+            history = model.fit(train, validation_data=validation, epochs=epochs, callbacks=callbacks, verbose=0)
+
+        # Per-symbol accuracy on the held-out bars
+        predicted = (model.predict(validation, verbose=0)[:, 0] > 0.5).astype(int)
+        val_ids, val_positions = ids[cut:], positions[cut:]
+        per_symbol = {}
+        for symbol, member in self.members.items():
+            mask = val_ids == member.symbol_id
+            if mask.any():
+                per_symbol[symbol] = float(np.mean(predicted[mask] == targets[member.symbol_id][val_positions[mask]]))
+
+        self.model = model
+        self.model_version = None
+        self.results = {
+            'symbols': self.symbols,
+            'train_samples': cut,
+            'validation_samples': int(len(order) - cut),
+            'epochs': len(history.epoch),
+            'val_accuracy': float(max(history.history['val_accuracy'])),
+            'per_symbol_accuracy': per_symbol
+        }
+        print(f"🏆 Pooled validation accuracy: {self.results['val_accuracy']:.3f} over {len(self.members)} symbols")
+        return history
+
+    def predict_universe(self, data_by_symbol: Dict[str, pd.DataFrame]) -> Dict[str, Dict]:
+        """
+        Signals for the latest bar of every given symbol from one forward pass
+
+        Returns:
+            Symbol -> signal dict (as from predict_with_advanced_confidence)
+        """
+        if self.model is None:
+            raise ValueError("Model not trained. Call train() first.")
+
+        inputs = {symbol: self.members[symbol].prepare_prediction_input(data)
+                  for symbol, data in data_by_symbol.items()}
+        with self.template.profiler.span('model.predict', rows=len(inputs)):
+            outputs = np.asarray(self.model.predict_on_batch(np.concatenate([X for _, X in inputs.values()])))
+
+        signals = {}
+        for (symbol, (df, _)), output in zip(inputs.items(), outputs):
+            signals[symbol], _, _ = self.members[symbol].signal_from_prediction(df, float(output[0]))
+        return signals
+
+
+__all__ = ['PooledCryptoPredictor', 'PooledMemberPredictor', 'PooledWindows', 'SymbolEmbedding',
+           'build_pooled_lstm_model', 'with_symbol_channel', 'POOLED_SYMBOL']
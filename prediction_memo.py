@@ -0,0 +1,150 @@
+"""
+Prediction Memo
+Process-wide cache of signal dicts keyed by model version, symbol, timeframe and last closed bar
+"""
+
+import copy
+import threading
+import time
+import uuid
+import weakref
+from collections import OrderedDict
+from typing import Callable, Hashable, Optional, Tuple
+
+import pandas as pd
+
+from app_config import get_section
+from synthetic_data import timeframe_to_minutes
+
+_memo = None
+_memo_lock = threading.Lock()
+
+# Token per live model object; unlike id(), never handed to a later model
+_model_tokens = weakref.WeakKeyDictionary()
+_model_tokens_lock = threading.Lock()
+
+
+def last_closed_bar(timeframe: str, now: Optional[pd.Timestamp] = None) -> pd.Timestamp:
+    """Open time (UTC) of the most recent fully closed bar of a timeframe"""
+    now = pd.Timestamp.now(tz='UTC') if now is None else pd.Timestamp(now)
+    bar = pd.Timedelta(minutes=timeframe_to_minutes(timeframe))
+    return now.floor(bar) - bar
+
+
+def model_token(model) -> Optional[str]:
+    """Random token assigned to a model object on first use and dropped with it"""
+    if model is None:
+        return None
+    with _model_tokens_lock:
+        token = _model_tokens.get(model)
+        if token is None:
+            token = _model_tokens[model] = f"model-{uuid.uuid4().hex}"
+        return token
+
+
+def memo_key(predictor, now: Optional[pd.Timestamp] = None) -> Tuple:
+    """
+    (model version, symbol, timeframe, last closed bar) for a predictor
+
+    Predictors without a registry version are keyed by a token of their
+    model object, so sessions only share results when they share the model.
+    """
+    version = getattr(predictor, 'model_version', None)
+    if version is None:
+        version = model_token(predictor.model)
+    return version, predictor.symbol, predictor.timeframe, last_closed_bar(predictor.timeframe, now)
+
+
+class PredictionMemo:
+    """
+    Thread-safe LRU of prediction results with a time-to-live
+
+    Concurrent misses for the same key compute once; the other callers wait
+    and receive the same result. Callers get copies, so a session mutating its
+    signal dict does not affect the others.
+    """
+
+    def __init__(self, ttl_seconds: float = 300, max_entries: int = 256):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (stored_at, value)
+        self._lock = threading.Lock()
+        self._computing = {}  # key -> lock, so concurrent misses compute once
+        self.stats = {'hits': 0, 'misses': 0, 'expired': 0, 'evictions': 0}
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def _lookup(self, key: Hashable):
+        """Cached value or None; caller holds self._lock"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[0] > self.ttl_seconds:
+            del self._entries[key]
+            self.stats['expired'] += 1
+            return None
+        self._entries.move_to_end(key)
+        self.stats['hits'] += 1
+        return entry[1]
+
+    def get(self, key: Hashable):
+        """Copy of the cached value for key, or None"""
+        with self._lock:
+            value = self._lookup(key)
+        return copy.deepcopy(value) if value is not None else None
+
+    def put(self, key: Hashable, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), copy.deepcopy(value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats['evictions'] += 1
+
+    def get_or_compute(self, key: Hashable, compute: Callable):
+        """
+        Cached value for key, calling compute() on a miss
+
+        A None result is returned but not cached (e.g. no market data).
+        """
+        with self._lock:
+            value = self._lookup(key)
+            if value is not None:
+                return copy.deepcopy(value)
+            key_lock = self._computing.setdefault(key, threading.Lock())
+
+        with key_lock:
+            with self._lock:
+                value = self._lookup(key)
+            if value is not None:
+                return copy.deepcopy(value)
+
+            try:
+                value = compute()
+                with self._lock:
+                    self.stats['misses'] += 1
+                if value is not None:
+                    self.put(key, value)
+            finally:
+                with self._lock:
+                    self._computing.pop(key, None)
+            return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def get_prediction_memo() -> PredictionMemo:
+    """Process-wide memo sized by the prediction_memo section of config.json"""
+    global _memo
+    with _memo_lock:
+        if _memo is None:
+            settings = get_section('prediction_memo')
+            _memo = PredictionMemo(settings.get('ttl_seconds', 300), settings.get('max_entries', 256))
+    return _memo
+
+
+__all__ = ['PredictionMemo', 'get_prediction_memo', 'memo_key', 'model_token', 'last_closed_bar']
@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+Retrain Scheduler
+Daemon that retrains or fine-tunes registered models only when feature drift or live accuracy says they degraded
+"""
+
+import argparse
+import json
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from app_config import get_section
+from drift_monitor import population_stability
+from model_refresh import refresh_model, retrain_model
+from model_registry import ModelRegistry
+
+DEFAULT_SCHEDULER_SETTINGS = {
+    'check_interval_seconds': 3600,
+    'data_period': '1mo',
+    'retrain_period': '2y',
+    'training_slots': 2,
+    'drift_window': 500,
+    'drift_feature_threshold': 0.5,  # Population stability index of one feature
+    'max_drifted_fraction': 0.15,
+    'accuracy_window': 200,
+    'min_signals': 50,
+    'min_accuracy': 0.5,
+    'min_model_age_hours': 24,
+    'ledger_dir': 'logs/signals'
+}
+
+
+def get_scheduler_settings() -> Dict:
+    """retrain_scheduler from config.json, with defaults for missing keys"""
+    settings = dict(DEFAULT_SCHEDULER_SETTINGS)
+    settings.update(get_section('retrain_scheduler'))
+    return settings
+
+
+class SignalLedger:
+    """
+    Append-only log of emitted signals as <root>/<symbol>/<timeframe>.jsonl
+
+    The signal service appends to it; the scheduler reads it back to score
+    the signals once the bar after them has closed.
+    """
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = Path(root or get_scheduler_settings()['ledger_dir'])
+        self._lock = threading.Lock()
+
+    def path(self, symbol: str, timeframe: str) -> Path:
+        return self.root / symbol / f"{timeframe}.jsonl"
+
+    def record(self, signal: Dict):
+        """Append a signal dict from SignalService.predict (skipped if the model was not run)"""
+        if signal.get('prediction_value') is None:
+            return
+        line = json.dumps({
+            'bar_time': signal['bar_time'],
+            'model_version': signal.get('model_version'),
+            'prediction': float(signal['prediction_value'])
+        })
+        path = self.path(signal['symbol'], signal['timeframe'])
+        with self._lock:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, 'a') as f:
+                f.write(line + '\n')
+
+    def signals(self, symbol: str, timeframe: str, model_version: Optional[int] = None) -> pd.DataFrame:
+        """
+        Recorded signals, one row per bar (the latest prediction for it)
+
+        Returns:
+            Frame indexed by bar time with a prediction column
+        """
+        path = self.path(symbol, timeframe)
+        rows = []
+        if path.exists():
+            with open(path) as f:
+                rows = [json.loads(line) for line in f if line.strip()]
+        if model_version is not None:
+            rows = [row for row in rows if row['model_version'] == model_version]
+        if not rows:
+            return pd.DataFrame({'prediction': []}, index=pd.DatetimeIndex([]))
+
+        frame = pd.DataFrame(rows)
+        frame.index = pd.DatetimeIndex(pd.to_datetime(frame.pop('bar_time')))
+        return frame[~frame.index.duplicated(keep='last')].sort_index()[['prediction']]
+
+
+def live_accuracy(signals: pd.DataFrame, data: pd.DataFrame, window: int = 200) -> Dict:
+    """
+    Directional hit rate of the most recent resolved signals
+
+    A signal is resolved once the bar after it has closed; it is correct
+    when a prediction above 0.5 is followed by a higher close (or one
+    below 0.5 by a lower or equal close), which is the model's Binary_Target.
+
+    Returns:
+        {'accuracy': float or None, 'signals': resolved signals scored}
+    """
+    positions = data.index.get_indexer(signals.index)
+    resolved = (positions >= 0) & (positions + 1 < len(data))
+    if not resolved.any():
+        return {'accuracy': None, 'signals': 0}
+
+    close = data['Close'].to_numpy()
+    positions = positions[resolved][-window:]
+    predicted_up = signals['prediction'].to_numpy()[resolved][-window:] > 0.5
+    went_up = close[positions + 1] > close[positions]
+    return {'accuracy': float(np.mean(predicted_up == went_up)), 'signals': int(len(positions))}
+
+
+def feature_drift(predictor, df: pd.DataFrame, window: int = 500, threshold: float = 0.5) -> Dict:
+    """
+    Population stability of recent features against the reference saved at fit time
+
+    The predictor keeps quantile bins of the last drift_window rows it was
+    fitted on (drift_monitor.build_drift_reference); the last `window` rows
+    of df are scaled the same way and binned against them. Level features
+    (prices, moving averages, bands, cumulative volume) are not scored.
+    Models registered without a reference report no drift.
+
+    Returns:
+        {'drifted_fraction', 'drifted_features' (worst first), 'scores'}
+    """
+    reference = getattr(predictor, 'drift_reference', None)
+    if not reference:
+        return {'drifted_fraction': 0.0, 'drifted_features': [], 'scores': {}}
+
+    features = [f for f in predictor.selected_features if f in df.columns]
+    scaled = predictor.feature_scaler.transform(df[features].tail(window).to_numpy(dtype=np.float64))
+    scores = population_stability(reference, features, scaled)
+
+    ranked = sorted(scores, key=scores.get, reverse=True)
+    drifted = [name for name in ranked if scores[name] > threshold]
+    return {
+        'drifted_fraction': len(drifted) / len(scores) if scores else 0.0,
+        'drifted_features': drifted,
+        'scores': {name: scores[name] for name in ranked}
+    }
+
+
+class RetrainScheduler:
+    """
+    Checks every registered model on a fixed interval and queues training
+    only for the degraded ones
+
+    Feature drift past max_drifted_fraction queues a full retrain (the
+    scaler itself is stale); live accuracy below min_accuracy over at least
+    min_signals resolved signals queues a fine-tune. At most training_slots
+    jobs train at once; a model with a job queued or running, or registered
+    less than min_model_age_hours ago, is not checked again.
+    """
+
+    def __init__(self, registry: Optional[ModelRegistry] = None, ledger: Optional[SignalLedger] = None,
+                 data_provider=None, slots: Optional[int] = None, settings: Optional[Dict] = None):
+        self.settings = dict(get_scheduler_settings(), **(settings or {}))
+        self.registry = registry or ModelRegistry(get_section('signal_service').get('registry_root', 'models/registry'))
+        self.ledger = ledger or SignalLedger(self.settings['ledger_dir'])
+        self.data_provider = data_provider
+        self.slots = slots or self.settings['training_slots']
+        self._executor = ThreadPoolExecutor(max_workers=self.slots, thread_name_prefix='retrain')
+        self._lock = threading.Lock()
+        self.jobs: Dict[tuple, Future] = {}  # (symbol, timeframe) -> queued or running job
+        self.completed: List[Dict] = []
+
+    def assess(self, symbol: str, timeframe: str, data: Optional[pd.DataFrame] = None) -> Dict:
+        """
+        Drift and live accuracy of the latest registered model
+
+        Returns:
+            Assessment dict; 'action' is 'retrain', 'fine_tune' or None
+        """
+        settings = self.settings
+        predictor = self.registry.get_predictor(symbol, timeframe)
+        if self.data_provider is not None:
+            from data_providers import get_data_provider
+            predictor.data_provider = get_data_provider(self.data_provider)
+        if data is None:
+            data = predictor.fetch_comprehensive_data(settings['data_period'])
+            if data is None or data.empty:
+                return {'symbol': symbol, 'timeframe': timeframe, 'action': None, 'reason': 'no data'}
+
+        df = predictor.prepare_features(data)
+        drift = feature_drift(predictor, df, settings['drift_window'], settings['drift_feature_threshold'])
+        signals = self.ledger.signals(symbol, timeframe, predictor.model_version)
+        accuracy = live_accuracy(signals, data, settings['accuracy_window'])
+
+        action, reason = None, 'healthy'
+        if drift['drifted_fraction'] > settings['max_drifted_fraction']:
+            action = 'retrain'
+            reason = (f"{drift['drifted_fraction']:.0%} of features drifted "
+                      f"({', '.join(drift['drifted_features'][:3])})")
+        elif accuracy['signals'] >= settings['min_signals'] and accuracy['accuracy'] < settings['min_accuracy']:
+            action = 'fine_tune'
+            reason = f"live accuracy {accuracy['accuracy']:.1%} over {accuracy['signals']} signals"
+
+        return {
+            'symbol': symbol,
+            'timeframe': timeframe,
+            'model_version': predictor.model_version,
+            'action': action,
+            'reason': reason,
+            'drifted_fraction': drift['drifted_fraction'],
+            'drifted_features': drift['drifted_features'],
+            'live_accuracy': accuracy['accuracy'],
+            'resolved_signals': accuracy['signals']
+        }
+
+    def submit(self, assessment: Dict, data: Optional[pd.DataFrame] = None) -> Optional[Future]:
+        """Queue the assessment's action unless the model already has a job"""
+        key = (assessment['symbol'], assessment['timeframe'])
+        with self._lock:
+            if assessment['action'] is None or key in self.jobs:
+                return None
+            future = self._executor.submit(self._train, assessment, data)
+            self.jobs[key] = future
+        print(f"🗓️ Queued {assessment['action']} for {key[0]} {key[1]}: {assessment['reason']}")
+        return future
+
+    def _train(self, assessment: Dict, data: Optional[pd.DataFrame]) -> Optional[Dict]:
+        symbol, timeframe = assessment['symbol'], assessment['timeframe']
+        started = time.time()
+        entry, error = None, None
+        try:
+            if assessment['action'] == 'retrain':
+                entry = retrain_model(self.registry, symbol, timeframe, data,
+                                      self.settings['retrain_period'], self.data_provider)
+            else:
+                entry = refresh_model(self.registry, symbol, timeframe, data,
+                                      self.settings['data_period'], self.data_provider)
+            return entry
+        except Exception as e:
+            error = str(e)
+            print(f"❌ {assessment['action']} failed for {symbol} {timeframe}: {e}")
+            return None
+        finally:
+            with self._lock:
+                self.jobs.pop((symbol, timeframe), None)
+                self.completed.append(dict(
+                    assessment,
+                    new_version=entry['version'] if entry else None,
+                    error=error,
+                    seconds=round(time.time() - started, 1)
+                ))
+
+    def _recently_registered(self, symbol: str, timeframe: str) -> bool:
+        entry = self.registry.resolve(symbol, timeframe)
+        created = time.mktime(time.strptime(entry['created_at'], '%Y-%m-%dT%H:%M:%S'))
+        return time.time() - created < self.settings['min_model_age_hours'] * 3600
+
+    def check_all(self) -> List[Dict]:
+        """
+        Assess every registered symbol/timeframe and queue the degraded ones
+
+        Pooled cross-asset models are not assessed (see model_refresh.refresh_all).
+
+        Returns:
+            Assessments of the models that were checked
+        """
+        from pooled_model import POOLED_SYMBOL
+        pairs = sorted({(entry['symbol'], entry['timeframe']) for entry in self.registry.list()
+                        if entry['symbol'] != POOLED_SYMBOL})
+        assessments = []
+        for symbol, timeframe in pairs:
+            with self._lock:
+                busy = (symbol, timeframe) in self.jobs
+            if busy or self._recently_registered(symbol, timeframe):
+                continue
+            try:
+                assessment = self.assess(symbol, timeframe)
+            except Exception as e:
+                print(f"❌ Could not assess {symbol} {timeframe}: {e}")
+                continue
+            assessments.append(assessment)
+            self.submit(assessment)
+        return assessments
+
+    def run(self, interval_seconds: Optional[float] = None, iterations: Optional[int] = None):
+        """Check all models every interval_seconds (forever unless iterations is given)"""
+        interval = interval_seconds if interval_seconds is not None else self.settings['check_interval_seconds']
+        done = 0
+        try:
+            while iterations is None or done < iterations:
+                assessments = self.check_all()
+                queued = sum(assessment['action'] is not None for assessment in assessments)
+                print(f"🩺 Checked {len(assessments)} models, {queued} queued, {len(self.jobs)} in training")
+                done += 1
+                if iterations is None or done < iterations:
+                    time.sleep(interval)
+        finally:
+            self.shutdown()
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)
+
+
+__all__ = ['RetrainScheduler', 'SignalLedger', 'feature_drift', 'live_accuracy',
+           'get_scheduler_settings', 'DEFAULT_SCHEDULER_SETTINGS']
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Retrain registered models when they drift or degrade")
+    parser.add_argument('--registry', default=get_section('signal_service').get('registry_root', 'models/registry'))
+    parser.add_argument('--provider', help="Data provider name (defaults to config.json)")
+    parser.add_argument('--slots', type=int, help="Concurrent training jobs")
+    parser.add_argument('--interval', type=float, help="Seconds between checks")
+    parser.add_argument('--once', action='store_true', help="Check once, wait for the jobs and exit")
+    args = parser.parse_args(argv)
+
+    scheduler = RetrainScheduler(ModelRegistry(args.registry), data_provider=args.provider, slots=args.slots)
+    scheduler.run(args.interval, iterations=1 if args.once else None)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -113,10 +113,11 @@ def test_installation():
         import tensorflow as tf
         import yfinance as yf
         import streamlit as st
-        import talib
         import plotly
+        from indicator_backend import get_indicator_backend, get_backend_name
         
         print("✅ All core packages imported successfully")
+        print(f"📊 Indicator backend: {get_backend_name(get_indicator_backend())}")
         
         # Test TensorFlow GPU (if available)
         if tf.config.list_physical_devices('GPU'):
@@ -163,7 +164,7 @@ def main():
     
     # Install TA-Lib
     if not install_talib():
-        print("⚠️ TA-Lib installation issues - some features may not work")
+        print("⚠️ TA-Lib installation issues - indicators will use the Numba backend")
     
     # Test installation
     if not test_installation():
@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+Signal Serving Service
+HTTP/JSON ASGI app serving predict_with_advanced_confidence with request micro-batching
+
+Run with: uvicorn signal_service:app --host 127.0.0.1 --port 8000
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app_config import get_section
+from data_providers import get_data_provider
+
+
+def to_jsonable(value):
+    """Convert numpy/pandas values in a signal dict into plain JSON types"""
+    if isinstance(value, dict):
+        return {str(key): to_jsonable(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_jsonable(item) for item in value]
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    if isinstance(value, (pd.Timestamp, np.datetime64)):
+        return pd.Timestamp(value).isoformat()
+    return value
+
+
+class MicroBatcher:
+    """
+    Collects concurrent model calls for a few milliseconds and runs each
+    model once on the stacked inputs
+
+    Requests for the same model key share one forward pass; different
+    models flushed in the same window run side by side in worker threads.
+    """
+
+    def __init__(self, window_ms: float = 5.0, max_batch: int = 64):
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        # key -> (model, [(X, future), ...]); models are only referenced while a batch is pending
+        self._pending: Dict[object, Tuple[object, List]] = {}
+        self._timer = None
+        self.stats = {'requests': 0, 'batches': 0, 'largest_batch': 0}
+
+    async def predict(self, key, model, X: np.ndarray) -> np.ndarray:
+        """Model output for X (rows in the same order), computed as part of a batch"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.setdefault(key, (model, []))[1].append((X, future))
+        self.stats['requests'] += 1
+
+        if len(self._pending[key][1]) >= self.max_batch:
+            self._start(*self._pending.pop(key))
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+
+        return await future
+
+    def _flush(self):
+        self._timer = None
+        pending, self._pending = self._pending, {}
+        for model, items in pending.values():
+            self._start(model, items)
+
+    def _start(self, model, items):
+        asyncio.ensure_future(self._run(model, items))
+
+    async def _run(self, model, items):
+        self.stats['batches'] += 1
+        self.stats['largest_batch'] = max(self.stats['largest_batch'], len(items))
+        try:
+            batch = np.concatenate([X for X, _ in items])
+            outputs = np.asarray(await asyncio.to_thread(model.predict_on_batch, batch))
+        except Exception as e:
+            for _, future in items:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        start = 0
+        for X, future in items:
+            if not future.done():
+                future.set_result(outputs[start:start + len(X)])
+            start += len(X)
+
+
+class SignalService:
+    """
+    ASGI application keeping predictors and models warm
+
+    Routes:
+        GET  /health          liveness and number of loaded predictors
+        GET  /stats           micro-batching and cascade statistics
+        POST /predict         {"symbol": "BTC-USD", "timeframe": "1h"} -> signal dict
+        POST /predict/batch   {"requests": [{"symbol": ..., "timeframe": ...}, ...]}
+    """
+
+    def __init__(self, registry=None, data_provider=None, period: Optional[str] = None,
+                 window_ms: Optional[float] = None, max_batch: Optional[int] = None,
+                 data_ttl_seconds: Optional[float] = None, cascade: Optional[bool] = None, ledger=None,
+                 pooled: Optional[bool] = None, max_predictors: Optional[int] = None):
+        settings = get_section('signal_service')
+        self._registry = registry
+        self.registry_root = settings.get('registry_root', 'models/registry')
+        self.data_provider = get_data_provider(data_provider) if data_provider is not None else None
+        self.period = period or settings.get('data_period', '1mo')
+        self.data_ttl = data_ttl_seconds if data_ttl_seconds is not None else settings.get('data_ttl_seconds', 30)
+        self.batcher = MicroBatcher(
+            window_ms if window_ms is not None else settings.get('batch_window_ms', 5),
+            max_batch or settings.get('max_batch_size', 64)
+        )
+        # Skip the model for symbols whose latest bar is already vetoed by the rule gates
+        self.cascade = cascade if cascade is not None else settings.get('cascade', False)
+        self.skipped = 0
+        # Emitted signals are logged for the retrain scheduler's live accuracy
+        if ledger is None and settings.get('record_signals', False):
+            from retrain_scheduler import SignalLedger
+            ledger = SignalLedger()
+        self.ledger = ledger
+        # Serve symbols from the timeframe's pooled cross-asset model instead of per-symbol models
+        self.pooled = pooled if pooled is not None else settings.get('pooled', False)
+        # Registry-loaded predictors are kept in LRU order and capped; added ones are pinned
+        self.max_predictors = max_predictors or settings.get('max_predictors', 256)
+        self.predictors: 'OrderedDict[Tuple[str, str], object]' = OrderedDict()
+        self._pinned = set()
+        self._inputs: Dict[Tuple[str, str], Tuple[float, object, np.ndarray]] = {}
+        self._input_locks: Dict[Tuple[str, str], asyncio.Lock] = {}
+
+    @property
+    def registry(self):
+        if self._registry is None:
+            from model_registry import ModelRegistry
+            self._registry = ModelRegistry(self.registry_root)
+        return self._registry
+
+    def add_predictor(self, predictor, pinned: bool = True):
+        """
+        Serve an in-memory predictor (instead of loading from the registry)
+
+        Args:
+            pinned: Keep it regardless of max_predictors (registry-loaded
+                predictors are not pinned and can be reloaded once evicted)
+        """
+        key = (predictor.symbol, predictor.timeframe)
+        self.predictors[key] = predictor
+        self.predictors.move_to_end(key)
+        if pinned:
+            self._pinned.add(key)
+        if self.data_provider is not None:
+            predictor.data_provider = self.data_provider
+
+    def get_predictor(self, symbol: str, timeframe: str):
+        key = (symbol, timeframe)
+        if key in self.predictors:
+            self.predictors.move_to_end(key)
+            return self.predictors[key]
+
+        if self.pooled:
+            from pooled_model import POOLED_SYMBOL, PooledCryptoPredictor
+            pooled = self.registry.get_predictor(POOLED_SYMBOL, timeframe, predictor_cls=PooledCryptoPredictor)
+            if symbol not in pooled.members:
+                raise LookupError(f"{symbol} is not in the pooled {timeframe} model")
+            self.add_pooled(pooled, pinned=False)
+            predictor = pooled.members[symbol]
+        else:
+            predictor = self.registry.get_predictor(symbol, timeframe)
+            self.add_predictor(predictor, pinned=False)
+        self._evict(keep=key)
+        return predictor
+
+    def add_pooled(self, pooled, pinned: bool = True):
+        """Serve every symbol of a PooledCryptoPredictor; their requests share forward passes"""
+        for member in pooled.members.values():
+            self.add_predictor(member, pinned)
+
+    def _evict(self, keep=None):
+        """Drop the least recently used unpinned predictors (and their cached inputs) beyond max_predictors"""
+        excess = len(self.predictors) - self.max_predictors
+        for key in [key for key in self.predictors if key not in self._pinned and key != keep][:max(excess, 0)]:
+            del self.predictors[key]
+            self._inputs.pop(key, None)
+            self._input_locks.pop(key, None)
+
+    async def _prediction_input(self, predictor):
+        """Features for the latest bar, shared by requests within the data TTL"""
+        key = (predictor.symbol, predictor.timeframe)
+        lock = self._input_locks.setdefault(key, asyncio.Lock())
+
+        async with lock:
+            cached = self._inputs.get(key)
+            if cached is not None and time.monotonic() - cached[0] < self.data_ttl:
+                return cached[1], cached[2]
+
+            data = await asyncio.to_thread(predictor.fetch_comprehensive_data, self.period)
+            if data is None or data.empty:
+                raise LookupError(f"No market data for {predictor.symbol} {predictor.timeframe}")
+            df, X = await asyncio.to_thread(predictor.prepare_prediction_input, data)
+            self._inputs[key] = (time.monotonic(), df, X)
+            return df, X
+
+    async def predict(self, symbol: str, timeframe: str = '1h') -> Dict:
+        """Full signal dict for one symbol/timeframe"""
+        predictor = self.get_predictor(symbol, timeframe)
+        if predictor.model is None:
+            raise LookupError(f"No trained model for {symbol} {timeframe}")
+
+        df, X = await self._prediction_input(predictor)
+        veto = predictor.pre_model_veto(df) if self.cascade else None
+
+        if veto is not None:
+            self.skipped += 1
+            signal, latest_row, _ = predictor.signal_from_prediction(df, None, veto)
+        else:
+            # Predictors sharing one model object (e.g. a pooled model) are batched together
+            model_key = getattr(predictor.model, 'key', None) or id(predictor.model)
+            output = await self.batcher.predict(model_key, predictor.model, X)
+
+            # Sub-millisecond, so it runs inline rather than hopping to a thread
+            signal, latest_row, _ = predictor.signal_from_prediction(df, float(output[0][0]))
+        signal.update({
+            'symbol': symbol,
+            'timeframe': timeframe,
+            'model_version': predictor.model_version,
+            'bar_time': df.index[-1]
+        })
+        signal = to_jsonable(signal)
+        if self.ledger is not None:
+            self.ledger.record(signal)
+        return signal
+
+    async def _route(self, method: str, path: str, body: bytes):
+        if method == 'GET' and path == '/health':
+            return 200, {'status': 'ok', 'predictors': len(self.predictors)}
+        if method == 'GET' and path == '/stats':
+            return 200, dict(self.batcher.stats, skipped=self.skipped)
+
+        if method == 'POST' and path in ('/predict', '/predict/batch'):
+            payload = json.loads(body or b'{}')
+            if not isinstance(payload, dict):
+                raise ValueError("Request body must be a JSON object")
+            items = [payload] if path == '/predict' else payload.get('requests', [])
+            if not isinstance(items, list):
+                raise ValueError("'requests' must be a list")
+            for i, item in enumerate(items):
+                if not isinstance(item, dict) or not isinstance(item.get('symbol'), str):
+                    raise ValueError(f"Request {i} needs a 'symbol' string")
+                if not isinstance(item.get('timeframe', '1h'), str):
+                    raise ValueError(f"Request {i} has a non-string 'timeframe'")
+            if path == '/predict':
+                return 200, await self.predict(payload['symbol'], payload.get('timeframe', '1h'))
+
+            results = await asyncio.gather(
+                *(self.predict(item['symbol'], item.get('timeframe', '1h')) for item in items),
+                return_exceptions=True
+            )
+            return 200, {'results': [
+                {'error': str(result)} if isinstance(result, Exception) else result for result in results
+            ]}
+
+        return 404, {'error': f"No route for {method} {path}"}
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            while True:
+                message = await receive()
+                if message['type'] == 'lifespan.startup':
+                    await send({'type': 'lifespan.startup.complete'})
+                elif message['type'] == 'lifespan.shutdown':
+                    await send({'type': 'lifespan.shutdown.complete'})
+                    return
+
+        if scope['type'] != 'http':
+            return
+
+        body = b''
+        while True:
+            message = await receive()
+            body += message.get('body', b'')
+            if not message.get('more_body'):
+                break
+
+        try:
+            status, payload = await self._route(scope['method'], scope['path'], body)
+        except (KeyError, LookupError) as e:
+            status, payload = 404, {'error': str(e)}
+        except (ValueError, TypeError) as e:
+            status, payload = 400, {'error': str(e)}
+        except Exception as e:
+            status, payload = 500, {'error': str(e)}
+
+        response = json.dumps(payload).encode('utf-8')
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': [(b'content-type', b'application/json'),
+                        (b'content-length', str(len(response)).encode())]
+        })
+        await send({'type': 'http.response.body', 'body': response})
+
+
+app = SignalService()
+
+
+def main(argv=None):
+    settings = get_section('signal_service')
+    parser = argparse.ArgumentParser(description="Serve trading signals over HTTP")
+    parser.add_argument('--host', default=settings.get('host', '127.0.0.1'))
+    parser.add_argument('--port', type=int, default=settings.get('port', 8000))
+    args = parser.parse_args(argv)
+
+    try:
+        import uvicorn
+    except ImportError:
+        print("❌ uvicorn is not installed. Run: pip install uvicorn")
+        return 1
+
+    uvicorn.run(app, host=args.host, port=args.port, log_level='warning')
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
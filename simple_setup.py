@@ -124,7 +124,7 @@ def install_talib():
         except subprocess.CalledProcessError:
             continue
     
-    print("⚠️ TA-Lib installation failed - some features may not work")
+    print("⚠️ TA-Lib installation failed - indicators will use the Numba backend")
     return False
 
 def install_tensorflow():
@@ -171,8 +171,8 @@ yfinance>=0.2.0
 plotly>=5.0.0
 requests>=2.25.0
 
-# Technical analysis (try talib-binary if TA-Lib fails)
-talib-binary>=0.4.0
+# Technical analysis (TA-Lib is optional - the Numba backend is used without it)
+numba>=0.57.0
 
 # Machine learning (CPU version is fine)
 tensorflow-cpu>=2.10.0
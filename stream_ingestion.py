@@ -0,0 +1,216 @@
+"""
+Streaming Market Data Ingestion
+Subscribes to exchange candle/trade streams through the ccxt.pro interface and emits closed bars
+"""
+
+import asyncio
+import inspect
+from typing import Callable, List, Optional
+
+import pandas as pd
+
+from app_config import get_section
+from candle_store import CandleStore
+from data_providers import OHLCV_COLUMNS, market_symbol
+from synthetic_data import timeframe_to_minutes
+
+# 1970-01-01 was a Thursday; weekly buckets start on Monday 1970-01-05
+WEEK_OFFSET_MS = 4 * 24 * 60 * 60 * 1000
+
+# Raised by stream clients (e.g. the fake exchange) when a finite stream is exhausted
+STREAM_END_ERRORS = (EOFError,)
+
+
+class CandleAssembler:
+    """
+    Builds candles from trades or exchange kline updates
+
+    A candle is closed once data for a later bucket arrives (or on flush()).
+    Candles are [timestamp_ms, open, high, low, close, volume] lists.
+    """
+
+    def __init__(self, timeframe: str = '1m'):
+        self.timeframe = timeframe
+        self.bar_ms = timeframe_to_minutes(timeframe) * 60_000
+        self.offset_ms = WEEK_OFFSET_MS if timeframe == '1w' else 0
+        self.current: Optional[list] = None
+
+    def bucket(self, timestamp: int) -> int:
+        return timestamp - (timestamp - self.offset_ms) % self.bar_ms
+
+    def add_trade(self, timestamp: int, price: float, amount: float) -> List[list]:
+        """Fold one trade into the open candle; returns candles closed by it"""
+        bucket = self.bucket(timestamp)
+        closed = []
+
+        if self.current is not None and bucket > self.current[0]:
+            closed.append(self.current)
+            self.current = None
+
+        if self.current is None:
+            self.current = [bucket, price, price, price, price, amount]
+        elif bucket == self.current[0]:
+            self.current[2] = max(self.current[2], price)
+            self.current[3] = min(self.current[3], price)
+            self.current[4] = price
+            self.current[5] += amount
+        # Trades for an already closed bucket arrive too late and are dropped
+
+        return closed
+
+    def add_candle(self, candle: list) -> List[list]:
+        """Take an exchange kline snapshot; returns the previous candle once a new one starts"""
+        closed = []
+        if self.current is not None and candle[0] > self.current[0]:
+            closed.append(self.current)
+        if self.current is None or candle[0] >= self.current[0]:
+            self.current = list(candle[:6])
+        return closed
+
+    def flush(self) -> List[list]:
+        """Close the open candle (end of stream)"""
+        closed = [self.current] if self.current is not None else []
+        self.current = None
+        return closed
+
+
+def candles_to_frame(candles: List[list]) -> pd.DataFrame:
+    """[timestamp_ms, o, h, l, c, v] rows to an OHLCV frame with a UTC index"""
+    data = pd.DataFrame(candles, columns=['Timestamp'] + OHLCV_COLUMNS).set_index('Timestamp')
+    data.index = pd.to_datetime(data.index, unit='ms', utc=True)
+    return data
+
+
+class StreamIngestor:
+    """
+    Live candle ingestion for one symbol
+
+    mode='ohlcv' subscribes to exchange klines (watch_ohlcv), mode='trades'
+    assembles candles from the trade stream (watch_trades). Every closed bar
+    is appended to the CandleStore and passed to the registered callbacks.
+    """
+
+    def __init__(self, symbol: str, timeframe: str = '1m', exchange=None, exchange_id: Optional[str] = None,
+                 mode: str = 'ohlcv', store: Optional[CandleStore] = None, quote_currency: Optional[str] = None):
+        """
+        Args:
+            symbol: App symbol (e.g. 'BTC-USD') or exchange market (e.g. 'BTC/USDT')
+            exchange: ccxt.pro-compatible client; created from exchange_id when omitted
+            exchange_id: ccxt exchange name (defaults to data_sources.ccxt.exchange)
+            mode: 'ohlcv' or 'trades'
+            store: CandleStore receiving closed bars (created when omitted)
+        """
+        if mode not in ('ohlcv', 'trades'):
+            raise ValueError(f"Unknown stream mode: {mode}")
+
+        settings = get_section('data_sources').get('ccxt', {})
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.mode = mode
+        self.exchange_id = exchange_id or settings.get('exchange', 'binance')
+        self.market = market_symbol(symbol, quote_currency or settings.get('quote_currency', 'USDT'))
+        self.exchange = exchange
+        self.store = store or CandleStore(base_timeframe=timeframe)
+        self.assembler = CandleAssembler(timeframe)
+        self.callbacks: List[Callable] = []
+        self.bars_closed = 0
+        self._running = False
+
+    def on_bar(self, callback: Callable):
+        """
+        Register callback(symbol, bar) for each closed bar (plain or async function)
+
+        Callbacks are awaited before the stream reads again, so a slow one
+        delays this stream's next bars (plain functions run in a worker thread).
+        """
+        self.callbacks.append(callback)
+        return callback
+
+    def stop(self):
+        self._running = False
+
+    def _create_exchange(self):
+        import ccxt.pro as ccxtpro
+
+        return getattr(ccxtpro, self.exchange_id)({'enableRateLimit': True})
+
+    async def _emit(self, candles: List[list]):
+        if not candles:
+            return
+        frame = candles_to_frame(candles)
+        self.store.append(self.symbol, frame)
+
+        for timestamp, bar in frame.iterrows():
+            self.bars_closed += 1
+            for callback in self.callbacks:
+                if inspect.iscoroutinefunction(callback):
+                    await callback(self.symbol, bar)
+                else:
+                    # Off the event loop so other streams keep reading; this stream
+                    # waits for its callbacks, so bars are handled in order
+                    await asyncio.to_thread(callback, self.symbol, bar)
+
+    async def run(self, max_bars: Optional[int] = None):
+        """
+        Consume the stream until stop(), the stream ends, or max_bars bars have closed
+        """
+        owns_exchange = self.exchange is None
+        if owns_exchange:
+            self.exchange = self._create_exchange()
+
+        self._running = True
+        try:
+            while self._running and (max_bars is None or self.bars_closed < max_bars):
+                try:
+                    if self.mode == 'ohlcv':
+                        updates = await self.exchange.watch_ohlcv(self.market, self.timeframe)
+                        closed = []
+                        for candle in updates:
+                            closed.extend(self.assembler.add_candle(candle))
+                    else:
+                        trades = await self.exchange.watch_trades(self.market)
+                        closed = []
+                        for trade in trades:
+                            closed.extend(self.assembler.add_trade(trade['timestamp'], trade['price'], trade['amount']))
+                except STREAM_END_ERRORS:
+                    await self._emit(self.assembler.flush())
+                    break
+
+                await self._emit(closed)
+        finally:
+            self._running = False
+            if owns_exchange:
+                await self.exchange.close()
+
+
+class StreamingSignalHandler:
+    """
+    on_bar callback that keeps a rolling candle window and refreshes the
+    predictor's signal on every closed bar
+    """
+
+    def __init__(self, predictor, history: Optional[pd.DataFrame] = None,
+                 window: int = 500, on_signal: Optional[Callable] = None):
+        self.predictor = predictor
+        self.window = window
+        self.on_signal = on_signal
+        self.data = history[OHLCV_COLUMNS].iloc[-window:] if history is not None else pd.DataFrame(columns=OHLCV_COLUMNS)
+        self.last_signal = None
+
+    def __call__(self, symbol, bar):
+        self.data = pd.concat([self.data, bar[OHLCV_COLUMNS].to_frame().T.astype(float)]).iloc[-self.window:]
+
+        if self.predictor.model is None:
+            return
+        try:
+            signal, latest_row, confluence = self.predictor.predict_with_advanced_confidence(self.data)
+        except Exception as e:
+            print(f"❌ Streaming prediction error for {symbol}: {e}")
+            return
+
+        self.last_signal = signal
+        if self.on_signal is not None:
+            self.on_signal(symbol, bar.name, signal)
+
+
+__all__ = ['CandleAssembler', 'StreamIngestor', 'StreamingSignalHandler', 'candles_to_frame']
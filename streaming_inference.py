@@ -0,0 +1,216 @@
+"""
+Streaming LSTM Inference
+One recurrent step per new bar, carrying every layer's hidden and cell state between ticks
+"""
+
+import threading
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app_config import get_section
+
+ACTIVATIONS = {
+    'tanh': np.tanh,
+    'sigmoid': lambda x: 1.0 / (1.0 + np.exp(-x)),
+    'relu': lambda x: np.maximum(x, 0.0),
+    'linear': lambda x: x
+}
+
+
+def _activation(layer, attribute: str):
+    function = getattr(layer, attribute)
+    name = getattr(function, '__name__', str(function))
+    if name not in ACTIVATIONS:
+        raise ValueError(f"Unsupported activation '{name}' in layer {layer.name}")
+    return ACTIVATIONS[name]
+
+
+class StreamingLSTM:
+    """
+    Incremental inference for the predictors' LSTM stacks
+
+    The weights of the Keras model are evaluated directly in NumPy, one bar at
+    a time, for any number of streams (symbols) at once. A stream is primed
+    exactly from a full lookback window; afterwards each new closed bar costs a
+    single recurrent step instead of lookback_window steps.
+
+    Carried state also remembers bars older than the window the model was
+    trained on, so every resync_every steps the stream is re-primed from its
+    window to bound that drift.
+    """
+
+    def __init__(self, model, resync_every: Optional[int] = None):
+        """
+        Args:
+            model: Keras Sequential model (LSTM / BatchNormalization / Dense / Dropout layers)
+            resync_every: Steps between exact re-primes (config performance.streaming_inference)
+        """
+        settings = get_section('performance').get('streaming_inference', {})
+        self.model = model
+        self.resync_every = resync_every or settings.get('resync_every', 60)
+        layers = self._compile(model)
+        last_recurrent = max(i for i, layer in enumerate(layers) if layer[0] == 'lstm')
+        self.stack = layers[:last_recurrent + 1]  # Evaluated every time step
+        self.head = layers[last_recurrent + 1:]  # Evaluated on the last step only
+        self.recurrent = [layer for layer in self.stack if layer[0] == 'lstm']
+        self._streams: Dict[Hashable, Dict] = {}
+        self._lock = threading.Lock()
+        self.stats = {'primes': 0, 'steps': 0, 'cached': 0}
+
+    @staticmethod
+    def _compile(model) -> List[Tuple]:
+        """Extract the layer stack as NumPy weights"""
+        layers = []
+        for layer in model.layers:
+            kind = type(layer).__name__
+            if kind == 'InputLayer' or kind == 'Dropout':
+                continue
+            weights = [np.asarray(weight, dtype=np.float64) for weight in layer.get_weights()]
+
+            if kind == 'LSTM':
+                kernel, recurrent_kernel = weights[0], weights[1]
+                bias = weights[2] if layer.use_bias else np.zeros(kernel.shape[1])
+                layers.append(('lstm', kernel, recurrent_kernel, bias, layer.units,
+                               _activation(layer, 'activation'), _activation(layer, 'recurrent_activation')))
+            elif kind == 'BatchNormalization':
+                config = layer.get_config()
+                gamma = weights.pop(0) if config.get('scale', True) else 1.0
+                beta = weights.pop(0) if config.get('center', True) else 0.0
+                mean, variance = weights
+                scale = gamma / np.sqrt(variance + config.get('epsilon', 1e-3))
+                layers.append(('affine', scale, beta - mean * scale))
+            elif kind == 'Dense':
+                bias = weights[1] if layer.use_bias else 0.0
+                layers.append(('dense', weights[0], bias, _activation(layer, 'activation')))
+            else:
+                raise ValueError(f"Layer type {kind} is not supported for streaming inference")
+        return layers
+
+    @classmethod
+    def supports(cls, model) -> bool:
+        try:
+            cls._compile(model)
+            return True
+        except (ValueError, AttributeError):
+            return False
+
+    def _run(self, inputs: np.ndarray, states: List[List[np.ndarray]]) -> np.ndarray:
+        """
+        Advance the stacks over inputs of shape (streams, steps, features)
+
+        states holds [h, c] per LSTM layer and is updated in place.
+        Returns the model output for the last step of each stream.
+        """
+        x = None
+        for t in range(inputs.shape[1]):
+            x = inputs[:, t, :]
+            recurrent_index = 0
+            for layer in self.stack:
+                if layer[0] == 'lstm':
+                    _, kernel, recurrent_kernel, bias, units, activation, recurrent_activation = layer
+                    h, c = states[recurrent_index]
+                    z = x @ kernel + h @ recurrent_kernel + bias
+                    i = recurrent_activation(z[:, :units])
+                    f = recurrent_activation(z[:, units:2 * units])
+                    g = activation(z[:, 2 * units:3 * units])
+                    o = recurrent_activation(z[:, 3 * units:])
+                    c = f * c + i * g
+                    h = o * activation(c)
+                    states[recurrent_index] = [h, c]
+                    recurrent_index += 1
+                    x = h
+                else:
+                    # Normalisation between recurrent layers applies per time step
+                    x = x * layer[1] + layer[2]
+
+        for layer in self.head:
+            if layer[0] == 'affine':
+                x = x * layer[1] + layer[2]
+            elif layer[0] == 'dense':
+                x = layer[3](x @ layer[1] + layer[2])
+            else:
+                raise ValueError("Recurrent layers must come before the dense head")
+        return x
+
+    def _zero_states(self, streams: int) -> List[List[np.ndarray]]:
+        return [[np.zeros((streams, layer[4])), np.zeros((streams, layer[4]))] for layer in self.recurrent]
+
+    def predict_window(self, windows: np.ndarray) -> np.ndarray:
+        """Exact model output for full windows of shape (streams, lookback, features)"""
+        return self._run(np.asarray(windows, dtype=np.float64), self._zero_states(len(windows)))
+
+    def reset(self, key: Optional[Hashable] = None):
+        """Drop the carried state of one stream (or all)"""
+        with self._lock:
+            if key is None:
+                self._streams.clear()
+            else:
+                self._streams.pop(key, None)
+
+    def predict(self, key: Hashable, window: np.ndarray, bar_times: Sequence) -> float:
+        """Prediction for one stream; see predict_many"""
+        return float(self.predict_many([key], [window], [bar_times])[0])
+
+    def predict_many(self, keys: List[Hashable], windows: List[np.ndarray],
+                     bar_times: List[Sequence]) -> np.ndarray:
+        """
+        Predictions for the latest bar of several streams
+
+        Args:
+            keys: Stream identifiers (e.g. symbol)
+            windows: Scaled (lookback, features) inputs, oldest bar first
+            bar_times: Timestamps of the window rows
+
+        A stream whose previous call ended one bar before this window's last
+        bar is advanced by a single step; the same bar again returns the cached
+        prediction; anything else (new stream, gap, resync due) is primed from
+        the full window.
+        """
+        outputs = np.zeros(len(keys))
+        step_items, prime_items = [], []
+
+        with self._lock:
+            for position, (key, window, times) in enumerate(zip(keys, windows, bar_times)):
+                stream = self._streams.get(key)
+                last_time = times[-1]
+                if stream is not None and stream['time'] == last_time:
+                    outputs[position] = stream['prediction']
+                    self.stats['cached'] += 1
+                elif (stream is not None and len(times) > 1 and stream['time'] == times[-2]
+                      and stream['steps'] < self.resync_every):
+                    step_items.append((position, key, window))
+                else:
+                    prime_items.append((position, key, window))
+
+            for items, steps in ((step_items, 1), (prime_items, None)):
+                if not items:
+                    continue
+                if steps == 1:
+                    inputs = np.stack([window[-1:] for _, _, window in items]).astype(np.float64)
+                    states = [
+                        [np.stack([self._streams[key]['states'][i][j] for _, key, _ in items]) for j in range(2)]
+                        for i in range(len(self.recurrent))
+                    ]
+                else:
+                    inputs = np.stack([window for _, _, window in items]).astype(np.float64)
+                    states = self._zero_states(len(items))
+
+                results = self._run(inputs, states)[:, 0]
+
+                for row, (position, key, _) in enumerate(items):
+                    outputs[position] = results[row]
+                    previous_steps = self._streams[key]['steps'] if steps == 1 else -1
+                    self._streams[key] = {
+                        'time': bar_times[position][-1],
+                        'prediction': float(results[row]),
+                        'steps': previous_steps + 1,
+                        'states': [[h[row], c[row]] for h, c in states]
+                    }
+
+                self.stats['steps' if steps == 1 else 'primes'] += len(items)
+
+        return outputs
+
+
+__all__ = ['StreamingLSTM']
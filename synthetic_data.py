@@ -0,0 +1,85 @@
+"""
+Synthetic Market Data
+Deterministic OHLCV fixtures for offline tests and benchmarks
+"""
+
+import zlib
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Bar length in minutes for the timeframes used across the app
+TIMEFRAME_MINUTES = {
+    '1m': 1, '5m': 5, '15m': 15, '30m': 30,
+    '1h': 60, '4h': 240, '1d': 1440, '1w': 10080
+}
+
+DEFAULT_SYMBOLS = ['BTC-USD', 'ETH-USD', 'ADA-USD', 'DOT-USD', 'LINK-USD', 'SOL-USD', 'MATIC-USD', 'AVAX-USD']
+
+
+def timeframe_to_minutes(timeframe: str) -> int:
+    """Bar length of a timeframe string such as '15m' or '4h'"""
+    if timeframe not in TIMEFRAME_MINUTES:
+        raise ValueError(f"Unsupported timeframe '{timeframe}'. Choose from {list(TIMEFRAME_MINUTES)}")
+    return TIMEFRAME_MINUTES[timeframe]
+
+
+def generate_ohlcv(length: int = 1500, timeframe: str = '1h', seed: int = 7,
+                   start: str = '2024-01-01', start_price: float = 100.0,
+                   hourly_volatility: float = 0.01) -> pd.DataFrame:
+    """
+    Deterministic random-walk OHLCV frame
+
+    Args:
+        length: Number of bars
+        timeframe: Bar size ('1m' ... '1w'); volatility scales with sqrt(bar length)
+        seed: Random seed, the same seed always yields the same frame
+        start: First bar timestamp
+        start_price: Price level the walk starts from
+        hourly_volatility: Standard deviation of log returns per hour
+
+    Returns:
+        DataFrame with Open, High, Low, Close, Volume on a regular DatetimeIndex
+    """
+    minutes = timeframe_to_minutes(timeframe)
+    sigma = hourly_volatility * np.sqrt(minutes / 60)
+
+    rng = np.random.default_rng(seed)
+    close = start_price * np.exp(np.cumsum(rng.normal(0, sigma, length)))
+    open_price = np.r_[close[0], close[:-1]] * (1 + rng.normal(0, sigma / 10, length))
+    high = np.maximum(open_price, close) * (1 + np.abs(rng.normal(0, sigma * 0.4, length)))
+    low = np.minimum(open_price, close) * (1 - np.abs(rng.normal(0, sigma * 0.4, length)))
+    volume = rng.uniform(1e3, 1e4, length)
+
+    return pd.DataFrame(
+        {'Open': open_price, 'High': high, 'Low': low, 'Close': close, 'Volume': volume},
+        index=pd.date_range(start, periods=length, freq=pd.Timedelta(minutes=minutes))
+    )
+
+
+def generate_universe(num_symbols: int = 4, length: int = 1500, timeframe: str = '1h',
+                      seed: int = 7, symbols: Optional[List[str]] = None) -> Dict[str, pd.DataFrame]:
+    """
+    Aligned synthetic frames for several symbols
+
+    Each symbol gets its own seed derived from its name, so adding symbols
+    never changes the series already generated for the others.
+
+    Returns:
+        {symbol: OHLCV DataFrame}
+    """
+    if symbols is None:
+        symbols = DEFAULT_SYMBOLS[:num_symbols]
+        symbols += [f"SYN{i}-USD" for i in range(len(symbols), num_symbols)]
+
+    universe = {}
+    for symbol in symbols:
+        symbol_seed = seed + zlib.crc32(symbol.encode('utf-8'))
+        start_price = 10 + symbol_seed % 990
+        universe[symbol] = generate_ohlcv(length, timeframe, symbol_seed, start_price=start_price)
+
+    return universe
+
+
+__all__ = ['generate_ohlcv', 'generate_universe', 'timeframe_to_minutes', 'TIMEFRAME_MINUTES']
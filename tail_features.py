@@ -0,0 +1,585 @@
+"""
+Tail-Window Feature Computation
+Prediction-time features over the minimum warm-up tail, with recursive indicators seeded from cached state
+"""
+
+import threading
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from indicator_backend import get_indicator_backend, njit
+
+# Bars a window-bounded indicator needs before its first value (recursive
+# indicators are seeded from state, so only what is computed on top of them counts)
+INDICATOR_WARMUP = {
+    'SMA_200': 199,
+    'Senkou_B': 51 + 26,       # 52-bar high/low midpoint, shifted 26 bars forward
+    'Senkou_A': 25 + 26,
+    'Volume_SMA_50': 49,
+    'Resistance_50': 49,
+    'Volatility_Regime': 49,   # 50-bar quantiles of the seeded ATR_Ratio
+    'ULTOSC': 28,
+    'Target': 19,              # 20-bar mean of ATR_Ratio
+    'CCI_20': 19,
+    'BB_Width': 19,
+    'Price_Volatility_20': 20,
+    'Market_Regime': 20,
+    'Evening_Star': 12
+}
+
+# Rows at the end of the data that prepare_features drops (Chikou is Close shifted 26 bars back)
+TRAILING_SHIFT = 26
+
+# (EMA periods, RSI periods, MACD settings) used by calculate_all_indicators
+EMA_PERIODS = (5, 10, 20, 50, 100, 200)
+RSI_PERIODS = (9, 14, 21, 30)
+MACD_SETTINGS = ((12, 26, 9), (5, 13, 5))
+ATR_PERIOD = 14
+ADX_PERIOD = 14
+SAR_SETTINGS = (0.02, 0.2)
+ADOSC_SETTINGS = (3, 10)
+
+
+def warmup_bars() -> int:
+    """Bars of history every prediction-time feature needs before it is exact"""
+    return max(INDICATOR_WARMUP.values())
+
+
+def tail_length(lookback_window: int) -> int:
+    """Input rows that reproduce the last lookback_window rows of prepare_features"""
+    return warmup_bars() + lookback_window + TRAILING_SHIFT
+
+
+# === RESUMABLE KERNELS ===
+# Each kernel follows the same arithmetic as its indicator_backend counterpart,
+# but keeps its running values in `state` (updated in place) so a later call
+# can continue exactly where the previous one stopped. A zeroed state starts
+# from the first bar.
+
+@njit(cache=True, nogil=True)
+def _ema_resume(x, period, state):
+    # state: count, seed sum, ema
+    n = len(x)
+    out = np.full(n, np.nan)
+    k = 2.0 / (period + 1)
+    for i in range(n):
+        state[0] += 1
+        if state[0] < period:
+            state[1] += x[i]
+        elif state[0] == period:
+            state[1] += x[i]
+            state[2] = state[1] / period
+            out[i] = state[2]
+        else:
+            state[2] = (x[i] - state[2]) * k + state[2]
+            out[i] = state[2]
+    return out
+
+
+@njit(cache=True, nogil=True)
+def _macd_resume(x, fast, slow, signal, state):
+    # state: count, slow seed sum, fast ema, slow ema, signal count, signal seed sum, signal ema,
+    #        then the first `slow` values (the fast average is seeded from the last `fast` of them)
+    n = len(x)
+    macd = np.full(n, np.nan)
+    macd_signal = np.full(n, np.nan)
+    macd_hist = np.full(n, np.nan)
+    fast_k = 2.0 / (fast + 1)
+    slow_k = 2.0 / (slow + 1)
+    signal_k = 2.0 / (signal + 1)
+    for i in range(n):
+        state[0] += 1
+        count = int(state[0])
+        if count <= slow:
+            state[7 + count - 1] = x[i]
+            state[1] += x[i]
+            if count < slow:
+                continue
+            total = 0.0
+            for j in range(slow - fast, slow):
+                total += state[7 + j]
+            state[2] = total / fast
+            state[3] = state[1] / slow
+        else:
+            state[2] = (x[i] - state[2]) * fast_k + state[2]
+            state[3] = (x[i] - state[3]) * slow_k + state[3]
+
+        line = state[2] - state[3]
+        state[4] += 1
+        if state[4] < signal:
+            state[5] += line
+            continue
+        if state[4] == signal:
+            state[5] += line
+            state[6] = state[5] / signal
+        else:
+            state[6] = (line - state[6]) * signal_k + state[6]
+        macd[i] = line
+        macd_signal[i] = state[6]
+        macd_hist[i] = line - state[6]
+    return macd, macd_signal, macd_hist
+
+
+@njit(cache=True, nogil=True)
+def _rsi_resume(x, period, state):
+    # state: count, previous value, average gain, average loss
+    n = len(x)
+    out = np.full(n, np.nan)
+    for i in range(n):
+        state[0] += 1
+        if state[0] == 1:
+            state[1] = x[i]
+            continue
+        diff = x[i] - state[1]
+        state[1] = x[i]
+        diffs = state[0] - 1
+        if diffs > period:
+            state[3] *= (period - 1)
+            state[2] *= (period - 1)
+        if diff < 0:
+            state[3] -= diff
+        else:
+            state[2] += diff
+        if diffs < period:
+            continue
+        state[3] /= period
+        state[2] /= period
+        total = state[2] + state[3]
+        out[i] = 100.0 * (state[2] / total) if not (-1e-8 < total < 1e-8) else 0.0
+    return out
+
+
+@njit(cache=True, nogil=True)
+def _atr_resume(high, low, close, period, state):
+    # state: count, previous close, atr (seed sum during warm-up)
+    n = len(close)
+    out = np.full(n, np.nan)
+    for i in range(n):
+        state[0] += 1
+        if state[0] == 1:
+            state[1] = close[i]
+            continue
+        greatest = high[i] - low[i]
+        value = abs(state[1] - high[i])
+        if value > greatest:
+            greatest = value
+        value = abs(state[1] - low[i])
+        if value > greatest:
+            greatest = value
+        state[1] = close[i]
+        bars = state[0] - 1
+        if bars < period:
+            state[2] += greatest
+        elif bars == period:
+            state[2] += greatest
+            state[2] /= period
+            out[i] = state[2]
+        else:
+            state[2] *= period - 1
+            state[2] += greatest
+            state[2] /= period
+            out[i] = state[2]
+    return out
+
+
+@njit(cache=True, nogil=True)
+def _directional_resume(high, low, close, period, state):
+    # state: count, previous high, previous low, previous close, +DM, -DM, TR, DX sum, ADX
+    n = len(close)
+    adx = np.full(n, np.nan)
+    plus_di = np.full(n, np.nan)
+    minus_di = np.full(n, np.nan)
+    lookback = 2 * period - 1
+    for i in range(n):
+        state[0] += 1
+        index = int(state[0]) - 1
+        if index == 0:
+            state[1] = high[i]
+            state[2] = low[i]
+            state[3] = close[i]
+            continue
+        diff_p = high[i] - state[1]
+        diff_m = state[2] - low[i]
+        tr = max(high[i] - low[i], abs(high[i] - state[3]), abs(low[i] - state[3]))
+        state[1] = high[i]
+        state[2] = low[i]
+        state[3] = close[i]
+
+        if index >= period:
+            state[5] -= state[5] / period
+            state[4] -= state[4] / period
+        if diff_m > 0 and diff_p < diff_m:
+            state[5] += diff_m
+        elif diff_p > 0 and diff_p > diff_m:
+            state[4] += diff_p
+        if index < period:
+            state[6] += tr
+            continue
+        state[6] = state[6] - (state[6] / period) + tr
+
+        dx = -1.0
+        if not (-1e-8 < state[6] < 1e-8):
+            p_di = 100.0 * (state[4] / state[6])
+            m_di = 100.0 * (state[5] / state[6])
+            plus_di[i] = p_di
+            minus_di[i] = m_di
+            di_total = m_di + p_di
+            if not (-1e-8 < di_total < 1e-8):
+                dx = 100.0 * (abs(m_di - p_di) / di_total)
+        else:
+            plus_di[i] = 0.0
+            minus_di[i] = 0.0
+
+        if index < lookback:
+            if dx >= 0.0:
+                state[7] += dx
+        elif index == lookback:
+            if dx >= 0.0:
+                state[7] += dx
+            state[8] = state[7] / period
+            adx[i] = state[8]
+        else:
+            if dx >= 0.0:
+                state[8] = ((state[8] * (period - 1)) + dx) / period
+            adx[i] = state[8]
+    return adx, plus_di, minus_di
+
+
+@njit(cache=True, nogil=True)
+def _sar_resume(high, low, acceleration, maximum, state):
+    # state: count, is_long, sar, extreme point, acceleration factor, last high, last low
+    n = len(high)
+    out = np.full(n, np.nan)
+    for i in range(n):
+        state[0] += 1
+        if state[0] == 1:
+            state[5] = high[i]
+            state[6] = low[i]
+            continue
+        if state[0] == 2:
+            # Initial direction from the first bar's -DM
+            diff_p = high[i] - state[5]
+            diff_m = state[6] - low[i]
+            is_long = not (diff_m > 0 and diff_p < diff_m)
+            state[1] = 1.0 if is_long else 0.0
+            state[3] = high[i] if is_long else low[i]
+            state[2] = state[6] if is_long else state[5]
+            state[4] = min(acceleration, maximum)
+            state[5] = high[i]
+            state[6] = low[i]
+
+        prev_high = state[5]
+        prev_low = state[6]
+        new_high = high[i]
+        new_low = low[i]
+        state[5] = new_high
+        state[6] = new_low
+        sar = state[2]
+        ep = state[3]
+        af = state[4]
+
+        if state[1] == 1.0:
+            if new_low <= sar:
+                state[1] = 0.0
+                sar = max(ep, prev_high, new_high)
+                out[i] = sar
+                af = acceleration
+                ep = new_low
+                sar = max(sar + af * (ep - sar), prev_high, new_high)
+            else:
+                out[i] = sar
+                if new_high > ep:
+                    ep = new_high
+                    af = min(af + acceleration, maximum)
+                sar = min(sar + af * (ep - sar), prev_low, new_low)
+        else:
+            if new_high >= sar:
+                state[1] = 1.0
+                sar = min(ep, prev_low, new_low)
+                out[i] = sar
+                af = acceleration
+                ep = new_high
+                sar = min(sar + af * (ep - sar), prev_low, new_low)
+            else:
+                out[i] = sar
+                if new_low < ep:
+                    ep = new_low
+                    af = min(af + acceleration, maximum)
+                sar = max(sar + af * (ep - sar), prev_high, new_high)
+
+        state[2] = sar
+        state[3] = ep
+        state[4] = af
+    return out
+
+
+@njit(cache=True, nogil=True)
+def _volume_resume(high, low, close, volume, fast, slow, state):
+    # OBV, AD and the AD oscillator
+    # state: count, previous close, obv, ad, fast ema, slow ema
+    n = len(close)
+    obv = np.full(n, np.nan)
+    ad = np.full(n, np.nan)
+    adosc = np.full(n, np.nan)
+    fast_k = 2.0 / (fast + 1)
+    slow_k = 2.0 / (slow + 1)
+    lookback = max(fast, slow) - 1
+    for i in range(n):
+        state[0] += 1
+        index = int(state[0]) - 1
+
+        if index == 0:
+            state[2] = volume[i]
+        elif close[i] > state[1]:
+            state[2] += volume[i]
+        elif close[i] < state[1]:
+            state[2] -= volume[i]
+        state[1] = close[i]
+        obv[i] = state[2]
+
+        span = high[i] - low[i]
+        if span > 0.0:
+            state[3] += (((close[i] - low[i]) - (high[i] - close[i])) / span) * volume[i]
+        ad[i] = state[3]
+
+        if index == 0:
+            state[4] = state[3]
+            state[5] = state[3]
+        else:
+            state[4] = (fast_k * state[3]) + ((1.0 - fast_k) * state[4])
+            state[5] = (slow_k * state[3]) + ((1.0 - slow_k) * state[5])
+        if index >= lookback:
+            adosc[i] = state[4] - state[5]
+    return obv, ad, adosc
+
+
+class RecursiveIndicatorState:
+    """
+    Running state of every recursive indicator in calculate_all_indicators
+    (EMA, MACD, RSI, ATR, ADX/DI, SAR, OBV, AD, ADOSC) for one series
+
+    advance() consumes new bars in O(new bars) and returns their indicator
+    values exactly as a full-history computation would produce them.
+    ATR_Ratio values are kept sorted, so the volatility quantile over the
+    whole history is a lookup; new values are merged in with one copy.
+    """
+
+    def __init__(self):
+        self.states = {
+            **{('EMA', p): np.zeros(3) for p in EMA_PERIODS},
+            **{('RSI', p): np.zeros(4) for p in RSI_PERIODS},
+            **{('MACD',) + s: np.zeros(7 + s[1]) for s in MACD_SETTINGS},
+            ('ATR', ATR_PERIOD): np.zeros(3),
+            ('ADX', ADX_PERIOD): np.zeros(9),
+            ('SAR',) + SAR_SETTINGS: np.zeros(7),
+            ('VOLUME',) + ADOSC_SETTINGS: np.zeros(6)
+        }
+        self.last_time = None
+        self.last_bar = None
+        self.bars = 0
+        self.sorted_atr_ratio = np.empty(0)  # Finite ATR_Ratio values of every bar seen, ascending
+
+    def advance(self, ohlcv: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """Indicator values for bars that follow the last one seen"""
+        high = ohlcv['High'].to_numpy(np.float64)
+        low = ohlcv['Low'].to_numpy(np.float64)
+        close = ohlcv['Close'].to_numpy(np.float64)
+        volume = ohlcv['Volume'].to_numpy(np.float64)
+        out = {}
+
+        for period in EMA_PERIODS:
+            out[f'EMA_{period}'] = _ema_resume(close, period, self.states[('EMA', period)])
+        for period in RSI_PERIODS:
+            out[f'RSI_{period}'] = _rsi_resume(close, period, self.states[('RSI', period)])
+        for settings in MACD_SETTINGS:
+            out[('MACD',) + settings] = _macd_resume(close, *settings, self.states[('MACD',) + settings])
+        out['ATR'] = _atr_resume(high, low, close, ATR_PERIOD, self.states[('ATR', ATR_PERIOD)])
+        out['ADX'], out['DI_Plus'], out['DI_Minus'] = _directional_resume(
+            high, low, close, ADX_PERIOD, self.states[('ADX', ADX_PERIOD)])
+        out['PSAR'] = _sar_resume(high, low, *SAR_SETTINGS, self.states[('SAR',) + SAR_SETTINGS])
+        out['OBV'], out['AD'], out['ADOSC'] = _volume_resume(
+            high, low, close, volume, *ADOSC_SETTINGS, self.states[('VOLUME',) + ADOSC_SETTINGS])
+
+        if len(ohlcv):
+            self._push_atr_ratio(out['ATR'] / close)
+            self.last_time = ohlcv.index[-1]
+            self.last_bar = ohlcv.iloc[-1][['Open', 'High', 'Low', 'Close', 'Volume']].to_numpy(np.float64)
+            self.bars += len(ohlcv)
+        return out
+
+    def _push_atr_ratio(self, values: np.ndarray):
+        values = np.sort(values[np.isfinite(values)])
+        self.sorted_atr_ratio = np.insert(self.sorted_atr_ratio,
+                                          np.searchsorted(self.sorted_atr_ratio, values), values)
+
+    def volatile_threshold(self) -> float:
+        """
+        80th percentile of ATR_Ratio over every bar seen (calculate_market_regime's
+        threshold over the same frame), with numpy's linear interpolation
+        """
+        ratios = self.sorted_atr_ratio
+        if len(ratios) == 0:
+            return np.nan
+        position = 0.8 * (len(ratios) - 1)
+        lower = int(position)
+        upper = min(lower + 1, len(ratios) - 1)
+        weight, difference = position - lower, ratios[upper] - ratios[lower]
+        # Same rounding as numpy's lerp, so labels at the threshold agree bit for bit
+        if weight >= 0.5:
+            return float(ratios[upper] - difference * (1 - weight))
+        return float(ratios[lower] + difference * weight)
+
+
+class SeededIndicatorBackend:
+    """
+    Indicator backend that answers the recursive indicators from precomputed,
+    state-seeded values and delegates everything else to the real backend
+    """
+
+    def __init__(self, base, seeded: Dict):
+        self.base = base
+        self.seeded = seeded
+        self.name = f"seeded-{getattr(base, 'name', None) or getattr(base, '__name__', 'backend')}"
+
+    def __getattr__(self, name):
+        return getattr(self.base, name)
+
+    def EMA(self, real, timeperiod=30):
+        if f'EMA_{timeperiod}' in self.seeded:
+            return self.seeded[f'EMA_{timeperiod}']
+        return self.base.EMA(real, timeperiod=timeperiod)
+
+    def RSI(self, real, timeperiod=14):
+        if f'RSI_{timeperiod}' in self.seeded:
+            return self.seeded[f'RSI_{timeperiod}']
+        return self.base.RSI(real, timeperiod=timeperiod)
+
+    def MACD(self, real, fastperiod=12, slowperiod=26, signalperiod=9):
+        key = ('MACD', fastperiod, slowperiod, signalperiod)
+        if key in self.seeded:
+            return self.seeded[key]
+        return self.base.MACD(real, fastperiod=fastperiod, slowperiod=slowperiod, signalperiod=signalperiod)
+
+    def ATR(self, high, low, close, timeperiod=14):
+        return self.seeded['ATR'] if timeperiod == ATR_PERIOD else self.base.ATR(high, low, close, timeperiod=timeperiod)
+
+    def ADX(self, high, low, close, timeperiod=14):
+        return self.seeded['ADX'] if timeperiod == ADX_PERIOD else self.base.ADX(high, low, close, timeperiod=timeperiod)
+
+    def PLUS_DI(self, high, low, close, timeperiod=14):
+        return self.seeded['DI_Plus'] if timeperiod == ADX_PERIOD else self.base.PLUS_DI(high, low, close, timeperiod=timeperiod)
+
+    def MINUS_DI(self, high, low, close, timeperiod=14):
+        return self.seeded['DI_Minus'] if timeperiod == ADX_PERIOD else self.base.MINUS_DI(high, low, close, timeperiod=timeperiod)
+
+    def SAR(self, high, low, acceleration=0.02, maximum=0.2):
+        if (acceleration, maximum) == SAR_SETTINGS:
+            return self.seeded['PSAR']
+        return self.base.SAR(high, low, acceleration=acceleration, maximum=maximum)
+
+    def OBV(self, real, volume):
+        return self.seeded['OBV']
+
+    def AD(self, high, low, close, volume):
+        return self.seeded['AD']
+
+    def ADOSC(self, high, low, close, volume, fastperiod=3, slowperiod=10):
+        if (fastperiod, slowperiod) == ADOSC_SETTINGS:
+            return self.seeded['ADOSC']
+        return self.base.ADOSC(high, low, close, volume, fastperiod=fastperiod, slowperiod=slowperiod)
+
+
+class TailFeatureState:
+    """
+    Recursive indicator state plus the seeded values of the last rows, kept
+    between prediction calls for one symbol/timeframe
+    """
+
+    def __init__(self, rows: int):
+        self.rows = rows
+        self.recursive = RecursiveIndicatorState()
+        self.values: Dict = {}
+        self.index = pd.Index([])
+        self._lock = threading.Lock()
+        self.stats = {'cold': 0, 'warm': 0}
+
+    def _matches(self, data: pd.DataFrame) -> Optional[int]:
+        """Position of the last seen bar in data, if data extends what was seen"""
+        if self.recursive.last_time is None:
+            return None
+        position = data.index.searchsorted(self.recursive.last_time)
+        if position >= len(data) or data.index[position] != self.recursive.last_time:
+            return None
+        # The bar count must line up too, or the data starts somewhere else
+        if position + 1 != self.recursive.bars:
+            return None
+        row = data.iloc[position][['Open', 'High', 'Low', 'Close', 'Volume']].to_numpy(np.float64)
+        return position if np.array_equal(row, self.recursive.last_bar) else None
+
+    def update(self, data: pd.DataFrame) -> Tuple[Dict, float]:
+        """
+        Seeded recursive indicator values for the last `rows` bars of data
+
+        Only bars after the previously seen one are processed; a history that
+        does not extend the cached one (restart, revised bar) is replayed from scratch.
+
+        Returns:
+            (values aligned with data.iloc[-rows:], volatility quantile)
+        """
+        with self._lock:
+            position = self._matches(data)
+            if position is None:
+                self.recursive = RecursiveIndicatorState()
+                self.values = {}
+                self.index = pd.Index([])
+                new_bars = data
+                self.stats['cold'] += 1
+            else:
+                new_bars = data.iloc[position + 1:]
+                self.stats['warm'] += 1
+
+            fresh = self.recursive.advance(new_bars)
+            keep = self.rows - len(new_bars)
+            merged = {}
+            for key, new_values in fresh.items():
+                if isinstance(new_values, tuple):
+                    merged[key] = tuple(self._merge(self.values.get(key, (None,) * len(new_values))[i], part, keep)
+                                        for i, part in enumerate(new_values))
+                else:
+                    merged[key] = self._merge(self.values.get(key), new_values, keep)
+            self.values = merged
+            self.index = data.index[-self.rows:]
+
+            # The cached state always starts at data's first bar, so its history is the whole frame
+            return merged, self.recursive.volatile_threshold()
+
+    def _merge(self, cached, new_values, keep):
+        if keep <= 0 or cached is None:
+            return new_values[-self.rows:]
+        return np.concatenate([cached[-keep:], new_values])
+
+
+def compute_tail_features(data: pd.DataFrame, state: TailFeatureState, backend: Optional[str] = None) -> pd.DataFrame:
+    """
+    Indicator frame for data.iloc[-state.rows:] matching a full-history computation
+
+    Returns:
+        Frame after calculate_all_indicators/market regime/support-resistance/risk metrics
+    """
+    from advanced_indicators import AdvancedTechnicalIndicators
+
+    seeded, volatile_threshold = state.update(data)
+    tail = data.iloc[-state.rows:]
+    lib = SeededIndicatorBackend(get_indicator_backend(backend), seeded)
+
+    df = AdvancedTechnicalIndicators.calculate_all_indicators(tail, backend=lib)
+    df = AdvancedTechnicalIndicators.calculate_market_regime(df, volatile_threshold=volatile_threshold)
+    df = AdvancedTechnicalIndicators.calculate_support_resistance_levels(df)
+    df = AdvancedTechnicalIndicators.calculate_risk_metrics(df)
+    return df
+
+
+__all__ = ['TailFeatureState', 'RecursiveIndicatorState', 'SeededIndicatorBackend',
+           'compute_tail_features', 'warmup_bars', 'tail_length', 'INDICATOR_WARMUP', 'TRAILING_SHIFT']
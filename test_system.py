@@ -19,7 +19,6 @@ def test_imports():
         import pandas as pd
         import tensorflow as tf
         import yfinance as yf
-        import talib
         import streamlit as st
         import plotly.graph_objects as go
         import sklearn
@@ -32,6 +31,9 @@ def test_imports():
         print(f"🐼 Pandas version: {pd.__version__}")
         print(f"🔢 NumPy version: {np.__version__}")
         
+        from indicator_backend import get_indicator_backend, get_backend_name
+        print(f"📐 Indicator backend: {get_backend_name(get_indicator_backend())}")
+        
         return True
         
     except ImportError as e:
@@ -63,6 +65,260 @@ def test_data_fetching():
         print(f"❌ Data fetching error: {e}")
         return False
 
+def test_data_providers():
+    """Test the offline replay data provider"""
+    print("\n📼 Testing data providers...")
+    
+    try:
+        from data_providers import ReplayProvider, get_data_provider
+        from enhanced_predictor import EnhancedCryptoPredictorLSTM
+        
+        data = _synthetic_ohlcv(24 * 40)
+        provider = ReplayProvider(speed=None)
+        provider.add_frame('BTC-USD', '1h', data)
+        
+        recent = provider.fetch('BTC-USD', '1h', '7d')
+        if len(recent) != 24 * 7 or recent.index[-1] != data.index[-1]:
+            print(f"❌ Period slicing returned {len(recent)} bars")
+            return False
+        
+        bars = list(provider.stream('BTC-USD', '1h', period='1d'))
+        if len(bars) != 24 or not bars[-1].equals(data.iloc[-1]):
+            print("❌ Replay stream did not emit the expected bars")
+            return False
+        
+        if get_data_provider(provider) is not provider:
+            print("❌ Provider instances should pass through get_data_provider")
+            return False
+        
+        predictor = EnhancedCryptoPredictorLSTM('ETH-USD', '1h', data_provider='replay')
+        fetched = predictor.fetch_comprehensive_data('1mo')
+        if fetched is None or fetched.empty:
+            print("❌ Predictor could not fetch from the replay provider")
+            return False
+        
+        print(f"✅ Replay provider served {len(fetched)} synthetic bars for ETH-USD")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Data provider error: {e}")
+        traceback.print_exc()
+        return False
+
+def test_async_fetcher():
+    """Test concurrent fetching against a local chart API"""
+    print("\n⚡ Testing async multi-symbol fetcher...")
+    
+    try:
+        import asyncio
+        import time
+        from aiohttp import web
+        from data_providers import YFinanceProvider
+        from async_fetcher import AsyncDataFetcher
+        
+        data = _synthetic_ohlcv(200)
+        chart = {'chart': {'error': None, 'result': [{
+            'timestamp': [int(ts.timestamp()) for ts in data.index],
+            'indicators': {'quote': [{column.lower(): data[column].tolist() for column in data.columns}]}
+        }]}}
+        attempts = {}
+        
+        async def handler(request):
+            key = (request.match_info['symbol'], request.query['interval'])
+            attempts[key] = attempts.get(key, 0) + 1
+            first_attempt = attempts[key] == 1
+            await asyncio.sleep(0.2)
+            if first_attempt and key[0] == 'ETH-USD':
+                return web.Response(status=503)
+            return web.json_response(chart)
+        
+        async def run():
+            app = web.Application()
+            app.router.add_get('/v8/finance/chart/{symbol}', handler)
+            runner = web.AppRunner(app)
+            await runner.setup()
+            site = web.TCPSite(runner, '127.0.0.1', 0)
+            await site.start()
+            port = site._server.sockets[0].getsockname()[1]
+            
+            provider = YFinanceProvider(rate_limit=None, base_url=f"http://127.0.0.1:{port}")
+            requests = [(symbol, timeframe) for symbol in ['BTC-USD', 'ETH-USD', 'SOL-USD'] for timeframe in ['1h', '1d']]
+            order = []
+            try:
+                async with AsyncDataFetcher(provider, max_concurrency=8, backoff=0.05) as fetcher:
+                    async for symbol, timeframe, frame in fetcher.iter_fetch(requests):
+                        order.append((symbol, timeframe, frame))
+            finally:
+                await runner.cleanup()
+            return order
+        
+        start = time.perf_counter()
+        results = asyncio.run(run())
+        elapsed = time.perf_counter() - start
+        
+        if len(results) != 6 or any(frame is None or len(frame) != len(data) for _, _, frame in results):
+            print("❌ Not every series was fetched")
+            return False
+        if results[-1][0] != 'ETH-USD':
+            print("❌ Results were not yielded in completion order")
+            return False
+        if elapsed > 1.0:
+            print(f"❌ Fetch took {elapsed:.2f}s; requests were not concurrent")
+            return False
+        
+        # Exchange throttling raised by the ccxt path is retried too
+        import ccxt
+        from data_providers import DataProvider
+        
+        class ThrottledProvider(DataProvider):
+            name = 'throttled'
+            
+            def __init__(self):
+                super().__init__(rate_limit=None)
+                self.calls = 0
+            
+            async def fetch_async(self, symbol, timeframe, period, session=None):
+                self.calls += 1
+                if self.calls == 1:
+                    raise ccxt.RateLimitExceeded('429 Too Many Requests')
+                return data
+        
+        async def throttled():
+            async with AsyncDataFetcher(throttled_provider, backoff=0.01) as fetcher:
+                return await fetcher.fetch('BTC/USDT', '1h', '1mo')
+        
+        throttled_provider = ThrottledProvider()
+        if len(asyncio.run(throttled())) != len(data) or throttled_provider.calls != 2:
+            print("❌ ccxt RateLimitExceeded was not retried")
+            return False
+        
+        print(f"✅ 6 series (2 retried) fetched in {elapsed:.2f}s vs ~{0.2 * 8:.1f}s serially")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Async fetcher error: {e}")
+        traceback.print_exc()
+        return False
+
+def test_candle_resampling():
+    """Test incremental higher-timeframe resampling from 1m candles"""
+    print("\n🕯️ Testing candle store resampling...")
+    
+    try:
+        from synthetic_data import generate_ohlcv
+        from candle_store import CandleStore, ResamplingProvider, resample_ohlcv
+        from data_providers import ReplayProvider
+        
+        base = generate_ohlcv(3010, '1m', seed=3)
+        store = CandleStore()
+        store.append('BTC-USD', base.iloc[:120])
+        for timeframe in ['5m', '1h', '4h', '1d']:
+            store.get('BTC-USD', timeframe)
+        
+        # Stream the rest in chunks, each revising the previous (open) bar
+        for start in range(120, len(base), 17):
+            store.append('BTC-USD', base.iloc[start - 1:start + 17])
+        
+        for timeframe in ['5m', '1h', '4h', '1d']:
+            if not store.get('BTC-USD', timeframe).equals(resample_ohlcv(base, timeframe)):
+                print(f"❌ Incremental {timeframe} candles differ from a full resample")
+                return False
+        
+        hourly = store.get('BTC-USD', '1h')
+        if len(store.get('BTC-USD', '1h', closed_only=True)) != len(hourly) - 1:
+            print("❌ Open hourly bucket was not excluded")
+            return False
+        
+        class CountingReplay(ReplayProvider):
+            def fetch(self, symbol, timeframe, period):
+                self.calls.append((timeframe, period))
+                return super().fetch(symbol, timeframe, period)
+        
+        upstream = CountingReplay()
+        upstream.calls = []
+        upstream.add_frame('ETH-USD', '1m', generate_ohlcv(40000, '1m', seed=4))
+        provider = ResamplingProvider(upstream, max_base_period='1mo', warmup_bars=100)
+        fifteen = provider.fetch('ETH-USD', '15m', '1d')
+        four_hour = provider.fetch('ETH-USD', '4h', '5d')
+        if [timeframe for timeframe, _ in upstream.calls] != ['1m', '1m']:
+            print(f"❌ Resampling provider did not serve from the base series: {upstream.calls}")
+            return False
+        # Exactly the requested period is returned; the base history also covers the warm-up bars
+        if len(fifteen) != 96 or len(four_hour) != 30:
+            print(f"❌ Requested periods not returned exactly: {len(fifteen)} 15m, {len(four_hour)} 4h bars")
+            return False
+        if len(provider.store.get('ETH-USD', '4h')) < 30 + 100:
+            print(f"❌ Warm-up bars missing from the base series: {len(provider.store.get('ETH-USD', '4h'))} 4h bars")
+            return False
+        provider.fetch('ETH-USD', '1h', '1y')
+        if upstream.calls[-1] != ('1h', '1y'):
+            print("❌ Spans beyond max_base_period were not passed to the upstream provider")
+            return False
+        
+        from data_providers import get_data_provider
+        if get_data_provider('resample', upstream='replay') is not get_data_provider('resample', upstream='replay'):
+            print("❌ Resampling providers are not shared across predictors")
+            return False
+        
+        print(f"✅ 5m/1h/4h/1d candles match full resamples ({len(hourly)} hourly bars)")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Candle resampling error: {e}")
+        traceback.print_exc()
+        return False
+
+def test_stream_ingestion():
+    """Test streaming candle ingestion against the fake exchange"""
+    print("\n📡 Testing stream ingestion...")
+    
+    try:
+        import asyncio
+        import numpy as np
+        from synthetic_data import generate_ohlcv
+        from fake_exchange import FakeExchangeServer, FakeExchangeClient
+        from stream_ingestion import StreamIngestor, StreamingSignalHandler
+        from enhanced_predictor import EnhancedCryptoPredictorLSTM
+        
+        candles = generate_ohlcv(403, '1m', seed=5).tz_localize('UTC')
+        history, live = candles.iloc[:400], candles.iloc[400:]
+        
+        predictor = EnhancedCryptoPredictorLSTM('BTC-USD', '1m')
+        X, _, _, _ = predictor.create_lstm_sequences(predictor.prepare_features(history))
+        predictor.model = predictor.build_advanced_lstm_model((X.shape[1], X.shape[2]))
+        
+        async def ingest(mode, frame, callback=None):
+            async with FakeExchangeServer(frame) as server:
+                ingestor = StreamIngestor('BTC-USD', '1m', exchange=FakeExchangeClient(server.url), mode=mode)
+                if callback is not None:
+                    ingestor.on_bar(callback)
+                try:
+                    await ingestor.run()
+                finally:
+                    await ingestor.exchange.close()
+            return ingestor
+        
+        for mode in ['ohlcv', 'trades']:
+            ingestor = asyncio.run(ingest(mode, candles.iloc[:60]))
+            assembled = ingestor.store.get('BTC-USD')
+            if not (assembled.index.equals(candles.index[:60]) and np.allclose(assembled.values, candles.values[:60])):
+                print(f"❌ {mode} stream assembled different candles")
+                return False
+        
+        handler = StreamingSignalHandler(predictor, history=history)
+        ingestor = asyncio.run(ingest('ohlcv', live, handler))
+        if ingestor.bars_closed != 3 or len(handler.data) != 403 or handler.last_signal is None:
+            print("❌ Signal handler did not receive every closed bar")
+            return False
+        
+        print(f"✅ Kline and trade streams rebuilt 60 candles; handler tracked {ingestor.bars_closed} live bars")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Stream ingestion error: {e}")
+        traceback.print_exc()
+        return False
+
 def test_technical_indicators():
     """Test technical indicator calculations"""
     print("\n📈 Testing technical indicators...")
@@ -100,6 +356,94 @@ def test_technical_indicators():
         traceback.print_exc()
         return False
 
+def _synthetic_ohlcv(length=1500, seed=7):
+    """Deterministic random-walk OHLCV frame for offline tests"""
+    from synthetic_data import generate_ohlcv
+    
+    return generate_ohlcv(length, '1h', seed)
+
+def test_indicator_backend_parity():
+    """Test that the Numba indicator backend matches TA-Lib"""
+    print("\n⚖️ Testing indicator backend parity...")
+    
+    try:
+        import numpy as np
+        from indicator_backend import get_indicator_backend, TALIB_AVAILABLE
+        from advanced_indicators import AdvancedTechnicalIndicators
+        
+        if not TALIB_AVAILABLE:
+            print("⚠️ TA-Lib not installed - skipping parity check")
+            return True
+        
+        # Tick-rounded and flat prices exercise the zero tolerances on summed values
+        random_walk = _synthetic_ohlcv()
+        tick_rounded = _synthetic_ohlcv(600, seed=1)
+        tick_rounded[['Open', 'High', 'Low', 'Close']] = tick_rounded[['Open', 'High', 'Low', 'Close']].round(1)
+        flat = _synthetic_ohlcv(300, seed=2)
+        flat[['Open', 'High', 'Low', 'Close']] = 27.3
+        
+        for name, data in [('random walk', random_walk), ('tick-rounded', tick_rounded), ('flat', flat)]:
+            talib_df = AdvancedTechnicalIndicators.calculate_all_indicators(data, backend='talib')
+            numba_df = AdvancedTechnicalIndicators.calculate_all_indicators(data, backend='numba')
+            
+            mismatched = []
+            for column in talib_df.columns:
+                expected = talib_df[column].values
+                actual = numba_df[column].values
+                if expected.dtype.kind in 'fi':
+                    same = np.allclose(expected, actual, rtol=1e-9, atol=1e-9, equal_nan=True)
+                else:
+                    same = (expected == actual).all()
+                if not same:
+                    mismatched.append(column)
+            
+            if mismatched:
+                print(f"❌ Backends disagree on {name} series: {mismatched}")
+                return False
+        
+        numba = get_indicator_backend('numba')
+        print(f"✅ {len(talib_df.columns)} columns identical across TA-Lib and {numba.name} backends")
+        
+        return True
+        
+    except Exception as e:
+        print(f"❌ Indicator backend parity error: {e}")
+        traceback.print_exc()
+        return False
+
+def test_batch_indicators():
+    """Test stacked multi-symbol indicators against the per-frame calculation"""
+    print("\n🧮 Testing batched indicator computation...")
+    
+    try:
+        import numpy as np
+        from advanced_indicators import (
+            AdvancedTechnicalIndicators, BatchTechnicalIndicators, VOLATILITY_REGIME_CODES
+        )
+        
+        frames = {f'SYM{i}': _synthetic_ohlcv(600, seed=i) for i in range(3)}
+        ohlcv, index, symbols = BatchTechnicalIndicators.stack_ohlcv(frames)
+        tensor, columns = BatchTechnicalIndicators.calculate_all_indicators(ohlcv, max_workers=2)
+        
+        for i, symbol in enumerate(symbols):
+            expected = AdvancedTechnicalIndicators.calculate_all_indicators(frames[symbol])
+            expected['Volatility_Regime'] = expected['Volatility_Regime'].map(VOLATILITY_REGIME_CODES)
+            if list(expected.columns) != columns:
+                print(f"❌ Column mismatch for {symbol}")
+                return False
+            if not np.array_equal(expected.to_numpy(dtype=np.float64).astype(np.float32), tensor[i], equal_nan=True):
+                print(f"❌ Values differ for {symbol}")
+                return False
+        
+        print(f"✅ Batched tensor {tensor.shape} ({tensor.dtype}) matches per-symbol frames")
+        
+        return True
+        
+    except Exception as e:
+        print(f"❌ Batched indicators error: {e}")
+        traceback.print_exc()
+        return False
+
 def test_model_creation():
     """Test LSTM model creation"""
     print("\n🧠 Testing LSTM model creation...")
@@ -158,6 +502,1007 @@ def test_feature_preparation():
         traceback.print_exc()
         return False
 
+def test_compact_features():
+    """Test the compact processed-frame representation"""
+    print("\n🗜️ Testing compact feature frames...")
+    
+    try:
+        import numpy as np
+        from enhanced_predictor import EnhancedCryptoPredictorLSTM
+        
+        predictor = EnhancedCryptoPredictorLSTM('BTC-USD', '1h')
+        data = _synthetic_ohlcv(800)
+        
+        full = predictor.prepare_features(data)
+        compact = predictor.prepare_features(data, compact=True)
+        
+        full_size = full.memory_usage(deep=True).sum()
+        compact_size = compact.memory_usage(deep=True).sum()
+        ratio = full_size / compact_size
+        
+        features = [f for f in predictor.selected_features if f in full.columns]
+        if not np.allclose(full[features].to_numpy(), compact[features].to_numpy(dtype=np.float64), rtol=1e-6):
+            print("❌ Compact features drifted from full precision values")
+            return False
+        if list(compact['Market_Regime'].astype(str)) != list(full['Market_Regime']):
+            print("❌ Market regime labels changed")
+            return False
+        
+        print(f"✅ Compact frame is {ratio:.1f}x smaller ({full_size:,} -> {compact_size:,} bytes)")
+        
+        return ratio >= 2
+        
+    except Exception as e:
+        print(f"❌ Compact features error: {e}")
+        traceback.print_exc()
+        return False
+
+def test_feature_store():
+    """Test memory-mapped feature matrix storage"""
+    print("\n💾 Testing feature matrix store...")
+    
+    try:
+        import tempfile
+        import numpy as np
+        from enhanced_predictor import EnhancedCryptoPredictorLSTM
+        from feature_store import FeatureMatrixStore
+        
+        predictor = EnhancedCryptoPredictorLSTM('BTC-USD', '1h')
+        df = predictor.prepare_features(_synthetic_ohlcv(800))
+        
+        # Frames no longer than the lookback window give no sequences rather than an error
+        for rows in (predictor.lookback_window - 5, predictor.lookback_window):
+            X_short = predictor.create_lstm_sequences(df.iloc[:rows])[0]
+            if X_short.shape[:2] != (0, predictor.lookback_window):
+                print(f"❌ {rows} rows gave sequences of shape {X_short.shape}")
+                return False
+        
+        X, y, returns, indices = predictor.create_lstm_sequences(df)
+        
+        with tempfile.TemporaryDirectory() as root:
+            store = FeatureMatrixStore(root)
+            key = predictor.export_feature_matrix(df, store)
+            
+            worker = EnhancedCryptoPredictorLSTM('BTC-USD', '1h')
+            matrix = worker.load_feature_matrix(store, key)
+            X_mapped, y_mapped, returns_mapped = matrix.windows()
+            
+            if not isinstance(matrix.features, np.memmap):
+                print("❌ Stored features are not memory-mapped")
+                return False
+            if not (np.array_equal(X, X_mapped) and np.array_equal(y, y_mapped)):
+                print("❌ Mapped windows differ from create_lstm_sequences")
+                return False
+            
+            # A crash while writing the scaler must not leave a complete-looking entry
+            def crash(path):
+                raise OSError("disk full")
+
+            try:
+                store.write('partial', df[['Close']].values, df['Binary_Target'].values, df['Future_Return'].values,
+                            artifacts={'feature_scaler.pkl': crash})
+            except OSError:
+                pass
+            if store.exists('partial'):
+                print("❌ Entry marked complete without its scaler")
+                return False
+
+            print(f"✅ {key}: {X_mapped.shape} windows served from the mapping")
+        
+        return True
+        
+    except Exception as e:
+        print(f"❌ Feature store error: {e}")
+        traceback.print_exc()
+        return False
+
+def test_instrumentation():
+    """Test pipeline timing spans and metric export"""
+    print("\n⏱️ Testing pipeline instrumentation...")
+    
+    try:
+        import tracemalloc
+        from instrumentation import PipelineProfiler
+        from enhanced_predictor import EnhancedCryptoPredictorLSTM
+        
+        disabled = PipelineProfiler(enabled=False)
+        with disabled.span('noop', rows=10):
+            pass
+        if disabled.report()['stages']:
+            print("❌ Disabled profiler recorded stages")
+            return False
+        
+        tracemalloc.start()
+        try:
+            profiler = PipelineProfiler(enabled=True, track_memory=True)
+            predictor = EnhancedCryptoPredictorLSTM('BTC-USD', '1h')
+            predictor.profiler = profiler
+            df = predictor.prepare_features(_synthetic_ohlcv(600))
+            predictor.create_lstm_sequences(df)
+        finally:
+            tracemalloc.stop()
+        
+        stages = profiler.report()['stages']
+        expected = ['calculate_all_indicators', 'calculate_market_regime', 'create_lstm_sequences']
+        missing = [stage for stage in expected if stage not in stages]
+        if missing:
+            print(f"❌ Missing stages: {missing}")
+            return False
+        if stages['calculate_all_indicators']['rows'] != 600 or stages['create_lstm_sequences']['peak_memory_mb'] <= 0:
+            print("❌ Row counts or peak memory not recorded")
+            return False
+        
+        metrics = profiler.to_prometheus()
+        if 'crypto_predictor_stage_seconds_total{stage="calculate_all_indicators"}' not in metrics:
+            print("❌ Prometheus output missing stage metrics")
+            return False
+        
+        for stage, stats in stages.items():
+            print(f"📊 {stage}: {stats['total_seconds'] * 1000:.1f} ms, {stats['rows']} rows, "
+                  f"peak {stats['peak_memory_mb']:.1f} MB")
+        
+        return True
+        
+    except Exception as e:
+        print(f"❌ Instrumentation error: {e}")
+        traceback.print_exc()
+        return False
+
+def test_benchmark_suite():
+    """Test synthetic fixtures and the offline benchmark runner"""
+    print("\n🏁 Testing benchmark suite...")
+    
+    try:
+        import json
+        from synthetic_data import generate_ohlcv, generate_universe
+        from benchmark import run_benchmarks, compare_results
+        
+        if not generate_ohlcv(300, '15m', seed=3).equals(generate_ohlcv(300, '15m', seed=3)):
+            print("❌ Synthetic data is not deterministic")
+            return False
+        
+        universe = generate_universe(3, 300, '4h')
+        if len(universe) != 3 or any(len(frame) != 300 for frame in universe.values()):
+            print("❌ Synthetic universe has the wrong shape")
+            return False
+        
+        report = run_benchmarks(length=400, num_symbols=2, repeat=1,
+                                stages=['calculate_all_indicators', 'batch_indicators', 'create_lstm_sequences'])
+        json.dumps(report)
+        
+        comparison = compare_results(report, report)
+        if set(comparison) != set(report['results']) or any(c['regression'] for c in comparison.values()):
+            print("❌ Self-comparison reported regressions")
+            return False
+        
+        for stage, stats in report['results'].items():
+            print(f"📊 {stage}: {stats['median_seconds'] * 1000:.1f} ms ({stats['rows']} rows)")
+        
+        # The requested backend reaches the predictor's feature stages too
+        import advanced_indicators, tail_features
+        requested, resolve = [], advanced_indicators.get_indicator_backend
+        
+        def recording(name=None):
+            if name is None or isinstance(name, str):  # Not the tail path's seeded wrapper
+                requested.append(name)
+            return resolve(name)
+        
+        advanced_indicators.get_indicator_backend = tail_features.get_indicator_backend = recording
+        try:
+            report = run_benchmarks(length=400, num_symbols=2, repeat=1, backend='numba',
+                                    stages=['prepare_features', 'prepare_features_tail'])
+        finally:
+            advanced_indicators.get_indicator_backend = tail_features.get_indicator_backend = resolve
+        if not requested or set(requested) != {'numba'} or report['meta']['indicator_backend'] != 'numba':
+            print(f"❌ Backends used: {set(requested)}, reported {report['meta']['indicator_backend']}")
+            return False
+        
+        return True
+        
+    except Exception as e:
+        print(f"❌ Benchmark suite error: {e}")
+        traceback.print_exc()
+        return False
+
+def test_model_registry():
+    """Test versioned registry, lazy loading and the bounded model cache"""
+    print("\n🗂️ Testing model registry...")
+    
+    try:
+        import tempfile
+        import numpy as np
+        from enhanced_predictor import EnhancedCryptoPredictorLSTM
+        from model_registry import ModelRegistry, ModelCache, LazyModel
+        
+        predictor = EnhancedCryptoPredictorLSTM('BTC-USD', '1h')
+        X, _, _, _ = predictor.create_lstm_sequences(predictor.prepare_features(_synthetic_ohlcv(600)))
+        predictor.model = predictor.build_advanced_lstm_model((X.shape[1], X.shape[2]))
+        expected = predictor.model.predict(X[-4:], verbose=0)
+        
+        with tempfile.TemporaryDirectory() as root:
+            # Budget for a single model, so loading a second evicts the first
+            cache = ModelCache(max_bytes=predictor.model.count_params() * 4)
+            registry = ModelRegistry(root, cache)
+            registry.register(predictor, metrics={'val_accuracy': 0.5})
+            latest = registry.register(predictor)
+            predictor.symbol = 'ETH-USD'
+            registry.register(predictor)
+            
+            if latest['version'] != 2 or len(registry.list()) != 3:
+                print("❌ Versions were not assigned per symbol/timeframe")
+                return False
+            
+            btc = registry.get_predictor('BTC-USD', '1h')
+            eth = registry.get_predictor('ETH-USD', '1h')
+            if not isinstance(btc.model, LazyModel) or len(cache) != 0:
+                print("❌ Models were loaded eagerly")
+                return False
+            
+            if not np.allclose(btc.model.predict(X[-4:], verbose=0), expected):
+                print("❌ Registered model predicts differently")
+                return False
+            eth.model.predict(X[-4:], verbose=0)
+            btc.model.predict(X[-4:], verbose=0)
+            
+            if len(cache) != 1 or cache.stats['evictions'] != 2:
+                print(f"❌ Cache did not stay within budget: {cache.stats}")
+                return False
+            
+            print(f"✅ 3 versions registered; cache stats {cache.stats}")
+        
+        return True
+        
+    except Exception as e:
+        print(f"❌ Model registry error: {e}")
+        traceback.print_exc()
+        return False
+
+def test_signal_service():
+    """Test the ASGI signal service and request micro-batching"""
+    print("\n🛰️ Testing signal service...")
+    
+    try:
+        import asyncio
+        import json
+        from enhanced_predictor import EnhancedCryptoPredictorLSTM
+        from data_providers import ReplayProvider
+        from signal_service import SignalService
+        
+        service = SignalService(data_provider=ReplayProvider(), window_ms=20)
+        for symbol in ['BTC-USD', 'ETH-USD']:
+            predictor = EnhancedCryptoPredictorLSTM(symbol, '1h', data_provider=ReplayProvider())
+            X, _, _, _ = predictor.create_lstm_sequences(
+                predictor.prepare_features(predictor.fetch_comprehensive_data('1mo'))
+            )
+            predictor.model = predictor.build_advanced_lstm_model((X.shape[1], X.shape[2]))
+            service.add_predictor(predictor)
+        
+        async def call(method, path, payload=None):
+            messages = [{'type': 'http.request', 'body': json.dumps(payload or {}).encode()}]
+            response = {}
+            
+            async def receive():
+                return messages.pop(0)
+            
+            async def send(message):
+                if message['type'] == 'http.response.start':
+                    response['status'] = message['status']
+                else:
+                    response['body'] = json.loads(message['body'])
+            
+            await service({'type': 'http', 'method': method, 'path': path}, receive, send)
+            return response['status'], response['body']
+        
+        async def run():
+            # Warm the feature cache, then fire concurrent requests inside one batching window
+            await call('POST', '/predict', {'symbol': 'BTC-USD'})
+            await call('POST', '/predict', {'symbol': 'ETH-USD'})
+            before = dict(service.batcher.stats)
+            requests = [call('POST', '/predict', {'symbol': symbol, 'timeframe': '1h'})
+                        for symbol in ['BTC-USD', 'ETH-USD'] * 6]
+            responses = await asyncio.gather(*requests)
+            missing = await call('POST', '/predict', {'symbol': 'XRP-USD'})
+            malformed = await call('POST', '/predict/batch', {'requests': [{'symbol': 'BTC-USD'}, 'ETH-USD']})
+            return before, responses, missing, malformed
+        
+        before, responses, missing, malformed = asyncio.run(run())
+        
+        if any(status != 200 or 'action' not in body for status, body in responses):
+            print(f"❌ Prediction requests failed: {responses[0]}")
+            return False
+        batches = service.batcher.stats['batches'] - before['batches']
+        if batches != 2:
+            print(f"❌ 12 concurrent requests ran in {batches} forward passes (expected 2)")
+            return False
+        if missing[0] != 404:
+            print("❌ Unknown model should return 404")
+            return False
+        if malformed[0] != 400 or 'Request 1' not in malformed[1]['error']:
+            print(f"❌ Non-object batch item should return 400 naming its index: {malformed}")
+            return False
+        if service.batcher._pending:
+            print("❌ Batcher still references models after flushing")
+            return False
+        
+        # Registry-loaded predictors are evicted least recently used first; added ones stay
+        service.max_predictors = 3
+        for symbol in ['SOL-USD', 'ADA-USD', 'DOT-USD']:
+            predictor = EnhancedCryptoPredictorLSTM(symbol, '1h')
+            service.add_predictor(predictor, pinned=False)
+            service._evict()
+        if list(service.predictors) != [('BTC-USD', '1h'), ('ETH-USD', '1h'), ('DOT-USD', '1h')]:
+            print(f"❌ Predictor cap not enforced: {list(service.predictors)}")
+            return False
+        
+        print(f"✅ 12 concurrent requests served by {batches} batched forward passes")
+        print(f"🎯 Sample signal: {responses[0][1]['symbol']} {responses[0][1]['action']}")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Signal service error: {e}")
+        traceback.print_exc()
+        return False
+
+def test_hyperparameter_search():
+    """Test successive-halving search on a shared feature matrix"""
+    print("\n🔎 Testing hyperparameter search...")
+    
+    try:
+        import tempfile
+        from pathlib import Path
+        from enhanced_predictor import EnhancedCryptoPredictorLSTM
+        from feature_store import FeatureMatrixStore
+        from hyperparameter_search import HyperparameterSearch, apply_best_params
+        
+        predictor = EnhancedCryptoPredictorLSTM('BTC-USD', '1h')
+        search_space = {
+            'lstm_units': [8, 16],
+            'dense_units': [8],
+            'dropout': [0.1, 0.2],
+            'learning_rate': {'low': 1e-3, 'high': 1e-2, 'log': True},
+            'batch_size': [64],
+            'lookback_window': [10, 20]
+        }
+        # One small layer of each kind keeps the per-trial graph tracing short
+        architecture = {
+            'lstm_layers': [{'units': 8, 'dropout': 0.1}],
+            'dense_layers': [{'units': 8, 'activation': 'relu', 'dropout': 0.1}],
+            'optimizer': {'type': 'Adam', 'learning_rate': 0.001}
+        }
+        
+        with tempfile.TemporaryDirectory() as root:
+            store = FeatureMatrixStore(Path(root) / 'features')
+            search = HyperparameterSearch.from_predictor(
+                predictor, _synthetic_ohlcv(600), store, search_space=search_space,
+                n_trials=4, min_epochs=1, max_epochs=4, reduction_factor=4,
+                max_workers=2, output_dir=Path(root) / 'hpo', base_architecture=architecture
+            )
+            summary = search.run()
+            
+            pruned = [trial for trial in summary['trials'] if trial['pruned_at'] is not None]
+            if len(pruned) != 3 or summary['best']['epochs'] != 4:
+                print(f"❌ Expected 3 pruned trials and a 4-epoch winner: {summary['trials']}")
+                return False
+            if summary['cost_fraction'] >= 0.6:
+                print(f"❌ Search cost {summary['cost_fraction']:.0%} of a full search")
+                return False
+            if not Path(summary['best']['checkpoint']).exists() or len(store.keys()) != 1:
+                print("❌ Best checkpoint missing or feature matrix rebuilt")
+                return False
+            
+            # The same bars reuse the stored matrix; newer bars get their own
+            same = HyperparameterSearch.from_predictor(predictor, _synthetic_ohlcv(600), store)
+            newer = HyperparameterSearch.from_predictor(predictor, _synthetic_ohlcv(650), store)
+            if same.key != search.key or newer.key == search.key or len(store.keys()) != 2:
+                print(f"❌ Feature matrix key does not follow the data: {store.keys()}")
+                return False
+            
+            apply_best_params(predictor, summary)
+            if predictor.lookback_window != summary['best']['params']['lookback_window']:
+                print("❌ Best parameters were not applied to the predictor")
+                return False
+        
+        print(f"✅ Best {summary['metric']} {summary['best']['score']:.4f} "
+              f"at {summary['cost_fraction']:.0%} of the full training cost")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Hyperparameter search error: {e}")
+        traceback.print_exc()
+        return False
+
+def test_warm_start_cv():
+    """Test warm-started cross-validation with a replay buffer"""
+    print("\n🔁 Testing warm-started cross-validation...")
+    
+    try:
+        from enhanced_predictor import EnhancedCryptoPredictorLSTM
+        
+        predictor = EnhancedCryptoPredictorLSTM('BTC-USD', '1h')
+        predictor.lookback_window = 20
+        predictor.model_architecture = {
+            'lstm_layers': [{'units': 8, 'dropout': 0.1}],
+            'dense_layers': [{'units': 8, 'activation': 'relu', 'dropout': 0.1}],
+            'optimizer': {'type': 'Adam', 'learning_rate': 0.005}
+        }
+        predictor.training_settings = dict(predictor.training_settings, batch_size=64, warm_start_epochs=2)
+        
+        predictor.train_with_cross_validation(_synthetic_ohlcv(600), n_splits=3, epochs=4, warm_start=True)
+        results = predictor.cv_results
+        
+        if len(results['fold_scores']) != 3 or predictor.model is None:
+            print("❌ Missing fold results or model")
+            return False
+        if results['total_epochs'] > 4 + 2 * 2:
+            print(f"❌ Warm folds trained too long: {results['fold_epochs']}")
+            return False
+        
+        print(f"✅ Fold accuracies {[round(score, 3) for score in results['fold_scores']]} "
+              f"in {results['total_epochs']} epochs")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Warm-start CV error: {e}")
+        traceback.print_exc()
+        return False
+
+def test_resumable_training():
+    """Test that an interrupted checkpointed training run resumes where it stopped"""
+    print("\n💾 Testing resumable training...")
+    
+    try:
+        import shutil
+        import tempfile
+        import training_checkpoint
+        from enhanced_predictor import EnhancedCryptoPredictorLSTM
+        
+        run_dir = tempfile.mkdtemp()
+        data = _synthetic_ohlcv(600)
+        predictor = EnhancedCryptoPredictorLSTM('BTC-USD', '1h')
+        predictor.model_architecture = {
+            'lstm_layers': [{'units': 8, 'dropout': 0.1}],
+            'dense_layers': [{'units': 8, 'activation': 'relu', 'dropout': 0.1}],
+            'optimizer': {'type': 'Adam', 'learning_rate': 0.001}
+        }
+        
+        # Simulate a crash right after the second epoch of fold 2 was checkpointed
+        save_state = training_checkpoint.TrainingRun.save_state
+        saves = []
+        
+        def crashing_save_state(run, state):
+            save_state(run, state)
+            saves.append(1)
+            if len(saves) == 8:
+                raise KeyboardInterrupt
+        
+        training_checkpoint.TrainingRun.save_state = crashing_save_state
+        try:
+            predictor.train_with_cross_validation(data, n_splits=3, epochs=4, warm_start=True, run_dir=run_dir)
+            print("❌ Simulated interruption did not happen")
+            return False
+        except KeyboardInterrupt:
+            pass
+        finally:
+            training_checkpoint.TrainingRun.save_state = save_state
+        
+        resumed = EnhancedCryptoPredictorLSTM('BTC-USD', '1h')
+        resumed.resume_training(data, run_dir)
+        results = resumed.cv_results
+        
+        if results['resumed_from'] != {'fold': 1, 'epoch': 2}:
+            print(f"❌ Resumed from {results['resumed_from']}")
+            return False
+        if results['fold_epochs'] != [4, 4, 4] or resumed.model is None:
+            print(f"❌ Unexpected resumed run: {results}")
+            return False
+        
+        try:
+            resumed.train_with_cross_validation(data, n_splits=2, epochs=4, run_dir=run_dir)
+            print("❌ Run directory accepted different parameters")
+            return False
+        except ValueError:
+            pass
+        
+        shutil.rmtree(run_dir, ignore_errors=True)
+        print(f"✅ Resumed at fold 2 epoch 2; folds {results['fold_epochs']} epochs")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Resumable training error: {e}")
+        traceback.print_exc()
+        return False
+
+def test_fine_tuning():
+    """Test fine-tuning a registered model on new bars and registering the update"""
+    print("\n🔁 Testing incremental fine-tuning...")
+
+    try:
+        import tempfile
+        import numpy as np
+        from enhanced_predictor import EnhancedCryptoPredictorLSTM
+        from model_refresh import refresh_model
+        from model_registry import ModelRegistry, ModelCache
+
+        data = _synthetic_ohlcv(700)
+        predictor = EnhancedCryptoPredictorLSTM('BTC-USD', '1h')
+        predictor.model_architecture = {
+            'lstm_layers': [{'units': 8, 'dropout': 0.1}],
+            'dense_layers': [{'units': 8, 'activation': 'relu', 'dropout': 0.1}],
+            'optimizer': {'type': 'Adam', 'learning_rate': 0.001}
+        }
+        predictor.train_with_cross_validation(data.iloc[:600], n_splits=2, epochs=2)
+
+        with tempfile.TemporaryDirectory() as root:
+            registry = ModelRegistry(root, ModelCache())
+            base = registry.register(predictor)
+            base_weights = registry.load_model(base).get_weights()
+
+            entry = refresh_model(registry, 'BTC-USD', '1h', data, epochs=2)
+            if entry is None or entry['version'] != 2 or entry['metrics']['new_samples'] != 80:
+                print(f"❌ Unexpected refresh: {entry}")
+                return False
+            if entry['metrics']['fine_tuned_from'] != 1 or entry['metrics']['replay_samples'] != 40 or \
+                    entry['metrics']['holdout_samples'] != 20:
+                print(f"❌ Unexpected refresh metrics: {entry['metrics']}")
+                return False
+
+            # The cached base model is untouched and the scaler is carried over
+            if not all(np.array_equal(a, b) for a, b in zip(base_weights, registry.load_model(base).get_weights())):
+                print("❌ Fine-tuning modified the registered base model")
+                return False
+            refreshed = registry.get_predictor('BTC-USD', '1h')
+            if not np.array_equal(refreshed.feature_scaler.center_, predictor.feature_scaler.center_):
+                print("❌ Feature scaler was refit")
+                return False
+            if refreshed.trained_through <= predictor.trained_through:
+                print(f"❌ trained_through not advanced: {refreshed.trained_through}")
+                return False
+
+            # The held-out bars are left for the next refresh
+            _, _, _, indices = refreshed.create_lstm_sequences(refreshed.prepare_features(data), fit_scaler=False)
+            if str(indices[-21]) != refreshed.trained_through:
+                print(f"❌ trained_through includes held-out bars: {refreshed.trained_through}")
+                return False
+            
+            if refresh_model(registry, 'BTC-USD', '1h', data.loc[:refreshed.trained_through]) is not None:
+                print("❌ Refresh without new bars registered a version")
+                return False
+            
+            # History that does not reach back past trained_through plus the warm-up is refused
+            try:
+                refreshed.fine_tune(data.iloc[-150:])
+                print("❌ Fine-tuning accepted data without enough history before trained_through")
+                return False
+            except ValueError:
+                pass
+
+        print(f"✅ Fine-tuned on {entry['metrics']['new_samples']} new bars → v{entry['version']}")
+        return True
+
+    except Exception as e:
+        print(f"❌ Fine-tuning error: {e}")
+        traceback.print_exc()
+        return False
+
+def test_retrain_scheduler():
+    """Test drift/accuracy assessment and bounded retraining of degraded models"""
+    print("\n🩺 Testing retrain scheduler...")
+
+    try:
+        import tempfile
+        import threading
+        import model_refresh
+        import retrain_scheduler
+        from data_providers import ReplayProvider
+        from enhanced_predictor import EnhancedCryptoPredictorLSTM
+        from model_registry import ModelRegistry, ModelCache
+        from pooled_model import POOLED_SYMBOL
+        from retrain_scheduler import RetrainScheduler, SignalLedger, feature_drift
+
+        data = _synthetic_ohlcv(700)
+        predictor = EnhancedCryptoPredictorLSTM('BTC-USD', '1h')
+        predictor.model_architecture = {
+            'lstm_layers': [{'units': 8, 'dropout': 0.1}],
+            'dense_layers': [{'units': 8, 'activation': 'relu', 'dropout': 0.1}],
+            'optimizer': {'type': 'Adam', 'learning_rate': 0.001}
+        }
+        predictor.training_settings = dict(predictor.training_settings, epochs=2, cross_validation_folds=2)
+        predictor.train_with_cross_validation(data.iloc[:600], n_splits=2, epochs=2)
+
+        # BTC moves to a three times more volatile regime; ETH keeps its features but its signals go wrong
+        from synthetic_data import generate_ohlcv
+        max_drifted = retrain_scheduler.get_scheduler_settings()['max_drifted_fraction']
+        shifted = generate_ohlcv(700, '1h', 8, hourly_volatility=0.03)
+        shifted.index = data.index
+        drift = feature_drift(predictor, predictor.prepare_features(shifted))
+        baseline = feature_drift(predictor, predictor.prepare_features(data))
+        if drift['drifted_fraction'] <= max_drifted or baseline['drifted_fraction'] > max_drifted:
+            print(f"❌ Drift {drift['drifted_fraction']:.2f} vs baseline {baseline['drifted_fraction']:.2f}")
+            return False
+        
+        # Healthy models are not flagged: none of the scaler's own training data drifts,
+        # nor does a later window from the same process
+        for seed in range(4):
+            series = _synthetic_ohlcv(1500, seed=seed)
+            healthy = EnhancedCryptoPredictorLSTM('BTC-USD', '1h')
+            healthy.create_lstm_sequences(healthy.prepare_features(series.iloc[:1000]))
+            in_sample = feature_drift(healthy, healthy.prepare_features(series.iloc[:1000]))
+            later = feature_drift(healthy, healthy.prepare_features(series))
+            if in_sample['drifted_fraction'] != 0 or later['drifted_fraction'] > max_drifted:
+                print(f"❌ Seed {seed}: in-sample drift {in_sample['drifted_fraction']:.2f}, "
+                      f"later window {later['drifted_fraction']:.2f} ({later['drifted_features']})")
+                return False
+
+        provider = ReplayProvider(speed=None)
+        provider.add_frame('BTC-USD', '1h', shifted)
+        provider.add_frame('ETH-USD', '1h', data)
+
+        with tempfile.TemporaryDirectory() as root:
+            registry = ModelRegistry(root, ModelCache())
+            registry.register(predictor)
+            predictor.symbol = 'ETH-USD'
+            registry.register(predictor)
+            # A pooled entry is retrained with PooledCryptoPredictor.train, not per symbol
+            predictor.symbol = POOLED_SYMBOL
+            registry.register(predictor)
+
+            ledger = SignalLedger(f"{root}/signals")
+            close = data['Close']
+            for i in range(600, 699):
+                went_up = close.iloc[i + 1] > close.iloc[i]
+                ledger.record({'symbol': 'ETH-USD', 'timeframe': '1h', 'model_version': 1,
+                               'bar_time': data.index[i].isoformat(), 'prediction_value': 0.2 if went_up else 0.8})
+
+            # Count concurrent training jobs to check the slot bound
+            active, peak, lock = [0], [0], threading.Lock()
+
+            def tracked(job):
+                def wrapper(*args, **kwargs):
+                    with lock:
+                        active[0] += 1
+                        peak[0] = max(peak[0], active[0])
+                    try:
+                        return job(*args, **kwargs)
+                    finally:
+                        with lock:
+                            active[0] -= 1
+                return wrapper
+
+            retrain_model, refresh_model = retrain_scheduler.retrain_model, retrain_scheduler.refresh_model
+            retrain_scheduler.retrain_model = tracked(retrain_model)
+            retrain_scheduler.refresh_model = tracked(refresh_model)
+            try:
+                scheduler = RetrainScheduler(registry, ledger, provider, slots=1,
+                                             settings={'min_model_age_hours': 0})
+                assessed, assess = [], scheduler.assess
+                scheduler.assess = lambda symbol, timeframe: assessed.append(symbol) or assess(symbol, timeframe)
+                assessments = {a['symbol']: a for a in scheduler.check_all()}
+                scheduler.shutdown()
+            finally:
+                retrain_scheduler.retrain_model, retrain_scheduler.refresh_model = retrain_model, refresh_model
+
+            refreshed = []
+            model_refresh.refresh_model = lambda registry, symbol, timeframe, **kwargs: refreshed.append(symbol)
+            try:
+                model_refresh.refresh_all(registry)
+            finally:
+                model_refresh.refresh_model = refresh_model
+            if POOLED_SYMBOL in assessed or sorted(refreshed) != ['BTC-USD', 'ETH-USD']:
+                print(f"❌ Pooled entry was picked up: assessed {assessed}, refreshed {refreshed}")
+                return False
+
+            if assessments['BTC-USD']['action'] != 'retrain' or assessments['ETH-USD']['action'] != 'fine_tune':
+                print(f"❌ Unexpected actions: { {s: a['action'] for s, a in assessments.items()} }")
+                return False
+            if assessments['ETH-USD']['live_accuracy'] != 0.0 or peak[0] != 1:
+                print(f"❌ Accuracy {assessments['ETH-USD']['live_accuracy']}, peak jobs {peak[0]}")
+                return False
+            if sorted(job['new_version'] for job in scheduler.completed) != [2, 2]:
+                print(f"❌ Jobs did not register new versions: {scheduler.completed}")
+                return False
+
+            # Fresh versions have no ledger history and are within the minimum age
+            scheduler = RetrainScheduler(registry, ledger, provider, slots=1)
+            if scheduler.check_all():
+                print("❌ Freshly registered models were checked again")
+                return False
+            scheduler.shutdown()
+
+        print(f"✅ BTC retrained on drift ({drift['drifted_fraction']:.0%} of features), "
+              f"ETH fine-tuned on 0% live accuracy, 1 slot")
+        return True
+
+    except Exception as e:
+        print(f"❌ Retrain scheduler error: {e}")
+        traceback.print_exc()
+        return False
+
+def test_training_farm():
+    """Test the per-symbol training farm: thread budget, process pool, feature cache and registry"""
+    print("\n🏭 Testing training farm...")
+
+    try:
+        import tempfile
+        from pathlib import Path
+        from model_registry import ModelRegistry
+        from training_farm import TrainingFarm, build_job_matrix, thread_budget
+
+        if thread_budget(72, threads_per_job=2, cores=16) != (8, 2) or thread_budget(3, 8, cores=16) != (3, 5):
+            print("❌ Thread budget oversubscribes the cores")
+            return False
+
+        jobs = [dict(job, period='1mo') for job in build_job_matrix(['BTC-USD', 'ETH-USD'], ['1h'])]
+        options = {
+            'data_provider': 'replay',
+            'architecture': {
+                'lstm_layers': [{'units': 8, 'dropout': 0.1}],
+                'dense_layers': [{'units': 8, 'activation': 'relu', 'dropout': 0.1}],
+                'optimizer': {'type': 'Adam', 'learning_rate': 0.001}
+            },
+            'training_settings': {'epochs': 2, 'cross_validation_folds': 2}
+        }
+
+        with tempfile.TemporaryDirectory() as root:
+            paths = {'registry_root': f"{root}/registry", 'store_root': f"{root}/features",
+                     'report_path': f"{root}/report.json"}
+            report = TrainingFarm(jobs, max_workers=2, threads_per_job=1, cores=2, **paths, **options).run()
+            if report['trained'] != 2 or report['threads_per_job'] != 1 or report['feature_cache_hits'] != 0:
+                print(f"❌ Unexpected farm report: {report}")
+                return False
+
+            # Same bars again: features come from the store
+            rerun = TrainingFarm(jobs, max_workers=1, **paths, **options).run()
+            if rerun['feature_cache_hits'] != 2 or [r['version'] for r in rerun['results']] != [2, 2]:
+                print(f"❌ Unexpected rerun report: {rerun}")
+                return False
+
+            if len(ModelRegistry(paths['registry_root']).list()) != 4 or not Path(paths['report_path']).exists():
+                print("❌ Models or report missing")
+                return False
+
+        print(f"✅ 2 jobs on 2 workers in {report['elapsed_seconds']:.1f}s; rerun reused cached features")
+        return True
+
+    except Exception as e:
+        print(f"❌ Training farm error: {e}")
+        traceback.print_exc()
+        return False
+
+def test_pooled_model():
+    """Test the pooled cross-asset model: embedding, per-symbol scalers, registry and batched serving"""
+    print("\n🌐 Testing pooled cross-asset model...")
+
+    try:
+        import asyncio
+        import tempfile
+        import numpy as np
+        from data_providers import ReplayProvider
+        from model_registry import ModelRegistry, ModelCache
+        from pooled_model import PooledCryptoPredictor, POOLED_SYMBOL
+        from signal_service import SignalService
+
+        symbols = ['BTC-USD', 'ETH-USD', 'SOL-USD']
+        pooled = PooledCryptoPredictor(timeframe='1h', data_provider=ReplayProvider(), symbols=symbols, embedding_dim=4)
+        for member in pooled.members.values():
+            member.model_architecture = {
+                'lstm_layers': [{'units': 8, 'dropout': 0.1}],
+                'dense_layers': [{'units': 8, 'activation': 'relu', 'dropout': 0.1}],
+                'optimizer': {'type': 'Adam', 'learning_rate': 0.001}
+            }
+        data = pooled.fetch_universe('1mo')
+        pooled.train(data, epochs=2)
+
+        if sorted(pooled.results['per_symbol_accuracy']) != sorted(symbols):
+            print(f"❌ Missing per-symbol accuracy: {pooled.results}")
+            return False
+        scalers = pooled.feature_scaler
+        if np.allclose(scalers['BTC-USD'].center_, scalers['ETH-USD'].center_):
+            print("❌ Symbols share one feature scaler")
+            return False
+
+        # One forward pass for the universe matches predicting each symbol alone
+        signals = pooled.predict_universe(data)
+        for symbol, member in pooled.members.items():
+            _, X = member.prepare_prediction_input(data[symbol])
+            alone = float(pooled.model.predict(X, verbose=0)[0][0])
+            if not np.isclose(signals[symbol]['prediction_value'], alone, atol=1e-5):
+                print(f"❌ {symbol} batched prediction differs from a single-symbol pass")
+                return False
+
+        with tempfile.TemporaryDirectory() as root:
+            cache = ModelCache()
+            registry = ModelRegistry(root, cache)
+            entry = registry.register(pooled, metrics=pooled.results)
+            loaded = registry.get_predictor(POOLED_SYMBOL, '1h', predictor_cls=PooledCryptoPredictor)
+            loaded.data_provider = pooled.data_provider
+            restored = loaded.predict_universe(data)
+            if any(not np.isclose(restored[s]['prediction_value'], signals[s]['prediction_value'], atol=1e-5)
+                   for s in symbols):
+                print("❌ Registered pooled model predicts differently")
+                return False
+            if len(cache) != 1 or loaded.members['ETH-USD'].model_version != entry['version']:
+                print("❌ Pooled members did not share one loaded model")
+                return False
+            try:
+                loaded.members['ETH-USD'].fine_tune(data['ETH-USD'])
+                print("❌ A pooled member fine-tuned on its own")
+                return False
+            except TypeError:
+                pass
+
+            service = SignalService(registry=registry, data_provider=ReplayProvider(), window_ms=20, pooled=True)
+
+            async def run():
+                await asyncio.gather(*(service.predict(symbol, '1h') for symbol in symbols))  # Warm the feature cache
+                before = service.batcher.stats['batches']
+                results = await asyncio.gather(*(service.predict(symbol, '1h') for symbol in symbols * 2))
+                return service.batcher.stats['batches'] - before, results
+
+            batches, results = asyncio.run(run())
+            if batches != 1 or any(result['model_version'] != entry['version'] for result in results):
+                print(f"❌ {len(results)} pooled requests ran in {batches} forward passes (expected 1)")
+                return False
+
+        print(f"✅ {len(symbols)} symbols, one model; 6 service requests in 1 forward pass")
+        return True
+
+    except Exception as e:
+        print(f"❌ Pooled model error: {e}")
+        traceback.print_exc()
+        return False
+
+def test_performance_profiles():
+    """Test performance profile loading and the per-profile throughput benchmark"""
+    print("\n⚙️ Testing performance profiles...")
+    
+    try:
+        from benchmark import run_profile_benchmarks
+        from performance_profile import get_profile
+        
+        if get_profile('cpu_bf16').get('mixed_precision') != 'mixed_bfloat16':
+            print("❌ cpu_bf16 profile does not enable bfloat16")
+            return False
+        try:
+            get_profile('no_such_profile')
+            print("❌ Unknown profile was accepted")
+            return False
+        except ValueError:
+            pass
+        # Implicit setup (module import, predictor construction) falls back instead of raising
+        if get_profile('no_such_profile', strict=False)['name'] != 'default':
+            print("❌ Lenient lookup did not fall back to the default profile")
+            return False
+        
+        architecture = {
+            'lstm_layers': [{'units': 8, 'dropout': 0.0}],
+            'dense_layers': [{'units': 8, 'activation': 'relu', 'dropout': 0.0}],
+            'optimizer': {'type': 'Adam', 'learning_rate': 0.001}
+        }
+        report = run_profile_benchmarks(['default', 'cpu_bf16'], samples=128, epochs=1,
+                                        batch_size=32, lookback=10, architecture=architecture)
+        profiles = report['profiles']
+        
+        if profiles['cpu_bf16']['compute_dtype'] != 'bfloat16' or profiles['default']['compute_dtype'] != 'float32':
+            print("❌ Mixed precision policy was not applied per profile")
+            return False
+        if min(stats['train_samples_per_second'] for stats in profiles.values()) <= 0:
+            print("❌ Missing throughput measurements")
+            return False
+        
+        for name, stats in profiles.items():
+            print(f"✅ {name}: {stats['train_samples_per_second']:,.0f} train samples/s")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Performance profile error: {e}")
+        traceback.print_exc()
+        return False
+
+def test_streaming_inference():
+    """Test one-step stateful LSTM inference against full-window predictions"""
+    print("\n📡 Testing streaming LSTM inference...")
+    
+    try:
+        import numpy as np
+        from enhanced_predictor import EnhancedCryptoPredictorLSTM
+        
+        predictor = EnhancedCryptoPredictorLSTM('BTC-USD', '1h')
+        df = predictor.prepare_features(_synthetic_ohlcv(600))
+        X, _, _, _ = predictor.create_lstm_sequences(df)
+        predictor.model = predictor.build_advanced_lstm_model((X.shape[1], X.shape[2]))
+        streaming = predictor.enable_streaming_inference(resync_every=10)
+        
+        bars = range(len(X) - 25, len(X))
+        expected = predictor.model.predict(X[bars.start:], verbose=0)[:, 0]
+        lookback = predictor.lookback_window
+        streamed = np.array([
+            predictor.predict_latest(df.iloc[:i + lookback], X[i:i + 1]) for i in bars
+        ])
+        
+        exact = streaming.predict_window(X[-3:])[:, 0]
+        if np.abs(exact - expected[-3:]).max() > 1e-5:
+            print("❌ Full-window NumPy pass differs from the Keras model")
+            return False
+        if np.abs(streamed - expected).max() > 0.02:
+            print(f"❌ Streamed predictions drifted: {np.abs(streamed - expected).max():.4f}")
+            return False
+        if streaming.stats['primes'] != 3 or streaming.stats['steps'] != 22:
+            print(f"❌ Unexpected prime/step counts: {streaming.stats}")
+            return False
+        
+        # The same bar again is served from the stream's cache
+        predictor.predict_latest(df.iloc[:bars[-1] + lookback], X[bars[-1]:bars[-1] + 1])
+        if streaming.stats['cached'] != 1:
+            print("❌ Repeated bar was recomputed")
+            return False
+        
+        print(f"✅ {streaming.stats['steps']} one-step updates, max deviation "
+              f"{np.abs(streamed - expected).max():.2e} from full windows")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Streaming inference error: {e}")
+        traceback.print_exc()
+        return False
+
+def test_tail_features():
+    """Test prediction-time tail features against the full prepare_features chain"""
+    print("\n✂️ Testing tail-window features...")
+    
+    try:
+        import numpy as np
+        import pandas as pd
+        from enhanced_predictor import EnhancedCryptoPredictorLSTM
+        
+        predictor = EnhancedCryptoPredictorLSTM('BTC-USD', '1h')
+        data = _synthetic_ohlcv(1200)
+        lookback = predictor.lookback_window
+        
+        # Cold start, then bars appended to the cached state
+        for end in (1100, 1101, 1108):
+            full = predictor.prepare_features(data.iloc[:end]).iloc[-lookback:]
+            tail = predictor.prepare_features_tail(data.iloc[:end]).iloc[-lookback:]
+            
+            if not full.index.equals(tail.index):
+                print(f"❌ Tail rows end at {tail.index[-1]}, expected {full.index[-1]}")
+                return False
+            if not (full['Market_Regime'] == tail['Market_Regime']).all():
+                print("❌ Market regime differs")
+                return False
+            numeric = full.select_dtypes('number').columns
+            if not np.allclose(full[numeric], tail[numeric], rtol=1e-7, atol=1e-8):
+                print(f"❌ Features differ after {end} bars")
+                return False
+        
+        if predictor.tail_state.stats != {'cold': 1, 'warm': 2}:
+            print(f"❌ Appended bars were not continued from cached state: {predictor.tail_state.stats}")
+            return False
+        
+        # The volatility quantile covers the whole history, however long and however it arrived
+        from tail_features import RecursiveIndicatorState
+        long_data = _synthetic_ohlcv(12000)
+        chunked = RecursiveIndicatorState()
+        for start in range(0, len(long_data), 700):
+            chunked.advance(long_data.iloc[start:start + 700])
+        ratio = RecursiveIndicatorState().advance(long_data)['ATR'] / long_data['Close'].to_numpy()
+        if chunked.volatile_threshold() != pd.Series(ratio).quantile(0.8):
+            print("❌ Volatility quantile differs from the full-history quantile")
+            return False
+        full = predictor.prepare_features(long_data).iloc[-60:]
+        tail = predictor.prepare_features_tail(long_data).iloc[-60:]
+        if not (full['Market_Regime'] == tail['Market_Regime']).all():
+            print("❌ Market regime differs on a long history")
+            return False
+        
+        print(f"✅ Last {lookback} rows match prepare_features from a "
+              f"{predictor.tail_state.rows}-bar tail")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Tail features error: {e}")
+        traceback.print_exc()
+        return False
+
 def test_confidence_scoring():
     """Test confidence scoring system"""
     print("\n🎯 Testing confidence scoring...")
@@ -202,6 +1547,175 @@ def test_confidence_scoring():
         traceback.print_exc()
         return False
 
+def test_confidence_series():
+    """Test the vectorized confidence scoring against the per-bar functions"""
+    print("\n🧮 Testing vectorized confidence scoring...")
+    
+    try:
+        import numpy as np
+        from advanced_indicators import AdvancedTechnicalIndicators, ConfidenceScoring, TRADE_BLOCK_REASONS
+        from enhanced_predictor import EnhancedCryptoPredictorLSTM
+        
+        predictor = EnhancedCryptoPredictorLSTM('BTC-USD', '1h')
+        df = predictor.prepare_features(_synthetic_ohlcv(800))
+        predictions = np.random.default_rng(3).uniform(0, 1, len(df))
+        risk_params = {'min_confidence': 0.5, 'min_confluence': 0.5}
+        
+        scores = ConfidenceScoring.score_frame(df, predictions, risk_params)
+        
+        for i in range(len(df)):
+            row = df.iloc[i]
+            confluence = AdvancedTechnicalIndicators.get_signal_confluence(df, i)
+            volume_confirmation = row['Volume_Ratio'] > 1.5
+            confidence, factors = ConfidenceScoring.calculate_comprehensive_confidence(
+                predictions[i], confluence, row['Market_Regime'], volume_confirmation, row['Volatility_Regime']
+            )
+            should_trade, reason = ConfidenceScoring.should_trade(
+                confidence, confluence, {'regime': row['Market_Regime'], 'volume_confirmation': volume_confirmation},
+                risk_params
+            )
+            
+            if abs(scores['confidence'][i] - confidence) > 1e-12:
+                print(f"❌ Confidence differs at bar {i}")
+                return False
+            if len(ConfidenceScoring.describe_factors(scores['factors'][i])) != len(factors):
+                print(f"❌ Factor mask differs at bar {i}")
+                return False
+            if scores['should_trade'][i] != should_trade or \
+                    not reason.startswith(TRADE_BLOCK_REASONS[scores['trade_reason'][i]].split(' below')[0]):
+                print(f"❌ Trade decision differs at bar {i}: {reason}")
+                return False
+        
+        print(f"✅ {len(df)} bars scored in one call, {int(scores['should_trade'].sum())} tradeable")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Vectorized confidence error: {e}")
+        traceback.print_exc()
+        return False
+
+def test_cascade_inference():
+    """Test that rule vetoes skip the model without changing backtest results"""
+    print("\n🪜 Testing cheap-first inference cascade...")
+    
+    try:
+        import numpy as np
+        from enhanced_predictor import EnhancedCryptoPredictorLSTM
+        
+        predictor = EnhancedCryptoPredictorLSTM('BTC-USD', '1h')
+        predictor.risk_params.update({'min_confidence': 0.5, 'min_confluence': 0.5})
+        data = _synthetic_ohlcv(900)
+        df = predictor.prepare_features(data)
+        X, _, _, _ = predictor.create_lstm_sequences(df)
+        predictor.model = predictor.build_advanced_lstm_model((X.shape[1], X.shape[2]), {
+            'lstm_layers': [{'units': 8, 'dropout': 0.1}],
+            'dense_layers': [{'units': 8, 'activation': 'relu', 'dropout': 0.1}],
+            'optimizer': {'type': 'Adam', 'learning_rate': 0.001}
+        })
+        # Spread the untrained outputs so that some bars clear the entry/exit thresholds
+        kernel, bias = predictor.model.layers[-1].get_weights()
+        predictor.model.layers[-1].set_weights([kernel * 40, bias])
+        predictor.confidence_threshold = 0.5
+        
+        full = predictor.comprehensive_backtest(data, cascade=False)
+        cascaded = predictor.comprehensive_backtest(data, cascade=True)
+        
+        if cascaded['model_evaluations'] >= full['model_evaluations']:
+            print("❌ Cascade did not skip any bars")
+            return False
+        if not full['trades'] or len(cascaded['trades']) != len(full['trades']) or \
+                not np.isclose(cascaded['final_capital'], full['final_capital']):
+            print("❌ Cascaded backtest differs from the full one")
+            return False
+        
+        # Live signal: a vetoed latest bar never reaches the model
+        signal, _, _ = predictor.predict_with_advanced_confidence(data, cascade=True)
+        skipped = predictor.cascade_stats['skipped'] == 1
+        if skipped != (signal['prediction_value'] is None) or (skipped and signal['action'] != 'HOLD'):
+            print(f"❌ Inconsistent cascaded signal: {signal['action']} {predictor.cascade_stats}")
+            return False
+        
+        print(f"✅ Model ran on {cascaded['model_evaluations']} of {full['model_evaluations']} "
+              f"backtest bars with identical results")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Cascade inference error: {e}")
+        traceback.print_exc()
+        return False
+
+def test_prediction_memo():
+    """Test the shared prediction memo: dedup, TTL, size bound and bar keys"""
+    print("\n🗂️ Testing prediction memo...")
+    
+    try:
+        import threading
+        import time
+        from types import SimpleNamespace
+        import pandas as pd
+        from prediction_memo import PredictionMemo, memo_key
+        
+        memo = PredictionMemo(ttl_seconds=0.2, max_entries=2)
+        calls = []
+        
+        def predict():
+            calls.append(1)
+            time.sleep(0.05)
+            return {'action': 'BUY', 'confidence': 0.9}
+        
+        # Concurrent duplicate requests compute once and get independent copies
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(memo.get_or_compute('k', predict)))
+                   for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        results[0]['action'] = 'SELL'
+        if len(calls) != 1 or memo.get('k')['action'] != 'BUY':
+            print(f"❌ Duplicate requests recomputed or shared a mutable result ({len(calls)} calls)")
+            return False
+        
+        time.sleep(0.25)
+        memo.get_or_compute('k', predict)
+        memo.get_or_compute('a', predict)
+        memo.get_or_compute('b', predict)
+        if len(calls) != 4 or len(memo) != 2 or memo.stats['expired'] != 1:
+            print(f"❌ TTL or size bound not applied: {memo.stats}")
+            return False
+        
+        predictor = SimpleNamespace(model_version=3, symbol='BTC-USD', timeframe='1h', model=None)
+        key = memo_key(predictor, pd.Timestamp('2024-05-01 10:59', tz='UTC'))
+        if key != (3, 'BTC-USD', '1h', pd.Timestamp('2024-05-01 09:00', tz='UTC')) or \
+                key != memo_key(predictor, pd.Timestamp('2024-05-01 10:01', tz='UTC')):
+            print(f"❌ Unexpected memo key {key}")
+            return False
+        
+        # Unregistered models get a token that is never reused by a later model
+        class Model:
+            pass
+        
+        unregistered = SimpleNamespace(model_version=None, symbol='BTC-USD', timeframe='1h', model=Model())
+        first = memo_key(unregistered)[0]
+        if memo_key(unregistered)[0] != first:
+            print("❌ Model token is not stable")
+            return False
+        tokens = set()
+        for _ in range(50):
+            unregistered.model = Model()  # The previous model is freed, so id() may repeat
+            tokens.add(memo_key(unregistered)[0])
+        if first in tokens or len(tokens) != 50:
+            print("❌ A new model reused an earlier model's memo key")
+            return False
+        
+        print(f"✅ Memo stats {memo.stats}")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Prediction memo error: {e}")
+        traceback.print_exc()
+        return False
+
 def test_streamlit_ui():
     """Test if Streamlit UI can be imported"""
     print("\n🖥️ Testing Streamlit UI components...")
@@ -268,10 +1782,35 @@ def main():
     tests = [
         ("Import Test", test_imports),
         ("Data Fetching Test", test_data_fetching),
+        ("Data Provider Test", test_data_providers),
+        ("Async Fetcher Test", test_async_fetcher),
+        ("Candle Resampling Test", test_candle_resampling),
+        ("Stream Ingestion Test", test_stream_ingestion),
         ("Technical Indicators Test", test_technical_indicators),
+        ("Indicator Backend Parity Test", test_indicator_backend_parity),
+        ("Batched Indicators Test", test_batch_indicators),
         ("Model Creation Test", test_model_creation),
         ("Feature Preparation Test", test_feature_preparation),
+        ("Compact Features Test", test_compact_features),
+        ("Feature Store Test", test_feature_store),
+        ("Instrumentation Test", test_instrumentation),
+        ("Benchmark Suite Test", test_benchmark_suite),
+        ("Model Registry Test", test_model_registry),
+        ("Signal Service Test", test_signal_service),
+        ("Hyperparameter Search Test", test_hyperparameter_search),
+        ("Warm-Start CV Test", test_warm_start_cv),
+        ("Resumable Training Test", test_resumable_training),
+        ("Fine-Tuning Test", test_fine_tuning),
+        ("Retrain Scheduler Test", test_retrain_scheduler),
+        ("Training Farm Test", test_training_farm),
+        ("Pooled Model Test", test_pooled_model),
+        ("Performance Profile Test", test_performance_profiles),
+        ("Streaming Inference Test", test_streaming_inference),
+        ("Tail Features Test", test_tail_features),
         ("Confidence Scoring Test", test_confidence_scoring),
+        ("Confidence Series Test", test_confidence_series),
+        ("Cascade Inference Test", test_cascade_inference),
+        ("Prediction Memo Test", test_prediction_memo),
         ("Streamlit UI Test", test_streamlit_ui),
         ("Comprehensive Test", run_comprehensive_test)
     ]
@@ -0,0 +1,157 @@
+"""
+Training Checkpoints
+Resumable cross-validation runs: model, optimizer, callback and fold state kept in a run directory
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import tensorflow as tf
+
+RUN_STATE_FILE = 'run.json'
+CURRENT_MODEL_FILE = 'current.keras'  # Fold in progress, saved after every epoch
+BEST_WEIGHTS_FILE = 'best_weights.npz'  # EarlyStopping's best weights for the fold in progress
+
+
+class TrainingRun:
+    """
+    Run directory of one train_with_cross_validation call
+
+    Layout:
+        run.json          parameters, finished folds and the fold in progress
+        fold_<k>.keras    final model of each finished fold
+        current.keras     model and optimizer state after the last finished epoch
+        best_weights.npz  weights EarlyStopping would restore for the fold in progress
+
+    Every file is written to a temporary name and renamed, so an interrupted
+    write leaves the previous checkpoint intact.
+    """
+
+    def __init__(self, run_dir: str):
+        self.run_dir = Path(run_dir)
+
+    @property
+    def exists(self) -> bool:
+        return (self.run_dir / RUN_STATE_FILE).exists()
+
+    def load_state(self) -> Dict:
+        """
+        Raises:
+            FileNotFoundError: No run was started in this directory
+        """
+        path = self.run_dir / RUN_STATE_FILE
+        if not path.exists():
+            raise FileNotFoundError(f"No training run found in {self.run_dir}")
+        with open(path) as f:
+            return json.load(f)
+
+    def save_state(self, state: Dict):
+        self.run_dir.mkdir(parents=True, exist_ok=True)
+        path = self.run_dir / RUN_STATE_FILE
+        tmp = path.with_suffix('.json.tmp')
+        with open(tmp, 'w') as f:
+            json.dump(state, f, indent=2, default=float)
+        os.replace(tmp, path)
+
+    def fold_model_path(self, fold: int) -> Path:
+        return self.run_dir / f"fold_{fold}.keras"
+
+    def current_model_path(self) -> Path:
+        return self.run_dir / CURRENT_MODEL_FILE
+
+    def save_model(self, model, path: Path):
+        # Keras requires the .keras suffix, so the temporary file keeps it
+        tmp = path.with_name(f"{path.stem}.tmp.keras")
+        model.save(tmp)
+        os.replace(tmp, path)
+
+    def load_model(self, path: Path):
+        return tf.keras.models.load_model(path)
+
+    def save_best_weights(self, weights: List[np.ndarray]):
+        path = self.run_dir / BEST_WEIGHTS_FILE
+        tmp = path.with_name('best_weights.tmp.npz')
+        np.savez(tmp, *weights)
+        os.replace(tmp, path)
+
+    def load_best_weights(self) -> Optional[List[np.ndarray]]:
+        path = self.run_dir / BEST_WEIGHTS_FILE
+        if not path.exists():
+            return None
+        with np.load(path) as saved:
+            return [saved[f"arr_{i}"] for i in range(len(saved.files))]
+
+    def clear_current(self):
+        """Drop the in-progress files once their fold is finished"""
+        self.current_model_path().unlink(missing_ok=True)
+        (self.run_dir / BEST_WEIGHTS_FILE).unlink(missing_ok=True)
+
+
+class EpochCheckpoint(tf.keras.callbacks.Callback):
+    """
+    Saves the model (with optimizer state), the epoch logs and the
+    EarlyStopping / ReduceLROnPlateau counters after every epoch, and puts
+    the counters back when a resumed fit starts
+
+    Must come after the callbacks it tracks, since their on_train_begin resets them.
+    """
+
+    def __init__(self, run: TrainingRun, state: Dict, early_stopping, reduce_lr):
+        super().__init__()
+        self.run = run
+        self.state = state
+        self.early_stopping = early_stopping
+        self.reduce_lr = reduce_lr
+
+    def on_train_begin(self, logs=None):
+        saved = self.state['current'].get('callbacks')
+        if not saved:
+            return
+        for callback, values in ((self.early_stopping, saved['early_stopping']),
+                                 (self.reduce_lr, saved['reduce_lr'])):
+            for name, value in values.items():
+                setattr(callback, name, value)
+        self.early_stopping.best_weights = self.run.load_best_weights()
+
+    def on_epoch_end(self, epoch, logs=None):
+        current = self.state['current']
+        current['epoch'] = epoch + 1
+        for name, value in (logs or {}).items():
+            # Per-class metrics such as f1_score are arrays
+            current['history'].setdefault(name, []).append(np.asarray(value, dtype=float).tolist())
+        current['stopped'] = bool(self.model.stop_training)
+
+        early_stopping, reduce_lr = self.early_stopping, self.reduce_lr
+        if early_stopping.best_weights is not None and early_stopping.best_epoch == epoch:
+            self.run.save_best_weights(early_stopping.best_weights)
+        current['callbacks'] = {
+            'early_stopping': {
+                'wait': early_stopping.wait,
+                'best': None if early_stopping.best is None else float(early_stopping.best),
+                'best_epoch': early_stopping.best_epoch,
+                'stopped_epoch': early_stopping.stopped_epoch
+            },
+            'reduce_lr': {
+                'wait': reduce_lr.wait,
+                'best': None if reduce_lr.best is None else float(reduce_lr.best),
+                'cooldown_counter': reduce_lr.cooldown_counter
+            }
+        }
+
+        # Model first: a state file never points at an epoch the model has not reached
+        self.run.save_model(self.model, self.run.current_model_path())
+        self.run.save_state(self.state)
+
+
+def history_from_logs(logs: Dict[str, List[float]]):
+    """Keras History object for per-epoch logs restored from a run"""
+    history = tf.keras.callbacks.History()
+    history.history = {name: list(values) for name, values in logs.items()}
+    history.epoch = list(range(len(next(iter(logs.values()), []))))
+    return history
+
+
+__all__ = ['TrainingRun', 'EpochCheckpoint', 'history_from_logs']
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Training Farm
+Trains every symbol x timeframe in parallel worker processes and writes the models to the registry
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from app_config import get_section
+from performance_profile import set_thread_budget
+
+DEFAULT_FARM_SETTINGS = {
+    'max_workers': 0,  # 0: as many as the thread budget allows
+    'threads_per_job': 2,
+    'cores': 0,  # 0: all of os.cpu_count(); lower to leave cores for other services
+    'data_period': '2y',
+    'data_periods': {'1m': '5d', '5m': '1mo', '15m': '1mo'},  # Provider limits on intraday history
+    'feature_store': 'data/feature_store',
+    'report_path': 'models/farm/report.json'
+}
+
+
+def get_farm_settings() -> Dict:
+    """training_farm from config.json, with defaults for missing keys"""
+    settings = dict(DEFAULT_FARM_SETTINGS)
+    settings.update(get_section('training_farm'))
+    return settings
+
+
+def build_job_matrix(symbols: Optional[List[str]] = None, timeframes: Optional[List[str]] = None) -> List[Dict]:
+    """
+    One job per symbol x timeframe, defaulting to data_sources in config.json
+
+    Each job carries the history period to fetch for its timeframe.
+    """
+    sources = get_section('data_sources')
+    settings = get_farm_settings()
+    symbols = symbols or sources.get('crypto_symbols', ['BTC-USD'])
+    timeframes = timeframes or sources.get('timeframes', ['1h'])
+    return [{
+        'symbol': symbol,
+        'timeframe': timeframe,
+        'period': settings['data_periods'].get(timeframe, settings['data_period'])
+    } for symbol in symbols for timeframe in timeframes]
+
+
+def thread_budget(n_jobs: int, max_workers: Optional[int] = None,
+                  threads_per_job: Optional[int] = None, cores: Optional[int] = None) -> Tuple[int, int]:
+    """
+    Split the CPU between concurrent jobs so workers x threads never exceeds the cores
+
+    Args:
+        n_jobs: Jobs to run
+        max_workers: Concurrent jobs; cores // threads_per_job when not given
+        threads_per_job: Minimum CPU threads per job when deriving the worker count
+        cores: Defaults to os.cpu_count()
+
+    Returns:
+        (workers, threads per job)
+    """
+    cores = cores or os.cpu_count() or 1
+    if max_workers:
+        workers = min(max_workers, cores)
+    else:
+        workers = max(cores // max(threads_per_job or 1, 1), 1)
+    workers = max(min(workers, n_jobs), 1)
+    # Fewer jobs than slots: the running ones get the spare cores
+    return workers, max(cores // workers, 1)
+
+
+def data_fingerprint(data) -> str:
+    """Short hash of an OHLCV frame, so cached feature matrices follow the data"""
+    import pandas as pd
+
+    return hashlib.sha1(pd.util.hash_pandas_object(data).to_numpy().tobytes()).hexdigest()[:10]
+
+
+def train_job(task: Dict) -> Dict:
+    """
+    Fetch, build (or reuse) the feature matrix, cross-validate and register one model
+
+    Runs in a worker process; failures are reported in the result instead of raised.
+    """
+    set_thread_budget(task.get('threads'))
+
+    from enhanced_predictor import EnhancedCryptoPredictorLSTM
+    from feature_store import FeatureMatrixStore, feature_set_hash
+    from model_registry import ModelRegistry
+
+    started = time.perf_counter()
+    result = {'symbol': task['symbol'], 'timeframe': task['timeframe'], 'status': 'failed',
+              'version': None, 'feature_cache_hit': False, 'error': None}
+    try:
+        predictor = EnhancedCryptoPredictorLSTM(task['symbol'], task['timeframe'], data_provider=task.get('data_provider'))
+        if task.get('architecture'):
+            predictor.model_architecture = task['architecture']
+        if task.get('training_settings'):
+            predictor.training_settings = dict(predictor.training_settings, **task['training_settings'])
+        settings = predictor.training_settings
+
+        data = predictor.fetch_comprehensive_data(task['period'])
+        if data is None or data.empty:
+            raise LookupError(f"No data for {task['symbol']} {task['timeframe']}")
+
+        # Keyed by data as well as features, so a rerun on the same bars skips the indicators
+        store = FeatureMatrixStore(task['store_root'])
+        key = (f"{predictor.symbol}_{predictor.timeframe}_"
+               f"{feature_set_hash(predictor.selected_features, predictor.lookback_window)}_{data_fingerprint(data)}")
+        result['feature_cache_hit'] = store.exists(key)
+        if not result['feature_cache_hit']:
+            predictor.export_feature_matrix(predictor.prepare_features(data), store, key)
+        matrix = predictor.load_feature_matrix(store, key)
+
+        predictor.train_with_cross_validation(matrix, settings['cross_validation_folds'], settings['epochs'])
+        entry = ModelRegistry(task['registry_root']).register(predictor, metrics=predictor.cv_results)
+
+        result.update({
+            'status': 'trained',
+            'version': entry['version'],
+            'samples': len(matrix) - predictor.lookback_window,
+            'mean_accuracy': predictor.cv_results['mean_accuracy'],
+            'best_accuracy': predictor.cv_results['best_accuracy'],
+            'epochs': predictor.cv_results['total_epochs']
+        })
+    except Exception as e:
+        result['error'] = f"{type(e).__name__}: {e}"
+    result['seconds'] = round(time.perf_counter() - started, 2)
+    result['threads'] = task.get('threads')
+    return result
+
+
+class TrainingFarm:
+    """
+    Trains a matrix of symbol/timeframe jobs on a process pool
+
+    Each worker is limited to its share of the CPU threads (workers x threads
+    <= cores), so TensorFlow pools in different processes do not compete.
+    Feature matrices go through the FeatureMatrixStore and finished models
+    into the ModelRegistry; run() returns and saves a summary report.
+    """
+
+    def __init__(self, jobs: Optional[List[Dict]] = None, max_workers: Optional[int] = None,
+                 threads_per_job: Optional[int] = None, registry_root: Optional[str] = None,
+                 store_root: Optional[str] = None, report_path: Optional[str] = None,
+                 data_provider=None, architecture: Optional[Dict] = None,
+                 training_settings: Optional[Dict] = None, cores: Optional[int] = None):
+        """
+        Args:
+            jobs: From build_job_matrix (defaults to every configured symbol x timeframe)
+            max_workers: Concurrent jobs (1 trains in this process)
+            threads_per_job: CPU threads per job
+            data_provider: Provider name; worker processes build their own provider,
+                so instances are only usable with max_workers=1
+            architecture, training_settings: Override the configured ones for every job
+            cores: CPU cores to budget (defaults to training_farm.cores, then all)
+        """
+        settings = get_farm_settings()
+        self.jobs = jobs if jobs is not None else build_job_matrix()
+        self.workers, self.threads = thread_budget(
+            len(self.jobs),
+            max_workers or settings['max_workers'],
+            threads_per_job or settings['threads_per_job'],
+            cores or settings['cores']
+        )
+        self.registry_root = registry_root or get_section('signal_service').get('registry_root', 'models/registry')
+        self.store_root = store_root or settings['feature_store']
+        self.report_path = Path(report_path or settings['report_path'])
+        self.data_provider = data_provider
+        self.architecture = architecture
+        self.training_settings = training_settings
+
+    def _task(self, job: Dict) -> Dict:
+        return dict(
+            job,
+            threads=self.threads if self.workers > 1 else None,
+            store_root=str(self.store_root),
+            registry_root=str(self.registry_root),
+            data_provider=self.data_provider,
+            architecture=self.architecture,
+            training_settings=self.training_settings
+        )
+
+    def run(self) -> Dict:
+        """
+        Train every job
+
+        Returns:
+            Report with one result per job (in job order) and farm totals
+        """
+        print(f"🏭 Training {len(self.jobs)} models on {self.workers} worker(s) x {self.threads} thread(s)")
+        started = time.perf_counter()
+        results = [None] * len(self.jobs)
+        tasks = [self._task(job) for job in self.jobs]
+
+        if self.workers > 1:
+            # spawn: forked TensorFlow runtimes are not safe to reuse
+            with ProcessPoolExecutor(self.workers, mp_context=get_context('spawn')) as executor:
+                futures = {executor.submit(train_job, task): i for i, task in enumerate(tasks)}
+                for future in as_completed(futures):
+                    results[futures[future]] = self._report_job(future.result())
+        else:
+            for i, task in enumerate(tasks):
+                results[i] = self._report_job(train_job(task))
+
+        elapsed = time.perf_counter() - started
+        trained = [result for result in results if result['status'] == 'trained']
+        job_seconds = sum(result['seconds'] for result in results)
+        report = {
+            'jobs': len(results),
+            'trained': len(trained),
+            'failed': len(results) - len(trained),
+            'workers': self.workers,
+            'threads_per_job': self.threads,
+            'feature_cache_hits': sum(result['feature_cache_hit'] for result in results),
+            'elapsed_seconds': round(elapsed, 2),
+            'job_seconds': round(job_seconds, 2),
+            'parallel_speedup': round(job_seconds / elapsed, 2) if elapsed > 0 else None,
+            'registry_root': str(self.registry_root),
+            'results': results
+        }
+
+        self.report_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.report_path, 'w') as f:
+            json.dump(report, f, indent=2)
+
+        print(f"🏁 {report['trained']}/{report['jobs']} trained, {report['failed']} failed in {elapsed:.1f}s "
+              f"({report['parallel_speedup']}x over sequential); report: {self.report_path}")
+        return report
+
+    def _report_job(self, result: Dict) -> Dict:
+        name = f"{result['symbol']} {result['timeframe']}"
+        if result['status'] == 'trained':
+            print(f"✅ {name} v{result['version']}: mean accuracy {result['mean_accuracy']:.3f} "
+                  f"({result['seconds']:.1f}s{', cached features' if result['feature_cache_hit'] else ''})")
+        else:
+            print(f"❌ {name}: {result['error']}")
+        return result
+
+
+__all__ = ['TrainingFarm', 'build_job_matrix', 'thread_budget', 'train_job', 'data_fingerprint',
+           'get_farm_settings', 'DEFAULT_FARM_SETTINGS']
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train every symbol x timeframe into the model registry")
+    parser.add_argument('--symbols', nargs='+', help="Defaults to data_sources.crypto_symbols")
+    parser.add_argument('--timeframes', nargs='+', help="Defaults to data_sources.timeframes")
+    parser.add_argument('--provider', help="Data provider name (defaults to config.json)")
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--threads-per-job', type=int)
+    parser.add_argument('--registry')
+    parser.add_argument('--report')
+    args = parser.parse_args(argv)
+
+    farm = TrainingFarm(
+        build_job_matrix(args.symbols, args.timeframes),
+        max_workers=args.workers, threads_per_job=args.threads_per_job,
+        registry_root=args.registry, report_path=args.report, data_provider=args.provider
+    )
+    report = farm.run()
+    return 0 if report['failed'] == 0 else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())